@@ -17,7 +17,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=['PyQt5.QtWebEngine', 'PyQt5.QtWebEngineWidgets', 'PyQt5.QtWebEngineCore', 'PyQt5.QtBluetooth', 'PyQt5.QtNfc', 'PyQt5.QtPositioning', 'PyQt5.QtLocation', 'PyQt5.QtSensors', 'PyQt5.QtSerialPort', 'PyQt5.QtQuick', 'PyQt5.QtQml', 'PyQt5.Qt3D', 'PyQt5.QtDesigner', 'PyQt5.QtHelp', 'PyQt5.QtSql', 'PyQt5.QtTest', 'PyQt5.QtXml', 'PyQt5.QtXmlPatterns', 'matplotlib', 'numpy', 'pandas', 'scipy', 'PIL', 'tkinter'],
+    excludes=['PyQt5.QtWebEngine', 'PyQt5.QtWebEngineWidgets', 'PyQt5.QtWebEngineCore', 'PyQt5.QtBluetooth', 'PyQt5.QtNfc', 'PyQt5.QtPositioning', 'PyQt5.QtLocation', 'PyQt5.QtSensors', 'PyQt5.QtSerialPort', 'PyQt5.QtQuick', 'PyQt5.QtQml', 'PyQt5.Qt3D', 'PyQt5.QtDesigner', 'PyQt5.QtHelp', 'PyQt5.QtSql', 'PyQt5.QtTest', 'PyQt5.QtXml', 'PyQt5.QtXmlPatterns', 'matplotlib', 'pandas', 'scipy', 'PIL', 'tkinter'],
     noarchive=False,
     optimize=0,
 )
@@ -0,0 +1,9 @@
+"""
+批量视频编码工具 - 命令行入口（无界面，不依赖 PyQt5）
+"""
+import sys
+from core.cli import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
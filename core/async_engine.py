@@ -0,0 +1,615 @@
+"""
+异步编码引擎 - 基于 asyncio 子进程，一个事件循环即可同时管理大量探测和编码任务
+
+用法示例:
+    async def main():
+        engine = AsyncEncodeEngine(FFmpegHandler(), max_concurrent=4)
+        for path in paths:
+            engine.submit(path, output_for(path), video_codec="libx265", video_crf="26")
+        engine.close()
+        async for event in engine.events():
+            print(event["event"], event["job"].input_path, event.get("progress"))
+
+    asyncio.run(main())
+
+事件为字典，字段与命令行模式的 JSON Lines 一致，另附 "job" 字段指向任务句柄：
+    file_started / progress / audio_fallback / file_finished，全部任务结束后迭代器退出。
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from core.ffmpeg_handler import FFmpegHandler, CREATE_NO_WINDOW
+from core.clip_batch import ClipBatch
+from core.crop_detect import (
+    WINDOW_TIMEOUT, aggregate_crops, build_cropdetect_command, crop_fields, crop_filter, crop_rect,
+    parse_cropdetect, sample_offsets
+)
+from core.decimate import DecimateStats, decimate_filter
+from core.file_processor import FileProcessor
+from core.renditions import active_renditions, check_outputs, rendition_outputs
+
+# 任务状态
+JOB_QUEUED = "queued"
+JOB_PROBING = "probing"
+JOB_ENCODING = "encoding"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+# 事件队列结束标记
+_END_OF_EVENTS = object()
+
+
+def _subprocess_kwargs() -> Dict[str, Any]:
+    """子进程公共参数（Windows 上隐藏控制台窗口）"""
+    kwargs: Dict[str, Any] = {}
+    if sys.platform == 'win32':
+        kwargs['creationflags'] = CREATE_NO_WINDOW
+    return kwargs
+
+
+class EncodeJob:
+    """编码任务句柄（由 AsyncEncodeEngine.submit 返回）"""
+
+    def __init__(self, job_id: int, input_path: str, output_path: str, encode_kwargs: Dict[str, Any],
+                 fallback_audio: Optional[Tuple[str, str]] = None):
+        self.job_id = job_id
+        self.input_path = input_path
+        self.output_path = output_path
+        self.encode_kwargs = encode_kwargs
+        self.fallback_audio = fallback_audio
+        self.state = JOB_QUEUED
+        self.progress = 0.0
+        # 编码统计（来自 FFmpeg 进度行）
+        self.duration = 0.0
+        self.encoded_time = 0.0
+        self.fps = 0.0
+        self.speed = 0.0
+        self.out_bytes = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.success: Optional[bool] = None
+        self.message = ""
+        self._cancel_requested = False
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._done = asyncio.get_running_loop().create_future()
+
+    def cancel(self):
+        """请求取消任务（排队中的任务直接取消，运行中的任务终止 FFmpeg 进程）"""
+        self._cancel_requested = True
+        if self._process is not None and self._process.returncode is None:
+            try:
+                self._process.terminate()
+            except ProcessLookupError:
+                pass
+
+    @property
+    def cancelled(self) -> bool:
+        """是否已请求取消"""
+        return self._cancel_requested
+
+    def done(self) -> bool:
+        """任务是否已结束"""
+        return self._done.done()
+
+    async def wait(self) -> Tuple[bool, str]:
+        """等待任务结束，返回 (success, message)"""
+        return await asyncio.shield(self._done)
+
+    def __await__(self):
+        return self.wait().__await__()
+
+    def __repr__(self):
+        return f"<EncodeJob #{self.job_id} {self.state} {os.path.basename(self.input_path)}>"
+
+
+class AsyncEncodeEngine:
+    """asyncio 编码引擎，必须在事件循环中创建和使用"""
+
+    def __init__(self, ffmpeg_handler: FFmpegHandler, max_concurrent: int = 1, max_concurrent_probes: int = 16):
+        """
+        Args:
+            ffmpeg_handler: FFmpeg 处理器（仅用于构建命令和解析输出，不会阻塞调用）
+            max_concurrent: 同时运行的编码进程数
+            max_concurrent_probes: 同时运行的 ffprobe 进程数
+        """
+        self.ffmpeg_handler = ffmpeg_handler
+        self._encode_slots = asyncio.Semaphore(max(1, max_concurrent))
+        self._probe_slots = asyncio.Semaphore(max(1, max_concurrent_probes))
+        self._events: asyncio.Queue = asyncio.Queue()
+        self._jobs: Dict[int, EncodeJob] = {}
+        self._tasks = set()
+        self._next_id = 1
+        self._closed = False
+
+    @property
+    def jobs(self) -> Dict[int, EncodeJob]:
+        """所有已提交的任务 {job_id: EncodeJob}"""
+        return dict(self._jobs)
+
+    def submit(self, input_path: str, output_path: str,
+               fallback_audio: Optional[Tuple[str, str]] = None, **encode_kwargs) -> EncodeJob:
+        """
+        提交编码任务
+
+        Args:
+            input_path: 输入文件路径
+            output_path: 输出文件路径
+            fallback_audio: (备用音频编码, 备用音频码率)，音频为 copy 且与 MP4 不兼容时使用；None 表示不检查
+            **encode_kwargs: 传给 FFmpegHandler.build_command 的编码参数
+
+        Returns:
+            任务句柄
+        """
+        job = self._new_job(input_path, output_path, encode_kwargs, fallback_audio)
+        self._schedule(self._run_job(job))
+        return job
+
+    def submit_batch(self, specs: List[Tuple[str, str, Dict[str, Any], Optional[Tuple[str, str]]]]) -> List[EncodeJob]:
+        """
+        提交一组小文件，由同一个 FFmpeg 进程编码（见 core.clip_batch），只占用一个编码并发槽位
+
+        进程失败时组内的文件逐个单独重新编码，只有真正有问题的文件失败。
+
+        Args:
+            specs: [(输入文件, 输出文件, 编码参数, 备用音频)]，通常按时长从长到短排列
+
+        Returns:
+            各文件的任务句柄（事件与 submit 相同）
+        """
+        jobs = [self._new_job(*spec) for spec in specs]
+        if len(jobs) == 1:
+            self._schedule(self._run_job(jobs[0]))
+        elif jobs:
+            self._schedule(self._run_batch(jobs))
+        return jobs
+
+    def _new_job(self, input_path: str, output_path: str, encode_kwargs: Dict[str, Any],
+                 fallback_audio: Optional[Tuple[str, str]] = None) -> EncodeJob:
+        if self._closed:
+            raise RuntimeError("引擎已关闭，不能再提交任务")
+        job = EncodeJob(self._next_id, input_path, output_path, dict(encode_kwargs), fallback_audio)
+        self._next_id += 1
+        self._jobs[job.job_id] = job
+        return job
+
+    def _schedule(self, coroutine):
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+
+    def close(self):
+        """不再接受新任务；所有任务结束后 events() 迭代器退出"""
+        self._closed = True
+        if not self._tasks:
+            self._events.put_nowait(_END_OF_EVENTS)
+
+    def cancel_all(self):
+        """取消所有未结束的任务"""
+        for job in self._jobs.values():
+            if not job.done():
+                job.cancel()
+
+    async def events(self) -> AsyncIterator[Dict[str, Any]]:
+        """按发生顺序迭代任务事件，close() 后且全部任务结束时退出"""
+        while True:
+            event = await self._events.get()
+            if event is _END_OF_EVENTS:
+                return
+            yield event
+
+    async def run_until_complete(self) -> Dict[int, EncodeJob]:
+        """关闭引擎并等待所有任务结束（丢弃事件），返回所有任务"""
+        self.close()
+        async for _ in self.events():
+            pass
+        return self.jobs
+
+    def _on_task_done(self, task):
+        self._tasks.discard(task)
+        if self._closed and not self._tasks:
+            self._events.put_nowait(_END_OF_EVENTS)
+
+    def _emit(self, event: str, job: EncodeJob, **fields):
+        record = {"event": event, "job": job, "index": job.job_id, "input": job.input_path}
+        record.update(fields)
+        self._events.put_nowait(record)
+
+    async def _run_probe(self, cmd: list) -> dict:
+        """异步运行 ffprobe 并解析 JSON 输出"""
+        async with self._probe_slots:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                    **_subprocess_kwargs()
+                )
+                try:
+                    stdout, _ = await asyncio.wait_for(process.communicate(), timeout=10)
+                except asyncio.TimeoutError:
+                    process.kill()
+                    await process.wait()
+                    return {}
+                if process.returncode == 0:
+                    return json.loads(stdout.decode('utf-8', errors='replace'))
+            except Exception as e:
+                print(f"获取视频信息失败: {e}")
+        return {}
+
+    async def probe_duration(self, video_path: str) -> float:
+        """异步获取视频时长（秒）"""
+        cmd = self.ffmpeg_handler.build_probe_command(video_path)
+        if not cmd:
+            return 0.0
+        return FFmpegHandler.parse_duration(await self._run_probe(cmd))
+
+    async def probe_source(self, video_path: str) -> dict:
+        """异步获取时长和视频流参数（简化版探测，格式与 FFmpegHandler.parse_detailed_video_info 相同）"""
+        cmd = self.ffmpeg_handler.build_probe_command(video_path)
+        if not cmd:
+            return {}
+        return FFmpegHandler.parse_detailed_video_info(video_path, await self._run_probe(cmd))
+
+    async def probe_detailed(self, video_path: str) -> dict:
+        """异步获取详细视频信息（格式与 FFmpegHandler.get_detailed_video_info 相同，同样使用其 probe_cache）"""
+        probe_cache = self.ffmpeg_handler.probe_cache
+        if probe_cache is not None:
+            cached = probe_cache.get(video_path)
+            if cached is not None:
+                return cached
+        cmd = self.ffmpeg_handler.build_detailed_probe_command(video_path)
+        if not cmd:
+            return {}
+        data = await self._run_probe(cmd)
+        info = FFmpegHandler.parse_detailed_video_info(video_path, data) if data else {}
+        if probe_cache is not None:
+            probe_cache.put(video_path, info)
+        return info
+
+    async def _run_cropdetect(self, cmd: list):
+        """运行一个黑边检测窗口，返回检测到的区域"""
+        async with self._probe_slots:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE,
+                    **_subprocess_kwargs()
+                )
+                try:
+                    _, stderr = await asyncio.wait_for(process.communicate(), timeout=WINDOW_TIMEOUT)
+                except asyncio.TimeoutError:
+                    process.kill()
+                    await process.wait()
+                    return None
+                return parse_cropdetect(stderr.decode('utf-8', errors='replace'))
+            except Exception as e:
+                print(f"黑边检测失败: {e}")
+        return None
+
+    async def detect_crop(self, video_path: str, info: dict) -> dict:
+        """异步检测黑边（各抽样窗口并发运行，结果格式和缓存与 FFmpegHandler.detect_crop 相同）"""
+        probe_cache = self.ffmpeg_handler.probe_cache
+        cached = probe_cache.get(video_path) if probe_cache is not None else None
+        if crop_rect(cached):
+            return crop_fields(crop_rect(cached))
+        duration = float(info.get('format_duration') or info.get('video_duration') or 0)
+        rects = await asyncio.gather(*(
+            self._run_cropdetect(build_cropdetect_command(self.ffmpeg_handler.ffmpeg_path, video_path, offset))
+            for offset in sample_offsets(duration)
+        ))
+        fields = crop_fields(aggregate_crops(list(rects), int(info.get('width') or 0), int(info.get('height') or 0)))
+        if probe_cache is not None:
+            probe_cache.update(video_path, fields)
+        return fields
+
+    async def _run_job(self, job: EncodeJob):
+        """运行单个任务：排队 -> 探测 -> 编码"""
+        result = (False, "Cancelled")
+        try:
+            async with self._encode_slots:
+                if job.cancelled:
+                    job.state = JOB_CANCELLED
+                else:
+                    result = await self._encode(job)
+        except asyncio.CancelledError:
+            # 事件循环关闭（例如 Ctrl+C）时终止 FFmpeg 进程
+            await self._terminate(job)
+            job.state = JOB_CANCELLED
+            result = (False, "Cancelled")
+            raise
+        except Exception as e:
+            job.state = JOB_FAILED
+            result = (False, f"Error: {str(e)}")
+        finally:
+            self._finish_job(job, result)
+
+    def _finish_job(self, job: EncodeJob, result: Tuple[bool, str]):
+        """记录任务结果并发出 file_finished 事件"""
+        job.success, job.message = result
+        job.finished_at = time.time()
+        if not job._done.done():
+            job._done.set_result(result)
+        fields = {}
+        renditions = active_renditions(job.encode_kwargs)
+        if renditions:
+            # 多码率输出时附带各规格的输出文件
+            fields["outputs"] = [path for _, path in rendition_outputs(job.output_path, renditions)]
+        self._emit("file_finished", job, output=job.output_path, success=result[0], message=result[1], **fields)
+
+    async def _encode(self, job: EncodeJob) -> Tuple[bool, str]:
+        """执行编码（在编码并发槽位内调用）"""
+        job.state = JOB_PROBING
+        job.started_at = time.time()
+        self._emit("file_started", job, output=job.output_path)
+
+        # 确保输出目录存在
+        output_dir = os.path.dirname(job.output_path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir, exist_ok=True)
+
+        kwargs = dict(job.encode_kwargs)
+        info = self._provided_info(kwargs)
+        if info is None:
+            if self._needs_audio_probe(job):
+                info = await self.probe_detailed(job.input_path)
+            else:
+                info = await self.probe_source(job.input_path)
+            # 源视频参数用于规划滤镜（省略与源相同的缩放、像素格式和帧率转换）
+            kwargs["source_info"] = dict(kwargs.get("source_info") or {}, **info)
+        if self._needs_audio_probe(job):
+            self._apply_audio_fallback(job, kwargs, info)
+        duration = info.get('format_duration', 0) or info.get('video_duration', 0)
+        if kwargs.get("auto_crop") and not kwargs.get("crop") and not crop_rect(kwargs["source_info"]):
+            # 尚未检测黑边：编码前检测
+            kwargs["source_info"] = dict(kwargs["source_info"], **await self.detect_crop(job.input_path, info))
+            self._emit("crop_detected", job, crop=crop_filter(kwargs["source_info"]))
+
+        job.duration = duration
+        if job.cancelled:
+            job.state = JOB_CANCELLED
+            return False, "Cancelled"
+
+        cmd = self.ffmpeg_handler.build_command(job.input_path, job.output_path, **kwargs)
+        job.state = JOB_ENCODING
+        job._process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+            **_subprocess_kwargs()
+        )
+        encode_started = time.monotonic()
+        concurrency = self._encoding_count()
+
+        error_lines = []
+        # 丢弃重复帧时统计输出帧数
+        decimate_stats = None
+        if decimate_filter(kwargs) and kwargs.get("video_codec", "libx264") != "copy":
+            decimate_stats = DecimateStats(kwargs["source_info"], duration, kwargs.get("video_framerate", ""))
+
+        def handle_line(line: str):
+            if decimate_stats:
+                decimate_stats.feed(line)
+            self._handle_line(job, line, duration, error_lines)
+
+        await self._read_lines(job._process, handle_line)
+
+        returncode = await job._process.wait()
+        if job.cancelled:
+            job.state = JOB_CANCELLED
+            return False, "Cancelled"
+        if returncode == 0:
+            job.progress = 100.0
+            self._emit("progress", job, progress=100.0, message="Encoding finished")
+            renditions = active_renditions(kwargs)
+            if renditions:
+                # 一次编码输出多个文件时逐个确认
+                success, message = check_outputs(job.output_path, renditions)
+            else:
+                success, message = True, "Success"
+            if success and decimate_stats:
+                self._emit("frames_dropped", job, dropped=decimate_stats.dropped,
+                           source_frames=decimate_stats.source_frames, output_frames=decimate_stats.output_frames)
+                message = decimate_stats.summary(message)
+            speed_model = self.ffmpeg_handler.speed_model
+            if success and speed_model is not None:
+                # 编码期间同时运行的编码数取开始和结束时的较大值
+                speed_model.record(kwargs, kwargs["source_info"], duration or job.encoded_time,
+                                   time.monotonic() - encode_started, max(concurrency, self._encoding_count()))
+            job.state = JOB_DONE if success else JOB_FAILED
+            return success, message
+        job.state = JOB_FAILED
+        return False, FFmpegHandler.format_error_message(error_lines, returncode)
+
+    def _encoding_count(self) -> int:
+        """正在编码的任务数"""
+        return sum(1 for job in self._jobs.values() if job.state == JOB_ENCODING)
+
+    @staticmethod
+    def _provided_info(kwargs: Dict[str, Any]) -> Optional[dict]:
+        """调用方提供的详细视频信息（source_info，例如队列清单自带的探测结果），不完整时为 None（需要探测）"""
+        info = kwargs.get("source_info") or {}
+        if info.get('quick') or not (info.get('format_duration') or info.get('video_duration')):
+            return None
+        return info
+
+    @staticmethod
+    def _needs_audio_probe(job: EncodeJob) -> bool:
+        """音频为 copy 且设置了备用音频时需要探测源音频编码"""
+        return bool(job.fallback_audio) and job.encode_kwargs.get("audio_codec", "copy") == "copy"
+
+    def _apply_audio_fallback(self, job: EncodeJob, kwargs: Dict[str, Any], info: dict):
+        """源音频不能 copy 到 MP4 时改用备用音频编码"""
+        src_audio_codec = (info.get("audio_codec", "") or "").lower()
+        if src_audio_codec not in FileProcessor.MP4_SAFE_AUDIO_CODECS:
+            kwargs["audio_codec"] = job.fallback_audio[0] or "aac"
+            kwargs["audio_bitrate"] = job.fallback_audio[1] or "192k"
+            self._emit("audio_fallback", job, audio_codec=kwargs["audio_codec"],
+                       audio_bitrate=kwargs["audio_bitrate"])
+
+    @staticmethod
+    async def _read_lines(process, handle_line: Callable[[str], None]):
+        """逐行读取 FFmpeg 的 stderr 直到进程关闭输出"""
+        buffer = ""
+        while True:
+            chunk = await process.stderr.read(4096)
+            if not chunk:
+                break
+            buffer += chunk.decode('utf-8', errors='replace')
+            # FFmpeg 的进度行以 \r 结尾，其余输出以 \n 结尾
+            lines = buffer.replace('\r', '\n').split('\n')
+            buffer = lines.pop()
+            for line in lines:
+                handle_line(line)
+        if buffer:
+            handle_line(buffer)
+
+    async def _run_batch(self, jobs: List[EncodeJob]):
+        """运行一组小文件：一个进程编码整组，失败时逐个单独重新编码"""
+        results: Dict[int, Tuple[bool, str]] = {}
+        try:
+            async with self._encode_slots:
+                pending = [job for job in jobs if not job.cancelled]
+                if len(pending) > 1:
+                    results.update(await self._encode_batch(pending))
+            # 进程失败时整组结果不可信，逐个单独编码找出真正有问题的文件
+            for job in jobs:
+                result = results.get(job.job_id)
+                if result is not None and not result[0] and not job.cancelled:
+                    self._emit("batch_retry", job, message=result[1])
+                    result = None
+                if result is None:
+                    async with self._encode_slots:
+                        if job.cancelled:
+                            job.state = JOB_CANCELLED
+                            result = (False, "Cancelled")
+                        else:
+                            result = await self._encode(job)
+                results[job.job_id] = result
+                self._finish_job(job, result)
+        except asyncio.CancelledError:
+            for job in jobs:
+                await self._terminate(job)
+                if not job.done():
+                    job.state = JOB_CANCELLED
+            raise
+        except Exception as e:
+            for job in jobs:
+                if not job.done():
+                    job.state = JOB_FAILED
+                    results[job.job_id] = (False, f"Error: {str(e)}")
+        finally:
+            for job in jobs:
+                if not job.done():
+                    self._finish_job(job, results.get(job.job_id, (False, "Cancelled")))
+
+    async def _encode_batch(self, jobs: List[EncodeJob]) -> Dict[int, Tuple[bool, str]]:
+        """在一个 FFmpeg 进程中编码一组任务（在编码并发槽位内调用），返回 {job_id: (success, message)}"""
+        members = []
+        for job in jobs:
+            job.state = JOB_PROBING
+            job.started_at = time.time()
+            self._emit("file_started", job, output=job.output_path, batch=len(jobs))
+            output_dir = os.path.dirname(job.output_path)
+            if output_dir and not os.path.exists(output_dir):
+                os.makedirs(output_dir, exist_ok=True)
+            members.append((job.input_path, job.output_path, dict(job.encode_kwargs)))
+
+        # 只有需要判断源音频编码的任务才探测（并发进行），其余任务的时长从 FFmpeg 输出中读取
+        probing = [(job, kwargs) for job, (_, _, kwargs) in zip(jobs, members)
+                   if self._needs_audio_probe(job) and self._provided_info(kwargs) is None]
+        infos = await asyncio.gather(*(self.probe_detailed(job.input_path) for job, _ in probing))
+        for (_, kwargs), info in zip(probing, infos):
+            kwargs["source_info"] = dict(kwargs.get("source_info") or {}, **info)
+        for job, (_, _, kwargs) in zip(jobs, members):
+            if self._needs_audio_probe(job):
+                self._apply_audio_fallback(job, kwargs, kwargs["source_info"])
+        if any(job.cancelled for job in jobs):
+            # 组内有任务被取消时其余任务单独编码
+            return {job.job_id: (False, "Cancelled") for job in jobs if job.cancelled}
+
+        batch = ClipBatch([job.output_path for job in jobs],
+                          [float((kwargs.get("source_info") or {}).get("format_duration") or 0)
+                           for _, _, kwargs in members])
+        cmd = self.ffmpeg_handler.build_batch_command(members)
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+            **_subprocess_kwargs()
+        )
+        for job in jobs:
+            job.state = JOB_ENCODING
+            job._process = process
+
+        error_lines = []
+
+        def handle_line(line: str):
+            if FFmpegHandler.ERROR_PATTERN.search(line):
+                error_lines.append(line.strip())
+            for index in batch.feed(line):
+                job = jobs[index]
+                job.duration = batch.durations[index]
+                job.progress = batch.progress[index]
+                job.encoded_time = min(job.duration, job.progress * job.duration / 100)
+                self._emit("progress", job, progress=round(job.progress, 2),
+                           message=f"Encoding: {job.progress:.1f}% (batch)")
+
+        await self._read_lines(process, handle_line)
+        returncode = await process.wait()
+        results = {}
+        for job, result in zip(jobs, batch.results(returncode, error_lines)):
+            job._process = None
+            if job.cancelled:
+                job.state = JOB_CANCELLED
+                results[job.job_id] = (False, "Cancelled")
+            elif result[0]:
+                job.state = JOB_DONE
+                job.progress = 100.0
+                self._emit("progress", job, progress=100.0, message="Encoding finished")
+                results[job.job_id] = result
+            else:
+                results[job.job_id] = result
+        return results
+
+    def _handle_line(self, job: EncodeJob, line: str, duration: float, error_lines: list):
+        """处理一行 FFmpeg 输出：收集错误、解析进度"""
+        if not line.strip():
+            return
+        if FFmpegHandler.ERROR_PATTERN.search(line):
+            error_lines.append(line.strip())
+        current_time = FFmpegHandler.parse_progress_time(line)
+        if current_time is None:
+            return
+        job.encoded_time = current_time
+        stats = FFmpegHandler.parse_progress_stats(line)
+        job.fps = stats.get('fps', job.fps)
+        job.speed = stats.get('speed', job.speed)
+        job.out_bytes = int(stats.get('size', job.out_bytes))
+        if duration > 0:
+            progress = min(current_time / duration * 100, 99.0)  # 最多99%，最后完成时设为100%
+            if progress > job.progress:
+                job.progress = progress
+                self._emit("progress", job, progress=round(progress, 2), message=f"Encoding: {progress:.1f}%",
+                           fps=job.fps, speed=job.speed, size=job.out_bytes)
+
+    async def _terminate(self, job: EncodeJob):
+        """终止任务的 FFmpeg 进程"""
+        process = job._process
+        if process is None or process.returncode is not None:
+            return
+        try:
+            process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), timeout=2)
+            except asyncio.TimeoutError:
+                process.kill()
+        except ProcessLookupError:
+            pass
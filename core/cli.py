@@ -0,0 +1,649 @@
+"""
+命令行批量编码 - 无界面模式（不导入 PyQt5）
+
+用法示例:
+    python cli.py D:/videos -o D:/output -j 2 --set video_codec=libx265 --set video_crf=26
+
+进度以 JSON Lines 格式逐行输出到标准输出，每行一个事件对象：
+    {"event": "start", "total": 3, "output_dir": "..."}
+    {"event": "file_started", "index": 1, "total": 3, "input": "...", "output": "..."}
+    {"event": "progress", "index": 1, "total": 3, "input": "...", "progress": 12.5, "message": "..."}
+    {"event": "file_finished", "index": 1, "total": 3, "input": "...", "output": "...", "success": true, "message": "..."}
+    {"event": "finished", "total": 3, "success": 3, "failed": 0, "elapsed": 12.3}
+
+监视模式（--watch）下持续监控给定文件夹和配置中的 watch_folders，
+新文件写入完成后自动编码，直到按 Ctrl+C 退出；此时 total 为 0。
+
+--manifest 读取界面导出（或脚本生成）的队列清单（JSON Lines，可为 .gz），清单中的输出路径和
+文件级设置优先，自带详细探测结果的任务不再探测；状态为 done / paused / duplicate 的任务跳过。
+
+开始编码前会为所有任务生成编码计划：多个输入输出到同一文件、或输出会覆盖输入文件时
+输出 error 事件（包含 conflicts 列表）并以退出码 2 结束；输出文件已存在时输出 output_exists 事件。
+--dry-run 只输出计划，不编码：每个任务一个 plan_job 事件，最后是 plan 汇总事件；
+--plan FILE 同时把计划写入文件（.sh / .bat / .cmd 为脚本，其余为队列清单）。
+
+配置 batch_small_files 为 true（或 --set batch_small_files=true）时，小文件每组由同一个 FFmpeg 进程编码，
+事件与单独编码时相同；整组失败时组内文件逐个重新编码，此前会输出 batch_retry 事件。
+
+配置 decimate 为 true 时用 mpdecimate 丢弃重复帧（适合屏幕录制），编码完成后输出 frames_dropped 事件
+（dropped / source_frames / output_frames），file_finished 的 message 中也给出丢弃的帧数。
+
+配置 crf_search 为 true 时开始编码前按片源搜索 CRF：先输出 crf_search 事件（files / metric / target），
+每个文件一个 crf_selected 事件（crf / score / met / encodes）或 crf_search_failed 事件；
+--dry-run 时只使用缓存的得分，不试编码。
+
+配置 complexity_analysis 为 true 时（需要 NumPy）先分析各文件的内容复杂度（在 CRF 搜索之前），每个文件一个
+complexity 事件（spatial / temporal / cuts / scene_cuts / tier / overrides）或 complexity_failed 事件，
+档位对应的 CRF 和预设调整写入文件级参数；结果与探测信息一起缓存在 probe_cache.json 中。
+
+每次编码成功后把速度记录到本机的速度模型（speed_model.json，与界面共用）。
+--deadline（或配置 deadline_planning 为 true）时按速度模型为每个文件选择预设，在截止时间前尽量提高压缩率：
+先输出 deadline_plan 事件（available / predicted / feasible / calibrated / presets / jobs），
+编码过程中实际速度与预测偏差过大时重新规划尚未开始的文件，输出 deadline_replan 事件（slowdown / changed）。
+--cores 为可用于编码的核心数（机器同时运行其他工作时）。
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from core.async_engine import JOB_QUEUED, AsyncEncodeEngine
+from core.clip_batch import DEFAULT_BATCH_MAX_DURATION, DEFAULT_BATCH_MAX_FILES, group_batches
+from core.presets import TIER_NAMES, tier_overrides
+from core.config_manager import ConfigManager
+from core.crf_search import CRF_CACHE_FILE, CrfSearch, CrfSearchCache, searchable
+from core.crop_detect import crop_filter
+from core.deadline_planner import DeadlineTracker, core_share, parse_deadline, plan_deadline
+from core.encode_plan import BATCH_SCRIPT_EXTENSIONS, ISSUE_EXISTS, build_plan
+from core.ffmpeg_capabilities import CAPABILITY_CACHE_FILE
+from core.ffmpeg_handler import FFmpegHandler
+from core.file_processor import FileProcessor
+from core.folder_watcher import FolderWatcher
+from core.media_store import HAS_NUMPY
+from core.probe_cache import PROBE_CACHE_FILE, ProbeCache
+from core.queue_manifest import ManifestReader
+from core.speed_model import SPEED_MODEL_FILE, SpeedModel
+
+# 清单中不需要编码的任务状态
+MANIFEST_SKIP_STATUSES = ("done", "paused", "duplicate")
+# --plan 按脚本导出的扩展名（其余导出为队列清单）
+PLAN_SCRIPT_EXTENSIONS = (".sh",) + BATCH_SCRIPT_EXTENSIONS
+
+
+class JsonLinesReporter:
+    """JSON Lines 事件输出（线程安全）"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+
+    def emit(self, event: str, **fields) -> None:
+        """输出一个事件"""
+        record = {"event": event}
+        record.update(fields)
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+def parse_overrides(items: List[str], defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    解析 --set KEY=VALUE 形式的设置覆盖
+
+    值的类型按默认配置中同名键的类型转换（bool / int / JSON 列表），其余保持字符串。
+    """
+    overrides = {}
+    for item in items or []:
+        if "=" not in item:
+            raise ValueError(f"无效的设置覆盖（应为 KEY=VALUE）: {item}")
+        key, value = item.split("=", 1)
+        key = key.strip()
+        default = defaults.get(key)
+        if isinstance(default, bool):
+            overrides[key] = value.strip().lower() in ("1", "true", "yes", "on")
+        elif isinstance(default, int):
+            overrides[key] = int(value)
+        elif isinstance(default, list):
+            # 列表类设置（如 renditions）使用 JSON
+            overrides[key] = json.loads(value) if value.strip() else []
+        else:
+            overrides[key] = value
+    return overrides
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """构建命令行参数解析器"""
+    parser = argparse.ArgumentParser(
+        prog="vvenc-cli",
+        description="VvEnc 命令行批量编码（无界面），进度以 JSON Lines 输出到标准输出"
+    )
+    parser.add_argument("paths", nargs="*", help="输入文件或文件夹（文件夹会递归扫描；监视模式下为要监视的文件夹）")
+    parser.add_argument(
+        "-m", "--manifest", action="append", default=[], metavar="FILE",
+        help="队列清单（JSON Lines，可为 .gz），可多次指定"
+    )
+    parser.add_argument("-o", "--output-dir", default="", help="输出目录（默认使用配置中的 output_dir）")
+    parser.add_argument("-c", "--config", default="config.json", help="配置文件路径（默认 config.json）")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="同时编码的文件数（默认 1）")
+    parser.add_argument("--ffmpeg", default="", help="FFmpeg 可执行文件路径（默认使用配置或系统 PATH）")
+    parser.add_argument(
+        "--set", dest="overrides", action="append", default=[], metavar="KEY=VALUE",
+        help="覆盖配置项，可多次指定，例如 --set video_codec=libx265"
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="监视模式：持续监控文件夹（给定路径及配置中的 watch_folders），新文件写入完成后自动编码"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="只生成编码计划（输出路径、命令、估算工作量和冲突），不编码"
+    )
+    parser.add_argument(
+        "--plan", default="", metavar="FILE",
+        help="将编码计划写入文件而不编码：.sh / .bat / .cmd 为脚本，其余为队列清单（JSON Lines，可为 .gz）"
+    )
+    parser.add_argument(
+        "--deadline", default="", metavar="TIME",
+        help="截止时间（如 23:30、\"2026-10-20 08:00\"、+2h、+90m），按本机速度为每个文件选择预设"
+    )
+    parser.add_argument(
+        "--cores", type=int, default=None,
+        help="截止时间规划中可用于编码的核心数（默认使用配置中的 deadline_cores，0 表示全部核心）"
+    )
+    return parser
+
+
+def run(args: argparse.Namespace, reporter: JsonLinesReporter) -> int:
+    """
+    执行命令行批量编码
+
+    Returns:
+        进程退出码：0 全部成功，1 存在失败（--dry-run 时为存在冲突），2 参数或环境错误，130 被中断
+    """
+    config_manager = ConfigManager(args.config)
+    try:
+        config_manager.update(parse_overrides(args.overrides, config_manager.default_config))
+    except ValueError as e:
+        reporter.emit("error", message=str(e))
+        return 2
+
+    if not args.paths and not args.manifest and not args.watch:
+        reporter.emit("error", message="未指定输入文件或文件夹")
+        return 2
+
+    output_dir = args.output_dir or config_manager.get("output_dir", "")
+    # 监视模式下允许各监视文件夹使用自己的输出目录，清单中的任务可以自带输出路径
+    if not output_dir and not args.watch and not args.manifest:
+        reporter.emit("error", message="未指定输出目录（使用 -o 或在配置中设置 output_dir）")
+        return 2
+
+    try:
+        ffmpeg_handler = FFmpegHandler(args.ffmpeg or config_manager.get("ffmpeg_path", ""))
+    except FileNotFoundError as e:
+        reporter.emit("error", message=str(e))
+        return 2
+    file_processor = FileProcessor(ffmpeg_handler)
+    ffmpeg_handler.speed_model = SpeedModel(config_manager.get_data_path(SPEED_MODEL_FILE))
+
+    encode_kwargs = config_manager.get_encode_kwargs()
+    fallback_audio_codec = config_manager.get("fallback_audio_codec", "aac")
+    fallback_audio_bitrate = config_manager.get("fallback_audio_bitrate", "192k")
+    cancel_event = threading.Event()
+    start_time = time.time()
+
+    def encode_one(idx: int, total: int, input_path: str, output_path: str, file_kwargs: Dict[str, Any],
+                   fallback_codec: str, fallback_bitrate: str) -> bool:
+        """编码单个文件（在线程池中执行）"""
+        if cancel_event.is_set():
+            return False
+        reporter.emit("file_started", index=idx, total=total, input=input_path, output=output_path)
+
+        current_kwargs = dict(file_kwargs)
+        audio_codec, audio_bitrate, used_fallback = file_processor.resolve_audio_options(
+            input_path,
+            file_kwargs["audio_codec"],
+            file_kwargs["audio_bitrate"],
+            fallback_codec,
+            fallback_bitrate
+        )
+        current_kwargs["audio_codec"] = audio_codec
+        current_kwargs["audio_bitrate"] = audio_bitrate
+        if used_fallback:
+            reporter.emit("audio_fallback", index=idx, input=input_path,
+                          audio_codec=audio_codec, audio_bitrate=audio_bitrate)
+
+        def on_progress(progress: float, message: str):
+            reporter.emit("progress", index=idx, total=total, input=input_path,
+                          progress=round(progress, 2), message=message)
+
+        success, message = ffmpeg_handler.encode(
+            input_path,
+            output_path,
+            progress_callback=on_progress,
+            cancel_flag=cancel_event.is_set,
+            **current_kwargs
+        )
+        reporter.emit("file_finished", index=idx, total=total, input=input_path,
+                      output=output_path, success=success, message=message)
+        return success
+
+    if args.watch:
+        try:
+            return _run_watch(args, reporter, config_manager, file_processor, output_dir,
+                              encode_one, cancel_event, start_time)
+        finally:
+            ffmpeg_handler.speed_model.save()
+
+    # 扫描并去重输入文件
+    files = []
+    seen = set()
+    for path in args.paths:
+        for f in file_processor.scan_files(path):
+            if f not in seen:
+                seen.add(f)
+                files.append(f)
+
+    # 队列清单中的任务（自带输出路径、文件级设置和探测结果）
+    manifest_outputs: Dict[str, str] = {}
+    manifest_settings: Dict[str, Dict[str, Any]] = {}
+    per_file_kwargs: Dict[str, Dict[str, Any]] = {}
+    fallback_audio: Dict[str, tuple] = {}
+    # 各文件的详细视频信息：清单自带的探测结果直接使用，其余文件在需要时探测（见 _probe_missing），编码时不再探测
+    infos: Dict[str, dict] = {}
+    for manifest_path in args.manifest:
+        reader = ManifestReader(manifest_path)
+        try:
+            for entry in reader:
+                file_path = entry["path"]
+                if entry["status"] in MANIFEST_SKIP_STATUSES or file_path in seen:
+                    continue
+                seen.add(file_path)
+                files.append(file_path)
+                if entry["output"]:
+                    manifest_outputs[file_path] = entry["output"]
+                probe = entry["probe"]
+                if probe and not probe.get("quick"):
+                    infos[file_path] = dict(probe, file_path=file_path)
+                settings = entry["settings"]
+                if settings:
+                    manifest_settings[file_path] = settings
+                    per_file_kwargs[file_path] = config_manager.get_encode_kwargs(settings)
+                    fallback_audio[file_path] = (
+                        settings.get("fallback_audio_codec", fallback_audio_codec),
+                        settings.get("fallback_audio_bitrate", fallback_audio_bitrate)
+                    )
+        except (OSError, EOFError, ValueError) as e:
+            reporter.emit("error", message=f"读取队列清单失败: {e}", manifest=manifest_path)
+            return 2
+        if reader.errors:
+            reporter.emit("manifest_warning", manifest=manifest_path, invalid_lines=reader.errors,
+                          message=reader.first_error)
+    if not files:
+        reporter.emit("error", message="未找到视频文件")
+        return 2
+
+    unresolved = [f for f in files if f not in manifest_outputs]
+    if unresolved and not output_dir:
+        reporter.emit("error", message="未指定输出目录（使用 -o 或在配置中设置 output_dir）")
+        return 2
+    output_paths = file_processor.calculate_output_paths(unresolved, output_dir) if unresolved else {}
+    output_paths.update(manifest_outputs)
+    total = len(files)
+    dry_run = args.dry_run or bool(args.plan)
+
+    if config_manager.get("complexity_analysis", False):
+        _analyze_complexity(ffmpeg_handler, reporter, config_manager, files, infos, encode_kwargs, per_file_kwargs,
+                            manifest_settings, max(1, args.jobs))
+    if config_manager.get("crf_search", False):
+        _search_crf(ffmpeg_handler, reporter, config_manager, files, infos, encode_kwargs, per_file_kwargs,
+                    manifest_settings, max(1, args.jobs), cached_only=dry_run)
+    tracker = None
+    deadline_text = args.deadline or (config_manager.get("deadline", "") if config_manager.get("deadline_planning") else "")
+    if deadline_text:
+        deadline = parse_deadline(deadline_text)
+        if deadline is None:
+            reporter.emit("error", message=f"无效的截止时间: {deadline_text}")
+            return 2
+        cores = args.cores if args.cores is not None else int(config_manager.get("deadline_cores", 0) or 0)
+        tracker = _plan_deadline(ffmpeg_handler, reporter, files, infos, encode_kwargs, per_file_kwargs,
+                                 manifest_settings, deadline.timestamp(), cores, max(1, args.jobs))
+
+    # 编码计划：一次性计算所有任务的参数和命令，找出输出冲突
+    plan_kwargs: Dict[str, Dict[str, Any]] = {}
+    if dry_run:
+        # 估算工作量需要时长；音频参数按源音频编码确定（与实际编码时相同）
+        _probe_missing(ffmpeg_handler, infos, files, max(1, args.jobs))
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+            # 自动裁剪黑边时检测结果显示在计划的滤镜中
+            crop_files = [f for f in files if per_file_kwargs.get(f, encode_kwargs).get("auto_crop")]
+            for f, fields in zip(crop_files, executor.map(lambda f: ffmpeg_handler.detect_crop(f, infos[f]), crop_files)):
+                infos[f] = dict(infos[f], **fields)
+    for f in files:
+        kwargs = dict(per_file_kwargs.get(f, encode_kwargs))
+        if dry_run:
+            fallback_codec, fallback_bitrate = fallback_audio.get(f, (fallback_audio_codec, fallback_audio_bitrate))
+            kwargs["audio_codec"], kwargs["audio_bitrate"], _ = file_processor.resolve_audio_options(
+                f, kwargs["audio_codec"], kwargs["audio_bitrate"], fallback_codec, fallback_bitrate, info=infos[f]
+            )
+        plan_kwargs[f] = kwargs
+    plan = build_plan(ffmpeg_handler.build_command, files, output_paths, encode_kwargs, plan_kwargs,
+                      info=infos.get if dry_run else None)
+
+    if dry_run:
+        for idx, job in enumerate(plan.jobs, 1):
+            reporter.emit("plan_job", index=idx, total=total, **job.to_dict())
+        if args.plan:
+            try:
+                if args.plan.lower().endswith(PLAN_SCRIPT_EXTENSIONS):
+                    written = plan.write_script(args.plan)
+                else:
+                    written = plan.write_manifest(args.plan, manifest_settings, infos.get)
+            except OSError as e:
+                reporter.emit("error", message=f"写入编码计划失败: {e}", plan=args.plan)
+                return 2
+            reporter.emit("plan_written", path=args.plan, jobs=written)
+        reporter.emit("plan", **plan.summary())
+        return 1 if plan.blocked_jobs() else 0
+
+    blocked = plan.blocked_jobs()
+    if blocked:
+        reporter.emit("error", message="输出路径冲突或会覆盖输入文件", conflicts=[
+            {"input": job.input_path, "output": job.output_path, "issues": job.issues} for job in blocked
+        ])
+        return 2
+    existing = [path for job in plan.jobs if ISSUE_EXISTS in job.issues for path in job.outputs if os.path.exists(path)]
+    if existing:
+        reporter.emit("output_exists", count=len(existing), outputs=existing)
+
+    # 开始前检查编码器、滤镜和封装格式是否可用
+    capabilities = ffmpeg_handler.get_capabilities(config_manager.get_data_path(CAPABILITY_CACHE_FILE))
+    if capabilities is not None:
+        problems = []
+        for output_path in {os.path.splitext(p)[1].lower(): p for p in output_paths.values()}.values():
+            for problem in capabilities.validate_job(encode_kwargs, output_path):
+                if problem not in problems:
+                    problems.append(problem)
+        if not problems and not capabilities.has_encoder(fallback_audio_codec):
+            problems.append(f"备用音频编码器不可用: {fallback_audio_codec}")
+        if problems:
+            reporter.emit("error", message="当前 FFmpeg 无法执行编码任务", problems=problems,
+                          ffmpeg_version=capabilities.version)
+            return 2
+
+    # 小文件批量模式：时长未探测，按文件大小判断是否为小文件
+    groups = [[f] for f in files]
+    if config_manager.get("batch_small_files", False):
+        groups = group_batches(files, lambda f: per_file_kwargs.get(f, encode_kwargs),
+                               float(config_manager.get("batch_max_duration", DEFAULT_BATCH_MAX_DURATION)),
+                               int(config_manager.get("batch_max_files", DEFAULT_BATCH_MAX_FILES)))
+
+    reporter.emit("start", total=total, output_dir=output_dir, jobs=max(1, args.jobs),
+                  batches=sum(1 for group in groups if len(group) > 1))
+
+    try:
+        results = asyncio.run(_run_batch(ffmpeg_handler, reporter, groups, output_paths, encode_kwargs,
+                                         fallback_audio_codec, fallback_audio_bitrate, max(1, args.jobs),
+                                         per_file_kwargs, fallback_audio, tracker, infos))
+    except KeyboardInterrupt:
+        # asyncio.run 退出时会取消所有任务，引擎随之终止正在运行的 FFmpeg 进程
+        reporter.emit("cancelled", elapsed=round(time.time() - start_time, 3))
+        return 130
+    finally:
+        ffmpeg_handler.speed_model.save()
+
+    success_count = sum(1 for ok in results if ok)
+    reporter.emit("finished", total=total, success=success_count, failed=total - success_count,
+                  elapsed=round(time.time() - start_time, 3))
+    return 0 if success_count == total else 1
+
+
+def _probe_missing(ffmpeg_handler, infos: Dict[str, dict], files, jobs: int) -> Dict[str, dict]:
+    """并行探测 infos 中还没有视频信息的文件，结果写入 infos（探测失败时为空字典）"""
+    missing = [f for f in files if f not in infos]
+    if missing:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            infos.update(zip(missing, executor.map(ffmpeg_handler.get_detailed_video_info, missing)))
+    return infos
+
+
+def _analyze_complexity(ffmpeg_handler, reporter, config_manager, files, infos, encode_kwargs, per_file_kwargs,
+                        manifest_settings, jobs: int):
+    """
+    分析内容复杂度，档位对应的 video_crf / video_preset 写入 per_file_kwargs（清单中明确设置的项不调整）
+
+    结果缓存在界面共用的 probe_cache.json 中，已分析过且未修改的文件不再解码。
+    """
+    if not HAS_NUMPY:
+        reporter.emit("complexity_failed", message="内容复杂度分析需要 NumPy")
+        return
+    if ffmpeg_handler.probe_cache is None:
+        ffmpeg_handler.probe_cache = ProbeCache(config_manager.get_data_path(PROBE_CACHE_FILE))
+    tiers = config_manager.get("complexity_tiers") or {}
+    _probe_missing(ffmpeg_handler, infos, files, jobs)
+
+    def analyze_one(file_path):
+        return ffmpeg_handler.analyze_complexity(file_path, infos[file_path])
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for file_path, fields in zip(files, executor.map(analyze_one, files)):
+            if not fields:
+                reporter.emit("complexity_failed", input=file_path)
+                continue
+            kwargs = dict(per_file_kwargs.get(file_path, encode_kwargs))
+            settings = manifest_settings.get(file_path, {})
+            overrides = {key: value for key, value in tier_overrides(fields["complexity_tier"], kwargs, tiers).items()
+                         if key not in settings}
+            if overrides:
+                per_file_kwargs[file_path] = dict(kwargs, **overrides)
+            reporter.emit("complexity", input=file_path, spatial=fields["complexity_spatial"],
+                          temporal=fields["complexity_temporal"], cuts=fields["complexity_cuts"],
+                          scene_cuts=fields.get("scene_cuts", []), tier=TIER_NAMES[fields["complexity_tier"]],
+                          overrides=overrides)
+    ffmpeg_handler.probe_cache.save()
+
+
+def _search_crf(ffmpeg_handler, reporter, config_manager, files, infos, encode_kwargs, per_file_kwargs,
+                manifest_settings, jobs: int, cached_only: bool = False):
+    """
+    按片源搜索 CRF，结果写入 per_file_kwargs 的 video_crf（清单中明确设置了 video_crf 的文件不搜索）
+
+    需要时先检测黑边，检测结果作为 crop 写入文件级参数，编码时不再检测。
+    预览计划时（cached_only）只使用缓存的得分，不试编码。
+    """
+    capabilities = ffmpeg_handler.get_capabilities(config_manager.get_data_path(CAPABILITY_CACHE_FILE))
+    has_vmaf = capabilities is not None and capabilities.has_filter("libvmaf")
+    cache = CrfSearchCache(config_manager.get_data_path(CRF_CACHE_FILE))
+    search = CrfSearch.from_config(config_manager, ffmpeg_handler, has_vmaf, cache)
+    targets = [f for f in files if searchable(per_file_kwargs.get(f, encode_kwargs))
+               and "video_crf" not in manifest_settings.get(f, {})]
+    _probe_missing(ffmpeg_handler, infos, targets, jobs)
+
+    def search_one(file_path):
+        kwargs = dict(per_file_kwargs.get(file_path, encode_kwargs))
+        info = infos[file_path]
+        if kwargs.get("auto_crop") and not kwargs.get("crop"):
+            kwargs["crop"] = crop_filter(dict(info, **ffmpeg_handler.detect_crop(file_path, info)))
+            kwargs["auto_crop"] = False
+        duration = float(info.get("format_duration") or info.get("video_duration") or 0)
+        return kwargs, search.search(file_path, dict(kwargs, source_info=info or None), duration, cached_only)
+
+    reporter.emit("crf_search", files=len(targets), metric=search.metric, target=search.target,
+                  cached_only=cached_only)
+    # 每个文件的抽样窗口已并行试编码，同时搜索的文件数按 -j 限制
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for file_path, (kwargs, result) in zip(targets, executor.map(search_one, targets)):
+            if result is None:
+                reporter.emit("crf_search_failed", input=file_path)
+                continue
+            kwargs["video_crf"] = str(result.crf)
+            per_file_kwargs[file_path] = kwargs
+            reporter.emit("crf_selected", input=file_path, **result.to_dict())
+    cache.save()
+
+
+def _plan_deadline(ffmpeg_handler, reporter, files, infos, encode_kwargs, per_file_kwargs, manifest_settings,
+                   deadline: float, cores: int, jobs: int) -> DeadlineTracker:
+    """
+    按截止时间为每个文件选择预设，写入 per_file_kwargs 的 video_preset（清单中明确设置了 video_preset 的文件不调整）
+
+    Returns:
+        编码过程中用于重新规划的跟踪器
+    """
+    _probe_missing(ffmpeg_handler, infos, files, jobs)
+    targets = [(f, per_file_kwargs.get(f, encode_kwargs), infos[f]) for f in files]
+    fixed = [f for f in files if "video_preset" in manifest_settings.get(f, {})]
+    plan = plan_deadline(targets, ffmpeg_handler.speed_model, deadline - time.time(), core_share(cores), fixed=fixed)
+    for file_path, preset in plan.presets().items():
+        per_file_kwargs[file_path] = dict(per_file_kwargs.get(file_path, encode_kwargs), video_preset=preset)
+    reporter.emit("deadline_plan", deadline=time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(deadline)),
+                  cores=cores, jobs=[job.to_dict() for job in plan.jobs], **plan.summary())
+    return DeadlineTracker(plan, deadline, ffmpeg_handler.speed_model)
+
+
+def _replan_deadline(reporter, engine, tracker, job, jobs: int, batched):
+    """一个文件完成后比较实际耗时，偏差过大时重新规划尚未开始的文件（小文件批量组内的文件不调整）"""
+    if not job.success or job.started_at is None:
+        return
+    if not tracker.finished(job.input_path, job.finished_at - job.started_at, jobs):
+        return
+    queued = [j for j in engine.jobs.values() if j.state == JOB_QUEUED and j.input_path not in batched]
+    if not queued:
+        return
+    plan = tracker.replan([(j.input_path, j.encode_kwargs) for j in queued])
+    presets = plan.presets()
+    changed = {}
+    for queued_job in queued:
+        preset = presets.get(queued_job.input_path)
+        if preset and preset != queued_job.encode_kwargs.get("video_preset"):
+            # 引擎在任务开始时才读取编码参数
+            queued_job.encode_kwargs = dict(queued_job.encode_kwargs, video_preset=preset)
+            changed[queued_job.input_path] = preset
+    reporter.emit("deadline_replan", slowdown=round(tracker.slowdown, 3), changed=changed, **plan.summary())
+
+
+async def _run_batch(ffmpeg_handler, reporter, groups, output_paths, encode_kwargs,
+                     fallback_audio_codec, fallback_audio_bitrate, jobs,
+                     per_file_kwargs=None, fallback_audio=None, tracker=None, infos=None) -> List[bool]:
+    """
+    批量模式：所有文件提交到异步引擎，在同一个事件循环中探测和编码
+
+    groups 为 core.clip_batch.group_batches 的分组，多个文件的组由同一个 FFmpeg 进程编码。
+    设置了截止时间跟踪器（tracker）时每完成一个文件检查是否需要重新规划。
+    infos 中已有视频信息的文件（队列清单自带或规划时已探测）作为 source_info 传给引擎，编码前不再探测。
+    """
+    engine = AsyncEncodeEngine(ffmpeg_handler, max_concurrent=jobs)
+    total = sum(len(group) for group in groups)
+    per_file_kwargs = per_file_kwargs or {}
+    fallback_audio = fallback_audio or {}
+    infos = infos or {}
+
+    def job_kwargs(f):
+        kwargs = per_file_kwargs.get(f, encode_kwargs)
+        return dict(kwargs, source_info=infos[f]) if infos.get(f) else kwargs
+
+    for group in groups:
+        engine.submit_batch([
+            (f, output_paths[f], job_kwargs(f), fallback_audio.get(f, (fallback_audio_codec, fallback_audio_bitrate)))
+            for f in group
+        ])
+    engine.close()
+    batched = {f for group in groups if len(group) > 1 for f in group}
+    async for event in engine.events():
+        fields = {k: v for k, v in event.items() if k not in ("event", "job")}
+        if event["event"] in ("file_started", "progress", "file_finished"):
+            fields["total"] = total
+        reporter.emit(event["event"], **fields)
+        if tracker is not None and event["event"] == "file_finished":
+            _replan_deadline(reporter, engine, tracker, event["job"], jobs, batched)
+    return [job.success for job in engine.jobs.values()]
+
+
+def _run_watch(args, reporter, config_manager, file_processor, output_dir,
+               encode_one, cancel_event, start_time) -> int:
+    """监视模式：文件写入完成后按所属文件夹的设置编码，直到 Ctrl+C"""
+    folders = [dict(f) for f in config_manager.get("watch_folders", []) or [] if f.get("path")]
+    for path in args.paths:
+        if os.path.isdir(path):
+            folders.append({"path": path, "output_dir": "", "settings": {}})
+    if not folders:
+        reporter.emit("error", message="没有可监视的文件夹（给定文件夹路径或在配置中设置 watch_folders）")
+        return 2
+
+    executor = ThreadPoolExecutor(max_workers=max(1, args.jobs))
+    counter = {"index": 0, "success": 0, "failed": 0}
+    counter_lock = threading.Lock()
+    pending = set()  # 尚未完成的编码任务（退出时取消尚未开始的任务）
+
+    def on_done(future):
+        with counter_lock:
+            pending.discard(future)
+            if not future.cancelled() and future.exception() is None and future.result():
+                counter["success"] += 1
+            else:
+                counter["failed"] += 1
+
+    def on_file_ready(file_path: str, folder: dict):
+        """文件写入完成：按所属文件夹设置计算输出路径并加入编码队列"""
+        settings = folder.get("settings") or {}
+        folder_output = folder.get("output_dir") or output_dir
+        if not folder_output:
+            reporter.emit("error", message="监视文件夹未设置输出目录", input=file_path, watch_folder=folder["path"])
+            return
+        output_path = file_processor.calculate_output_path(file_path, folder["path"], folder_output)
+        with counter_lock:
+            counter["index"] += 1
+            idx = counter["index"]
+        reporter.emit("queued", index=idx, input=file_path, output=output_path, watch_folder=folder["path"])
+        future = executor.submit(
+            encode_one, idx, 0, file_path, output_path,
+            config_manager.get_encode_kwargs(settings),
+            settings.get("fallback_audio_codec", config_manager.get("fallback_audio_codec", "aac")),
+            settings.get("fallback_audio_bitrate", config_manager.get("fallback_audio_bitrate", "192k"))
+        )
+        with counter_lock:
+            pending.add(future)
+        future.add_done_callback(on_done)
+
+    watcher = FolderWatcher(
+        folders,
+        on_file_ready,
+        file_processor.is_video_file,
+        stable_seconds=float(config_manager.get("watch_stable_seconds", 5)),
+        poll_interval=float(config_manager.get("watch_poll_interval", 2)),
+        process_existing=bool(config_manager.get("watch_process_existing", False))
+    )
+    watcher.start()
+    reporter.emit("watching", folders=[f["path"] for f in folders], backend=watcher.backend_name,
+                  jobs=max(1, args.jobs))
+    try:
+        while watcher.is_running():
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        pass
+    watcher.stop()
+    cancel_event.set()
+    # 取消尚未开始的任务（shutdown 的 cancel_futures 参数需要 Python 3.9）
+    with counter_lock:
+        queued = list(pending)
+    for future in queued:
+        future.cancel()
+    executor.shutdown(wait=True)
+    reporter.emit("finished", total=counter["index"], success=counter["success"], failed=counter["failed"],
+                  elapsed=round(time.time() - start_time, 3))
+    return 130
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    args = build_parser().parse_args(argv)
+    return run(args, JsonLinesReporter())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
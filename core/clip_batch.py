@@ -0,0 +1,157 @@
+"""
+小文件批量编码 - 多个短视频由同一个 FFmpeg 进程编码（多个 -i 输入，每个输入映射到自己的输出）
+
+几秒到几十秒的短片中，ffprobe、FFmpeg 进程启动和编码器初始化的耗时远大于实际编码。
+批量模式把小文件分组（每组最多 max_files 个），一个 FFmpeg 进程编码一组：
+- 不再为获取时长单独运行 ffprobe，时长从 FFmpeg 启动时输出的 "Input #i ... Duration:" 中读取；
+- FFmpeg 的进度行只反映第一个输出，因此组内按时长从长到短排列，让第一个输出的时间覆盖整组；
+  各输入按时间戳同步推进，每个输出的进度为 min(time / 该输入时长, 1)；
+- 进程失败时整组结果都不可信，组内的文件再逐个单独编码，只有真正有问题的文件失败。
+"""
+import os
+import re
+from typing import Callable, List, Optional, Tuple
+
+from core.ffmpeg_handler import FFmpegHandler
+from core.renditions import active_renditions
+
+# 默认值：时长不超过 30 秒的文件视为小文件，每组最多 16 个
+DEFAULT_BATCH_MAX_DURATION = 30.0
+DEFAULT_BATCH_MAX_FILES = 16
+# 时长未知（尚未探测）时按文件大小判断是否为小文件
+UNKNOWN_DURATION_MAX_SIZE = 32 * 1024 * 1024
+
+
+def batchable(encode_kwargs: dict) -> bool:
+    """
+    编码参数是否可以与其他文件合并到一个进程
+
+    自定义命令模板、多码率输出、需要先检测黑边和丢弃重复帧（需要单独统计输出帧数）的文件单独编码。
+    """
+    if encode_kwargs.get("use_custom") and encode_kwargs.get("custom_template"):
+        return False
+    if encode_kwargs.get("auto_crop") and not encode_kwargs.get("crop"):
+        return False
+    if encode_kwargs.get("decimate"):
+        return False
+    return not active_renditions(encode_kwargs)
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def group_batches(
+    input_paths: List[str],
+    kwargs_for: Callable[[str], dict],
+    max_duration: float = DEFAULT_BATCH_MAX_DURATION,
+    max_files: int = DEFAULT_BATCH_MAX_FILES,
+    duration_for: Optional[Callable[[str], float]] = None
+) -> List[List[str]]:
+    """
+    把待编码文件分组
+
+    Args:
+        input_paths: 按编码顺序排列的输入文件
+        kwargs_for: 返回文件编码参数的函数
+        max_duration: 小文件的最长时长（秒）
+        max_files: 每组最多文件数
+        duration_for: 返回已知时长的函数（未知时返回 0），None 表示全部按文件大小判断
+
+    Returns:
+        分组列表；大文件和不能合并的文件单独成组，多文件的组内按时长（未知时按大小）从长到短排列
+    """
+    groups: List[List[str]] = []
+    current: List[Tuple[float, int, str]] = []
+
+    def flush():
+        if current:
+            current.sort(key=lambda item: (item[0], item[1]), reverse=True)
+            groups.append([path for _, _, path in current])
+            current.clear()
+
+    for path in input_paths:
+        duration = duration_for(path) if duration_for else 0.0
+        size = _file_size(path)
+        small = duration <= max_duration if duration > 0 else 0 < size <= UNKNOWN_DURATION_MAX_SIZE
+        if max_files < 2 or not small or not batchable(kwargs_for(path)):
+            groups.append([path])
+            continue
+        current.append((duration, size, path))
+        if len(current) >= max_files:
+            flush()
+    flush()
+    return groups
+
+
+class ClipBatch:
+    """一组小文件的进度跟踪和结果检查（与进程的运行方式无关，同步和异步编码共用）"""
+
+    INPUT_PATTERN = re.compile(r'^Input #(\d+),')
+    DURATION_PATTERN = re.compile(r'^\s+Duration: (\d+):(\d{2}):(\d{2}(?:\.\d+)?)')
+
+    def __init__(self, output_paths: List[str], durations: Optional[List[float]] = None):
+        """
+        Args:
+            output_paths: 各输入对应的输出文件（顺序与 -i 相同）
+            durations: 已知的时长（0 表示未知，从 FFmpeg 输出中读取）
+        """
+        self.output_paths = output_paths
+        self.durations = list(durations) if durations else [0.0] * len(output_paths)
+        self.progress = [0.0] * len(output_paths)
+        self._input_index: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self.output_paths)
+
+    def feed(self, line: str) -> List[int]:
+        """
+        处理一行 FFmpeg 输出
+
+        Returns:
+            进度有变化的输出序号
+        """
+        match = self.INPUT_PATTERN.match(line)
+        if match:
+            self._input_index = int(match.group(1))
+            return []
+        match = self.DURATION_PATTERN.match(line)
+        if match:
+            index = self._input_index
+            if index is not None and index < len(self) and self.durations[index] <= 0:
+                hours, minutes, seconds = match.groups()
+                self.durations[index] = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+            return []
+        current_time = FFmpegHandler.parse_progress_time(line)
+        if current_time is None:
+            return []
+        changed = []
+        for index, duration in enumerate(self.durations):
+            if duration <= 0:
+                continue
+            progress = min(current_time / duration * 100, 99.0)  # 最多99%，进程结束后确认输出再设为100%
+            if progress > self.progress[index]:
+                self.progress[index] = progress
+                changed.append(index)
+        return changed
+
+    def results(self, returncode: int, error_lines: List[str]) -> List[Tuple[bool, str]]:
+        """进程结束后各输出的结果；进程失败时全部视为失败（由调用方逐个重新编码）"""
+        if returncode != 0:
+            message = FFmpegHandler.format_error_message(error_lines, returncode)
+            return [(False, message)] * len(self)
+        results = []
+        for index, output_path in enumerate(self.output_paths):
+            try:
+                ok = os.path.getsize(output_path) > 0
+            except OSError:
+                ok = False
+            if ok:
+                self.progress[index] = 100.0
+                results.append((True, "Success"))
+            else:
+                results.append((False, "Failed: output file missing"))
+        return results
@@ -0,0 +1,221 @@
+"""
+内容复杂度分析 - 一次 FFmpeg 解码输出缩小、抽帧后的灰度帧（rawvideo），用 NumPy 在所有帧上向量计算复杂度
+
+每隔 PAIR_INTERVAL 秒取相邻的两帧（select 按帧号取余），缩小到宽 ANALYSIS_WIDTH 的灰度图：
+- 空间复杂度：每帧梯度能量（水平和垂直相邻像素差的平方均值）开方后的平均值，反映细节和纹理；
+- 时间复杂度：每对相邻帧之差的能量开方后的平均值，反映运动（跨镜头切换的帧对不计入）；
+- 镜头切换：相邻两帧的亮度直方图差异超过 CUT_THRESHOLD 的位置（精度为取样间隔）。
+
+按两者分为 low / medium / high 三档，各档对应 CRF 偏移和预设快慢的调整（见 core.presets.tier_overrides），
+开始编码前写入文件级参数。解码器单线程运行并跳过环路滤波，通常远快于实时。
+
+结果以 COMPLEXITY_FIELDS 保存在视频信息中（与探测结果一起缓存，镜头切换位置 scene_cuts 只保存在缓存中），
+complexity_tier 为 0 表示尚未分析。需要 NumPy（可选依赖），未安装时 HAS_NUMPY 为 False。
+"""
+import subprocess
+import sys
+import time
+from typing import Callable, Optional
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+from core.ffmpeg_capabilities import ffmpeg_version, fps_mode_args
+from core.presets import TIER_HIGH, TIER_LOW, TIER_MEDIUM
+
+# 分析帧的宽度（高度按源宽高比计算，源分辨率未知时为 16:9）
+ANALYSIS_WIDTH = 128
+# 相邻帧对的取样间隔（秒），长片按 MAX_PAIRS 放宽间隔
+PAIR_INTERVAL = 0.5
+MAX_PAIRS = 1200
+# 源帧率未知时假定的帧率
+DEFAULT_FPS = 30.0
+# 直方图分箱数和判定为镜头切换的直方图差异（0 ~ 1）
+HISTOGRAM_BINS = 32
+CUT_THRESHOLD = 0.4
+# 每次参与计算的帧数（限制临时数组的内存）
+CHUNK_FRAMES = 256
+# 超时下限（秒），时长已知时不少于时长（按实时解码计）
+ANALYSIS_TIMEOUT = 120
+
+# 分档阈值：时间复杂度低于 TEMPORAL_LOW 且空间复杂度低于 SPATIAL_HIGH 为 low；
+# 时间复杂度不低于 TEMPORAL_HIGH，或空间复杂度不低于 SPATIAL_HIGH 且有明显运动为 high
+TEMPORAL_LOW = 2.0
+TEMPORAL_HIGH = 10.0
+SPATIAL_HIGH = 28.0
+
+COMPLEXITY_FIELDS = ("complexity_spatial", "complexity_temporal", "complexity_cuts", "complexity_tier")
+
+if sys.platform == 'win32':
+    CREATE_NO_WINDOW = 0x08000000
+else:
+    CREATE_NO_WINDOW = 0
+
+
+def analysis_size(width: int, height: int) -> tuple:
+    """分析帧的尺寸 (w, h)，高度取偶数"""
+    if width > 0 and height > 0:
+        return ANALYSIS_WIDTH, max(2, int(round(ANALYSIS_WIDTH * height / width / 2)) * 2)
+    return ANALYSIS_WIDTH, ANALYSIS_WIDTH * 9 // 16 // 2 * 2
+
+
+def pair_step(fps: float, duration: float) -> int:
+    """相邻帧对之间的源帧数（每 step 帧取第 0、1 帧）"""
+    fps = fps if fps > 0 else DEFAULT_FPS
+    interval = max(PAIR_INTERVAL, duration / MAX_PAIRS) if duration > 0 else PAIR_INTERVAL
+    return max(2, int(round(fps * interval)))
+
+
+def build_analysis_command(ffmpeg_path: str, video_path: str, size: tuple, step: int) -> list:
+    """分析命令：输出帧对的灰度小图（rawvideo），时长未知时最多输出 MAX_PAIRS 对"""
+    width, height = size
+    return [
+        ffmpeg_path, "-v", "error", "-nostdin", "-threads", "1", "-skip_loop_filter", "all",
+        "-i", video_path, "-map", "0:v:0", "-an", "-sn", "-dn", "-filter_threads", "1",
+        "-vf", f"select='lt(mod(n\\,{step})\\,2)',scale={width}:{height}:flags=area,format=gray",
+        *fps_mode_args(ffmpeg_version(ffmpeg_path), "passthrough"), "-frames:v", str(MAX_PAIRS * 2),
+        "-f", "rawvideo", "-"
+    ]
+
+
+def read_frames(cmd: list, size: tuple, timeout: float, cancel_flag: Optional[Callable[[], bool]] = None):
+    """
+    运行分析命令并读取所有帧
+
+    Returns:
+        形状为 (N, h, w) 的 uint8 数组，失败或取消时返回 None
+    """
+    width, height = size
+    try:
+        process = subprocess.Popen(
+            cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            creationflags=CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+        )
+    except OSError as e:
+        print(f"复杂度分析失败: {e}")
+        return None
+    start = time.monotonic()
+    while True:
+        try:
+            output, _ = process.communicate(timeout=0.5)
+            break
+        except subprocess.TimeoutExpired:
+            if (cancel_flag and cancel_flag()) or time.monotonic() - start > timeout:
+                process.kill()
+                process.communicate()
+                return None
+    frame_bytes = width * height
+    count = len(output) // frame_bytes
+    if count < 2:
+        return None
+    return np.frombuffer(output[:count * frame_bytes], dtype=np.uint8).reshape(count, height, width)
+
+
+def frame_statistics(frames):
+    """
+    逐帧统计（分块向量计算）
+
+    Returns:
+        (每帧梯度能量开方, 与下一帧之差的能量开方, 与下一帧的直方图差异)，后两者长度为 N - 1
+    """
+    count = len(frames)
+    gradients = np.empty(count, dtype=np.float32)
+    differences = np.empty(count - 1, dtype=np.float32)
+    histograms = np.empty((count, HISTOGRAM_BINS), dtype=np.float32)
+    shift = 8 - int(np.log2(HISTOGRAM_BINS))
+    for start in range(0, count, CHUNK_FRAMES):
+        # 与下一块重叠一帧，块之间的帧差也能算到
+        chunk = frames[start:start + CHUNK_FRAMES + 1].astype(np.float32)
+        own = min(CHUNK_FRAMES, count - start)
+        body = chunk[:own]
+        dx = np.diff(body, axis=2)
+        dy = np.diff(body, axis=1)
+        gradients[start:start + own] = np.sqrt((dx * dx).mean(axis=(1, 2)) + (dy * dy).mean(axis=(1, 2)))
+        if len(chunk) > 1:
+            diff = np.diff(chunk, axis=0)
+            differences[start:start + len(diff)] = np.sqrt((diff * diff).mean(axis=(1, 2)))
+        bins = (frames[start:start + own].reshape(own, -1) >> shift).astype(np.int64)
+        offsets = np.arange(own, dtype=np.int64)[:, None] * HISTOGRAM_BINS
+        histograms[start:start + own] = np.bincount(
+            (bins + offsets).ravel(), minlength=own * HISTOGRAM_BINS
+        ).reshape(own, HISTOGRAM_BINS)
+    histograms /= histograms.sum(axis=1, keepdims=True)
+    changes = np.abs(np.diff(histograms, axis=0)).sum(axis=1) / 2
+    return gradients, differences, changes
+
+
+def classify(spatial: float, temporal: float) -> int:
+    """复杂度档位"""
+    if temporal < TEMPORAL_LOW and spatial < SPATIAL_HIGH:
+        return TIER_LOW
+    if temporal >= TEMPORAL_HIGH or (spatial >= SPATIAL_HIGH and temporal >= TEMPORAL_LOW):
+        return TIER_HIGH
+    return TIER_MEDIUM
+
+
+def summarize_frames(frames, step: int, fps: float) -> dict:
+    """
+    由帧对计算复杂度字段
+
+    Args:
+        frames: read_frames 的结果（第 2k、2k+1 帧为一对相邻源帧）
+        step: 帧对之间的源帧数
+        fps: 源帧率（用于换算镜头切换位置）
+    """
+    fps = fps if fps > 0 else DEFAULT_FPS
+    gradients, differences, changes = frame_statistics(frames)
+    cuts = np.flatnonzero(changes > CUT_THRESHOLD)
+    # 帧对内部（第 2k 与 2k+1 帧）的差为相邻源帧之差
+    pair_index = np.arange(0, len(differences), 2)
+    motion = differences[pair_index][changes[pair_index] <= CUT_THRESHOLD]
+    spatial = float(gradients.mean())
+    temporal = float(motion.mean()) if len(motion) else 0.0
+    # 切换位于第 j 与 j+1 帧之间，位置取第 j+1 帧对应的源帧时间
+    following = cuts + 1
+    positions = ((following // 2) * step + following % 2) / fps
+    return {
+        "complexity_spatial": round(spatial, 2),
+        "complexity_temporal": round(temporal, 2),
+        "complexity_cuts": int(len(cuts)),
+        "complexity_tier": classify(spatial, temporal),
+        "scene_cuts": [round(float(t), 2) for t in positions],
+    }
+
+
+def analyze_complexity(
+    ffmpeg_path: str,
+    video_path: str,
+    info: Optional[dict] = None,
+    cancel_flag: Optional[Callable[[], bool]] = None
+) -> dict:
+    """
+    分析内容复杂度
+
+    Args:
+        info: 已知的视频信息（使用分辨率、帧率和时长，缺失时按默认值）
+        cancel_flag: 返回 True 时终止分析
+
+    Returns:
+        COMPLEXITY_FIELDS 和 scene_cuts（镜头切换位置，秒）；无法分析时返回空字典
+    """
+    if not HAS_NUMPY:
+        return {}
+    info = info or {}
+    fps = float(info.get("fps") or 0)
+    duration = float(info.get("format_duration") or info.get("video_duration") or 0)
+    size = analysis_size(int(info.get("width") or 0), int(info.get("height") or 0))
+    step = pair_step(fps, duration)
+    frames = read_frames(build_analysis_command(ffmpeg_path, video_path, size, step), size,
+                         max(ANALYSIS_TIMEOUT, duration), cancel_flag)
+    if frames is None:
+        return {}
+    return summarize_frames(frames, step, fps)
+
+
+def complexity_tier(info: Optional[dict]) -> int:
+    """视频信息中的复杂度档位，尚未分析时为 0"""
+    return int((info or {}).get("complexity_tier") or 0)
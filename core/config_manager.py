@@ -19,6 +19,37 @@ class ConfigManager:
             "video_crf": "23",
             "video_resolution": "",  # 空字符串表示保持原分辨率
             "video_bit_depth": "8",  # "8", "10" 位深度
+            "scale_flags": "bicubic",  # 缩放算法：FFmpeg scale 的 flags，或 auto（缩小用较快的 bilinear，放大用 bicubic）
+            # 多码率输出：[{"name": 文件名后缀, 以及覆盖的 video_codec / video_crf / video_resolution 等}]，
+            # 非空时一次解码同时输出多个文件（见 core.renditions）
+            "renditions": [],
+            "auto_crop": False,  # 编码前检测黑边（cropdetect 抽样），在缩放之前裁掉（见 core.crop_detect）
+            # 丢弃重复帧（mpdecimate + 可变帧率输出，适合屏幕录制，见 core.decimate）及其阈值
+            "decimate": False,
+            "decimate_hi": 768,
+            "decimate_lo": 320,
+            "decimate_frac": 0.33,
+            "decimate_max": 0,  # 最多连续丢弃的帧数，0 表示不限制
+            # 按片源搜索 CRF（抽样试编码 + SSIM / VMAF 评分，见 core.crf_search）：
+            # 质量指标 auto / ssim / vmaf、各指标的目标得分和 CRF 搜索范围
+            "crf_search": False,
+            "crf_search_metric": "auto",
+            "crf_search_target_ssim": 0.98,
+            "crf_search_target_vmaf": 93,
+            "crf_search_min": 18,
+            "crf_search_max": 36,
+            # 内容复杂度分析（缩小抽帧后用 NumPy 计算空间/时间复杂度，见 core.complexity）：
+            # 按 low / medium / high 档位调整 CRF（偏移）和预设（正数为更慢），未列出的档位不调整
+            "complexity_analysis": False,
+            "complexity_tiers": {
+                "low": {"crf_offset": 2, "preset_steps": -1},
+                "high": {"crf_offset": -2, "preset_steps": 1}
+            },
+            # 截止时间规划（按本机速度模型为每个文件选择预设，见 core.deadline_planner）：
+            # 截止时间如 "23:30" / "+2h"，可用核心数 0 表示全部核心
+            "deadline_planning": False,
+            "deadline": "+2h",
+            "deadline_cores": 0,
             "audio_codec": "copy",  # "copy"表示直接复制音频流
             "audio_bitrate": "",
             # 备用音频编码参数：当主音频编码为 copy 且与 MP4 容器不兼容时使用
@@ -37,7 +68,23 @@ class ConfigManager:
             "use_custom_command": False,  # 是否使用自定义命令行
             "custom_command_template": "",
             "language": "zh_CN",  # 语言设置
-            "last_file_dir": ""  # 最后添加的文件所在目录，用于下次打开文件对话框时的初始路径
+            "last_file_dir": "",  # 最后添加的文件所在目录，用于下次打开文件对话框时的初始路径
+            # 监视文件夹：[{"path": 收件目录, "output_dir": 输出目录（空表示使用全局设置）, "settings": {配置项覆盖}}]
+            "watch_folders": [],
+            "watch_stable_seconds": 5,  # 文件大小/修改时间保持不变多少秒后视为写入完成
+            "watch_poll_interval": 2,  # 轮询间隔（秒）
+            "watch_process_existing": False,  # 开始监视时是否处理目录中已有的文件
+            "encode_in_background_process": True,  # 在独立进程中编码（窗口关闭或崩溃后继续编码，重新打开后可重新连接）
+            "dedupe_on_add": False,  # 添加文件时检测内容相同的文件，只编码一次
+            "dedupe_full_hash": False,  # 抽样哈希相同后再比较完整文件哈希
+            # 小文件批量模式：时长不超过 batch_max_duration 秒的文件每 batch_max_files 个由同一个 FFmpeg 进程编码
+            "batch_small_files": False,
+            "batch_max_duration": 30,
+            "batch_max_files": 16,
+            # 抽样试编码预估：每个文件的窗口数、窗口时长（秒）和同时运行的窗口数（见 core.sample_estimate）
+            "estimate_samples": 3,
+            "estimate_window": 5,
+            "estimate_workers": 2
         }
         self.config = self.load_config()
     
@@ -66,6 +113,10 @@ class ConfigManager:
             print(f"保存配置失败: {e}")
             return False
     
+    def get_data_path(self, filename: str) -> str:
+        """返回与配置文件位于同一目录的数据文件路径（状态文件、缓存等）"""
+        return os.path.join(os.path.dirname(os.path.abspath(self.config_file)), filename)
+    
     def get(self, key: str, default: Any = None) -> Any:
         """获取配置值"""
         return self.config.get(key, default)
@@ -77,4 +128,38 @@ class ConfigManager:
     def update(self, updates: Dict[str, Any]) -> None:
         """批量更新配置"""
         self.config.update(updates)
+    
+    def get_encode_kwargs(self, overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        获取传给 FFmpegHandler.encode 的编码参数
+        
+        Args:
+            overrides: 配置项覆盖（使用配置键名，如监视文件夹的专属设置），None 表示使用全局设置
+        """
+        config = dict(self.config)
+        if overrides:
+            config.update(overrides)
+        return {
+            "video_codec": config.get("video_codec", "libx264"),
+            "video_preset": config.get("video_preset", "medium"),
+            "video_crf": config.get("video_crf", "23"),
+            "video_bit_depth": config.get("video_bit_depth", "8"),
+            "video_resolution": config.get("video_resolution", ""),
+            "video_framerate": config.get("video_framerate", ""),
+            "scale_flags": config.get("scale_flags", "bicubic"),
+            "renditions": config.get("renditions") or [],
+            "auto_crop": config.get("auto_crop", False),
+            "crop": config.get("crop", ""),  # 指定的裁剪区域 "w:h:x:y"（文件级设置），优先于检测结果
+            "decimate": config.get("decimate", False),
+            "decimate_hi": config.get("decimate_hi", 768),
+            "decimate_lo": config.get("decimate_lo", 320),
+            "decimate_frac": config.get("decimate_frac", 0.33),
+            "decimate_max": config.get("decimate_max", 0),
+            "audio_codec": config.get("audio_codec", "copy"),
+            "audio_bitrate": config.get("audio_bitrate", ""),
+            "subtitle_mode": config.get("subtitle_mode", "copy"),
+            "custom_args": config.get("custom_args", ""),
+            "use_custom": config.get("use_custom_command", False),
+            "custom_template": config.get("custom_command_template", "")
+        }
 
@@ -0,0 +1,379 @@
+"""
+按片源搜索 CRF - 用抽样试编码找出满足目标质量的最大（最省码率）CRF
+
+每个候选 CRF 在文件中均匀抽取几个短窗口，用实际的编码命令（FFmpegHandler.build_command，只替换 video_crf）
+试编码，再与源视频的同一窗口比较质量：SSIM（ssim 滤镜），或 FFmpeg 带有 libvmaf 时使用 VMAF（每 5 帧取 1 帧）。
+参考画面先做与编码相同的裁剪，再缩放到输出尺寸（scale2ref），质量在输出分辨率下计算。
+
+各窗口得分的平均值作为该 CRF 的得分。假设得分随 CRF 增大而单调下降，在 [crf_min, crf_max] 中二分查找
+得分不低于目标的最大 CRF；crf_min 也达不到目标时使用 crf_min。
+
+每个 CRF 的得分按（文件, 编码设置, 质量指标, 抽样方式）缓存，文件未变化时再次搜索不再试编码。
+"""
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from core.crop_detect import job_crop, sample_offsets
+from core.decimate import decimate_filter
+from core.renditions import active_renditions
+from core.sample_estimate import build_sample_command
+
+# 质量指标
+METRIC_AUTO = "auto"  # FFmpeg 带有 libvmaf 时使用 VMAF，否则使用 SSIM
+METRIC_SSIM = "ssim"
+METRIC_VMAF = "vmaf"
+# 各指标的默认目标得分
+DEFAULT_TARGETS = {METRIC_SSIM: 0.98, METRIC_VMAF: 93.0}
+# 默认搜索范围、每个文件的窗口数和窗口时长（秒）
+DEFAULT_CRF_MIN = 18
+DEFAULT_CRF_MAX = 36
+DEFAULT_SAMPLES = 3
+DEFAULT_WINDOW = 4.0
+# VMAF 每隔几帧计算一帧
+VMAF_SUBSAMPLE = 5
+# 每个窗口试编码的超时（秒）
+WINDOW_TIMEOUT = 600
+# 评分的超时（秒）：评分进程偶尔在并行运行时卡住，超时后重试一次
+SCORE_TIMEOUT = 60
+
+# 缓存文件名（与配置文件位于同一目录）
+CRF_CACHE_FILE = "crf_search_cache.json"
+CACHE_VERSION = 1
+
+if sys.platform == 'win32':
+    CREATE_NO_WINDOW = 0x08000000
+else:
+    CREATE_NO_WINDOW = 0
+
+_SSIM_PATTERN = re.compile(r'SSIM .*All:([\d.]+)')
+_VMAF_PATTERN = re.compile(r'VMAF score: ([\d.]+)')
+
+
+def resolve_metric(metric: str, has_vmaf: bool) -> str:
+    """实际使用的质量指标：auto 按 FFmpeg 是否带有 libvmaf 选择，要求 VMAF 但不可用时退回 SSIM"""
+    if metric == METRIC_SSIM or not has_vmaf:
+        return METRIC_SSIM
+    return METRIC_VMAF
+
+
+def searchable(encode_kwargs: dict) -> bool:
+    """任务能否搜索 CRF（复制视频流、自定义命令和多码率输出不搜索）"""
+    return (encode_kwargs.get("video_codec", "copy") not in ("", "copy") and not encode_kwargs.get("use_custom")
+            and not active_renditions(encode_kwargs))
+
+
+def settings_key(encode_kwargs: dict, source_info: Optional[dict], metric: str, samples: int, window: float) -> str:
+    """影响得分的编码设置（不含 CRF），作为缓存键"""
+    return "|".join(str(v) for v in (
+        encode_kwargs.get("video_codec", ""), encode_kwargs.get("video_preset", ""),
+        encode_kwargs.get("video_bit_depth", ""), encode_kwargs.get("video_resolution", ""),
+        encode_kwargs.get("video_framerate", ""), encode_kwargs.get("scale_flags", ""),
+        job_crop(encode_kwargs, source_info), decimate_filter(encode_kwargs), metric, samples, f"{window:g}"
+    ))
+
+
+def build_score_command(ffmpeg_path: str, sample_path: str, input_path: str, offset: float, window: float,
+                        metric: str, crop: str = "") -> List[str]:
+    """
+    比较试编码结果与源视频同一窗口的命令
+
+    参考画面先裁剪（与编码相同），再用 scale2ref 缩放到试编码结果的尺寸；两路画面的时间戳都从 0 开始。
+    """
+    reference = f"crop={crop}," if crop else ""
+    if metric == METRIC_VMAF:
+        score = f"libvmaf=n_subsample={VMAF_SUBSAMPLE}"
+    else:
+        score = "ssim"
+    graph = (
+        f"[1:v]{reference}settb=AVTB,setpts=PTS-STARTPTS[src];"
+        "[0:v]settb=AVTB,setpts=PTS-STARTPTS[enc];"
+        "[src][enc]scale2ref=flags=bicubic[ref][dist];"
+        "[dist]format=yuv420p[d];[ref]format=yuv420p[r];"
+        f"[d][r]{score}"
+    )
+    return [
+        ffmpeg_path, "-hide_banner", "-nostats", "-i", sample_path,
+        "-ss", f"{offset:.3f}", "-t", f"{window:.3f}", "-i", input_path,
+        "-lavfi", graph, "-an", "-f", "null", "-"
+    ]
+
+
+def parse_score(output: str, metric: str) -> Optional[float]:
+    """从 FFmpeg 输出中读取 SSIM（All）或 VMAF 得分"""
+    pattern = _VMAF_PATTERN if metric == METRIC_VMAF else _SSIM_PATTERN
+    match = pattern.search(output)
+    return float(match.group(1)) if match else None
+
+
+class CrfSearchCache:
+    """CRF 搜索得分缓存：{文件路径: {size, mtime_ns, scores: {设置键: {CRF: 得分}}}}（线程安全，首次使用时加载）"""
+
+    # 最多保留的文件数，超出时丢弃最早加入的项
+    MAX_ENTRIES = 20000
+
+    def __init__(self, cache_file: Optional[str] = None):
+        """
+        Args:
+            cache_file: 缓存文件路径，None 表示只保存在内存中
+        """
+        self.cache_file = cache_file
+        self._entries: Optional[Dict[str, dict]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, dict]:
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        if self.cache_file and os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") == CACHE_VERSION:
+                    self._entries = data.get("entries", {})
+            except (OSError, ValueError) as e:
+                print(f"加载 CRF 搜索缓存失败: {e}")
+        return self._entries
+
+    def scores(self, path: str, key: str) -> Dict[int, float]:
+        """已缓存的 {CRF: 得分}，文件已变化时清除该文件的缓存"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return {}
+        with self._lock:
+            entry = self._load().get(path)
+            if entry is None:
+                return {}
+            if entry["size"] != st.st_size or entry["mtime_ns"] != st.st_mtime_ns:
+                del self._entries[path]
+                self._dirty = True
+                return {}
+            return {int(crf): score for crf, score in entry["scores"].get(key, {}).items()}
+
+    def put(self, path: str, key: str, crf: int, score: float):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(path)
+            if entry is None or entry["size"] != st.st_size or entry["mtime_ns"] != st.st_mtime_ns:
+                entry = entries[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "scores": {}}
+                while len(entries) > self.MAX_ENTRIES:
+                    del entries[next(iter(entries))]
+            entry["scores"].setdefault(key, {})[str(crf)] = score
+            self._dirty = True
+
+    def save(self):
+        """保存缓存（无变化时不写入）"""
+        with self._lock:
+            if not self._dirty or not self.cache_file or self._entries is None:
+                return
+            data = {"version": CACHE_VERSION, "entries": dict(self._entries)}
+            self._dirty = False
+        try:
+            tmp_path = self.cache_file + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            print(f"保存 CRF 搜索缓存失败: {e}")
+
+
+class CrfResult:
+    """一个文件的搜索结果"""
+
+    def __init__(self, crf: int, score: float, metric: str, target: float, encodes: int):
+        """
+        Args:
+            crf: 选定的 CRF
+            score: 该 CRF 的得分
+            encodes: 本次实际运行的试编码次数（全部命中缓存时为 0）
+        """
+        self.crf = crf
+        self.score = score
+        self.metric = metric
+        self.target = target
+        self.encodes = encodes
+
+    @property
+    def met(self) -> bool:
+        """是否达到目标（crf_min 也达不到目标时为 False）"""
+        return self.score >= self.target
+
+    def summary(self) -> str:
+        """例如 "CRF 26 (SSIM 0.9812 >= 0.98)" """
+        relation = ">=" if self.met else "<"
+        return f"CRF {self.crf} ({self.metric.upper()} {self.score:.4g} {relation} {self.target:g})"
+
+    def to_dict(self) -> dict:
+        return {"crf": self.crf, "score": round(self.score, 6), "metric": self.metric,
+                "target": self.target, "met": self.met, "encodes": self.encodes}
+
+
+class CrfSearch:
+    """对单个文件二分搜索 CRF"""
+
+    def __init__(
+        self,
+        ffmpeg_path: str,
+        build_command: Callable[..., list],
+        metric: str = METRIC_SSIM,
+        target: Optional[float] = None,
+        crf_min: int = DEFAULT_CRF_MIN,
+        crf_max: int = DEFAULT_CRF_MAX,
+        samples: int = DEFAULT_SAMPLES,
+        window: float = DEFAULT_WINDOW,
+        cache: Optional[CrfSearchCache] = None
+    ):
+        """
+        Args:
+            ffmpeg_path: FFmpeg 路径（用于评分）
+            build_command: FFmpegHandler.build_command
+            metric: METRIC_SSIM 或 METRIC_VMAF（METRIC_AUTO 先用 resolve_metric 解析）
+            target: 目标得分，None 表示该指标的默认值
+            samples / window: 每个候选 CRF 的窗口数和窗口时长（秒），同一 CRF 的各窗口并行试编码
+        """
+        self.ffmpeg_path = ffmpeg_path
+        self.build_command = build_command
+        self.metric = metric
+        self.target = DEFAULT_TARGETS[metric] if target is None else float(target)
+        self.crf_min = min(crf_min, crf_max)
+        self.crf_max = max(crf_min, crf_max)
+        self.samples = samples
+        self.window = window
+        self.cache = cache if cache is not None else CrfSearchCache()
+        self._cancelled = False
+
+    @classmethod
+    def from_config(cls, config_manager, ffmpeg_handler, has_vmaf: bool,
+                    cache: Optional[CrfSearchCache] = None) -> "CrfSearch":
+        """按配置（crf_search_metric / crf_search_target_* / crf_search_min / crf_search_max）创建"""
+        metric = resolve_metric(config_manager.get("crf_search_metric", METRIC_AUTO), has_vmaf)
+        return cls(
+            ffmpeg_handler.ffmpeg_path, ffmpeg_handler.build_command, metric,
+            float(config_manager.get(f"crf_search_target_{metric}", DEFAULT_TARGETS[metric])),
+            int(config_manager.get("crf_search_min", DEFAULT_CRF_MIN)),
+            int(config_manager.get("crf_search_max", DEFAULT_CRF_MAX)),
+            cache=cache
+        )
+
+    def cancel(self):
+        """取消：正在运行的试编码和评分被终止"""
+        self._cancelled = True
+
+    def _run(self, cmd: List[str], timeout: float = WINDOW_TIMEOUT) -> Optional[str]:
+        """运行命令，返回 stderr；失败、超时或取消时返回 None"""
+        process = subprocess.Popen(
+            cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            text=True, encoding='utf-8', errors='replace',
+            creationflags=CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+        )
+        # 评分结果在 stderr 末尾，单独的线程读取避免管道写满
+        output: List[str] = []
+        reader = threading.Thread(target=lambda: output.append(process.stderr.read()), daemon=True)
+        reader.start()
+        start = time.monotonic()
+        while process.poll() is None:
+            if self._cancelled or time.monotonic() - start > timeout:
+                process.kill()
+                process.wait()
+                reader.join()
+                return None
+            time.sleep(0.05)
+        reader.join()
+        return "".join(output) if process.returncode == 0 else None
+
+    def _score_window(self, input_path: str, kwargs: dict, crf: int, offset: float, seconds: float,
+                      crop: str) -> Optional[float]:
+        """试编码一个窗口并评分"""
+        temp_dir = tempfile.mkdtemp(prefix="vvenc_crf_")
+        try:
+            sample_path = os.path.join(temp_dir, "sample.mkv")
+            cmd = self.build_command(input_path, sample_path, **dict(kwargs, video_crf=str(crf)))
+            # 只评价视频，不处理音频和字幕
+            cmd = build_sample_command(cmd[:-1] + ["-an", "-sn"] + cmd[-1:], offset, seconds)
+            if self._run(cmd) is None:
+                return None
+            score_cmd = build_score_command(self.ffmpeg_path, sample_path, input_path, offset, seconds,
+                                            self.metric, crop)
+            for _ in range(2):
+                output = self._run(score_cmd, SCORE_TIMEOUT)
+                if output is not None or self._cancelled:
+                    break
+            return parse_score(output, self.metric) if output is not None else None
+        except (OSError, ValueError) as e:
+            print(f"CRF 试编码失败: {e}")
+            return None
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def search(self, input_path: str, kwargs: dict, duration: float, cached_only: bool = False) -> Optional[CrfResult]:
+        """
+        搜索一个文件的 CRF
+
+        Args:
+            kwargs: build_command 的编码参数（包括 source_info）
+            duration: 文件时长（秒），0 表示未知（只抽取开头一个窗口）
+            cached_only: 只使用缓存的得分，需要试编码时返回 None（预览编码计划时使用）
+
+        Returns:
+            搜索结果；无法搜索（见 searchable）、试编码失败或取消时返回 None
+        """
+        if not searchable(kwargs):
+            return None
+        source_info = kwargs.get("source_info")
+        key = settings_key(kwargs, source_info, self.metric, self.samples, self.window)
+        scores = self.cache.scores(input_path, key)
+        crop = job_crop(kwargs, source_info)
+        windows = [(offset, min(self.window, duration - offset) if duration > 0 else self.window)
+                   for offset in sample_offsets(duration, self.samples, self.window)]
+        encodes = 0
+
+        def score(crf: int) -> Optional[float]:
+            nonlocal encodes
+            if crf in scores:
+                return scores[crf]
+            if cached_only:
+                return None
+            with ThreadPoolExecutor(max_workers=len(windows)) as executor:
+                results = list(executor.map(
+                    lambda w: self._score_window(input_path, kwargs, crf, w[0], w[1], crop), windows
+                ))
+            encodes += len(windows)
+            if self._cancelled or any(r is None for r in results):
+                return None
+            scores[crf] = sum(results) / len(results)
+            self.cache.put(input_path, key, crf, scores[crf])
+            return scores[crf]
+
+        # 二分查找得分不低于目标的最大 CRF
+        low, high = self.crf_min, self.crf_max
+        best = None
+        while low <= high:
+            crf = (low + high) // 2
+            value = score(crf)
+            if value is None:
+                return None
+            if value >= self.target:
+                best = crf
+                low = crf + 1
+            else:
+                high = crf - 1
+        if best is None:
+            # 最小的 CRF 也达不到目标：使用质量最高的 CRF
+            best = self.crf_min
+            if score(best) is None:
+                return None
+        return CrfResult(best, scores[best], self.metric, self.target, encodes)
@@ -0,0 +1,181 @@
+"""
+黑边检测 - 在文件中均匀抽取几个短窗口运行 cropdetect，汇总出稳定的裁剪区域
+
+每个窗口用 -ss 放在 -i 之前快速定位（只解码窗口内的帧），各窗口并行运行。
+汇总时取所有窗口检测区域的外接矩形：任何一个窗口中出现过画面的区域都不会被裁掉；
+有效窗口不足一半（例如大部分窗口是全黑画面）时不做判断。
+
+检测结果以 crop_width / crop_height / crop_x / crop_y 四个字段保存在视频信息中（与探测结果一起缓存），
+裁剪区域等于整个画面时表示已检测、没有黑边；四个字段为 0 表示尚未检测。
+"""
+import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# 默认抽样窗口数和每个窗口的时长（秒）
+DEFAULT_SAMPLES = 5
+DEFAULT_WINDOW = 2.0
+# 亮度阈值（小于 1 时按比例计算，与位深无关，约等于 8bit 的 24）
+CROPDETECT_LIMIT = "0.094"
+# 裁剪区域的宽高取整（yuv420 需要偶数）
+CROPDETECT_ROUND = 2
+# 每个窗口的超时（秒）
+WINDOW_TIMEOUT = 60
+
+CROP_FIELDS = ("crop_width", "crop_height", "crop_x", "crop_y")
+
+_CROP_PATTERN = re.compile(r'crop=(\d+):(\d+):(\d+):(\d+)')
+
+if sys.platform == 'win32':
+    CREATE_NO_WINDOW = 0x08000000
+else:
+    CREATE_NO_WINDOW = 0
+
+Rect = Tuple[int, int, int, int]
+
+
+def sample_offsets(duration: float, samples: int = DEFAULT_SAMPLES, window: float = DEFAULT_WINDOW) -> List[float]:
+    """
+    抽样窗口的起始时间：避开片头片尾，均匀分布在文件中
+
+    时长未知时只检测开头一个窗口。
+    """
+    if duration <= 0:
+        return [0.0]
+    if duration <= window * samples:
+        # 短片：窗口不重叠地铺满
+        count = max(1, int(duration // window))
+        return [round(i * duration / count, 3) for i in range(min(count, samples))]
+    return [round(duration * (i + 1) / (samples + 1) - window / 2, 3) for i in range(samples)]
+
+
+def build_cropdetect_command(ffmpeg_path: str, video_path: str, offset: float, window: float = DEFAULT_WINDOW) -> list:
+    """一个抽样窗口的 cropdetect 命令（reset=0：输出窗口内所有帧的累计区域）"""
+    return [
+        ffmpeg_path, "-hide_banner", "-nostats", "-ss", f"{offset:.3f}", "-i", video_path, "-t", f"{window:.3f}",
+        "-map", "0:v:0", "-an", "-sn", "-dn",
+        "-vf", f"cropdetect=limit={CROPDETECT_LIMIT}:round={CROPDETECT_ROUND}:reset=0",
+        "-f", "null", "-"
+    ]
+
+
+def parse_cropdetect(output: str) -> Optional[Rect]:
+    """cropdetect 输出中最后一个有效的区域 (w, h, x, y)，全黑画面或没有输出时返回 None"""
+    rect = None
+    for match in _CROP_PATTERN.finditer(output):
+        width, height, x, y = (int(v) for v in match.groups())
+        if width > 0 and height > 0:
+            rect = (width, height, x, y)
+    return rect
+
+
+def aggregate_crops(rects: List[Optional[Rect]], width: int, height: int) -> Optional[Rect]:
+    """
+    汇总各窗口的检测结果
+
+    Returns:
+        所有有效窗口的外接矩形（限制在画面内）；有效窗口不足一半时返回 None
+    """
+    valid = [r for r in rects if r]
+    if not valid or len(valid) * 2 < len(rects):
+        return None
+    left = min(x for _, _, x, _ in valid)
+    top = min(y for _, _, _, y in valid)
+    right = max(x + w for w, _, x, _ in valid)
+    bottom = max(y + h for _, h, _, y in valid)
+    if width > 0 and height > 0:
+        left, top = max(0, left), max(0, top)
+        right, bottom = min(width, right), min(height, bottom)
+    # 宽高保持偶数
+    crop_w = (right - left) // 2 * 2
+    crop_h = (bottom - top) // 2 * 2
+    if crop_w <= 0 or crop_h <= 0:
+        return None
+    return crop_w, crop_h, left, top
+
+
+def _run_window(cmd: list) -> Optional[Rect]:
+    try:
+        result = subprocess.run(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=WINDOW_TIMEOUT,
+            creationflags=CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"黑边检测失败: {e}")
+        return None
+    return parse_cropdetect(result.stderr.decode('utf-8', errors='replace'))
+
+
+def detect_crop(
+    ffmpeg_path: str,
+    video_path: str,
+    duration: float,
+    width: int,
+    height: int,
+    samples: int = DEFAULT_SAMPLES,
+    window: float = DEFAULT_WINDOW
+) -> Dict[str, int]:
+    """
+    检测黑边（各窗口并行运行）
+
+    Returns:
+        crop_width / crop_height / crop_x / crop_y 字段；无法判断时返回空字典
+    """
+    commands = [build_cropdetect_command(ffmpeg_path, video_path, offset, window)
+                for offset in sample_offsets(duration, samples, window)]
+    with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+        rects = list(executor.map(_run_window, commands))
+    return crop_fields(aggregate_crops(rects, width, height))
+
+
+def crop_fields(rect: Optional[Rect]) -> Dict[str, int]:
+    """裁剪区域 -> 视频信息中的字段，None 时返回空字典"""
+    if rect is None:
+        return {}
+    return dict(zip(CROP_FIELDS, rect))
+
+
+def crop_rect(info: Optional[dict]) -> Optional[Rect]:
+    """视频信息中的检测结果，尚未检测时返回 None"""
+    info = info or {}
+    rect = tuple(int(info.get(name) or 0) for name in CROP_FIELDS)
+    return rect if rect[0] > 0 and rect[1] > 0 else None
+
+
+def crop_filter(info: Optional[dict]) -> str:
+    """
+    crop 滤镜参数 "w:h:x:y"
+
+    尚未检测或没有黑边（裁剪区域等于整个画面）时返回空字符串。
+    """
+    rect = crop_rect(info)
+    if rect is None:
+        return ""
+    width, height = int(info.get("width") or 0), int(info.get("height") or 0)
+    if rect == (width, height, 0, 0):
+        return ""
+    return ":".join(str(v) for v in rect)
+
+
+def crop_savings(info: Optional[dict]) -> float:
+    """裁剪后少处理的像素比例（0 ~ 1），尚未检测或源分辨率未知时为 0"""
+    rect = crop_rect(info)
+    width, height = int((info or {}).get("width") or 0), int((info or {}).get("height") or 0)
+    if rect is None or width <= 0 or height <= 0:
+        return 0.0
+    return max(0.0, 1.0 - rect[0] * rect[1] / (width * height))
+
+
+def job_crop(encode_kwargs: dict, source: Optional[dict] = None) -> str:
+    """
+    任务实际使用的裁剪区域
+
+    编码参数中明确给出的 crop 优先；auto_crop 为 True 时使用源视频信息中的检测结果。
+    """
+    if encode_kwargs.get("crop"):
+        return encode_kwargs["crop"]
+    if encode_kwargs.get("auto_crop"):
+        return crop_filter(source)
+    return ""
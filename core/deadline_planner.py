@@ -0,0 +1,263 @@
+"""
+截止时间规划 - 给定截止时间和可用核心数，为队列中每个文件选择预设，在按时完成的前提下尽量提高压缩率
+
+每个文件的预设在所属的预设序列（x264/x265 的 ultrafast..veryslow、NVenc 的 p1..p7）中选择：
+先全部使用最快的预设，然后反复把“每多花一秒节省输出最多”的文件升级一档，直到预计总耗时达到可用时间。
+耗时由 core.speed_model 按本机实际编码的速度预测，核心数按占本机核心数的比例折算速度。
+输出节省按预设的先验体积比例和文件工作量（时长 × 像素速率）估算，只用于比较哪个文件升级更划算。
+
+直接复制、自定义命令、多码率输出、预设不在已知序列中或明确指定了预设的文件不调整，只计入耗时；
+时长未知的文件无法预测耗时，同样不调整。
+连最快的预设也无法按时完成时，全部使用最快的预设，计划标记为无法按时完成。
+
+同时编码多个文件不会缩短总耗时（速度模型按整台机器的吞吐量计算），所以只规划预设，不调整并行数。
+编码过程中每完成一个文件比较实际耗时与预测：偏差超过 REPLAN_TOLERANCE 时，按剩余时间和偏差比例重新规划尚未开始的文件。
+"""
+import heapq
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.presets import PRESET_LADDERS
+from core.encode_plan import estimate_cost
+from core.renditions import active_renditions
+from core.speed_model import SOURCE_DEFAULT, SpeedModel
+
+# 各预设相对于 medium / p4 的输出体积（先验值，相同 CRF 下）
+PRESET_SIZE = {
+    "ultrafast": 1.6, "superfast": 1.35, "veryfast": 1.12, "faster": 1.05, "fast": 1.02,
+    "medium": 1.0, "slow": 0.97, "slower": 0.95, "veryslow": 0.94,
+    "p1": 1.12, "p2": 1.08, "p3": 1.04, "p4": 1.0, "p5": 0.98, "p6": 0.97, "p7": 0.96,
+}
+# 实际耗时与预测的偏差超过该比例时重新规划
+REPLAN_TOLERANCE = 0.15
+
+
+def parse_deadline(value: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    解析截止时间
+
+    支持 "23:30"（今天，已过则为明天）、"2026-10-20 08:00"、"+90m" / "+2h" / "+1h30m" / "+3600"（秒）。
+    无法解析时返回 None。
+    """
+    value = (value or "").strip()
+    now = now or datetime.now()
+    if not value:
+        return None
+    if value.startswith("+"):
+        rest, seconds = value[1:].lower(), 0.0
+        try:
+            for unit, factor in (("h", 3600), ("m", 60)):
+                if unit in rest:
+                    number, rest = rest.split(unit, 1)
+                    seconds += float(number) * factor
+            if rest.rstrip("s"):
+                seconds += float(rest.rstrip("s"))
+        except ValueError:
+            return None
+        return now + timedelta(seconds=seconds) if seconds > 0 else None
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M", "%Y-%m-%d %H:%M:%S"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    for fmt in ("%H:%M", "%H:%M:%S"):
+        try:
+            parsed = datetime.strptime(value, fmt).time()
+        except ValueError:
+            continue
+        deadline = datetime.combine(now.date(), parsed)
+        return deadline if deadline > now else deadline + timedelta(days=1)
+    return None
+
+
+def core_share(cores: int) -> float:
+    """可用核心数占本机核心数的比例（0 或超过本机核心数时为 1）"""
+    total = os.cpu_count() or 1
+    return min(cores, total) / total if cores > 0 else 1.0
+
+
+def preset_ladder(kwargs: Dict[str, Any]) -> Tuple[str, ...]:
+    """文件可调整的预设序列，不可调整时为空"""
+    if kwargs.get("video_codec") == "copy" or kwargs.get("use_custom") or active_renditions(kwargs):
+        return ()
+    preset = kwargs.get("video_preset", "")
+    for ladder in PRESET_LADDERS:
+        if preset in ladder:
+            return ladder
+    return ()
+
+
+class DeadlineJob:
+    """计划中的一个文件"""
+
+    def __init__(self, input_path: str, kwargs: Dict[str, Any], info: Optional[dict], fixed: bool = False):
+        self.input_path = input_path
+        self.kwargs = kwargs
+        self.info = info or {}
+        self.duration, self.cost = estimate_cost(kwargs, info)
+        self.ladder = () if fixed or self.duration <= 0 else preset_ladder(kwargs)
+        # 各档预设的预计耗时；不可调整时只有当前参数一项
+        self.seconds: List[float] = []
+        self.choice = 0
+        self.uncalibrated = False
+
+    @property
+    def preset(self) -> str:
+        return self.ladder[self.choice] if self.ladder else self.kwargs.get("video_preset", "")
+
+    @property
+    def predicted(self) -> float:
+        return self.seconds[self.choice]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"input": self.input_path, "preset": self.preset, "predicted": round(self.predicted, 1),
+                "adjustable": bool(self.ladder)}
+
+
+class DeadlinePlan:
+    """整个队列的截止时间计划"""
+
+    def __init__(self, jobs: List[DeadlineJob], available: float, share: float, fixed: Iterable[str] = ()):
+        self.jobs = jobs
+        self.available = available
+        self.share = share
+        self.fixed = set(fixed)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(job.predicted for job in self.jobs)
+
+    @property
+    def feasible(self) -> bool:
+        return self.total_seconds <= self.available
+
+    @property
+    def calibrated(self) -> bool:
+        """所有预测都基于本机的数据"""
+        return not any(job.uncalibrated for job in self.jobs)
+
+    def presets(self) -> Dict[str, str]:
+        """可调整的文件选择的预设 {输入文件: 预设}"""
+        return {job.input_path: job.preset for job in self.jobs if job.ladder}
+
+    def predicted(self) -> Dict[str, float]:
+        """各文件的预计耗时 {输入文件: 秒数}"""
+        return {job.input_path: job.predicted for job in self.jobs}
+
+    def summary(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for preset in self.presets().values():
+            counts[preset] = counts.get(preset, 0) + 1
+        return {"files": len(self.jobs), "available": round(self.available, 1),
+                "predicted": round(self.total_seconds, 1), "feasible": self.feasible,
+                "calibrated": self.calibrated, "presets": counts}
+
+
+def plan_deadline(jobs: List[Tuple[str, Dict[str, Any], Optional[dict]]], model: SpeedModel,
+                  available: float, share: float = 1.0, slowdown: float = 1.0,
+                  fixed: Iterable[str] = ()) -> DeadlinePlan:
+    """
+    为队列选择预设
+
+    Args:
+        jobs: [(输入文件, 编码参数, 源视频信息)]
+        model: 速度模型
+        available: 可用时间（秒）
+        share: 可用核心数占本机的比例（见 core_share）
+        slowdown: 实际耗时与模型预测之比（重新规划时使用）
+        fixed: 不调整预设的文件（例如文件级设置中明确指定了预设）
+    """
+    fixed = set(fixed)
+    planned = [DeadlineJob(path, kwargs, info, path in fixed) for path, kwargs, info in jobs]
+    for job in planned:
+        for preset in job.ladder or (None,):
+            kwargs = job.kwargs if preset is None else dict(job.kwargs, video_preset=preset)
+            seconds, source = model.predict(kwargs, job.info, job.duration, share)
+            job.seconds.append(seconds * slowdown)
+            job.uncalibrated = job.uncalibrated or (source == SOURCE_DEFAULT and job.duration > 0)
+    plan = DeadlinePlan(planned, available, share, fixed)
+    total = plan.total_seconds
+
+    def upgrade(index: int):
+        """文件升级一档的 (-每秒节省, 文件序号, 多花的秒数)，已是最慢一档时为 None"""
+        job = planned[index]
+        if job.choice + 1 >= len(job.ladder):
+            return None
+        extra = max(job.seconds[job.choice + 1] - job.seconds[job.choice], 1e-6)
+        saving = job.cost * (PRESET_SIZE.get(job.ladder[job.choice], 1.0)
+                             - PRESET_SIZE.get(job.ladder[job.choice + 1], 1.0))
+        return -saving / extra, index, extra
+
+    heap = [item for item in (upgrade(i) for i in range(len(planned))) if item is not None]
+    heapq.heapify(heap)
+    while heap:
+        _, index, extra = heapq.heappop(heap)
+        if total + extra > available:
+            # 更慢的预设多花的时间只会更多，这个文件不再升级
+            continue
+        planned[index].choice += 1
+        total += extra
+        item = upgrade(index)
+        if item is not None:
+            heapq.heappush(heap, item)
+    return plan
+
+
+class DeadlineTracker:
+    """编码过程中跟踪实际耗时，偏差过大时重新规划尚未开始的文件"""
+
+    def __init__(self, plan: DeadlinePlan, deadline: float, model: SpeedModel):
+        """
+        Args:
+            plan: 开始编码时的计划
+            deadline: 截止时间（time.time() 时间戳）
+            model: 速度模型
+        """
+        self.plan = plan
+        self.deadline = deadline
+        self.model = model
+        self.slowdown = 1.0
+        self._predicted = plan.predicted()
+        self._infos = {job.input_path: job.info for job in plan.jobs}
+        self._actual = 0.0
+        self._expected = 0.0
+
+    def finished(self, input_path: str, wall_seconds: float, concurrency: int = 1) -> bool:
+        """
+        记录一个文件的实际耗时
+
+        Args:
+            wall_seconds: 文件的编码耗时
+            concurrency: 同时编码的文件数（预测耗时按整台机器计算，实际耗时按并行数折算后比较）
+
+        Returns:
+            上次规划以来实际与预测的偏差是否超过 REPLAN_TOLERANCE（需要重新规划）
+        """
+        predicted = self._predicted.get(input_path, 0.0)
+        if predicted <= 0 or wall_seconds <= 0:
+            return False
+        self._actual += wall_seconds / max(1, concurrency)
+        self._expected += predicted
+        ratio = self._actual / self._expected
+        if abs(ratio - 1) <= REPLAN_TOLERANCE:
+            return False
+        # 偏差累积到偏差比例中，之后与新的预测比较
+        self.slowdown *= ratio
+        self._actual = self._expected = 0.0
+        return True
+
+    def replan(self, remaining: List[Tuple[str, Dict[str, Any]]], now: Optional[float] = None) -> DeadlinePlan:
+        """
+        按剩余时间和偏差比例重新规划尚未开始的文件
+
+        Args:
+            remaining: [(输入文件, 当前编码参数)]，预设可以是所属序列中的任意一档
+            now: 当前时间戳，None 表示 time.time()
+        """
+        available = max(0.0, self.deadline - (now or time.time()))
+        jobs = [(path, kwargs, self._infos.get(path)) for path, kwargs in remaining]
+        plan = plan_deadline(jobs, self.model, available, self.plan.share, self.slowdown, self.plan.fixed)
+        self._predicted.update(plan.predicted())
+        return plan
@@ -0,0 +1,97 @@
+"""
+丢弃重复帧（mpdecimate） - 屏幕录制中大部分帧与上一帧相同，丢弃后编码器只处理有变化的帧
+
+mpdecimate 放在滤镜链的最前面（降低帧率的 fps 之后），之后的裁剪、缩放和像素格式转换只处理保留下来的帧。
+输出使用可变帧率（-fps_mode vfr，FFmpeg 5.1 之前为 -vsync vfr，见 core.ffmpeg_capabilities.fps_mode_args）：
+保留的帧沿用原时间戳，MP4 中按原节奏播放，静止画面一直显示到下一次变化。
+
+阈值与 FFmpeg 相同：8x8 块的差异超过 hi，或超过 lo 的块占比超过 frac 时视为有变化；
+max > 0 时最多连续丢弃 max 帧（保证长时间静止的画面也定期输出一帧）。
+
+丢弃的帧数 = 源帧数（时长 × 帧率）- 输出帧数（FFmpeg 最后一行进度的 frame=），时长和帧率未知时从 FFmpeg 输出中读取。
+"""
+import re
+from typing import Any, Dict, Optional
+
+from core.filter_graph import parse_rate
+
+# 默认阈值（与 FFmpeg mpdecimate 的默认值相同）
+DEFAULT_HI = 768
+DEFAULT_LO = 320
+DEFAULT_FRAC = 0.33
+DEFAULT_MAX = 0
+
+# 输出帧率模式：可变帧率（保留帧沿用原时间戳）
+VFR_MODE = "vfr"
+
+
+def decimate_filter(encode_kwargs: Dict[str, Any]) -> str:
+    """mpdecimate 滤镜表达式，未启用时返回空字符串"""
+    if not encode_kwargs.get("decimate"):
+        return ""
+    hi = int(encode_kwargs.get("decimate_hi") or DEFAULT_HI)
+    lo = int(encode_kwargs.get("decimate_lo") or DEFAULT_LO)
+    frac = float(encode_kwargs.get("decimate_frac") or DEFAULT_FRAC)
+    expression = f"mpdecimate=hi={hi}:lo={lo}:frac={frac:g}"
+    maximum = int(encode_kwargs.get("decimate_max") or 0)
+    if maximum:
+        expression += f":max={maximum}"
+    return expression
+
+
+class DecimateStats:
+    """从 FFmpeg 输出中统计输出帧数，编码结束后得出丢弃的重复帧数"""
+
+    DURATION_PATTERN = re.compile(r'^\s+Duration: (\d+):(\d{2}):(\d{2}(?:\.\d+)?)')
+    STREAM_FPS_PATTERN = re.compile(r'^\s+Stream #0:\d+.*: Video: .*?([\d.]+) fps')
+    FRAME_PATTERN = re.compile(r'^frame=\s*(\d+)')
+
+    def __init__(self, source_info: Optional[dict] = None, duration: float = 0.0, video_framerate: str = ""):
+        """
+        Args:
+            source_info: 源视频信息（使用其中的 fps）
+            duration: 源时长（秒），0 表示未知
+            video_framerate: 目标帧率，设置时源帧数按目标帧率计算
+        """
+        self.duration = duration
+        self.fps = float((source_info or {}).get("fps") or 0)
+        self.target_fps = parse_rate(video_framerate) if video_framerate else 0.0
+        self.output_frames = 0
+
+    def feed(self, line: str):
+        """处理一行 FFmpeg 输出（只读取第一个输入的时长和帧率）"""
+        match = self.FRAME_PATTERN.match(line)
+        if match:
+            self.output_frames = int(match.group(1))
+            return
+        if self.duration <= 0:
+            match = self.DURATION_PATTERN.match(line)
+            if match:
+                hours, minutes, seconds = match.groups()
+                self.duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+                return
+        if self.fps <= 0:
+            match = self.STREAM_FPS_PATTERN.match(line)
+            if match:
+                self.fps = float(match.group(1))
+
+    @property
+    def source_frames(self) -> int:
+        """不丢弃重复帧时的输出帧数，时长或帧率未知时为 0（设置了帧率时 fps 在 mpdecimate 之前，按目标帧率计算）"""
+        fps = self.target_fps or self.fps
+        return int(round(self.duration * fps)) if self.duration > 0 and fps > 0 else 0
+
+    @property
+    def dropped(self) -> int:
+        return max(0, self.source_frames - self.output_frames)
+
+    def summary(self, message: str) -> str:
+        """
+        在结果消息后附加丢弃的帧数
+
+        例如 "Success (dropped 2990/3600 duplicate frames, 83%)"；源帧数未知时只给出输出帧数
+        """
+        total = self.source_frames
+        if total <= 0 or not self.output_frames:
+            return f"{message} (kept {self.output_frames} frames)"
+        return f"{message} (dropped {self.dropped}/{total} duplicate frames, {self.dropped * 100 // total}%)"
@@ -0,0 +1,151 @@
+"""
+重复文件检测 - 添加文件时找出内容相同的视频（不同名称或不同目录下的副本）
+
+检测分为几级，每一级只处理上一级仍无法区分的文件：
+1. 同一 inode（硬链接、指向同一文件的符号链接）：只需 stat，不读取内容
+2. 文件大小相同
+3. 抽样哈希：通过 mmap 读取文件开头、中间和结尾各一块
+4. 完整哈希（可选）：读取整个文件
+
+重复的文件只编码一次，输出通过硬链接（不支持时复制）提供给其它副本。
+"""
+import hashlib
+import mmap
+import os
+import shutil
+from typing import Callable, Dict, Hashable, List, Optional
+
+# 抽样哈希每块读取的字节数
+SAMPLE_BLOCK_SIZE = 256 * 1024
+# 完整哈希的读取块大小
+FULL_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def sampled_hash(path: str, size: int, block_size: int = SAMPLE_BLOCK_SIZE) -> Optional[str]:
+    """
+    计算抽样哈希（文件开头、中间、结尾各 block_size 字节，文件较小时为整个文件）
+
+    Returns:
+        十六进制哈希值，读取失败时返回 None
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(size.to_bytes(8, 'little'))
+    if size == 0:
+        return digest.hexdigest()
+    try:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if len(mm) <= block_size * 3:
+                digest.update(mm)
+            else:
+                middle = (len(mm) - block_size) // 2
+                for offset in (0, middle, len(mm) - block_size):
+                    digest.update(mm[offset:offset + block_size])
+    except (OSError, ValueError) as e:
+        print(f"计算文件抽样哈希失败: {path}: {e}")
+        return None
+    return digest.hexdigest()
+
+
+def full_hash(path: str) -> Optional[str]:
+    """计算完整文件哈希，读取失败时返回 None"""
+    digest = hashlib.blake2b(digest_size=32)
+    buffer = bytearray(FULL_HASH_CHUNK_SIZE)
+    view = memoryview(buffer)
+    try:
+        with open(path, 'rb', buffering=0) as f:
+            while True:
+                count = f.readinto(buffer)
+                if not count:
+                    break
+                digest.update(view[:count])
+    except OSError as e:
+        print(f"计算文件哈希失败: {path}: {e}")
+        return None
+    return digest.hexdigest()
+
+
+def _group_by(paths: List[str], key_func: Callable[[str], Optional[Hashable]]) -> List[List[str]]:
+    """按键分组（保持原顺序），只返回包含多个文件的组；键为 None 的文件不参与分组"""
+    groups: Dict[Hashable, List[str]] = {}
+    for path in paths:
+        key = key_func(path)
+        if key is not None:
+            groups.setdefault(key, []).append(path)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def find_duplicates(paths: List[str], use_full_hash: bool = False,
+                    block_size: int = SAMPLE_BLOCK_SIZE) -> Dict[str, str]:
+    """
+    查找重复文件
+
+    Args:
+        paths: 文件路径列表（顺序决定哪个文件作为原件：每组中最先出现的文件）
+        use_full_hash: 抽样哈希相同后是否再比较完整哈希（更可靠，但需要读取整个文件）
+        block_size: 抽样哈希每块的字节数
+
+    Returns:
+        {重复文件路径: 原件路径}
+    """
+    duplicates: Dict[str, str] = {}
+    by_inode: Dict[tuple, str] = {}
+    by_size: Dict[int, List[str]] = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        # 硬链接和符号链接指向同一 inode：无需读取即可确定重复（部分文件系统不提供 inode，此时跳过）
+        if st.st_ino:
+            key = (st.st_dev, st.st_ino)
+            original = by_inode.get(key)
+            if original is not None:
+                if original != path:
+                    duplicates[path] = original
+                continue
+            by_inode[key] = path
+        by_size.setdefault(st.st_size, []).append(path)
+
+    for size, same_size in by_size.items():
+        # 空文件不是有效视频，不作为重复处理
+        if size == 0 or len(same_size) < 2:
+            continue
+        for group in _group_by(same_size, lambda p: sampled_hash(p, size, block_size)):
+            # 抽样已覆盖整个文件时无需再计算完整哈希
+            if use_full_hash and size > block_size * 3:
+                groups = _group_by(group, full_hash)
+            else:
+                groups = [group]
+            for same_content in groups:
+                for path in same_content[1:]:
+                    duplicates[path] = same_content[0]
+
+    # 同一 inode 的代表文件本身也可能是其它文件的副本：统一指向最终的原件
+    for path, original in duplicates.items():
+        while original in duplicates:
+            original = duplicates[original]
+        duplicates[path] = original
+    return duplicates
+
+
+def link_or_copy(source: str, destination: str) -> str:
+    """
+    将已编码的输出提供给重复文件的输出路径：优先创建硬链接，失败时（跨磁盘、文件系统不支持）复制
+
+    Returns:
+        "hardlink" 或 "copy"
+    """
+    if os.path.abspath(source) == os.path.abspath(destination):
+        return "hardlink"
+    directory = os.path.dirname(destination)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # 与 FFmpeg 的 -y 一致：覆盖已存在的输出
+    if os.path.lexists(destination):
+        os.remove(destination)
+    try:
+        os.link(source, destination)
+        return "hardlink"
+    except OSError:
+        shutil.copy2(source, destination)
+        return "copy"
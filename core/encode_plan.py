@@ -0,0 +1,323 @@
+"""
+编码计划 - 开始编码前一次性为整个队列计算输出路径、实际编码参数、FFmpeg 命令、估算工作量和冲突
+
+检查的问题：
+    collision        多个输入映射到同一个输出文件（例如同目录下的 clip.mkv 和 clip.avi 都输出 clip.mp4），
+                     后完成的任务会用 -y 覆盖先完成的结果
+    in_place         输出文件就是输入文件本身
+    input_overwrite  输出文件是队列中另一个任务的输入文件，编码时会破坏尚未编码的源文件
+    exists           输出文件已经存在，编码时会被覆盖
+
+前三种会浪费整次编码或损坏源文件，开始编码前必须解决；输出已存在只做提示。
+计划可以导出为 Shell/批处理脚本或队列清单，用于检查或在其他机器上执行。
+"""
+import os
+import shlex
+import subprocess
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.crop_detect import job_crop
+from core.decimate import decimate_filter
+from core.filter_graph import (
+    DEFAULT_SCALE_FLAGS, FilterPlan, output_dimensions, parse_rate, plan_video_filters, target_pix_fmt
+)
+from core.queue_manifest import ManifestWriter
+from core.renditions import active_renditions, rendition_kwargs, rendition_outputs
+
+ISSUE_COLLISION = "collision"
+ISSUE_IN_PLACE = "in_place"
+ISSUE_INPUT_OVERWRITE = "input_overwrite"
+ISSUE_EXISTS = "exists"
+
+# 必须在开始编码前解决的问题
+BLOCKING_ISSUES = (ISSUE_COLLISION, ISSUE_IN_PLACE, ISSUE_INPUT_OVERWRITE)
+
+ISSUE_MESSAGES = {
+    ISSUE_COLLISION: "与其他任务的输出路径相同",
+    ISSUE_IN_PLACE: "输出文件就是输入文件",
+    ISSUE_INPUT_OVERWRITE: "输出会覆盖队列中其他任务的输入文件",
+    ISSUE_EXISTS: "输出文件已存在，将被覆盖",
+}
+
+# 工作量的参考像素速率：1080p30，工作量以“相当于多少秒 1080p30 视频”表示
+REFERENCE_PIXEL_RATE = 1920 * 1080 * 30.0
+
+# 导出脚本时按扩展名区分 Windows 批处理和 POSIX Shell
+BATCH_SCRIPT_EXTENSIONS = (".bat", ".cmd")
+
+
+def path_key(path: str) -> str:
+    """比较路径用的键（绝对路径，Windows 下不区分大小写和分隔符）"""
+    return os.path.normcase(os.path.abspath(path))
+
+
+def estimate_cost(kwargs: Dict[str, Any], info: Optional[dict]) -> Tuple[float, float]:
+    """
+    估算单个任务的工作量
+
+    工作量 = 时长 × 输出像素速率 / 1080p30 像素速率，即“相当于多少秒 1080p30 视频”；
+    视频直接复制时工作量为 0。帧率或分辨率未知时按 1080p30 计算。多码率输出时为各规格工作量之和。
+
+    Returns:
+        (源时长秒数, 工作量)；时长未知时均为 0
+    """
+    info = info or {}
+    duration = float(info.get("format_duration") or info.get("video_duration") or info.get("audio_duration") or 0)
+    if duration <= 0:
+        return 0.0, 0.0
+    renditions = active_renditions(kwargs)
+    if renditions:
+        return duration, sum(estimate_cost(rendition_kwargs(kwargs, r), info)[1] for r in renditions)
+    if kwargs.get("video_codec") == "copy" and not kwargs.get("use_custom"):
+        return duration, 0.0
+    width, height = int(info.get("width") or 0), int(info.get("height") or 0)
+    crop = job_crop(kwargs, info)
+    if crop:
+        # 裁掉黑边后按裁剪后的画面计算
+        width, height = (int(v) for v in crop.split(":")[:2])
+    width, height = output_dimensions(width, height, kwargs.get("video_resolution", "") or "")
+    fps = parse_rate(kwargs.get("video_framerate") or 0) or float(info.get("fps") or 0)
+    pixel_rate = (width * height or 1920 * 1080) * (fps or 30.0)
+    return duration, duration * pixel_rate / REFERENCE_PIXEL_RATE
+
+
+class PlannedJob:
+    """编码计划中的一个任务"""
+
+    def __init__(self, input_path: str, output_path: str, kwargs: Dict[str, Any], command: List[str],
+                 duration: float = 0.0, cost: float = 0.0):
+        self.input_path = input_path
+        self.output_path = output_path
+        self.kwargs = kwargs
+        self.command = command
+        self.duration = duration
+        self.cost = cost
+        # 实际写出的文件（多码率输出时为各规格的输出，否则只有 output_path）
+        self.outputs = [path for _, path in rendition_outputs(output_path, active_renditions(kwargs))]
+        # 视频滤镜规划（直接复制视频、多码率输出或使用自定义命令时为 None）
+        self.filters: Optional[FilterPlan] = None
+        self.issues: List[str] = []
+        # 发生冲突的其他输入文件（collision / input_overwrite）
+        self.conflicts_with: List[str] = []
+
+    @property
+    def blocked(self) -> bool:
+        return any(issue in BLOCKING_ISSUES for issue in self.issues)
+
+    def add_issue(self, issue: str, conflicts_with: Iterable[str] = ()):
+        """记录问题（多码率输出的多个文件可能重复报告同一问题）"""
+        if issue not in self.issues:
+            self.issues.append(issue)
+        for path in conflicts_with:
+            if path not in self.conflicts_with:
+                self.conflicts_with.append(path)
+
+    def issue_text(self) -> str:
+        return "; ".join(ISSUE_MESSAGES[issue] for issue in self.issues)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "input": self.input_path,
+            "output": self.output_path,
+            "outputs": list(self.outputs),
+            "command": self.command,
+            "duration": round(self.duration, 3),
+            "cost": round(self.cost, 3),
+            "issues": list(self.issues),
+            "conflicts_with": list(self.conflicts_with),
+            "filters": self.filters.explain() if self.filters else [],
+        }
+
+
+class EncodePlan:
+    """整个队列的编码计划"""
+
+    def __init__(self, jobs: List[PlannedJob]):
+        self.jobs = jobs
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def count(self, issue: str) -> int:
+        """存在指定问题的任务数"""
+        return sum(1 for job in self.jobs if issue in job.issues)
+
+    def blocked_jobs(self) -> List[PlannedJob]:
+        return [job for job in self.jobs if job.blocked]
+
+    @property
+    def total_duration(self) -> float:
+        return sum(job.duration for job in self.jobs)
+
+    @property
+    def total_cost(self) -> float:
+        return sum(job.cost for job in self.jobs)
+
+    @property
+    def unknown_count(self) -> int:
+        """时长未知（尚未探测）的任务数"""
+        return sum(1 for job in self.jobs if job.duration <= 0)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "total": len(self.jobs),
+            "duration": round(self.total_duration, 3),
+            "cost": round(self.total_cost, 3),
+            "unknown": self.unknown_count,
+            ISSUE_COLLISION: self.count(ISSUE_COLLISION),
+            ISSUE_IN_PLACE: self.count(ISSUE_IN_PLACE),
+            ISSUE_INPUT_OVERWRITE: self.count(ISSUE_INPUT_OVERWRITE),
+            ISSUE_EXISTS: self.count(ISSUE_EXISTS),
+        }
+
+    def write_script(self, path: str) -> int:
+        """
+        导出为脚本：.bat / .cmd 为 Windows 批处理，其余为 POSIX Shell
+
+        每个任务先创建输出目录再执行 FFmpeg 命令；存在冲突的任务以注释形式写出。
+
+        Returns:
+            写出的（未注释的）命令数
+        """
+        batch = path.lower().endswith(BATCH_SCRIPT_EXTENSIONS)
+        if batch:
+            comment = "REM "
+
+            def quote(args: List[str]) -> str:
+                # 批处理中 % 需要转义
+                return subprocess.list2cmdline(args).replace("%", "%%")
+
+            def make_dir(directory: str) -> str:
+                return quote(["if", "not", "exist", directory, "mkdir", directory])
+            header = ["@echo off", "chcp 65001 > nul"]
+            newline = "\r\n"
+        else:
+            comment = "# "
+
+            def quote(args: List[str]) -> str:
+                return " ".join(shlex.quote(a) for a in args)
+
+            def make_dir(directory: str) -> str:
+                return quote(["mkdir", "-p", directory])
+            header = ["#!/bin/sh"]
+            newline = "\n"
+
+        summary = self.summary()
+        lines = header + [
+            f"{comment}VvEnc 编码计划: {summary['total']} 个任务，总时长 {summary['duration']:.0f} 秒",
+        ]
+        written = 0
+        created_dirs = set()
+        for job in self.jobs:
+            lines.append("")
+            if job.blocked:
+                lines.append(f"{comment}跳过 {job.input_path}: {job.issue_text()}")
+                lines.append(comment + quote(job.command))
+                continue
+            if job.issues:
+                lines.append(f"{comment}{job.issue_text()}")
+            directory = os.path.dirname(job.output_path)
+            if directory and directory not in created_dirs:
+                created_dirs.add(directory)
+                lines.append(make_dir(directory))
+            lines.append(quote(job.command))
+            written += 1
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(newline.join(lines) + newline)
+        return written
+
+    def write_manifest(self, path: str, settings: Optional[Dict[str, Dict[str, Any]]] = None,
+                       probe: Optional[Callable[[str], dict]] = None) -> int:
+        """
+        导出为队列清单（输出路径已固定），存在冲突的任务不写入
+
+        Args:
+            settings: 文件级设置 {输入文件: 配置项覆盖}
+            probe: 返回文件视频信息的函数，写入后导入时不再探测
+        """
+        settings = settings or {}
+        with ManifestWriter(path) as writer:
+            for job in self.jobs:
+                if job.blocked:
+                    continue
+                writer.write(job.input_path, job.output_path, "waiting",
+                             settings.get(job.input_path), probe(job.input_path) if probe else None)
+            return writer.count
+
+
+def _existing_names(directories: Iterable[str]) -> Dict[str, set]:
+    """每个目录只列出一次，返回 {目录: {规范化的文件名}}（目录不存在时为空集合）"""
+    names = {}
+    for directory in directories:
+        try:
+            names[directory] = {os.path.normcase(name) for name in os.listdir(directory)}
+        except OSError:
+            names[directory] = set()
+    return names
+
+
+def build_plan(
+    build_command: Callable[..., List[str]],
+    input_paths: List[str],
+    output_paths: Dict[str, str],
+    encode_kwargs: Dict[str, Any],
+    per_file_options: Optional[Dict[str, Dict[str, Any]]] = None,
+    info: Optional[Callable[[str], Optional[dict]]] = None
+) -> EncodePlan:
+    """
+    为整个队列生成编码计划
+
+    Args:
+        build_command: 生成命令的函数，通常为 FFmpegHandler.build_command
+        input_paths: 按编码顺序排列的输入文件
+        output_paths: {输入文件: 输出文件}
+        encode_kwargs: 全局编码参数
+        per_file_options: 文件级别的编码参数重写（与 FileProcessor.process_files 相同）
+        info: 返回文件视频信息的函数（用于估算工作量和规划滤镜），None 表示不估算
+    """
+    per_file_options = per_file_options or {}
+    jobs = []
+    for input_path in input_paths:
+        kwargs = dict(encode_kwargs)
+        kwargs.update(per_file_options.get(input_path, {}))
+        output_path = output_paths[input_path]
+        source = (info(input_path) if info else None) or None
+        duration, cost = estimate_cost(kwargs, source)
+        job = PlannedJob(input_path, output_path, kwargs,
+                         build_command(input_path, output_path, source_info=source, **kwargs), duration, cost)
+        if kwargs.get("video_codec", "copy") != "copy" and not kwargs.get("use_custom") \
+                and not active_renditions(kwargs):
+            job.filters = plan_video_filters(
+                kwargs.get("video_resolution", ""),
+                target_pix_fmt(kwargs.get("video_codec", ""), kwargs.get("video_bit_depth", "8")),
+                kwargs.get("video_framerate", ""),
+                kwargs.get("scale_flags", DEFAULT_SCALE_FLAGS),
+                source,
+                job_crop(kwargs, source),
+                decimate_filter(kwargs)
+            )
+        jobs.append(job)
+
+    # 按规范化路径分组，一次找出所有冲突
+    input_keys = {path_key(job.input_path): job.input_path for job in jobs}
+    by_output: Dict[str, List[PlannedJob]] = {}
+    for job in jobs:
+        for output_path in job.outputs:
+            by_output.setdefault(path_key(output_path), []).append(job)
+
+    existing = _existing_names({os.path.dirname(key) for key in by_output})
+    for key, group in by_output.items():
+        if len(group) > 1:
+            for job in group:
+                job.add_issue(ISSUE_COLLISION, [other.input_path for other in group if other is not job])
+        source = input_keys.get(key)
+        if source is not None:
+            for job in group:
+                if source == job.input_path:
+                    job.add_issue(ISSUE_IN_PLACE)
+                else:
+                    job.add_issue(ISSUE_INPUT_OVERWRITE, [source])
+        elif os.path.basename(key) in existing[os.path.dirname(key)]:
+            for job in group:
+                job.add_issue(ISSUE_EXISTS)
+    return EncodePlan(jobs)
@@ -0,0 +1,639 @@
+"""
+后台编码服务 - 在独立进程中调度编码，界面进程崩溃或关闭后编码继续进行
+
+- 服务进程使用 AsyncEncodeEngine 调度编码，任务状态（状态、进度、fps、速度、已输出字节数）
+  写入固定布局的共享内存表（multiprocessing.shared_memory），界面每帧轮询读取，无需跨进程回调；
+- 命令（快照、取消、修改排队任务的参数）和文件结束消息通过 multiprocessing.connection 管道传递；
+- 编码速度记录到状态文件所在目录的速度模型（core.speed_model），与界面共用；
+- 服务信息（管道地址、共享内存名称、任务列表、最终结果）保存在状态文件中，
+  界面重新启动后据此重新连接正在运行的编码，或显示关闭期间完成的结果。
+
+服务进程入口: python -m core.encode_service <状态文件>
+（打包后的可执行文件通过 main.py 的 --encode-service 参数进入）
+"""
+import asyncio
+import json
+import os
+import secrets
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import shared_memory
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from typing import Any, Dict, List, Optional
+
+from core.async_engine import (
+    AsyncEncodeEngine, EncodeJob,
+    JOB_QUEUED, JOB_PROBING, JOB_ENCODING, JOB_DONE, JOB_FAILED, JOB_CANCELLED
+)
+from core.ffmpeg_handler import FFmpegHandler, CREATE_NO_WINDOW
+from core.speed_model import SPEED_MODEL_FILE, SpeedModel
+
+# 打包后的可执行文件启动服务进程时使用的命令行参数
+SERVICE_ARG = "--encode-service"
+
+# 共享内存表中的任务状态代码
+STATE_CODES = {
+    JOB_QUEUED: 0,
+    JOB_PROBING: 1,
+    JOB_ENCODING: 2,
+    JOB_DONE: 3,
+    JOB_FAILED: 4,
+    JOB_CANCELLED: 5,
+}
+STATE_NAMES = {code: name for name, code in STATE_CODES.items()}
+FINAL_STATES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+# 任务状态写入共享内存的间隔（秒）
+REFRESH_INTERVAL = 0.1
+# 服务结束后等待界面读取结果的最长时间（秒）
+FINISH_LINGER_SECONDS = 5.0
+# 服务异常结束时等待已取消的任务结束的最长时间（秒）
+ABORT_WAIT_SECONDS = 5.0
+# 接受界面连接出错后重试前的等待时间（秒）
+ACCEPT_RETRY_INTERVAL = 0.5
+
+
+def load_state(path: str) -> Optional[Dict[str, Any]]:
+    """读取服务状态文件，不存在或损坏时返回 None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_state(path: str, state: Dict[str, Any]):
+    """原子写入服务状态文件"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def pid_alive(pid: int) -> bool:
+    """进程是否仍在运行"""
+    if not pid:
+        return False
+    if sys.platform == 'win32':
+        import ctypes
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        STILL_ACTIVE = 259
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        try:
+            exit_code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return False
+            return exit_code.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """连接已存在的共享内存，不交给本进程的 resource_tracker 管理（否则本进程退出时会被删除）"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        if os.name == 'posix':
+            try:
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(shm._name, "shared_memory")
+            except Exception:
+                pass
+        return shm
+
+
+class StatusTable:
+    """
+    固定布局的共享内存任务状态表
+
+    表头: magic, 版本, 容量, 任务数, 服务进程 PID, 心跳时间戳
+    每个任务一个槽位: 序号（seqlock，写入期间为奇数）, 状态代码, 进度, fps, 速度,
+        已输出字节数, 已编码时长（秒）, 总时长（秒）
+    单写多读：服务进程写入，读取方在序号为奇数或前后不一致时重试。
+    """
+
+    MAGIC = b"VVES"
+    VERSION = 1
+    HEADER = struct.Struct("<4sIIIId")
+    SEQ = struct.Struct("<I")
+    BODY = struct.Struct("<B3xfffxxxxQdd")
+    SLOT_SIZE = SEQ.size + BODY.size
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        _, _, self.capacity, _, _, _ = self.HEADER.unpack_from(shm.buf, 0)
+
+    @classmethod
+    def create(cls, name: str, capacity: int) -> "StatusTable":
+        """创建状态表（服务进程）"""
+        capacity = max(1, capacity)
+        shm = shared_memory.SharedMemory(name=name, create=True,
+                                         size=cls.HEADER.size + capacity * cls.SLOT_SIZE)
+        cls.HEADER.pack_into(shm.buf, 0, cls.MAGIC, cls.VERSION, capacity, 0, os.getpid(), time.time())
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "StatusTable":
+        """连接已有的状态表（界面进程）"""
+        shm = _attach_shared_memory(name)
+        magic, version = cls.HEADER.unpack_from(shm.buf, 0)[:2]
+        if magic != cls.MAGIC or version != cls.VERSION:
+            shm.close()
+            raise ValueError("共享内存状态表格式不匹配")
+        return cls(shm, owner=False)
+
+    def _slot_offset(self, index: int) -> int:
+        return self.HEADER.size + index * self.SLOT_SIZE
+
+    def set_count(self, count: int):
+        """设置任务数"""
+        magic, version, capacity, _, pid, heartbeat = self.HEADER.unpack_from(self.shm.buf, 0)
+        self.HEADER.pack_into(self.shm.buf, 0, magic, version, capacity, min(count, capacity), pid, heartbeat)
+
+    def touch(self):
+        """更新心跳时间戳"""
+        magic, version, capacity, count, pid, _ = self.HEADER.unpack_from(self.shm.buf, 0)
+        self.HEADER.pack_into(self.shm.buf, 0, magic, version, capacity, count, pid, time.time())
+
+    def header(self) -> Dict[str, Any]:
+        """读取表头"""
+        _, _, capacity, count, pid, heartbeat = self.HEADER.unpack_from(self.shm.buf, 0)
+        return {"capacity": capacity, "count": count, "pid": pid, "heartbeat": heartbeat}
+
+    def write_job(self, index: int, job: EncodeJob):
+        """写入任务状态"""
+        if index >= self.capacity:
+            return
+        offset = self._slot_offset(index)
+        seq = self.SEQ.unpack_from(self.shm.buf, offset)[0]
+        self.SEQ.pack_into(self.shm.buf, offset, (seq + 1) & 0xFFFFFFFF)
+        self.BODY.pack_into(
+            self.shm.buf, offset + self.SEQ.size,
+            STATE_CODES.get(job.state, 0), job.progress, job.fps, job.speed,
+            max(0, int(job.out_bytes)), job.encoded_time, job.duration
+        )
+        self.SEQ.pack_into(self.shm.buf, offset, (seq + 2) & 0xFFFFFFFF)
+
+    def read_job(self, index: int) -> Optional[Dict[str, Any]]:
+        """读取任务状态，连续读取失败时返回 None"""
+        offset = self._slot_offset(index)
+        for _ in range(100):
+            seq_before = self.SEQ.unpack_from(self.shm.buf, offset)[0]
+            if seq_before & 1:
+                continue
+            values = self.BODY.unpack_from(self.shm.buf, offset + self.SEQ.size)
+            if self.SEQ.unpack_from(self.shm.buf, offset)[0] == seq_before:
+                state, progress, fps, speed, out_bytes, encoded_time, duration = values
+                return {
+                    "state": STATE_NAMES.get(state, JOB_QUEUED),
+                    "progress": progress,
+                    "fps": fps,
+                    "speed": speed,
+                    "out_bytes": out_bytes,
+                    "encoded_time": encoded_time,
+                    "duration": duration,
+                }
+        return None
+
+    def read_all(self) -> List[Optional[Dict[str, Any]]]:
+        """读取所有任务状态"""
+        count = self.header()["count"]
+        return [self.read_job(i) for i in range(count)]
+
+    def close(self):
+        """断开共享内存；创建方同时删除共享内存"""
+        try:
+            self.shm.close()
+            if self.owner:
+                self.shm.unlink()
+        except (OSError, BufferError):
+            pass
+
+
+class EncodeService:
+    """后台编码服务（运行在独立进程中）"""
+
+    def __init__(self, state_path: str):
+        self.state_path = state_path
+        self.state = load_state(state_path)
+        if not self.state:
+            raise ValueError(f"无法读取服务状态文件: {state_path}")
+        self.jobs_spec = self.state.get("jobs", [])
+        self.table = StatusTable.create(self.state["shm_name"], len(self.jobs_spec))
+        self.table.set_count(len(self.jobs_spec))
+        self.listener = Listener(self.state["address"], authkey=bytes.fromhex(self.state["authkey"]))
+        self.engine: Optional[AsyncEncodeEngine] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.finished = False
+        self._stopped = threading.Event()  # 服务结束（正常或异常），监听线程据此退出
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._detached = threading.Event()
+        self._detached.set()
+
+        self.state["pid"] = os.getpid()
+        save_state(self.state_path, self.state)
+
+    def run(self) -> int:
+        """运行服务直到所有任务结束"""
+        threading.Thread(target=self._serve, name="EncodeServiceListener", daemon=True).start()
+        try:
+            asyncio.run(self._main())
+        finally:
+            self._stopped.set()
+            try:
+                self.listener.close()
+            except OSError:
+                pass
+            self.table.close()
+        return 0
+
+    async def _main(self):
+        self.loop = asyncio.get_running_loop()
+        try:
+            await self._encode_all()
+        except Exception as e:
+            print(f"后台编码失败: {e}")
+            if self.engine is not None:
+                # 终止仍在运行的 FFmpeg 并等待任务结束，不留下孤立的编码进程
+                self.engine.cancel_all()
+                pending = [asyncio.ensure_future(job.wait()) for job in self.engine.jobs.values() if not job.done()]
+                if pending:
+                    await asyncio.wait(pending, timeout=ABORT_WAIT_SECONDS)
+            raise
+        finally:
+            if not self.finished:
+                # 引擎异常结束：记录已有的结果，未结束的任务记为失败，界面不会一直等待
+                self._finish(self._abort_results())
+
+    def _abort_results(self) -> list:
+        """异常结束时的结果列表（未结束的任务记为失败）"""
+        if self.engine is None:
+            return [(spec["input"], spec["output"], False, "服务异常结束") for spec in self.jobs_spec]
+        return [
+            (job.input_path, job.output_path, bool(job.success) and job.state == JOB_DONE,
+             job.message if job.state in FINAL_STATES else "服务异常结束")
+            for job in self.engine.jobs.values()
+        ]
+
+    async def _encode_all(self):
+        """提交所有任务并转发事件，直到编码结束"""
+        try:
+            ffmpeg_handler = FFmpegHandler(self.state.get("ffmpeg_path", ""))
+        except FileNotFoundError as e:
+            self._finish([(spec["input"], spec["output"], False, str(e)) for spec in self.jobs_spec])
+            return
+        ffmpeg_handler.speed_model = SpeedModel(
+            os.path.join(os.path.dirname(os.path.abspath(self.state_path)), SPEED_MODEL_FILE)
+        )
+
+        self.engine = AsyncEncodeEngine(ffmpeg_handler, max_concurrent=int(self.state.get("max_concurrent", 1)))
+        # 相邻且 batch 相同的任务由同一个 FFmpeg 进程编码（小文件批量模式），任务序号仍与 jobs 的顺序一致
+        groups = []
+        for spec in self.jobs_spec:
+            if groups and spec.get("batch") is not None and spec.get("batch") == groups[-1][0].get("batch"):
+                groups[-1].append(spec)
+            else:
+                groups.append([spec])
+        for group in groups:
+            self.engine.submit_batch([(spec["input"], spec["output"], spec.get("kwargs", {}),
+                                       tuple(spec["fallback_audio"]) if spec.get("fallback_audio") else None)
+                                      for spec in group])
+        self.engine.close()
+
+        refresher = asyncio.ensure_future(self._refresh_loop())
+        async for event in self.engine.events():
+            if event["event"] == "file_finished":
+                job = event["job"]
+                self.table.write_job(job.job_id - 1, job)
+                self._send(("file_finished", self._job_snapshot(job)))
+        refresher.cancel()
+        ffmpeg_handler.speed_model.save()
+
+        jobs = self.engine.jobs.values()
+        for job in jobs:
+            self.table.write_job(job.job_id - 1, job)
+        self._finish([
+            (job.input_path, job.output_path, bool(job.success), job.message)
+            for job in jobs if job.started_at is not None
+        ])
+        # 等待界面读取结果后断开
+        await self.loop.run_in_executor(None, self._detached.wait, FINISH_LINGER_SECONDS)
+
+    def _finish(self, results: list):
+        """记录最终结果并通知界面"""
+        self.finished = True
+        self.state["finished"] = True
+        self.state["results"] = results
+        try:
+            save_state(self.state_path, self.state)
+        except OSError as e:
+            print(f"保存服务状态失败: {e}")
+        self._send(("finished", results))
+
+    async def _refresh_loop(self):
+        """定期将所有未结束任务的状态写入共享内存"""
+        while True:
+            for job in self.engine.jobs.values():
+                if job.state not in FINAL_STATES:
+                    self.table.write_job(job.job_id - 1, job)
+            self.table.touch()
+            await asyncio.sleep(REFRESH_INTERVAL)
+
+    @staticmethod
+    def _job_snapshot(job: EncodeJob) -> Dict[str, Any]:
+        return {
+            "index": job.job_id,
+            "input": job.input_path,
+            "output": job.output_path,
+            "state": job.state,
+            "started": job.started_at is not None,
+            "success": job.success,
+            "message": job.message,
+        }
+
+    def _snapshot(self) -> Dict[str, Any]:
+        """当前所有任务的快照（在事件循环线程中调用，保证与后续事件的顺序一致）"""
+        if self.engine is None:
+            jobs = [{"index": i, "input": spec["input"], "output": spec["output"], "state": JOB_QUEUED,
+                     "started": False, "success": None, "message": ""}
+                    for i, spec in enumerate(self.jobs_spec, 1)]
+        else:
+            jobs = [self._job_snapshot(job) for job in self.engine.jobs.values()]
+        return {"pid": os.getpid(), "shm_name": self.state["shm_name"], "finished": self.finished,
+                "results": self.state.get("results"), "jobs": jobs}
+
+    def _update_jobs(self, updates: Dict[str, Dict[str, Any]]):
+        """修改尚未开始的任务的编码参数 {输入文件: {参数: 值}}（引擎在任务开始时才读取参数）"""
+        if self.engine is None:
+            return
+        for job in self.engine.jobs.values():
+            if job.state == JOB_QUEUED and job.input_path in updates:
+                job.encode_kwargs = dict(job.encode_kwargs, **updates[job.input_path])
+
+    def _send(self, message):
+        """向当前连接的界面发送消息，连接断开时丢弃"""
+        with self._client_lock:
+            conn = self._client
+            if conn is None:
+                return
+            try:
+                conn.send(message)
+            except (OSError, ValueError):
+                self._drop_client(conn)
+
+    def _drop_client(self, conn):
+        """断开界面连接（调用方需持有 _client_lock）"""
+        if self._client is conn:
+            self._client = None
+            self._detached.set()
+        try:
+            conn.close()
+        except OSError:
+            pass
+
+    def _call_in_loop(self, callback, *args):
+        """在事件循环线程中执行回调"""
+        try:
+            self.loop.call_soon_threadsafe(callback, *args)
+        except (AttributeError, RuntimeError):
+            # 事件循环尚未启动或已经结束
+            callback(*args)
+
+    def _serve(self):
+        """接受界面连接（同一时间只服务一个界面，新连接替换旧连接），服务结束、监听关闭后退出"""
+        while not self._stopped.is_set():
+            try:
+                conn = self.listener.accept()
+            except (EOFError, AuthenticationError):
+                # 连接在握手时断开或密钥不符，只影响这一个连接
+                continue
+            except OSError as e:
+                # 服务结束时监听已关闭，直接退出；其他错误等待片刻后重试，不会空转
+                if self._stopped.wait(ACCEPT_RETRY_INTERVAL):
+                    return
+                print(f"接受界面连接失败: {e}")
+                continue
+            with self._client_lock:
+                if self._client is not None:
+                    self._drop_client(self._client)
+                self._client = conn
+                self._detached.clear()
+            threading.Thread(target=self._handle_client, args=(conn,), daemon=True).start()
+
+    def _handle_client(self, conn):
+        """处理界面发来的命令"""
+        while True:
+            try:
+                command = conn.recv()
+            except (EOFError, OSError):
+                break
+            name = command[0] if isinstance(command, tuple) and command else command
+            if name == "snapshot":
+                self._call_in_loop(lambda: self._send(("snapshot", self._snapshot())))
+            elif name == "cancel":
+                if self.engine is not None:
+                    self._call_in_loop(self.engine.cancel_all)
+            elif name == "update":
+                self._call_in_loop(self._update_jobs, command[1])
+            elif name == "detach":
+                break
+        with self._client_lock:
+            self._drop_client(conn)
+
+
+class EncodeServiceClient:
+    """后台编码服务客户端（界面进程使用，不依赖 Qt）"""
+
+    def __init__(self, state_path: str, state: Dict[str, Any], process: Optional[subprocess.Popen] = None):
+        self.state_path = state_path
+        self.state = state
+        self.process = process
+        self.conn = None
+        self.table: Optional[StatusTable] = None
+        self.lost = False
+
+    @classmethod
+    def launch(cls, state_path: str, jobs: List[Dict[str, Any]], ffmpeg_path: str = "",
+               max_concurrent: int = 1) -> "EncodeServiceClient":
+        """
+        启动服务进程
+
+        Args:
+            state_path: 状态文件路径
+            jobs: 任务列表 [{"input": 输入路径, "output": 输出路径, "kwargs": build_command 参数,
+                  "batch": 小文件批量分组编号（可选，相邻且相同的任务由同一个 FFmpeg 进程编码）,
+                  "fallback_audio": [备用音频编码, 码率]（可选，音频为 copy 时编码前探测源音频决定是否改用）}]
+            ffmpeg_path: FFmpeg 路径
+            max_concurrent: 同时编码的文件数
+        """
+        token = secrets.token_hex(8)
+        if sys.platform == 'win32':
+            address = r'\\.\pipe\vvenc-' + token
+        else:
+            address = os.path.join(tempfile.gettempdir(), f"vvenc-{token}.sock")
+        state = {
+            "address": address,
+            "authkey": secrets.token_hex(16),
+            "shm_name": f"vvenc_{token}",
+            "ffmpeg_path": ffmpeg_path,
+            "max_concurrent": max_concurrent,
+            "jobs": jobs,
+            "created": time.time(),
+            "pid": 0,
+            "finished": False,
+        }
+        save_state(state_path, state)
+
+        if getattr(sys, 'frozen', False):
+            cmd = [sys.executable, SERVICE_ARG, state_path]
+        else:
+            cmd = [sys.executable, "-m", "core.encode_service", state_path]
+        popen_kwargs: Dict[str, Any] = {
+            'cwd': os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            'stdin': subprocess.DEVNULL,
+            'stdout': subprocess.DEVNULL,
+        }
+        if sys.platform == 'win32':
+            # 独立进程组，界面进程退出时不受影响
+            popen_kwargs['creationflags'] = CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            popen_kwargs['start_new_session'] = True
+        log_path = os.path.splitext(state_path)[0] + ".log"
+        with open(log_path, 'w', encoding='utf-8') as log_file:
+            process = subprocess.Popen(cmd, stderr=log_file, **popen_kwargs)
+        return cls(state_path, state, process)
+
+    @classmethod
+    def find_existing(cls, state_path: str) -> Optional["EncodeServiceClient"]:
+        """读取已有的状态文件（上次界面退出后仍在运行或已完成的服务）"""
+        state = load_state(state_path)
+        if not state:
+            return None
+        return cls(state_path, state)
+
+    @property
+    def connected(self) -> bool:
+        return self.conn is not None
+
+    @property
+    def finished(self) -> bool:
+        """服务是否已经写入最终结果"""
+        return bool(self.state.get("finished"))
+
+    def is_alive(self) -> bool:
+        """服务进程是否仍在运行"""
+        if self.process is not None:
+            return self.process.poll() is None
+        return pid_alive(int(self.state.get("pid") or 0))
+
+    def reload_state(self) -> Dict[str, Any]:
+        """重新读取状态文件"""
+        self.state = load_state(self.state_path) or self.state
+        return self.state
+
+    def connect(self) -> bool:
+        """尝试连接服务，成功后请求任务快照"""
+        if self.conn is not None:
+            return True
+        try:
+            conn = Client(self.state["address"], authkey=bytes.fromhex(self.state["authkey"]))
+        except (OSError, EOFError):
+            return False
+        try:
+            self.table = StatusTable.attach(self.state["shm_name"])
+        except (OSError, ValueError):
+            conn.close()
+            return False
+        self.conn = conn
+        self._send(("snapshot",))
+        return True
+
+    def _send(self, command):
+        if self.conn is None:
+            return
+        try:
+            self.conn.send(command)
+        except (OSError, ValueError):
+            self.lost = True
+
+    def poll_messages(self) -> list:
+        """读取服务发来的所有消息（不阻塞）"""
+        messages = []
+        if self.conn is None:
+            return messages
+        try:
+            while self.conn.poll():
+                messages.append(self.conn.recv())
+        except (EOFError, OSError):
+            self.lost = True
+        return messages
+
+    def read_status(self) -> List[Optional[Dict[str, Any]]]:
+        """读取共享内存中的任务状态"""
+        if self.table is None:
+            return []
+        return self.table.read_all()
+
+    def cancel(self):
+        """取消所有任务"""
+        self._send(("cancel",))
+
+    def update_jobs(self, updates: Dict[str, Dict[str, Any]]):
+        """修改尚未开始的任务的编码参数 {输入文件: {参数: 值}}，已开始的任务不受影响"""
+        self._send(("update", updates))
+
+    def detach(self):
+        """断开连接（服务继续运行）"""
+        if self.conn is not None:
+            self._send(("detach",))
+            try:
+                self.conn.close()
+            except OSError:
+                pass
+            self.conn = None
+        if self.table is not None:
+            self.table.close()
+            self.table = None
+
+    def cleanup(self):
+        """删除状态文件（结果已被界面读取）"""
+        for path in (self.state_path, os.path.splitext(self.state_path)[0] + ".log"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def service_main(state_path: str) -> int:
+    """服务进程入口"""
+    try:
+        service = EncodeService(state_path)
+    except Exception as e:
+        print(f"启动编码服务失败: {e}", file=sys.stderr)
+        return 2
+    return service.run()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("用法: python -m core.encode_service <状态文件>", file=sys.stderr)
+        sys.exit(2)
+    sys.exit(service_main(sys.argv[1]))
@@ -0,0 +1,344 @@
+"""
+FFmpeg 能力检测 - 一次性获取版本、编码器、硬件加速、滤镜和封装格式，并缓存到磁盘
+
+缓存以 FFmpeg 可执行文件的路径、修改时间和大小为键，更换或升级 FFmpeg 后自动重新检测。
+检测结果用于在设置界面中标记不可用的编码器，以及在开始编码前检查任务参数。
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from core.ffmpeg_handler import CREATE_NO_WINDOW
+from core.renditions import normalize_renditions, rendition_kwargs
+
+# 能力缓存文件名（与配置文件位于同一目录）
+CAPABILITY_CACHE_FILE = "ffmpeg_capabilities.json"
+# 缓存格式版本，解析逻辑变化时递增
+CACHE_VERSION = 1
+
+# 输出文件扩展名对应的封装格式
+EXTENSION_MUXERS = {
+    ".mp4": "mp4",
+    ".m4v": "mp4",
+    ".mkv": "matroska",
+    ".mov": "mov",
+    ".webm": "webm",
+}
+
+_ENCODER_LINE = re.compile(r'^\s*([VAS][A-Z.]{5})\s+(\S+)\s*(.*)$')
+_ENCODER_CODEC = re.compile(r'\(codec (\S+)\)\s*$')
+_FILTER_LINE = re.compile(r'^\s*([TSC.|]{2,3})\s+(\S+)\s+\S*->\S*')
+_FORMAT_LINE = re.compile(r'^\s*([DEd. ]{1,3}?)\s*E[d. ]*\s+(\S+)')
+_VERSION = re.compile(r'version\s+(\S+)')
+_VERSION_NUMBER = re.compile(r'^n?(\d+)\.(\d+)')
+
+# -fps_mode 从 FFmpeg 5.1 起可用（取代 -vsync），更早的版本只能使用 -vsync
+FPS_MODE_MIN_VERSION = (5, 1)
+
+_memory_cache: Dict[str, "FFmpegCapabilities"] = {}
+_cache_lock = threading.Lock()
+# 只需要版本号时 ffmpeg -version 的结果 {FFmpeg 路径: 版本号}
+_version_cache: Dict[str, str] = {}
+
+
+class FFmpegCapabilities:
+    """FFmpeg 能力信息"""
+
+    def __init__(self, ffmpeg_path: str, version: str = "", encoders: Optional[Dict[str, Dict[str, str]]] = None,
+                 hwaccels: Optional[List[str]] = None, filters: Optional[List[str]] = None,
+                 muxers: Optional[List[str]] = None):
+        """
+        Args:
+            ffmpeg_path: FFmpeg 可执行文件路径
+            version: 版本号
+            encoders: 编码器 {名称: {"type": "V"/"A"/"S", "codec": 编码格式名, "description": 描述}}
+            hwaccels: 硬件加速方式列表
+            filters: 滤镜名称列表
+            muxers: 封装格式名称列表
+        """
+        self.ffmpeg_path = ffmpeg_path
+        self.version = version
+        self.encoders = encoders or {}
+        self.hwaccels = hwaccels or []
+        self.filters: Set[str] = set(filters or [])
+        self.muxers: Set[str] = set(muxers or [])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "encoders": self.encoders,
+            "hwaccels": self.hwaccels,
+            "filters": sorted(self.filters),
+            "muxers": sorted(self.muxers),
+        }
+
+    @classmethod
+    def from_dict(cls, ffmpeg_path: str, data: Dict[str, Any]) -> "FFmpegCapabilities":
+        return cls(ffmpeg_path, data.get("version", ""), data.get("encoders", {}), data.get("hwaccels", []),
+                   data.get("filters", []), data.get("muxers", []))
+
+    def has_encoder(self, name: str) -> bool:
+        """
+        是否支持指定的编码器（"copy" 总是可用）
+
+        同时接受编码格式名，例如 "mp3" 可由 libmp3lame 编码，与 FFmpeg 的 -c 参数解析方式一致。
+        """
+        if not name or name == "copy":
+            return True
+        if name in self.encoders:
+            return True
+        return any(info.get("codec") == name for info in self.encoders.values())
+
+    def has_filter(self, name: str) -> bool:
+        return name in self.filters
+
+    def has_muxer(self, name: str) -> bool:
+        return name in self.muxers
+
+    def fps_mode_args(self, mode: str) -> List[str]:
+        """输出帧率模式参数（vfr / passthrough 等），见 fps_mode_args"""
+        return fps_mode_args(self.version, mode)
+
+    def validate_job(self, encode_kwargs: Dict[str, Any], output_path: str = "") -> List[str]:
+        """
+        检查编码参数是否能被当前 FFmpeg 执行
+
+        Args:
+            encode_kwargs: 传给 FFmpegHandler.build_command 的编码参数
+            output_path: 输出文件路径（用于检查封装格式）
+
+        Returns:
+            问题列表（为空表示可以执行）；自定义命令模板不做检查
+        """
+        if encode_kwargs.get("use_custom") and encode_kwargs.get("custom_template"):
+            return []
+        renditions = normalize_renditions(encode_kwargs.get("renditions"))
+        if renditions:
+            # 多码率输出：逐个检查各规格，另外需要 split 滤镜
+            problems = [] if self.has_filter("split") else ["滤镜不可用: split"]
+            for rendition in renditions:
+                for problem in self.validate_job(rendition_kwargs(encode_kwargs, rendition), output_path):
+                    if problem not in problems:
+                        problems.append(problem)
+            return problems
+        problems = []
+        video_codec = encode_kwargs.get("video_codec", "")
+        if not self.has_encoder(video_codec):
+            problems.append(f"视频编码器不可用: {video_codec}")
+        audio_codec = encode_kwargs.get("audio_codec", "")
+        if not self.has_encoder(audio_codec):
+            problems.append(f"音频编码器不可用: {audio_codec}")
+        if video_codec and video_codec != "copy":
+            needed_filters = []
+            if encode_kwargs.get("video_resolution"):
+                needed_filters.append("scale")
+            if encode_kwargs.get("video_framerate"):
+                needed_filters.append("fps")
+            if encode_kwargs.get("video_bit_depth") == "10":
+                needed_filters.append("format")
+            if encode_kwargs.get("decimate"):
+                needed_filters.append("mpdecimate")
+            for name in needed_filters:
+                if not self.has_filter(name):
+                    problems.append(f"滤镜不可用: {name}")
+        muxer = EXTENSION_MUXERS.get(os.path.splitext(output_path)[1].lower()) if output_path else None
+        if muxer and not self.has_muxer(muxer):
+            problems.append(f"封装格式不可用: {muxer}")
+        return problems
+
+    def summary(self) -> str:
+        """简要描述，例如 "7.0.2 | 180 encoders | hwaccel: cuda, vaapi\""""
+        hwaccels = ", ".join(self.hwaccels) if self.hwaccels else "-"
+        return f"{self.version or '?'} | {len(self.encoders)} encoders | hwaccel: {hwaccels}"
+
+
+def _run(ffmpeg_path: str, *args: str) -> str:
+    """运行 FFmpeg 查询命令并返回标准输出"""
+    run_kwargs: Dict[str, Any] = {'capture_output': True, 'text': True, 'timeout': 15,
+                                  'encoding': 'utf-8', 'errors': 'replace'}
+    if sys.platform == 'win32':
+        run_kwargs['creationflags'] = CREATE_NO_WINDOW
+    result = subprocess.run([ffmpeg_path, "-hide_banner", *args], **run_kwargs)
+    return result.stdout or ""
+
+
+def parse_encoders(text: str) -> Dict[str, Dict[str, str]]:
+    """解析 ffmpeg -encoders 输出"""
+    encoders = {}
+    in_list = False
+    for line in text.splitlines():
+        if line.strip().startswith("---"):
+            in_list = True
+            continue
+        if not in_list:
+            continue
+        match = _ENCODER_LINE.match(line)
+        if not match:
+            continue
+        flags, name, description = match.groups()
+        codec_match = _ENCODER_CODEC.search(description)
+        encoders[name] = {
+            "type": flags[0],
+            "codec": codec_match.group(1) if codec_match else name,
+            "description": description.strip(),
+        }
+    return encoders
+
+
+def parse_hwaccels(text: str) -> List[str]:
+    """解析 ffmpeg -hwaccels 输出"""
+    lines = [line.strip() for line in text.splitlines()]
+    return [line for line in lines if line and not line.endswith(":")]
+
+
+def parse_filters(text: str) -> List[str]:
+    """解析 ffmpeg -filters 输出"""
+    filters = []
+    for line in text.splitlines():
+        match = _FILTER_LINE.match(line)
+        if match:
+            filters.append(match.group(2))
+    return filters
+
+
+def parse_muxers(text: str) -> List[str]:
+    """解析 ffmpeg -muxers 输出（名称可能以逗号分隔多个别名）"""
+    muxers = []
+    in_list = False
+    for line in text.splitlines():
+        if line.strip().startswith("--"):
+            in_list = True
+            continue
+        if not in_list:
+            continue
+        match = _FORMAT_LINE.match(line)
+        if match:
+            muxers.extend(name for name in match.group(2).split(",") if name)
+    return muxers
+
+
+def parse_version(version: str) -> Optional[Tuple[int, int]]:
+    """
+    解析主次版本号，例如 "7.0.2" / "n6.1" / "4.4.2-0ubuntu0.22.04.1"
+
+    Returns:
+        (主版本, 次版本)；开发版（如 "N-112345-g0123abcd"）或无法识别时返回 None
+    """
+    match = _VERSION_NUMBER.match(version or "")
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+def fps_mode_args(version: str, mode: str) -> List[str]:
+    """
+    输出帧率模式参数：FFmpeg 5.1 起为 -fps_mode，更早的版本为 -vsync（取值相同）
+
+    版本未知或为开发版时按新版本处理（-vsync 在新版本中已弃用）。
+    """
+    parsed = parse_version(version)
+    if parsed is not None and parsed < FPS_MODE_MIN_VERSION:
+        return ["-vsync", mode]
+    return ["-fps_mode", mode]
+
+
+def ffmpeg_version(ffmpeg_path: str) -> str:
+    """
+    FFmpeg 版本号，检测失败时返回空字符串
+
+    已检测过能力时直接使用其中的版本号，否则只运行 ffmpeg -version（结果按路径缓存）。
+    """
+    key = _cache_key(ffmpeg_path)
+    with _cache_lock:
+        cached = _memory_cache.get(key) if key else None
+        if cached is not None:
+            return cached.version
+        if ffmpeg_path in _version_cache:
+            return _version_cache[ffmpeg_path]
+    try:
+        version_text = _run(ffmpeg_path, "-version")
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"获取 FFmpeg 版本失败: {e}")
+        version_text = ""
+    version_match = _VERSION.search(version_text.splitlines()[0] if version_text else "")
+    version = version_match.group(1) if version_match else ""
+    with _cache_lock:
+        _version_cache[ffmpeg_path] = version
+    return version
+
+
+def probe_capabilities(ffmpeg_path: str) -> FFmpegCapabilities:
+    """运行 FFmpeg 检测能力（不使用缓存）"""
+    version_text = _run(ffmpeg_path, "-version")
+    version_match = _VERSION.search(version_text.splitlines()[0] if version_text else "")
+    return FFmpegCapabilities(
+        ffmpeg_path,
+        version=version_match.group(1) if version_match else "",
+        encoders=parse_encoders(_run(ffmpeg_path, "-encoders")),
+        hwaccels=parse_hwaccels(_run(ffmpeg_path, "-hwaccels")),
+        filters=parse_filters(_run(ffmpeg_path, "-filters")),
+        muxers=parse_muxers(_run(ffmpeg_path, "-muxers")),
+    )
+
+
+def _cache_key(ffmpeg_path: str) -> Optional[str]:
+    """缓存键：绝对路径 + 修改时间 + 文件大小"""
+    try:
+        real_path = os.path.realpath(ffmpeg_path)
+        st = os.stat(real_path)
+    except OSError:
+        return None
+    return f"{real_path}|{st.st_mtime_ns}|{st.st_size}"
+
+
+def get_capabilities(ffmpeg_path: str, cache_file: Optional[str] = None) -> Optional[FFmpegCapabilities]:
+    """
+    获取 FFmpeg 能力（进程内和磁盘缓存），检测失败时返回 None
+
+    Args:
+        ffmpeg_path: FFmpeg 可执行文件路径
+        cache_file: 磁盘缓存文件路径，None 表示只使用进程内缓存
+    """
+    key = _cache_key(ffmpeg_path)
+    if key is None:
+        return None
+    with _cache_lock:
+        cached = _memory_cache.get(key)
+        if cached is not None:
+            return cached
+
+        entries: Dict[str, Any] = {}
+        if cache_file and os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") == CACHE_VERSION:
+                    entries = data.get("entries", {})
+            except (OSError, ValueError) as e:
+                print(f"读取 FFmpeg 能力缓存失败: {e}")
+        if key in entries:
+            capabilities = FFmpegCapabilities.from_dict(ffmpeg_path, entries[key])
+            _memory_cache[key] = capabilities
+            return capabilities
+
+        try:
+            capabilities = probe_capabilities(ffmpeg_path)
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"检测 FFmpeg 能力失败: {e}")
+            return None
+        _memory_cache[key] = capabilities
+
+        if cache_file:
+            # 只保留仍然存在的 FFmpeg 的缓存项
+            entries = {k: v for k, v in entries.items() if os.path.exists(k.split("|", 1)[0])}
+            entries[key] = capabilities.to_dict()
+            try:
+                tmp_path = cache_file + ".tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({"version": CACHE_VERSION, "entries": entries}, f, ensure_ascii=False)
+                os.replace(tmp_path, cache_file)
+            except OSError as e:
+                print(f"保存 FFmpeg 能力缓存失败: {e}")
+        return capabilities
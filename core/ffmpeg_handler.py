@@ -4,11 +4,21 @@ FFmpeg处理器 - 封装FFmpeg调用和进度解析
 import subprocess
 import re
 import os
+import json
 import shutil
 import sys
-from typing import Optional, Callable, Tuple
+import threading
+import time
+from typing import Optional, Callable, Dict, List, Tuple
 from pathlib import Path
 
+from core.crop_detect import crop_fields, crop_rect, detect_crop, job_crop
+from core.decimate import VFR_MODE, DecimateStats, decimate_filter
+from core.filter_graph import DEFAULT_SCALE_FLAGS, plan_video_filters, target_pix_fmt
+from core.renditions import (
+    active_renditions, build_split_graph, check_outputs, normalize_renditions, rendition_kwargs, rendition_outputs
+)
+
 # Windows上隐藏控制台窗口的标志
 if sys.platform == 'win32':
     CREATE_NO_WINDOW = 0x08000000
@@ -19,6 +29,29 @@ else:
 class FFmpegHandler:
     """FFmpeg处理器"""
     
+    # 进度输出中的时间戳，例如 time=00:01:23.45
+    TIME_PATTERN = re.compile(r'time=(\d{2}):(\d{2}):(\d{2})\.(\d{2})')
+    # 可能的错误信息（包含error/failed/invalid等关键词的行）
+    ERROR_PATTERN = re.compile(r'error|Error|ERROR|failed|Failed|FAILED|invalid|Invalid|INVALID')
+    # 进度行中的编码速度和已输出大小
+    FPS_PATTERN = re.compile(r'fps=\s*([\d.]+)')
+    SPEED_PATTERN = re.compile(r'speed=\s*([\d.]+)x')
+    SIZE_PATTERN = re.compile(r'size=\s*(\d+)\s*(kB|KiB|MB|MiB|GB|GiB|B)')
+    SIZE_UNITS = {'B': 1, 'kB': 1024, 'KiB': 1024, 'MB': 1024 ** 2, 'MiB': 1024 ** 2, 'GB': 1024 ** 3, 'GiB': 1024 ** 3}
+    
+    # 已解析的 FFmpeg / ffprobe 路径（进程内缓存，避免每次创建处理器都搜索 PATH）
+    _resolved_ffmpeg: Dict[str, Optional[str]] = {}
+    _resolved_ffprobe: Dict[str, Optional[str]] = {}
+    
+    # 视频信息缓存（core.probe_cache.ProbeCache），None 表示不缓存
+    probe_cache = None
+    # 编码速度模型（core.speed_model.SpeedModel），设置时每次编码成功后记录速度
+    speed_model = None
+    
+    # 快速探测只读取文件开头的少量数据（字节 / 微秒）
+    QUICK_PROBE_SIZE = 65536
+    QUICK_ANALYZE_DURATION = 0
+    
     def __init__(self, ffmpeg_path: str = ""):
         """
         初始化FFmpeg处理器
@@ -29,9 +62,22 @@ class FFmpegHandler:
         self.ffmpeg_path = self._find_ffmpeg(ffmpeg_path)
         if not self.ffmpeg_path:
             raise FileNotFoundError("未找到FFmpeg，请确保已安装或在设置中指定路径")
+        # 正在运行的编码数（多个线程同时编码时，记录速度按并行数折算）
+        self._active_encodes = 0
+        self._active_lock = threading.Lock()
     
     def _find_ffmpeg(self, custom_path: str = "") -> Optional[str]:
-        """查找FFmpeg可执行文件"""
+        """查找FFmpeg可执行文件（结果按 custom_path 缓存，文件被删除后重新查找）"""
+        cached = FFmpegHandler._resolved_ffmpeg.get(custom_path)
+        if cached and os.path.exists(cached):
+            return cached
+        ffmpeg = self._search_ffmpeg(custom_path)
+        FFmpegHandler._resolved_ffmpeg[custom_path] = ffmpeg
+        return ffmpeg
+    
+    @staticmethod
+    def _search_ffmpeg(custom_path: str = "") -> Optional[str]:
+        """在自定义路径、系统PATH和常见安装位置中查找FFmpeg"""
         if custom_path and os.path.exists(custom_path):
             return custom_path
         
@@ -53,37 +99,124 @@ class FFmpegHandler:
         
         return None
     
-    def get_video_info(self, video_path: str) -> dict:
-        """获取视频信息（简化版，用于获取时长）"""
+    def get_ffprobe_path(self) -> Optional[str]:
+        """获取与 FFmpeg 对应的 ffprobe 路径"""
         if not self.ffmpeg_path:
-            return {}
+            return None
+        cached = FFmpegHandler._resolved_ffprobe.get(self.ffmpeg_path)
+        if cached and os.path.exists(cached):
+            return cached
+        # 只替换文件名部分，目录名中包含 "ffmpeg" 时不受影响
+        directory, name = os.path.split(self.ffmpeg_path)
+        ffprobe_path = os.path.join(directory, name.replace("ffmpeg", "ffprobe"))
+        if not os.path.exists(ffprobe_path):
+            ffprobe_path = shutil.which("ffprobe")
+        FFmpegHandler._resolved_ffprobe[self.ffmpeg_path] = ffprobe_path
+        return ffprobe_path
+    
+    def get_capabilities(self, cache_file: Optional[str] = None):
+        """
+        获取当前 FFmpeg 支持的编码器、滤镜和封装格式（带缓存）
+        
+        Args:
+            cache_file: 磁盘缓存文件路径，None 表示只使用进程内缓存
         
+        Returns:
+            FFmpegCapabilities，检测失败时返回 None
+        """
+        from core.ffmpeg_capabilities import get_capabilities
+        return get_capabilities(self.ffmpeg_path, cache_file)
+    
+    def fps_mode_args(self, mode: str) -> list:
+        """当前 FFmpeg 版本对应的输出帧率模式参数（-fps_mode 或旧版本的 -vsync）"""
+        from core.ffmpeg_capabilities import ffmpeg_version, fps_mode_args
+        return fps_mode_args(ffmpeg_version(self.ffmpeg_path), mode)
+    
+    def build_probe_command(self, video_path: str) -> Optional[list]:
+        """构建获取视频信息（简化版，用于获取时长）的 ffprobe 命令"""
+        ffprobe_path = self.get_ffprobe_path()
+        if not ffprobe_path:
+            return None
+        return [
+            ffprobe_path,
+            "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "stream=width,height,duration,r_frame_rate,codec_name,codec_type,pix_fmt",
+            "-show_entries", "format=duration",
+            "-of", "json",
+            video_path
+        ]
+    
+    def build_detailed_probe_command(self, video_path: str) -> Optional[list]:
+        """构建获取详细视频信息的 ffprobe 命令"""
+        ffprobe_path = self.get_ffprobe_path()
+        if not ffprobe_path:
+            return None
+        # 获取视频和音频流信息，以及格式信息
+        return [
+            ffprobe_path,
+            "-v", "error",
+            "-show_entries", "stream=width,height,codec_name,codec_type,bit_rate,r_frame_rate,duration,pix_fmt",
+            "-show_entries", "format=duration,size,bit_rate",
+            "-of", "json",
+            video_path
+        ]
+    
+    def build_quick_probe_command(self, video_path: str) -> Optional[list]:
+        """构建快速探测命令（只读取格式级的时长、大小和码率，不分析流）"""
+        ffprobe_path = self.get_ffprobe_path()
+        if not ffprobe_path:
+            return None
+        return [
+            ffprobe_path,
+            "-v", "error",
+            "-probesize", str(self.QUICK_PROBE_SIZE),
+            "-analyzeduration", str(self.QUICK_ANALYZE_DURATION),
+            "-show_entries", "format=duration,size,bit_rate",
+            "-of", "json",
+            video_path
+        ]
+    
+    def get_quick_video_info(self, video_path: str) -> dict:
+        """
+        快速获取格式级信息（时长、码率、大小）
+        
+        探测缓存中有详细信息时直接返回详细信息；否则返回的信息中 'quick' 为 True，
+        表示尚缺少分辨率、帧率和编码等流信息。
+        """
+        if self.probe_cache is not None:
+            cached = self.probe_cache.get(video_path)
+            if cached is not None:
+                return cached
+        data = {}
         try:
-            # 使用ffprobe获取视频信息
-            ffprobe_path = self.ffmpeg_path.replace("ffmpeg", "ffprobe")
-            if not os.path.exists(ffprobe_path):
-                ffprobe_path = shutil.which("ffprobe")
-            
-            if not ffprobe_path:
+            cmd = self.build_quick_probe_command(video_path)
+            if cmd:
+                run_kwargs = {'capture_output': True, 'text': True, 'timeout': 10}
+                if sys.platform == 'win32':
+                    run_kwargs['creationflags'] = CREATE_NO_WINDOW
+                result = subprocess.run(cmd, **run_kwargs)
+                if result.returncode == 0:
+                    data = json.loads(result.stdout)
+        except Exception as e:
+            print(f"快速获取视频信息失败: {e}")
+        info = self.parse_detailed_video_info(video_path, data)
+        info['quick'] = True
+        return info
+    
+    def get_video_info(self, video_path: str) -> dict:
+        """获取视频信息（简化版，用于获取时长）"""
+        try:
+            cmd = self.build_probe_command(video_path)
+            if not cmd:
                 return {}
             
-            cmd = [
-                ffprobe_path,
-                "-v", "error",
-                "-select_streams", "v:0",
-                "-show_entries", "stream=width,height,duration,r_frame_rate,codec_name",
-                "-show_entries", "format=duration",
-                "-of", "json",
-                video_path
-            ]
-            
             # Windows上隐藏控制台窗口
             run_kwargs = {'capture_output': True, 'text': True, 'timeout': 10}
             if sys.platform == 'win32':
                 run_kwargs['creationflags'] = CREATE_NO_WINDOW
             result = subprocess.run(cmd, **run_kwargs)
             if result.returncode == 0:
-                import json
                 return json.loads(result.stdout)
         except Exception as e:
             print(f"获取视频信息失败: {e}")
@@ -91,106 +224,149 @@ class FFmpegHandler:
         return {}
     
     def get_detailed_video_info(self, video_path: str) -> dict:
-        """获取详细的视频信息"""
-        if not self.ffmpeg_path:
-            return {}
-        
+        """获取详细的视频信息（设置了 probe_cache 时优先使用缓存）"""
+        if self.probe_cache is not None:
+            cached = self.probe_cache.get(video_path)
+            if cached is not None:
+                return cached
         try:
-            ffprobe_path = self.ffmpeg_path.replace("ffmpeg", "ffprobe")
-            if not os.path.exists(ffprobe_path):
-                ffprobe_path = shutil.which("ffprobe")
-            
-            if not ffprobe_path:
+            cmd = self.build_detailed_probe_command(video_path)
+            if not cmd:
                 return {}
             
-            # 获取视频和音频流信息，以及格式信息
-            cmd = [
-                ffprobe_path,
-                "-v", "error",
-                "-show_entries", "stream=width,height,codec_name,codec_type,bit_rate,r_frame_rate,duration",
-                "-show_entries", "format=duration,size,bit_rate",
-                "-of", "json",
-                video_path
-            ]
-            
             run_kwargs = {'capture_output': True, 'text': True, 'timeout': 10}
             if sys.platform == 'win32':
                 run_kwargs['creationflags'] = CREATE_NO_WINDOW
             result = subprocess.run(cmd, **run_kwargs)
             
             if result.returncode == 0:
-                import json
-                data = json.loads(result.stdout)
-                
-                info = {
-                    'file_path': video_path,
-                    'file_size': os.path.getsize(video_path) if os.path.exists(video_path) else 0
-                }
-                
-                # 解析流信息
-                if 'streams' in data:
-                    video_stream = None
-                    audio_stream = None
-                    
-                    for stream in data['streams']:
-                        if stream.get('codec_type') == 'video' and not video_stream:
-                            video_stream = stream
-                        elif stream.get('codec_type') == 'audio' and not audio_stream:
-                            audio_stream = stream
-                    
-                    # 视频信息
-                    if video_stream:
-                        info['width'] = int(video_stream.get('width', 0))
-                        info['height'] = int(video_stream.get('height', 0))
-                        info['video_codec'] = video_stream.get('codec_name', 'unknown')
-                        info['video_bitrate'] = int(video_stream.get('bit_rate', 0)) if video_stream.get('bit_rate') else 0
-                        
-                        # 帧率
-                        r_frame_rate = video_stream.get('r_frame_rate', '0/1')
-                        if '/' in r_frame_rate:
-                            num, den = map(int, r_frame_rate.split('/'))
-                            info['fps'] = num / den if den > 0 else 0
-                        else:
-                            info['fps'] = float(r_frame_rate) if r_frame_rate else 0
-                        
-                        # 视频时长
-                        info['video_duration'] = float(video_stream.get('duration', 0)) if video_stream.get('duration') else 0
-                    
-                    # 音频信息
-                    if audio_stream:
-                        info['audio_codec'] = audio_stream.get('codec_name', 'unknown')
-                        info['audio_bitrate'] = int(audio_stream.get('bit_rate', 0)) if audio_stream.get('bit_rate') else 0
-                        info['audio_duration'] = float(audio_stream.get('duration', 0)) if audio_stream.get('duration') else 0
-                
-                # 格式信息
-                if 'format' in data:
-                    format_info = data['format']
-                    info['format_duration'] = float(format_info.get('duration', 0)) if format_info.get('duration') else 0
-                    info['format_bitrate'] = int(format_info.get('bit_rate', 0)) if format_info.get('bit_rate') else 0
-                    info['format_size'] = int(format_info.get('size', 0)) if format_info.get('size') else 0
-                
-                # 计算每帧每10000像素点所用的bit数
-                if 'width' in info and 'height' in info and 'fps' in info and 'format_bitrate' in info:
-                    width = info['width']
-                    height = info['height']
-                    fps = info['fps']
-                    bitrate = info['format_bitrate']  # 总码率（bps）
-                    
-                    if width > 0 and height > 0 and fps > 0:
-                        pixels = width * height
-                        bits_per_frame = bitrate / fps if fps > 0 else 0
-                        bits_per_10000_pixels = (bits_per_frame / pixels * 10000) if pixels > 0 else 0
-                        info['bits_per_10000_pixels'] = bits_per_10000_pixels
-                
+                info = self.parse_detailed_video_info(video_path, json.loads(result.stdout))
+                if self.probe_cache is not None:
+                    self.probe_cache.put(video_path, info)
                 return info
         except Exception as e:
             print(f"获取详细视频信息失败: {e}")
         
         return {}
     
+    def detect_crop(self, video_path: str, info: Optional[dict] = None) -> dict:
+        """
+        检测黑边（见 core.crop_detect，设置了 probe_cache 时结果与探测结果一起缓存）
+        
+        Args:
+            info: 已知的视频信息（需要时长和分辨率），None 表示重新获取
+        
+        Returns:
+            crop_width / crop_height / crop_x / crop_y 字段，无法判断时为空字典
+        """
+        cached = self.probe_cache.get(video_path) if self.probe_cache is not None else None
+        if crop_rect(cached):
+            return crop_fields(crop_rect(cached))
+        info = info or cached or self.get_detailed_video_info(video_path)
+        duration = float(info.get('format_duration') or info.get('video_duration') or 0)
+        fields = detect_crop(self.ffmpeg_path, video_path, duration,
+                             int(info.get('width') or 0), int(info.get('height') or 0))
+        if self.probe_cache is not None:
+            self.probe_cache.update(video_path, fields)
+        return fields
+    
+    def analyze_complexity(self, video_path: str, info: Optional[dict] = None,
+                           cancel_flag: Optional[Callable[[], bool]] = None) -> dict:
+        """
+        分析内容复杂度（见 core.complexity，设置了 probe_cache 时结果与探测结果一起缓存）
+        
+        Args:
+            info: 已知的视频信息（使用分辨率、帧率和时长），None 表示重新获取
+            cancel_flag: 返回 True 时终止分析
+        
+        Returns:
+            complexity_* 字段和 scene_cuts，无法分析时为空字典
+        """
+        # core.complexity 会导入 NumPy，只在需要分析时导入（不影响启动耗时）
+        from core.complexity import COMPLEXITY_FIELDS, analyze_complexity, complexity_tier
+        cached = self.probe_cache.get(video_path) if self.probe_cache is not None else None
+        if complexity_tier(cached):
+            return {name: cached[name] for name in COMPLEXITY_FIELDS + ("scene_cuts",) if name in cached}
+        info = info or cached or self.get_detailed_video_info(video_path)
+        fields = analyze_complexity(self.ffmpeg_path, video_path, info, cancel_flag)
+        if self.probe_cache is not None:
+            self.probe_cache.update(video_path, fields)
+        return fields
+    
+    @staticmethod
+    def parse_detailed_video_info(video_path: str, data: dict) -> dict:
+        """解析 ffprobe 输出的详细视频信息"""
+        info = {
+            'file_path': video_path,
+            'file_size': os.path.getsize(video_path) if os.path.exists(video_path) else 0
+        }
+        
+        # 解析流信息
+        if 'streams' in data:
+            video_stream = None
+            audio_stream = None
+            
+            for stream in data['streams']:
+                if stream.get('codec_type') == 'video' and not video_stream:
+                    video_stream = stream
+                elif stream.get('codec_type') == 'audio' and not audio_stream:
+                    audio_stream = stream
+            
+            # 视频信息
+            if video_stream:
+                info['width'] = int(video_stream.get('width', 0))
+                info['height'] = int(video_stream.get('height', 0))
+                info['video_codec'] = video_stream.get('codec_name', 'unknown')
+                if video_stream.get('pix_fmt'):
+                    info['pix_fmt'] = video_stream['pix_fmt']
+                info['video_bitrate'] = int(video_stream.get('bit_rate', 0)) if video_stream.get('bit_rate') else 0
+                
+                # 帧率
+                r_frame_rate = video_stream.get('r_frame_rate', '0/1')
+                if '/' in r_frame_rate:
+                    num, den = map(int, r_frame_rate.split('/'))
+                    info['fps'] = num / den if den > 0 else 0
+                else:
+                    info['fps'] = float(r_frame_rate) if r_frame_rate else 0
+                
+                # 视频时长
+                info['video_duration'] = float(video_stream.get('duration', 0)) if video_stream.get('duration') else 0
+            
+            # 音频信息
+            if audio_stream:
+                info['audio_codec'] = audio_stream.get('codec_name', 'unknown')
+                info['audio_bitrate'] = int(audio_stream.get('bit_rate', 0)) if audio_stream.get('bit_rate') else 0
+                info['audio_duration'] = float(audio_stream.get('duration', 0)) if audio_stream.get('duration') else 0
+        
+        # 格式信息
+        if 'format' in data:
+            format_info = data['format']
+            info['format_duration'] = float(format_info.get('duration', 0)) if format_info.get('duration') else 0
+            info['format_bitrate'] = int(format_info.get('bit_rate', 0)) if format_info.get('bit_rate') else 0
+            info['format_size'] = int(format_info.get('size', 0)) if format_info.get('size') else 0
+        
+        # 计算每帧每10000像素点所用的bit数
+        if 'width' in info and 'height' in info and 'fps' in info and 'format_bitrate' in info:
+            width = info['width']
+            height = info['height']
+            fps = info['fps']
+            bitrate = info['format_bitrate']  # 总码率（bps）
+            
+            if width > 0 and height > 0 and fps > 0:
+                pixels = width * height
+                bits_per_frame = bitrate / fps if fps > 0 else 0
+                bits_per_10000_pixels = (bits_per_frame / pixels * 10000) if pixels > 0 else 0
+                info['bits_per_10000_pixels'] = bits_per_10000_pixels
+        
+        return info
+    
     def get_duration(self, video_path: str) -> float:
         """获取视频时长（秒）"""
-        info = self.get_video_info(video_path)
+        return self.parse_duration(self.get_video_info(video_path))
+    
+    @staticmethod
+    def parse_duration(info: dict) -> float:
+        """从 get_video_info 的结果中解析视频时长（秒）"""
         try:
             if "format" in info and "duration" in info["format"]:
                 return float(info["format"]["duration"])
@@ -216,9 +392,30 @@ class FFmpegHandler:
         subtitle_mode: str = "copy",
         custom_args: str = "",
         use_custom: bool = False,
-        custom_template: str = ""
+        custom_template: str = "",
+        scale_flags: str = DEFAULT_SCALE_FLAGS,
+        source_info: Optional[dict] = None,
+        renditions: Optional[list] = None,
+        crop: str = "",
+        auto_crop: bool = False,
+        decimate: bool = False,
+        decimate_hi: int = 0,
+        decimate_lo: int = 0,
+        decimate_frac: float = 0.0,
+        decimate_max: int = 0
     ) -> list:
-        """构建FFmpeg命令"""
+        """
+        构建FFmpeg命令
+
+        Args:
+            scale_flags: 缩放算法（见 core.filter_graph.SCALE_FLAGS）
+            source_info: 源视频信息（width / height / fps / pix_fmt），用于安排滤镜顺序和省略无效滤镜
+            renditions: 多码率输出规格（见 core.renditions），设置后一次解码输出多个文件，output_path 为基础路径
+            crop: 裁剪区域 "w:h:x:y"，在缩放之前裁掉黑边
+            auto_crop: 没有给出 crop 时使用 source_info 中的黑边检测结果（见 core.crop_detect）
+            decimate: 用 mpdecimate 丢弃重复帧并输出可变帧率（见 core.decimate），
+                decimate_hi / decimate_lo / decimate_frac / decimate_max 为其阈值，0 表示默认值
+        """
         if use_custom and custom_template:
             # 使用自定义命令模板
             cmd_str = custom_template.replace("{input}", input_path).replace("{output}", output_path)
@@ -227,79 +424,119 @@ class FFmpegHandler:
         
         cmd = [self.ffmpeg_path, "-i", input_path, "-y"]  # -y表示覆盖输出文件
         
+        crop = job_crop({"crop": crop, "auto_crop": auto_crop}, source_info)
+        mpdecimate = decimate_filter({
+            "decimate": decimate, "decimate_hi": decimate_hi, "decimate_lo": decimate_lo,
+            "decimate_frac": decimate_frac, "decimate_max": decimate_max
+        })
+        renditions = normalize_renditions(renditions)
+        if renditions:
+            # 多码率输出：一次解码，split 后分别编码
+            return self._build_rendition_command(
+                cmd, output_path, renditions, {
+                    "video_codec": video_codec, "video_preset": video_preset, "video_crf": video_crf,
+                    "video_resolution": video_resolution, "video_bit_depth": video_bit_depth,
+                    "video_framerate": video_framerate, "scale_flags": scale_flags, "crop": crop,
+                    "mpdecimate": mpdecimate
+                }, self._stream_args(audio_codec, audio_bitrate, subtitle_mode, custom_args), source_info
+            )
+        
         # 视频编码参数
         if video_codec:
-            cmd.extend(["-c:v", video_codec])
+            cmd.extend(self.video_codec_args(video_codec, video_preset, video_crf))
             if video_codec != "copy":
-                # NVenc编码器使用不同的参数
-                if video_codec in ["av1_nvenc", "h264_nvenc", "hevc_nvenc"]:
-                    if video_preset:
-                        cmd.extend(["-preset", video_preset])
-                    # NVenc使用-cq参数而不是-crf
-                    if video_crf:
-                        cmd.extend(["-cq", str(video_crf)])
-                    # NVenc通常使用VBR模式
-                    cmd.extend(["-rc", "vbr"])
-                else:
-                    # 软件编码器使用标准参数
-                    if video_preset:
-                        cmd.extend(["-preset", video_preset])
-                    if video_crf:
-                        cmd.extend(["-crf", str(video_crf)])
+                # 10bit编码处理（NVenc 使用 p010le，x265 / SVT-AV1 使用 yuv420p10le）
+                pix_fmt_value = target_pix_fmt(video_codec, video_bit_depth)
                 
-                # 10bit编码处理
-                pix_fmt_value = None
-                if video_bit_depth == "10":
-                    if video_codec == "av1_nvenc":
-                        # AV1 NVenc 10bit使用p010le像素格式
-                        pix_fmt_value = "p010le"
-                    elif video_codec == "libsvtav1":
-                        # SVT-AV1 10bit使用yuv420p10le
-                        pix_fmt_value = "yuv420p10le"
-                    elif video_codec == "libx265":
-                        # x265 10bit使用yuv420p10le
-                        pix_fmt_value = "yuv420p10le"
-                    elif video_codec in ["h264_nvenc", "hevc_nvenc"]:
-                        # NVenc H.264/HEVC 10bit使用p010le
-                        pix_fmt_value = "p010le"
-                
-                # 处理分辨率、像素格式和帧率
-                if video_resolution or pix_fmt_value or video_framerate:
-                    vf_filters = []
-                    if video_resolution:
-                        vf_filters.append(f"scale={video_resolution}")
-                    if pix_fmt_value:
-                        vf_filters.append(f"format={pix_fmt_value}")
-                    if video_framerate:
-                        vf_filters.append(f"fps={video_framerate}")
-                    if vf_filters:
-                        cmd.extend(["-vf", ",".join(vf_filters)])
-                elif pix_fmt_value:
+                # 处理分辨率、像素格式和帧率：由滤镜规划决定顺序，并省略与源相同的滤镜
+                steps = plan_video_filters(
+                    video_resolution, pix_fmt_value, video_framerate, scale_flags, source_info, crop, mpdecimate
+                ).steps
+                if len(steps) == 1 and steps[0].name == "format":
                     # 只有像素格式，没有分辨率和帧率
                     cmd.extend(["-pix_fmt", pix_fmt_value])
-                
-                # 如果只有帧率，没有分辨率和像素格式，使用 -r 参数
-                if video_framerate and not video_resolution and not pix_fmt_value:
+                elif len(steps) == 1 and steps[0].name == "fps":
+                    # 只有帧率，没有分辨率和像素格式，使用 -r 参数
                     cmd.extend(["-r", video_framerate])
+                elif steps:
+                    cmd.extend(["-vf", ",".join(step.expression for step in steps)])
+                if mpdecimate:
+                    # 保留帧沿用原时间戳，不补回被丢弃的帧
+                    cmd.extend(self.fps_mode_args(VFR_MODE))
         
+        # 音频、字幕和自定义参数
+        cmd.extend(self._stream_args(audio_codec, audio_bitrate, subtitle_mode, custom_args))
+        
+        cmd.append(output_path)
+        return cmd
+    
+    @staticmethod
+    def video_codec_args(video_codec: str, video_preset: str, video_crf: str) -> list:
+        """视频编码器及其预设、质量参数"""
+        args = ["-c:v", video_codec]
+        if video_codec == "copy":
+            return args
+        # NVenc编码器使用不同的参数
+        if video_codec in ["av1_nvenc", "h264_nvenc", "hevc_nvenc"]:
+            if video_preset:
+                args.extend(["-preset", video_preset])
+            # NVenc使用-cq参数而不是-crf
+            if video_crf:
+                args.extend(["-cq", str(video_crf)])
+            # NVenc通常使用VBR模式
+            args.extend(["-rc", "vbr"])
+        else:
+            # 软件编码器使用标准参数
+            if video_preset:
+                args.extend(["-preset", video_preset])
+            if video_crf:
+                args.extend(["-crf", str(video_crf)])
+        return args
+    
+    @staticmethod
+    def _stream_args(audio_codec: str, audio_bitrate: str, subtitle_mode: str, custom_args: str) -> list:
+        """音频编码、字幕处理和自定义参数（每个输出文件都需要）"""
+        args = []
         # 音频编码参数
         if audio_codec:
-            cmd.extend(["-c:a", audio_codec])
+            args.extend(["-c:a", audio_codec])
             if audio_codec != "copy" and audio_bitrate:
-                cmd.extend(["-b:a", audio_bitrate])
+                args.extend(["-b:a", audio_bitrate])
         
         # 字幕处理
         if subtitle_mode == "copy":
-            cmd.extend(["-c:s", "copy"])
+            args.extend(["-c:s", "copy"])
         elif subtitle_mode == "embed":
             # 嵌入字幕需要更复杂的处理，这里简化处理
             pass
         
         # 自定义参数
         if custom_args:
-            cmd.extend(custom_args.split())
-        
-        cmd.append(output_path)
+            args.extend(custom_args.split())
+        return args
+    
+    def _build_rendition_command(self, cmd: list, output_path: str, renditions: list, video_kwargs: dict,
+                                 stream_args: list, source_info: Optional[dict]) -> list:
+        """
+        多码率输出命令：-filter_complex 中用 split 把一次解码的画面分给各输出，
+        每个输出单独 -map 视频分支、第一条音轨（和字幕），并使用自己的编码参数
+        """
+        branches = [rendition_kwargs(video_kwargs, rendition) for rendition in renditions]
+        graph, sources = build_split_graph(branches, video_kwargs.get("scale_flags", DEFAULT_SCALE_FLAGS), source_info)
+        if graph:
+            cmd.extend(["-filter_complex", graph])
+        copy_subtitles = "-c:s" in stream_args
+        for (_, path), kwargs, source in zip(rendition_outputs(output_path, renditions), branches, sources):
+            cmd.extend(["-map", source, "-map", "0:a:0?"])
+            if copy_subtitles:
+                cmd.extend(["-map", "0:s:0?"])
+            if kwargs.get("video_codec"):
+                cmd.extend(self.video_codec_args(kwargs["video_codec"], kwargs.get("video_preset", ""),
+                                                 kwargs.get("video_crf", "")))
+                if kwargs["video_codec"] != "copy" and kwargs.get("mpdecimate"):
+                    cmd.extend(self.fps_mode_args(VFR_MODE))
+            cmd.extend(stream_args)
+            cmd.append(path)
         return cmd
     
     def encode(
@@ -328,12 +565,24 @@ class FFmpegHandler:
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir, exist_ok=True)
         
+        # 获取视频时长（用于计算进度）和源视频参数（用于规划滤镜）
+        probe_data = self.get_video_info(input_path)
+        duration = self.parse_duration(probe_data)
+        kwargs.setdefault("source_info", self.parse_detailed_video_info(input_path, probe_data))
+        if kwargs.get("auto_crop") and not kwargs.get("crop") and not crop_rect(kwargs["source_info"]):
+            # 尚未检测黑边：编码前检测（结果与探测结果一起缓存）
+            kwargs["source_info"] = dict(kwargs["source_info"], **self.detect_crop(input_path, kwargs["source_info"]))
         cmd = self.build_command(input_path, output_path, **kwargs)
+        renditions = active_renditions(kwargs)
+        progress_suffix = f" ({len(renditions)} renditions)" if renditions else ""
+        # 丢弃重复帧时统计输出帧数
+        decimate_stats = None
+        if decimate_filter(kwargs) and kwargs.get("video_codec", "libx264") != "copy":
+            decimate_stats = DecimateStats(kwargs["source_info"], duration, kwargs.get("video_framerate", ""))
         
         process = None
+        counted = False
         try:
-            # 获取视频时长用于计算进度
-            duration = self.get_duration(input_path)
             
             # Windows上隐藏控制台窗口
             popen_kwargs = {
@@ -345,34 +594,21 @@ class FFmpegHandler:
             if sys.platform == 'win32':
                 popen_kwargs['creationflags'] = CREATE_NO_WINDOW
             process = subprocess.Popen(cmd, **popen_kwargs)
+            started = time.monotonic()
+            with self._active_lock:
+                self._active_encodes += 1
+                concurrency = self._active_encodes
+            counted = True
             
             # 解析进度
-            time_pattern = re.compile(r'time=(\d{2}):(\d{2}):(\d{2})\.(\d{2})')
-            error_pattern = re.compile(r'error|Error|ERROR|failed|Failed|FAILED|invalid|Invalid|INVALID')
             last_progress = 0.0
+            encoded_time = 0.0
             error_lines = []  # 收集错误信息
             
             while True:
                 # 检查取消标志
                 if cancel_flag and cancel_flag():
-                    if process:
-                        try:
-                            process.terminate()  # 先尝试优雅终止
-                            import time
-                            time.sleep(1)  # 等待1秒
-                            if process.poll() is None:  # 如果还在运行
-                                process.kill()  # 强制终止
-                            # 等待进程结束（最多2秒）
-                            try:
-                                process.wait(timeout=2)
-                            except:
-                                pass
-                        except Exception:
-                            try:
-                                if process.poll() is None:
-                                    process.kill()
-                            except:
-                                pass
+                    self._terminate_process(process)
                     return False, "Cancelled"
                 
                 line = process.stderr.readline()
@@ -381,33 +617,44 @@ class FFmpegHandler:
                     if process.poll() is not None:
                         break
                     # 短暂等待避免CPU占用过高
-                    import time
                     time.sleep(0.05)
                     continue
                 
                 # 收集可能的错误信息（包含error/failed/invalid等关键词的行）
-                if error_pattern.search(line):
+                if self.ERROR_PATTERN.search(line):
                     error_lines.append(line.strip())
+                if decimate_stats:
+                    decimate_stats.feed(line)
                 
                 # 解析时间戳
-                match = time_pattern.search(line)
-                if match:
-                    hours, minutes, seconds, centiseconds = map(int, match.groups())
-                    current_time = hours * 3600 + minutes * 60 + seconds + centiseconds / 100.0
-                    
+                current_time = self.parse_progress_time(line)
+                if current_time is not None:
+                    encoded_time = current_time
                     if duration > 0:
                         progress = min(current_time / duration * 100, 99.0)  # 最多99%，最后完成时设为100%
                         if progress > last_progress:
                             last_progress = progress
                             if progress_callback:
-                                progress_callback(progress, f"Encoding: {progress:.1f}%")
+                                progress_callback(progress, f"Encoding: {progress:.1f}%{progress_suffix}")
             
             process.wait()
             
             if process.returncode == 0:
                 if progress_callback:
                     progress_callback(100.0, "Encoding finished")
-                return True, "Success"
+                if renditions:
+                    # 逐个确认各规格的输出文件
+                    success, message = check_outputs(output_path, renditions)
+                else:
+                    success, message = True, "Success"
+                if success and decimate_stats:
+                    message = decimate_stats.summary(message)
+                if success and self.speed_model is not None:
+                    with self._active_lock:
+                        concurrency = max(concurrency, self._active_encodes)
+                    self.speed_model.record(kwargs, kwargs["source_info"], duration or encoded_time,
+                                            time.monotonic() - started, concurrency)
+                return success, message
             elif process.returncode == -15 or process.returncode == -9:  # SIGTERM 或 SIGKILL
                 return False, "Cancelled"
             else:
@@ -422,28 +669,7 @@ class FFmpegHandler:
                         pass
                 
                 # 合并所有错误信息
-                all_errors = error_lines + remaining_stderr
-                
-                # 构建详细的错误消息
-                if all_errors:
-                    # 去重并限制长度（避免过长）
-                    unique_errors = []
-                    seen = set()
-                    for err in all_errors:
-                        if err and err not in seen:
-                            seen.add(err)
-                            unique_errors.append(err)
-                            if len(unique_errors) >= 20:  # 最多保留20行错误信息
-                                break
-                    
-                    error_msg = "\n".join(unique_errors)
-                    # 如果错误信息太长，截断并添加提示
-                    if len(error_msg) > 1000:
-                        error_msg = error_msg[:1000] + "\n... (error message truncated)"
-                else:
-                    error_msg = "Unknown error (return code: {})".format(process.returncode)
-                
-                return False, f"Failed (return code: {process.returncode}):\n{error_msg}"
+                return False, self.format_error_message(error_lines + remaining_stderr, process.returncode)
         
         except KeyboardInterrupt:
             if process:
@@ -461,4 +687,201 @@ class FFmpegHandler:
                 except:
                     pass
             return False, f"Error: {str(e)}"
-
+        finally:
+            if counted:
+                with self._active_lock:
+                    self._active_encodes -= 1
+    
+    @staticmethod
+    def _terminate_process(process):
+        """终止 FFmpeg 进程：先尝试优雅终止，1秒后仍在运行则强制终止"""
+        if not process:
+            return
+        try:
+            process.terminate()  # 先尝试优雅终止
+            import time
+            time.sleep(1)  # 等待1秒
+            if process.poll() is None:  # 如果还在运行
+                process.kill()  # 强制终止
+            # 等待进程结束（最多2秒）
+            try:
+                process.wait(timeout=2)
+            except:
+                pass
+        except Exception:
+            try:
+                if process.poll() is None:
+                    process.kill()
+            except:
+                pass
+    
+    def build_batch_command(self, members: List[Tuple[str, str, dict]]) -> list:
+        """
+        构建小文件批量编码命令：每个输入（-i）映射到自己的输出，各自使用自己的编码参数
+        
+        Args:
+            members: [(输入文件, 输出文件, build_command 的编码参数)]，编码参数中可以带 source_info
+        """
+        cmd = [self.ffmpeg_path]
+        for input_path, _, _ in members:
+            cmd.extend(["-i", input_path])
+        cmd.append("-y")
+        
+        graph = []
+        output_args = []
+        for index, (_, output_path, kwargs) in enumerate(members):
+            video_codec = kwargs.get("video_codec", "libx264")
+            video_source = f"{index}:v:0"
+            if video_codec and video_codec != "copy":
+                steps = plan_video_filters(
+                    kwargs.get("video_resolution", ""),
+                    target_pix_fmt(video_codec, kwargs.get("video_bit_depth", "8")),
+                    kwargs.get("video_framerate", ""),
+                    kwargs.get("scale_flags", DEFAULT_SCALE_FLAGS),
+                    kwargs.get("source_info"),
+                    job_crop(kwargs, kwargs.get("source_info"))
+                ).steps
+                if steps:
+                    graph.append(f"[{index}:v:0]{','.join(step.expression for step in steps)}[v{index}]")
+                    video_source = f"[v{index}]"
+            stream_args = self._stream_args(
+                kwargs.get("audio_codec", "copy"), kwargs.get("audio_bitrate", ""),
+                kwargs.get("subtitle_mode", "copy"), kwargs.get("custom_args", "")
+            )
+            output_args.extend(["-map", video_source, "-map", f"{index}:a:0?"])
+            if "-c:s" in stream_args:
+                output_args.extend(["-map", f"{index}:s:0?"])
+            if video_codec:
+                output_args.extend(self.video_codec_args(
+                    video_codec, kwargs.get("video_preset", "medium"), kwargs.get("video_crf", "23")
+                ))
+            output_args.extend(stream_args)
+            output_args.append(output_path)
+        
+        if graph:
+            cmd.extend(["-filter_complex", ";".join(graph)])
+        return cmd + output_args
+    
+    def encode_batch(
+        self,
+        members: List[Tuple[str, str, dict]],
+        durations: Optional[List[float]] = None,
+        progress_callback: Optional[Callable[[int, float, str], None]] = None,
+        cancel_flag: Optional[Callable[[], bool]] = None
+    ) -> List[Tuple[bool, str]]:
+        """
+        在一个 FFmpeg 进程中编码一组小文件（见 core.clip_batch）
+        
+        Args:
+            members: [(输入文件, 输出文件, 编码参数)]，通常按时长从长到短排列
+            durations: 已知的时长（0 表示未知，从 FFmpeg 输出中读取）
+            progress_callback: 进度回调 (组内序号, progress, message) -> None
+            cancel_flag: 取消标志函数
+        
+        Returns:
+            各文件的 (success, message)；进程失败时全部失败，由调用方逐个重新编码
+        """
+        # core.clip_batch 依赖本模块，在这里导入避免循环导入
+        from core.clip_batch import ClipBatch
+        for _, output_path, _ in members:
+            output_dir = os.path.dirname(output_path)
+            if output_dir and not os.path.exists(output_dir):
+                os.makedirs(output_dir, exist_ok=True)
+        batch = ClipBatch([output_path for _, output_path, _ in members], durations)
+        cmd = self.build_batch_command(members)
+        
+        process = None
+        try:
+            popen_kwargs = {
+                'stdout': subprocess.PIPE,
+                'stderr': subprocess.PIPE,
+                'universal_newlines': True,
+                'bufsize': 1
+            }
+            if sys.platform == 'win32':
+                popen_kwargs['creationflags'] = CREATE_NO_WINDOW
+            process = subprocess.Popen(cmd, **popen_kwargs)
+            
+            error_lines = []
+            while True:
+                if cancel_flag and cancel_flag():
+                    self._terminate_process(process)
+                    return [(False, "Cancelled")] * len(batch)
+                line = process.stderr.readline()
+                if not line:
+                    if process.poll() is not None:
+                        break
+                    import time
+                    time.sleep(0.05)
+                    continue
+                if self.ERROR_PATTERN.search(line):
+                    error_lines.append(line.strip())
+                for index in batch.feed(line):
+                    if progress_callback:
+                        progress = batch.progress[index]
+                        progress_callback(index, progress, f"Encoding: {progress:.1f}% (batch)")
+            
+            process.wait()
+            if process.returncode in (-15, -9):  # SIGTERM 或 SIGKILL
+                return [(False, "Cancelled")] * len(batch)
+            try:
+                error_lines.extend(line.strip() for line in process.stderr.readlines() if line.strip())
+            except:
+                pass
+            results = batch.results(process.returncode, error_lines)
+            if progress_callback:
+                for index, (success, _) in enumerate(results):
+                    if success:
+                        progress_callback(index, 100.0, "Encoding finished")
+            return results
+        except Exception as e:
+            self._terminate_process(process)
+            return [(False, f"Error: {str(e)}")] * len(members)
+    
+    @classmethod
+    def parse_progress_time(cls, line: str) -> Optional[float]:
+        """从 FFmpeg 进度输出行中解析已编码的时间（秒），没有时间戳时返回 None"""
+        match = cls.TIME_PATTERN.search(line)
+        if not match:
+            return None
+        hours, minutes, seconds, centiseconds = map(int, match.groups())
+        return hours * 3600 + minutes * 60 + seconds + centiseconds / 100.0
+    
+    @classmethod
+    def parse_progress_stats(cls, line: str) -> Dict[str, float]:
+        """从 FFmpeg 进度输出行中解析 fps、speed（倍速）和已输出字节数，只返回行中存在的字段"""
+        stats: Dict[str, float] = {}
+        match = cls.FPS_PATTERN.search(line)
+        if match:
+            stats['fps'] = float(match.group(1))
+        match = cls.SPEED_PATTERN.search(line)
+        if match:
+            stats['speed'] = float(match.group(1))
+        match = cls.SIZE_PATTERN.search(line)
+        if match:
+            stats['size'] = int(match.group(1)) * cls.SIZE_UNITS[match.group(2)]
+        return stats
+    
+    @staticmethod
+    def format_error_message(all_errors: list, returncode: int) -> str:
+        """根据收集到的错误输出构建失败消息"""
+        # 构建详细的错误消息
+        if all_errors:
+            # 去重并限制长度（避免过长）
+            unique_errors = []
+            seen = set()
+            for err in all_errors:
+                if err and err not in seen:
+                    seen.add(err)
+                    unique_errors.append(err)
+                    if len(unique_errors) >= 20:  # 最多保留20行错误信息
+                        break
+            
+            error_msg = "\n".join(unique_errors)
+            # 如果错误信息太长，截断并添加提示
+            if len(error_msg) > 1000:
+                error_msg = error_msg[:1000] + "\n... (error message truncated)"
+        else:
+            error_msg = "Unknown error (return code: {})".format(returncode)
+        
+        return f"Failed (return code: {returncode}):\n{error_msg}"
@@ -4,7 +4,10 @@
 import os
 from pathlib import Path
 from typing import List, Tuple, Optional, Callable, Dict
+from core.clip_batch import group_batches
 from core.ffmpeg_handler import FFmpegHandler
+from core.renditions import rendition_output_path, rendition_outputs
+from core.scan_index import ScanDelta, ScanIndex
 
 
 class FileProcessor:
@@ -13,8 +16,17 @@ class FileProcessor:
     # 支持的视频格式
     VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm','.m2ts', '.m2v', '.m4v', '.3gp', '.ts', '.mts', '.rm', '.rmvb', '.ts', '.mpg', '.mpeg', '.vob', '.dat'}
     
-    def __init__(self, ffmpeg_handler: FFmpegHandler):
+    # 能够安全 copy 到 MP4 容器的常见音频编码
+    MP4_SAFE_AUDIO_CODECS = {'aac', 'mp3', 'ac3', 'eac3'}
+    
+    def __init__(self, ffmpeg_handler: FFmpegHandler, scan_index: Optional[ScanIndex] = None):
+        """
+        Args:
+            ffmpeg_handler: FFmpeg处理器
+            scan_index: 目录快照索引，设置后扫描文件夹时只列出有变化的目录
+        """
         self.ffmpeg_handler = ffmpeg_handler
+        self.scan_index = scan_index
     
     def is_video_file(self, file_path: str) -> bool:
         """判断是否为视频文件"""
@@ -30,12 +42,26 @@ class FileProcessor:
         Returns:
             视频文件路径列表
         """
+        return self.scan_files_with_delta(path)[0]
+    
+    def scan_files_with_delta(self, path: str) -> Tuple[List[str], Optional[ScanDelta]]:
+        """
+        扫描文件，并返回文件夹与上次扫描相比的变化
+        
+        Args:
+            path: 文件或文件夹路径
+        
+        Returns:
+            (视频文件路径列表, 变化)；单个文件或未设置目录索引时变化为 None
+        """
         files = []
         path_obj = Path(path)
         
         if path_obj.is_file():
             if self.is_video_file(str(path_obj)):
                 files.append(str(path_obj))
+        elif path_obj.is_dir() and self.scan_index is not None:
+            return self.scan_index.scan(path, self.is_video_file)
         elif path_obj.is_dir():
             # 递归扫描文件夹
             for root, dirs, filenames in os.walk(path):
@@ -44,13 +70,14 @@ class FileProcessor:
                     if self.is_video_file(file_path):
                         files.append(file_path)
         
-        return files
+        return files, None
     
     def calculate_output_path(
         self,
         input_path: str,
         input_base: str,
-        output_base: str
+        output_base: str,
+        suffix: str = ""
     ) -> str:
         """
         计算输出路径，保留目录结构
@@ -59,6 +86,7 @@ class FileProcessor:
             input_path: 输入文件完整路径
             input_base: 输入基础路径（拖入的文件夹路径或文件所在目录）
             output_base: 输出基础路径
+            suffix: 多码率输出的规格名称，非空时加在文件名后（clip.mp4 -> clip_720p.mp4）
         
         Returns:
             输出文件完整路径
@@ -80,35 +108,34 @@ class FileProcessor:
         # 构建输出路径（保留目录结构，但始终使用 .mp4 容器）
         output_path = output_base_obj / relative_path
         
+        if suffix:
+            return rendition_output_path(str(output_path), suffix)
         return str(output_path)
     
-    def process_files(
-        self,
-        input_paths: List[str],
-        output_base: str,
-        progress_callback: Optional[Callable[[int, int, str, float, str], None]] = None,
-        file_started_callback: Optional[Callable[[int, int, str], None]] = None,
-        file_finished_callback: Optional[Callable[[int, int, str, bool, str], None]] = None,
-        cancel_flag: Optional[Callable[[], bool]] = None,
-        per_file_options: Optional[Dict[str, Dict[str, object]]] = None,
-        **encode_kwargs
-    ) -> List[Tuple[str, str, bool, str]]:
+    @staticmethod
+    def rendition_output_paths(output_path: str, renditions) -> List[str]:
         """
-        批量处理文件
+        任务实际写出的所有文件
+        
+        Args:
+            output_path: 基础输出路径（calculate_output_path 的结果）
+            renditions: 多码率输出规格，为空时只有基础输出路径
+        """
+        return [path for _, path in rendition_outputs(output_path, renditions)]
+    
+    def calculate_output_paths(self, input_paths: List[str], output_base: str) -> Dict[str, str]:
+        """
+        批量计算输出路径，保留拖入的目录结构
         
         Args:
             input_paths: 输入文件路径列表
             output_base: 输出基础目录
-            progress_callback: 进度回调 (current: int, total: int, file_path: str, progress: float, message: str) -> None
-            file_started_callback: 文件开始回调 (current: int, total: int, file_path: str) -> None
-            file_finished_callback: 文件结束回调 (current: int, total: int, file_path: str, success: bool, message: str) -> None
-            **encode_kwargs: 编码参数
         
         Returns:
-            [(输入文件路径, 输出文件路径, 成功标志, 消息), ...]
+            {输入文件路径: 输出文件路径}
         """
-        results = []
-        total = len(input_paths)
+        if not input_paths:
+            return {}
         
         # 确定输入基础路径（用于保留目录结构）
         if len(input_paths) == 1:
@@ -116,7 +143,11 @@ class FileProcessor:
             common_path = input_base
         else:
             # 找到所有文件的公共父目录
-            common_path = os.path.commonpath(input_paths) if input_paths else ""
+            try:
+                common_path = os.path.commonpath(input_paths)
+            except ValueError:
+                # 不同盘符等情况下没有公共路径
+                common_path = ""
             input_base = common_path if common_path else os.path.dirname(input_paths[0])
 
         # 判断是否需要强制保留拖入的主目录名称：
@@ -135,13 +166,8 @@ class FileProcessor:
             except Exception:
                 preserve_root_dir_for_flat_folder = False
         
-        for idx, input_path in enumerate(input_paths, 1):
-            # 检查取消标志
-            if cancel_flag and cancel_flag():
-                # 取消时输出路径未知，使用空字符串占位
-                results.append((input_path, "", False, "已取消"))
-                break
-            
+        output_paths = {}
+        for input_path in input_paths:
             # 计算基础输出路径（已统一为 .mp4 扩展名）
             output_path = Path(self.calculate_output_path(input_path, input_base, output_base))
 
@@ -154,37 +180,207 @@ class FileProcessor:
                 out_rel = Path(root_name) / rel
                 output_path = Path(output_base) / out_rel
             
-            # 文件开始回调
+            output_paths[input_path] = str(output_path)
+        
+        return output_paths
+    
+    def resolve_audio_options(
+        self,
+        file_path: str,
+        audio_codec: str,
+        audio_bitrate: str,
+        fallback_audio_codec: str = "aac",
+        fallback_audio_bitrate: str = "192k",
+        info: Optional[dict] = None
+    ) -> Tuple[str, str, bool]:
+        """
+        根据源音频编码决定是否可以直接 copy，或需要使用备用音频编码方案
+        
+        Args:
+            file_path: 输入文件路径
+            audio_codec: 主音频编码
+            audio_bitrate: 主音频码率
+            fallback_audio_codec: 备用音频编码
+            fallback_audio_bitrate: 备用音频码率
+            info: 已获取的详细视频信息，None 表示需要重新获取
+        
+        Returns:
+            (音频编码, 音频码率, 是否启用了备用方案)
+        """
+        # 仅当设置为 copy 时，才考虑是否需要启用备用方案
+        if audio_codec != "copy":
+            return audio_codec, audio_bitrate, False
+        
+        if info is None:
+            info = self.ffmpeg_handler.get_detailed_video_info(file_path)
+        src_audio_codec = (info.get("audio_codec", "") or "").lower()
+        
+        # 能够安全 copy 到 MP4 容器的常见音频编码
+        if src_audio_codec in self.MP4_SAFE_AUDIO_CODECS:
+            return audio_codec, audio_bitrate, False
+        
+        # 使用备用音频编码器和码率
+        return fallback_audio_codec or "aac", fallback_audio_bitrate or "192k", True
+    
+    def _process_batch(self, group, positions, total, output_paths, kwargs_for, info,
+                       progress_callback, file_started_callback, finish, cancel_flag) -> List[str]:
+        """
+        在一个 FFmpeg 进程中编码一组小文件
+        
+        Returns:
+            需要单独重新编码的文件（批量进程失败时整组都需要，取消时为空）
+        """
+        members = []
+        durations = []
+        for input_path in group:
+            kwargs = kwargs_for(input_path)
+            file_info = info(input_path) if info else None
+            if file_info:
+                kwargs.setdefault("source_info", file_info)
+            members.append((input_path, output_paths[input_path], kwargs))
+            durations.append(float((file_info or {}).get("format_duration") or 0))
             if file_started_callback:
-                file_started_callback(idx, total, input_path)
-            
-            # 文件级进度回调
-            def file_progress(progress: float, message: str):
-                if progress_callback:
-                    progress_callback(idx, total, input_path, progress, message)
-            
+                file_started_callback(positions[input_path], total, input_path)
+        
+        def batch_progress(index: int, progress: float, message: str):
+            if progress_callback:
+                input_path = group[index]
+                progress_callback(positions[input_path], total, input_path, progress, message)
+        
+        batch_results = self.ffmpeg_handler.encode_batch(members, durations, batch_progress, cancel_flag)
+        retry = []
+        for input_path, (success, msg) in zip(group, batch_results):
+            if success or (cancel_flag and cancel_flag()):
+                finish(positions[input_path], input_path, success, msg)
+            else:
+                retry.append(input_path)
+        return retry
+    
+    def process_files(
+        self,
+        input_paths: List[str],
+        output_base: str,
+        progress_callback: Optional[Callable[[int, int, str, float, str], None]] = None,
+        file_started_callback: Optional[Callable[[int, int, str], None]] = None,
+        file_finished_callback: Optional[Callable[[int, int, str, bool, str], None]] = None,
+        cancel_flag: Optional[Callable[[], bool]] = None,
+        per_file_options: Optional[Dict[str, Dict[str, object]]] = None,
+        output_paths: Optional[Dict[str, str]] = None,
+        batch_max_duration: float = 0.0,
+        batch_max_files: int = 1,
+        info: Optional[Callable[[str], Optional[dict]]] = None,
+        fallback_audio: Optional[Dict[str, Tuple[str, str]]] = None,
+        **encode_kwargs
+    ) -> List[Tuple[str, str, bool, str]]:
+        """
+        批量处理文件
+        
+        Args:
+            input_paths: 输入文件路径列表
+            output_base: 输出基础目录
+            progress_callback: 进度回调 (current: int, total: int, file_path: str, progress: float, message: str) -> None
+            file_started_callback: 文件开始回调 (current: int, total: int, file_path: str) -> None
+            file_finished_callback: 文件结束回调 (current: int, total: int, file_path: str, success: bool, message: str) -> None
+            per_file_options: 文件级别的编码参数重写 {文件路径: {参数名: 值}}
+            output_paths: 指定部分文件的输出路径 {文件路径: 输出路径}，其余文件按目录结构自动计算
+            batch_max_duration: 小文件批量模式中小文件的最长时长（秒），0 表示不使用批量模式
+            batch_max_files: 批量模式每个 FFmpeg 进程最多编码的文件数
+            info: 返回已知视频信息的函数（批量模式用于判断时长和规划滤镜），None 表示未知
+            fallback_audio: 编码前再决定音频编码的文件 {文件路径: (备用音频编码, 备用音频码率)}，
+                音频为 copy 时在编码线程中探测源音频（见 resolve_audio_options）
+            **encode_kwargs: 编码参数
+        
+        Returns:
+            [(输入文件路径, 输出文件路径, 成功标志, 消息), ...]
+        """
+        results = []
+        total = len(input_paths)
+        
+        # 预先计算所有文件的输出路径（保留目录结构），已指定输出路径的文件不参与计算
+        fixed_output_paths = output_paths or {}
+        resolved_output_paths = self.calculate_output_paths(
+            [p for p in input_paths if p not in fixed_output_paths], output_base
+        )
+        resolved_output_paths.update(fixed_output_paths)
+        
+        def kwargs_for(input_path: str) -> Dict[str, object]:
             # 针对当前文件合并通用编码参数与文件级别的重写参数
             current_kwargs = dict(encode_kwargs)
             if per_file_options and input_path in per_file_options:
                 current_kwargs.update(per_file_options[input_path])
-
-            # 执行编码
-            success, msg = self.ffmpeg_handler.encode(
-                input_path,
-                str(output_path),
-                progress_callback=file_progress,
-                cancel_flag=cancel_flag,
-                **current_kwargs
-            )
-            
-            results.append((input_path, output_path, success, msg))
-            
+            return current_kwargs
+        
+        def encode_kwargs_for(input_path: str) -> Dict[str, object]:
+            # 编码时的参数：音频编码推迟到编码时决定的文件在这里使用详细信息（尚未获取时探测）
+            current_kwargs = kwargs_for(input_path)
+            deferred = (fallback_audio or {}).get(input_path)
+            if deferred:
+                file_info = info(input_path) if info else None
+                current_kwargs["audio_codec"], current_kwargs["audio_bitrate"], _ = self.resolve_audio_options(
+                    input_path, current_kwargs.get("audio_codec", "copy"), current_kwargs.get("audio_bitrate", ""),
+                    deferred[0], deferred[1], info=file_info if file_info and not file_info.get("quick") else None
+                )
+            return current_kwargs
+        
+        def finish(idx: int, input_path: str, success: bool, msg: str):
+            results.append((input_path, resolved_output_paths[input_path], success, msg))
             # 文件结束回调
             if file_finished_callback:
                 file_finished_callback(idx, total, input_path, success, msg)
+        
+        # 小文件批量模式：多个小文件由同一个 FFmpeg 进程编码
+        if batch_max_files > 1 and batch_max_duration > 0:
+            def duration_for(path: str) -> float:
+                file_info = info(path) if info else None
+                return float((file_info or {}).get("format_duration") or 0)
+            groups = group_batches(input_paths, kwargs_for, batch_max_duration, batch_max_files, duration_for)
+        else:
+            groups = [[p] for p in input_paths]
+        positions = {path: idx for idx, path in enumerate(input_paths, 1)}
+        
+        for group in groups:
+            # 检查取消标志
+            if cancel_flag and cancel_flag():
+                # 取消时输出路径未知，使用空字符串占位
+                results.append((group[0], "", False, "已取消"))
+                break
             
-            # 如果编码失败或被取消，停止后续处理
-            if not success and (cancel_flag and cancel_flag()):
+            retry = group
+            if len(group) > 1:
+                retry = self._process_batch(group, positions, total, resolved_output_paths, encode_kwargs_for, info,
+                                            progress_callback, file_started_callback, finish, cancel_flag)
+            
+            for input_path in retry:
+                if cancel_flag and cancel_flag():
+                    results.append((input_path, "", False, "已取消"))
+                    break
+                idx = positions[input_path]
+                output_path = resolved_output_paths[input_path]
+                
+                # 文件开始回调
+                if file_started_callback:
+                    file_started_callback(idx, total, input_path)
+                
+                # 文件级进度回调
+                def file_progress(progress: float, message: str, idx=idx, input_path=input_path):
+                    if progress_callback:
+                        progress_callback(idx, total, input_path, progress, message)
+                
+                # 执行编码
+                success, msg = self.ffmpeg_handler.encode(
+                    input_path,
+                    output_path,
+                    progress_callback=file_progress,
+                    cancel_flag=cancel_flag,
+                    **encode_kwargs_for(input_path)
+                )
+                finish(idx, input_path, success, msg)
+                
+                # 如果编码失败或被取消，停止后续处理
+                if not success and (cancel_flag and cancel_flag()):
+                    break
+            
+            if cancel_flag and cancel_flag():
                 break
         
         return results
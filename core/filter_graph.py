@@ -0,0 +1,258 @@
+"""
+视频滤镜图规划 - 决定 -vf 中 fps、scale、format 滤镜的顺序、合并和省略
+
+规则：
+1. 降低帧率的 fps 滤镜放在最前：先丢帧，后面的缩放和像素格式转换只处理保留下来的帧；
+   提高帧率时放在最后，避免对复制出的重复帧做缩放。源帧率未知时按降低帧率处理。
+   丢弃重复帧的 mpdecimate 紧跟 fps（此时 fps 总是放在最前，否则提高帧率复制出的帧又会被丢弃），
+   之后的滤镜只处理有变化的帧。
+   裁掉黑边的 crop 放在 scale 之前，缩放只处理裁剪后的画面，目标分辨率按裁剪后的尺寸计算。
+2. format 紧跟在 scale 之后，两者由同一次 swscale 调用完成（不会先缩放再单独转换一遍）；
+   缩放算法可配置，默认为 FFmpeg 默认的 bicubic；auto 表示缩小时使用较快的 bilinear（画质略低），
+   放大或无法判断时使用 bicubic。
+3. 源已经符合目标（分辨率、像素格式或帧率相同）时省略对应滤镜。
+
+每个决定都记录原因代码和参数（见 REASON_MESSAGES），界面据此说明滤镜是如何选择的。
+"""
+from fractions import Fraction
+from typing import Any, Dict, List, Optional, Tuple
+
+# 可选的缩放算法（FFmpeg scale 滤镜的 flags），auto 按缩放方向自动选择
+SCALE_FLAGS = ("bicubic", "auto", "fast_bilinear", "bilinear", "area", "lanczos", "spline")
+# 默认缩放算法（与 FFmpeg scale 滤镜的默认值相同，输出与不指定 flags 时一致）
+DEFAULT_SCALE_FLAGS = "bicubic"
+# auto 时缩小和放大使用的算法
+AUTO_DOWNSCALE_FLAGS = "bilinear"
+AUTO_UPSCALE_FLAGS = "bicubic"
+
+# 判断帧率相同的容差
+FPS_TOLERANCE = 0.01
+
+# 原因代码 -> 说明（参数见 FilterDecision.params）
+REASON_MESSAGES = {
+    "fps_drop_first": "帧率 {source} → {target} fps：fps 放在最前，后续滤镜少处理 {saved}% 的帧",
+    "fps_unknown_first": "源帧率未知：fps 按降低帧率处理，放在最前",
+    "fps_raise_last": "帧率 {source} → {target} fps：fps 放在最后，避免缩放重复的帧",
+    "fps_same": "源帧率已是 {target} fps，省略 fps",
+    "fps_decimate_first": "帧率 {target} fps：放在 mpdecimate 之前，由 mpdecimate 丢弃重复帧",
+    "decimate": "mpdecimate 丢弃与上一帧相同的帧，之后的滤镜只处理有变化的帧（可变帧率输出）",
+    "crop": "裁掉黑边 {source} → {target}，少处理 {saved}% 的像素",
+    "crop_unknown": "裁掉黑边，裁剪为 {target}（源分辨率未知）",
+    "scale": "缩放 {source} → {target}，算法 {flags}",
+    "scale_unknown": "缩放到 {target}（源分辨率未知），算法 {flags}",
+    "scale_same": "源分辨率已是 {target}，省略 scale",
+    "format_merged": "像素格式 {source} → {target}：紧跟 scale，由同一次 swscale 完成",
+    "format": "像素格式 {source} → {target}",
+    "format_same": "源像素格式已是 {target}，省略 format",
+}
+
+
+def parse_rate(value: Any) -> float:
+    """解析帧率（"30"、"29.97"、"30000/1001"），无法解析时返回 0"""
+    try:
+        return float(Fraction(str(value).strip()))
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def _rescale(length: int, target: int, source: int, factor: int) -> int:
+    """按比例计算另一边的长度，并取整为 factor 的倍数（scale 的 -1 / -2 写法）"""
+    value = length * target / source
+    return max(factor, int(round(value / factor)) * factor)
+
+
+def output_dimensions(width: int, height: int, video_resolution: str) -> Tuple[int, int]:
+    """
+    按 scale 滤镜的规则计算输出分辨率
+
+    Args:
+        width, height: 源分辨率（未知时为 0）
+        video_resolution: 设置中的分辨率，如 "1920:1080"、"1280:-2"，为空时保持原分辨率
+
+    Returns:
+        (宽, 高)，无法确定时为 (0, 0)
+    """
+    if not video_resolution:
+        return width, height
+    parts = video_resolution.replace("x", ":").split(":")
+    try:
+        target_w, target_h = int(parts[0]), int(parts[1])
+    except (ValueError, IndexError):
+        return 0, 0
+    if target_w > 0 and target_h > 0:
+        return target_w, target_h
+    if not width or not height:
+        return 0, 0
+    if target_w > 0:
+        return target_w, _rescale(height, target_w, width, -target_h or 1)
+    if target_h > 0:
+        return _rescale(width, target_h, height, -target_w or 1), target_h
+    return width, height
+
+
+def target_pix_fmt(video_codec: str, video_bit_depth: str) -> str:
+    """10bit 编码时各编码器使用的像素格式，8bit 或不支持时返回空字符串"""
+    if video_bit_depth != "10":
+        return ""
+    if video_codec in ("av1_nvenc", "h264_nvenc", "hevc_nvenc"):
+        # NVenc 10bit 使用 p010le
+        return "p010le"
+    if video_codec in ("libsvtav1", "libx265"):
+        return "yuv420p10le"
+    return ""
+
+
+class FilterDecision:
+    """一个滤镜的选择结果（加入滤镜链或被省略）"""
+
+    def __init__(self, name: str, expression: str, reason: str, **params):
+        """
+        Args:
+            name: 滤镜名（fps / mpdecimate / crop / scale / format）
+            expression: 滤镜表达式，被省略时为空字符串
+            reason: 原因代码（REASON_MESSAGES 的键）
+            params: 说明中使用的参数
+        """
+        self.name = name
+        self.expression = expression
+        self.reason = reason
+        self.params = params
+
+    @property
+    def skipped(self) -> bool:
+        return not self.expression
+
+    def describe(self) -> str:
+        return REASON_MESSAGES[self.reason].format(**self.params)
+
+
+class FilterPlan:
+    """视频滤镜规划结果"""
+
+    def __init__(self, decisions: List[FilterDecision]):
+        # 按滤镜链中的顺序排列，被省略的滤镜排在最后
+        self.decisions = decisions
+
+    @property
+    def steps(self) -> List[FilterDecision]:
+        """实际使用的滤镜（按顺序）"""
+        return [d for d in self.decisions if not d.skipped]
+
+    def filter_chain(self) -> str:
+        """-vf 参数值，没有滤镜时为空字符串"""
+        return ",".join(d.expression for d in self.steps)
+
+    def explain(self) -> List[str]:
+        """每个决定的说明"""
+        return [d.describe() for d in self.decisions]
+
+
+def _format_fps(fps: float) -> str:
+    return f"{fps:.3f}".rstrip("0").rstrip(".")
+
+
+def plan_video_filters(
+    video_resolution: str = "",
+    pix_fmt: str = "",
+    video_framerate: str = "",
+    scale_flags: str = DEFAULT_SCALE_FLAGS,
+    source: Optional[Dict[str, Any]] = None,
+    crop: str = "",
+    decimate: str = ""
+) -> FilterPlan:
+    """
+    规划视频滤镜
+
+    Args:
+        video_resolution: 目标分辨率（scale 参数），为空时不缩放
+        pix_fmt: 目标像素格式，为空时不转换
+        video_framerate: 目标帧率，为空时保持原帧率
+        scale_flags: 缩放算法（SCALE_FLAGS 之一，或直接写 FFmpeg 的 flags），为空时使用 DEFAULT_SCALE_FLAGS
+        source: 源视频信息（FFmpegHandler 解析后的 width / height / fps / pix_fmt），None 表示未知
+        crop: 裁剪区域 "w:h:x:y"（见 core.crop_detect），为空时不裁剪
+        decimate: mpdecimate 滤镜表达式（见 core.decimate），为空时不丢弃重复帧
+    """
+    source = source or {}
+    src_w, src_h = int(source.get("width") or 0), int(source.get("height") or 0)
+    src_fps = float(source.get("fps") or 0)
+    src_pix_fmt = source.get("pix_fmt") or ""
+    skipped: List[FilterDecision] = []
+    before: List[FilterDecision] = []
+    after: List[FilterDecision] = []
+
+    # 帧率
+    if video_framerate:
+        target_fps = parse_rate(video_framerate)
+        if src_fps > 0 and target_fps > 0 and abs(src_fps - target_fps) < FPS_TOLERANCE:
+            skipped.append(FilterDecision("fps", "", "fps_same", target=_format_fps(target_fps)))
+        elif src_fps <= 0 or target_fps <= 0:
+            before.append(FilterDecision("fps", f"fps={video_framerate}", "fps_unknown_first"))
+        elif target_fps < src_fps:
+            before.append(FilterDecision(
+                "fps", f"fps={video_framerate}", "fps_drop_first",
+                source=_format_fps(src_fps), target=_format_fps(target_fps),
+                saved=int(round((1 - target_fps / src_fps) * 100))
+            ))
+        elif decimate:
+            before.append(FilterDecision(
+                "fps", f"fps={video_framerate}", "fps_decimate_first", target=_format_fps(target_fps)
+            ))
+        else:
+            after.append(FilterDecision(
+                "fps", f"fps={video_framerate}", "fps_raise_last",
+                source=_format_fps(src_fps), target=_format_fps(target_fps)
+            ))
+
+    # 丢弃重复帧
+    if decimate:
+        before.append(FilterDecision("mpdecimate", decimate, "decimate"))
+
+    # 裁掉黑边：之后的缩放以裁剪后的画面为源
+    if crop:
+        try:
+            crop_w, crop_h = (int(v) for v in crop.split(":")[:2])
+        except ValueError:
+            crop_w = crop_h = 0
+        if crop_w > 0 and crop_h > 0 and (crop_w, crop_h) != (src_w, src_h):
+            if src_w and src_h:
+                before.append(FilterDecision(
+                    "crop", f"crop={crop}", "crop", source=f"{src_w}x{src_h}", target=f"{crop_w}x{crop_h}",
+                    saved=int(round((1 - crop_w * crop_h / (src_w * src_h)) * 100))
+                ))
+            else:
+                before.append(FilterDecision("crop", f"crop={crop}", "crop_unknown", target=f"{crop_w}x{crop_h}"))
+            src_w, src_h = crop_w, crop_h
+
+    # 缩放
+    scaling = False
+    if video_resolution:
+        dst_w, dst_h = output_dimensions(src_w, src_h, video_resolution)
+        if src_w and src_h and (dst_w, dst_h) == (src_w, src_h):
+            skipped.append(FilterDecision("scale", "", "scale_same", target=f"{src_w}x{src_h}"))
+        else:
+            flags = scale_flags or DEFAULT_SCALE_FLAGS
+            if flags == "auto":
+                downscale = src_w and src_h and dst_w and dst_w * dst_h < src_w * src_h
+                flags = AUTO_DOWNSCALE_FLAGS if downscale else AUTO_UPSCALE_FLAGS
+            expression = f"scale={video_resolution}"
+            if "flags=" not in video_resolution:
+                expression += f":flags={flags}"
+            if src_w and src_h and dst_w and dst_h:
+                decision = FilterDecision("scale", expression, "scale", source=f"{src_w}x{src_h}",
+                                          target=f"{dst_w}x{dst_h}", flags=flags)
+            else:
+                decision = FilterDecision("scale", expression, "scale_unknown", target=video_resolution, flags=flags)
+            before.append(decision)
+            scaling = True
+
+    # 像素格式：紧跟 scale，由同一个缩放器完成
+    if pix_fmt:
+        if src_pix_fmt == pix_fmt:
+            skipped.append(FilterDecision("format", "", "format_same", target=pix_fmt))
+        else:
+            before.append(FilterDecision(
+                "format", f"format={pix_fmt}", "format_merged" if scaling else "format",
+                source=src_pix_fmt or "?", target=pix_fmt
+            ))
+
+    return FilterPlan(before + after + skipped)
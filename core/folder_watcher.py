@@ -0,0 +1,308 @@
+"""
+监视文件夹 - 监控收件目录，文件写入完成后自动加入编码队列
+
+优先使用 Linux inotify（通过 ctypes 调用，无需额外依赖），
+其它平台使用基于目录快照的轮询：只重新列出 mtime 发生变化的目录。
+文件在大小和修改时间保持不变一段时间后才视为写入完成。
+"""
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+# inotify 事件掩码
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+INOTIFY_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class _InotifyBackend:
+    """基于 inotify 的变化检测（仅 Linux）"""
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 失败")
+        self._watches: Dict[int, str] = {}
+
+    def add_tree(self, root: str) -> List[str]:
+        """递归添加目录监视，返回目录中已有的文件"""
+        files = []
+        for dirpath, _, filenames in os.walk(root):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dirpath), INOTIFY_WATCH_MASK)
+            if wd >= 0:
+                self._watches[wd] = dirpath
+            files.extend(os.path.join(dirpath, name) for name in filenames)
+        return files
+
+    def wait(self, timeout: float) -> Tuple[Set[str], bool]:
+        """
+        等待文件变化
+
+        Returns:
+            (发生变化的文件路径集合, 是否需要全量重新扫描)
+        """
+        changed: Set[str] = set()
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return changed, False
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed, False
+
+        offset = 0
+        while offset + _INOTIFY_EVENT.size <= len(data):
+            wd, mask, _, name_len = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = data[offset:offset + name_len].rstrip(b"\0")
+            offset += name_len
+            if mask & IN_Q_OVERFLOW:
+                # 事件队列溢出，需要全量重新扫描
+                return changed, True
+            parent = self._watches.get(wd)
+            if parent is None or not name:
+                continue
+            path = os.path.join(parent, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                # 新建或移入的子目录：加入监视并收集其中已有的文件
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    changed.update(self.add_tree(path))
+            else:
+                changed.add(path)
+        return changed, False
+
+    def close(self):
+        """关闭 inotify 句柄"""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class _PollingBackend:
+    """基于目录快照的轮询变化检测"""
+
+    def __init__(self):
+        self._roots: List[str] = []
+        # {目录路径: (mtime_ns, 文件名列表, 子目录列表)}
+        self._dirs: Dict[str, Tuple[int, List[str], List[str]]] = {}
+
+    def add_tree(self, root: str) -> List[str]:
+        """记录目录快照，返回目录中已有的文件"""
+        self._roots.append(root)
+        files: List[str] = []
+        self._refresh(root, files)
+        return files
+
+    def _refresh(self, dir_path: str, changed: List[str]):
+        """刷新目录快照，只重新列出 mtime 变化的目录"""
+        try:
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            self._dirs.pop(dir_path, None)
+            return
+        cached = self._dirs.get(dir_path)
+        if cached and cached[0] == mtime_ns:
+            subdirs = cached[2]
+        else:
+            old_files = set(cached[1]) if cached else set()
+            filenames, subdirs = [], []
+            try:
+                with os.scandir(dir_path) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif entry.is_file():
+                            filenames.append(entry.name)
+            except OSError:
+                return
+            self._dirs[dir_path] = (mtime_ns, filenames, subdirs)
+            changed.extend(os.path.join(dir_path, name) for name in filenames if name not in old_files)
+        for name in subdirs:
+            self._refresh(os.path.join(dir_path, name), changed)
+
+    def wait(self, timeout: float) -> Tuple[Set[str], bool]:
+        """等待一个轮询周期后返回新出现的文件"""
+        time.sleep(timeout)
+        changed: List[str] = []
+        for root in self._roots:
+            self._refresh(root, changed)
+        return set(changed), False
+
+    def close(self):
+        """轮询模式无需释放资源"""
+        pass
+
+
+class FolderWatcher:
+    """监视文件夹，文件稳定后回调"""
+
+    def __init__(
+        self,
+        folders: List[dict],
+        on_file_ready: Callable[[str, dict], None],
+        is_video_file: Callable[[str], bool],
+        stable_seconds: float = 5.0,
+        poll_interval: float = 2.0,
+        process_existing: bool = False,
+        use_inotify: bool = True
+    ):
+        """
+        Args:
+            folders: 监视文件夹配置列表，每项形如
+                {"path": 收件目录, "output_dir": 输出目录（空表示使用全局设置）, "settings": {配置项覆盖}}
+            on_file_ready: 文件写入完成后的回调 (file_path, folder) -> None，在监视线程中调用
+            is_video_file: 判断是否为视频文件
+            stable_seconds: 文件大小和修改时间保持不变多少秒后视为写入完成
+            poll_interval: 轮询间隔（秒），inotify 模式下也用于检查待定文件是否稳定
+            process_existing: 启动时是否处理目录中已有的文件
+            use_inotify: 是否优先使用 inotify
+        """
+        self.folders = [f for f in folders if f.get("path")]
+        self.on_file_ready = on_file_ready
+        self.is_video_file = is_video_file
+        self.stable_seconds = stable_seconds
+        self.poll_interval = poll_interval
+        self.process_existing = process_existing
+        self.use_inotify = use_inotify
+        self.backend_name = ""
+        self._backend = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        # 待定文件 {路径: (大小, mtime_ns, 最后一次变化的时间)}
+        self._pending: Dict[str, Tuple[int, int, float]] = {}
+        # 已回调的文件 {路径: (大小, mtime_ns)}，文件再次变化时才会重新回调
+        self._emitted: Dict[str, Tuple[int, int]] = {}
+
+    def _create_backend(self):
+        """创建变化检测后端，inotify 不可用时回退到轮询"""
+        if self.use_inotify and sys.platform.startswith("linux"):
+            try:
+                backend = _InotifyBackend()
+                self.backend_name = "inotify"
+                return backend
+            except Exception:
+                pass
+        self.backend_name = "polling"
+        return _PollingBackend()
+
+    def _folder_for(self, file_path: str) -> Optional[dict]:
+        """查找文件所属的监视文件夹（最长匹配）"""
+        best = None
+        for folder in self.folders:
+            root = os.path.abspath(folder["path"])
+            try:
+                inside = os.path.commonpath([root, os.path.abspath(file_path)]) == root
+            except ValueError:
+                # 不同盘符
+                inside = False
+            if inside:
+                if best is None or len(root) > len(os.path.abspath(best["path"])):
+                    best = folder
+        return best
+
+    def _track(self, paths):
+        """将变化的文件加入待定列表"""
+        now = time.time()
+        for path in paths:
+            if not self.is_video_file(path):
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                self._pending.pop(path, None)
+                continue
+            signature = (st.st_size, st.st_mtime_ns)
+            if self._emitted.get(path) == signature:
+                continue
+            pending = self._pending.get(path)
+            if pending is None or pending[:2] != signature:
+                self._pending[path] = (signature[0], signature[1], now)
+
+    def _check_stable(self):
+        """检查待定文件是否已经稳定，稳定则回调"""
+        now = time.time()
+        for path, (size, mtime_ns, changed_at) in list(self._pending.items()):
+            try:
+                st = os.stat(path)
+            except OSError:
+                del self._pending[path]
+                continue
+            signature = (st.st_size, st.st_mtime_ns)
+            if signature != (size, mtime_ns):
+                self._pending[path] = (signature[0], signature[1], now)
+                continue
+            if now - changed_at < self.stable_seconds or size == 0:
+                continue
+            del self._pending[path]
+            self._emitted[path] = signature
+            folder = self._folder_for(path)
+            if folder is not None:
+                try:
+                    self.on_file_ready(path, folder)
+                except Exception as e:
+                    print(f"监视文件夹回调失败: {e}")
+
+    def _scan_all(self) -> List[str]:
+        """为所有监视文件夹建立监视，返回已有文件"""
+        existing = []
+        for folder in self.folders:
+            if os.path.isdir(folder["path"]):
+                existing.extend(self._backend.add_tree(folder["path"]))
+        return existing
+
+    def _run(self):
+        """监视线程主循环"""
+        existing = self._scan_all()
+        if self.process_existing:
+            self._track(existing)
+        else:
+            # 已有文件视为已处理，之后发生变化时才会加入队列
+            for path in existing:
+                try:
+                    st = os.stat(path)
+                    self._emitted[path] = (st.st_size, st.st_mtime_ns)
+                except OSError:
+                    pass
+        while not self._stop_event.is_set():
+            timeout = min(self.poll_interval, 1.0) if self._pending else self.poll_interval
+            changed, rescan = self._backend.wait(timeout)
+            if rescan:
+                self._backend.close()
+                self._backend = self._create_backend()
+                changed.update(self._scan_all())
+            self._track(changed)
+            self._check_stable()
+        self._backend.close()
+
+    def start(self):
+        """启动监视线程"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._backend = self._create_backend()
+        self._thread = threading.Thread(target=self._run, name="FolderWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """停止监视线程"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        """监视线程是否正在运行"""
+        return self._thread is not None and self._thread.is_alive()
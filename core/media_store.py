@@ -0,0 +1,504 @@
+"""
+列式媒体信息库 - 队列中所有文件的路径、状态和视频信息
+
+每个字段存为一列紧凑的 array（每个文件共约 80 字节），编码名称和状态存为小整数编码，
+路径只保存一份（行号 <-> 路径）。表格模型、合计和编码队列都从这里读取。
+
+安装 NumPy（可选依赖）时，合计、条件筛选和排序在整列上以向量方式计算；
+未安装时使用等价的逐行实现。
+"""
+import importlib.util
+import os
+import sys
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+# NumPy 在第一次向量计算时才导入（见 numpy_module），不计入启动耗时
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+def numpy_module():
+    """NumPy 模块（第一次调用时导入，只在 HAS_NUMPY 为 True 时调用）"""
+    import numpy
+    return numpy
+
+
+# 探测级别
+PROBE_NONE = 0       # 尚未探测
+PROBE_QUICK = 1      # 只有格式级信息（时长、码率、大小）
+PROBE_DETAILED = 2   # 已获取详细信息
+PROBE_FAILED = 3     # 探测失败（无信息）
+
+# 数值列：(字段名, array 类型码)，字段名与 FFmpegHandler.parse_detailed_video_info 返回的键一致
+NUMERIC_FIELDS = (
+    ('width', 'I'),
+    ('height', 'I'),
+    ('fps', 'f'),
+    ('video_duration', 'f'),
+    ('audio_duration', 'f'),
+    ('format_duration', 'd'),
+    ('video_bitrate', 'Q'),
+    ('audio_bitrate', 'Q'),
+    ('format_bitrate', 'Q'),
+    ('file_size', 'Q'),
+    ('format_size', 'Q'),
+    ('bits_per_10000_pixels', 'f'),
+    # 黑边检测结果（见 core.crop_detect），0 表示尚未检测
+    ('crop_width', 'I'),
+    ('crop_height', 'I'),
+    ('crop_x', 'I'),
+    ('crop_y', 'I'),
+    # 内容复杂度分析结果（见 core.complexity），complexity_tier 为 0 表示尚未分析
+    ('complexity_spatial', 'f'),
+    ('complexity_temporal', 'f'),
+    ('complexity_cuts', 'I'),
+    ('complexity_tier', 'B'),
+)
+# 抽样试编码的预估结果（见 core.sample_estimate）：与编码参数有关，不属于探测信息，单独存放
+ESTIMATE_FIELDS = ('est_size', 'est_size_low', 'est_size_high', 'est_time', 'est_time_low', 'est_time_high')
+# 快速探测得到的字段
+FORMAT_FIELDS = ('format_duration', 'format_bitrate', 'format_size', 'file_size')
+# 以小整数编码保存的字符串列
+CODE_FIELDS = ('video_codec', 'audio_codec', 'pix_fmt', 'status')
+# 详细探测得到的编码字段
+STREAM_CODE_FIELDS = ('video_codec', 'audio_codec', 'pix_fmt')
+
+_INTEGER_TYPECODES = 'BHIQ'
+
+# 比较运算（用于 rows_where）
+_OPERATORS: Dict[str, Callable] = {
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+}
+
+
+def _to_number(value, typecode: str):
+    """转换为列类型的数值，无法转换时为 0"""
+    try:
+        value = float(value)
+        return max(0, int(value)) if typecode in _INTEGER_TYPECODES else value
+    except (TypeError, ValueError, OverflowError):
+        return 0
+
+
+class CodeTable:
+    """字符串与小整数编码的对应表（0 表示空字符串）"""
+
+    def __init__(self):
+        self.names: List[str] = [""]
+        self._codes: Dict[str, int] = {"": 0}
+
+    def encode(self, name: Optional[str]) -> int:
+        """返回名称的编码，新名称自动分配"""
+        name = name or ""
+        code = self._codes.get(name)
+        if code is None:
+            code = len(self.names)
+            self.names.append(name)
+            self._codes[name] = code
+        return code
+
+    def lookup(self, name: Optional[str]) -> int:
+        """返回已有名称的编码，不存在时返回 -1"""
+        return self._codes.get(name or "", -1)
+
+    def decode(self, code: int) -> str:
+        return self.names[code]
+
+
+class MediaStore:
+    """队列文件的列式存储（行号即加入队列的顺序）"""
+
+    def __init__(self):
+        self._paths: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._numeric = {name: array(typecode) for name, typecode in NUMERIC_FIELDS}
+        self._estimates = {name: array('d') for name in ESTIMATE_FIELDS}
+        self._codes = {name: array('H') for name in CODE_FIELDS}
+        self.code_tables = {name: CodeTable() for name in CODE_FIELDS}
+        self._probe = array('B')
+
+    # ---------- 行与路径 ----------
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._rows
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def paths(self) -> List[str]:
+        """所有文件（队列顺序）"""
+        return list(self._paths)
+
+    def path(self, row: int) -> str:
+        return self._paths[row]
+
+    def row(self, path: str) -> int:
+        """文件所在行，不存在时返回 -1"""
+        return self._rows.get(path, -1)
+
+    def add(self, paths: Iterable[str], status: str, infos: Optional[Sequence[dict]] = None) -> List[int]:
+        """
+        追加文件（已存在的跳过），各列整段扩展
+
+        Args:
+            infos: 与 paths 对应的视频信息（格式同 set_info，例如来自队列清单），
+                   None 或其中的空字典表示尚未探测；信息中没有文件大小时从磁盘读取
+
+        Returns:
+            新增的行号
+        """
+        first = len(self._paths)
+        new_infos = []
+        for index, path in enumerate(paths):
+            if path in self._rows:
+                continue
+            # 路径字符串驻留，队列、设置等其它字典中的同一路径共用一个对象
+            path = sys.intern(path)
+            self._rows[path] = len(self._paths)
+            self._paths.append(path)
+            if infos is not None:
+                new_infos.append(infos[index] or {})
+        count = len(self._paths) - first
+        if not count:
+            return []
+        for column in list(self._numeric.values()) + list(self._estimates.values()) + list(self._codes.values()):
+            column.frombytes(bytes(count * column.itemsize))
+        self._codes['status'][first:] = array('H', [self.code_tables['status'].encode(status)]) * count
+        self._probe.frombytes(bytes(count))
+        if new_infos:
+            self._fill_infos(first, new_infos)
+        sizes = self._numeric['file_size']
+        for row in range(first, first + count):
+            if not sizes[row]:
+                try:
+                    sizes[row] = os.path.getsize(self._paths[row])
+                except OSError:
+                    pass
+        return list(range(first, first + count))
+
+    def _fill_infos(self, first: int, infos: List[dict]):
+        """按列写入从 first 行开始的连续多行视频信息"""
+        end = first + len(infos)
+        levels = [
+            PROBE_NONE if not info else PROBE_QUICK if info.get('quick') else PROBE_DETAILED for info in infos
+        ]
+        all_detailed = all(level == PROBE_DETAILED for level in levels)
+        for name, column in self._numeric.items():
+            if all_detailed:
+                values = [info.get(name) or 0 for info in infos]
+            else:
+                allowed = (PROBE_QUICK, PROBE_DETAILED) if name in FORMAT_FIELDS else (PROBE_DETAILED,)
+                values = [info.get(name) or 0 if level in allowed else 0 for info, level in zip(infos, levels)]
+            try:
+                column[first:end] = array(column.typecode, values)
+            except (TypeError, ValueError, OverflowError):
+                # 类型不符（例如清单中整数列写成了小数或字符串）时逐个转换
+                column[first:end] = array(column.typecode, (_to_number(v, column.typecode) for v in values))
+        for name in STREAM_CODE_FIELDS:
+            table = self.code_tables[name]
+            self._codes[name][first:end] = array('H', [
+                table.encode(info.get(name)) if level == PROBE_DETAILED else 0 for info, level in zip(infos, levels)
+            ])
+        self._probe[first:end] = array('B', levels)
+
+    def remove(self, paths: Iterable[str]) -> int:
+        """
+        删除文件（一次性压缩所有列）
+
+        Returns:
+            删除的文件数
+        """
+        removed = {self._rows[p] for p in paths if p in self._rows}
+        if not removed:
+            return 0
+        keep = [row for row in range(len(self._paths)) if row not in removed]
+        self._paths = [self._paths[row] for row in keep]
+        self._rows = {path: row for row, path in enumerate(self._paths)}
+        if HAS_NUMPY:
+            np = numpy_module()
+            keep_index = np.asarray(keep, dtype=np.int64)
+
+            def compact(column: array) -> array:
+                if not keep:
+                    return array(column.typecode)
+                return array(column.typecode, np.frombuffer(column, dtype=column.typecode)[keep_index].tobytes())
+        else:
+            def compact(column: array) -> array:
+                return array(column.typecode, (column[row] for row in keep))
+        for columns in (self._numeric, self._estimates, self._codes):
+            for name, column in columns.items():
+                columns[name] = compact(column)
+        self._probe = compact(self._probe)
+        return len(removed)
+
+    def clear(self):
+        """清空所有文件（编码表一并重置）"""
+        self.__init__()
+
+    # ---------- 状态 ----------
+
+    def status(self, path: str) -> Optional[str]:
+        """文件状态，不在队列中时返回 None"""
+        row = self._rows.get(path)
+        if row is None:
+            return None
+        return self.code_tables['status'].decode(self._codes['status'][row])
+
+    def status_at(self, row: int) -> str:
+        return self.code_tables['status'].decode(self._codes['status'][row])
+
+    def set_status(self, paths: Iterable[str], status: str) -> List[int]:
+        """
+        批量设置状态
+
+        Returns:
+            被修改的行号
+        """
+        code = self.code_tables['status'].encode(status)
+        column = self._codes['status']
+        rows = []
+        for path in paths:
+            row = self._rows.get(path)
+            if row is not None:
+                column[row] = code
+                rows.append(row)
+        return rows
+
+    def paths_with_status(self, *statuses: str) -> List[str]:
+        """处于指定状态的文件（队列顺序）"""
+        return [self._paths[row] for row in self.rows_with_codes('status', statuses)]
+
+    def count_status(self, status: str) -> int:
+        return len(self.rows_with_codes('status', [status]))
+
+    # ---------- 视频信息 ----------
+
+    def set_info(self, path: str, info: dict):
+        """
+        保存探测结果
+
+        Args:
+            info: FFmpegHandler 返回的信息；空字典表示探测失败，'quick' 为 True 表示快速探测结果
+        """
+        row = self._rows.get(path)
+        if row is None:
+            return
+        if not info:
+            self._probe[row] = PROBE_FAILED
+            return
+        quick = bool(info.get('quick'))
+        for name, column in self._numeric.items():
+            if quick and name not in FORMAT_FIELDS:
+                continue
+            value = info.get(name) or 0
+            if name == 'file_size' and not value:
+                # 保留加入队列时读取的大小
+                continue
+            column[row] = value if column.typecode not in _INTEGER_TYPECODES else int(value)
+        if not quick:
+            for name in STREAM_CODE_FIELDS:
+                self._codes[name][row] = self.code_tables[name].encode(info.get(name))
+        self._probe[row] = PROBE_QUICK if quick else PROBE_DETAILED
+
+    def set_fields(self, path: str, fields: dict) -> int:
+        """
+        更新部分数值字段（如黑边检测结果），不改变探测级别
+
+        Returns:
+            文件所在行，不在队列中时返回 -1
+        """
+        row = self._rows.get(path, -1)
+        if row < 0:
+            return row
+        for name, value in fields.items():
+            column = self._numeric[name]
+            column[row] = _to_number(value, column.typecode)
+        return row
+
+    def set_estimate(self, path: str, fields: dict) -> int:
+        """
+        保存抽样试编码的预估结果（ESTIMATE_FIELDS）
+
+        Returns:
+            文件所在行，不在队列中时返回 -1
+        """
+        row = self._rows.get(path, -1)
+        if row >= 0:
+            for name in ESTIMATE_FIELDS:
+                self._estimates[name][row] = float(fields.get(name) or 0)
+        return row
+
+    def estimate(self, path: str) -> dict:
+        """预估结果，尚未预估时返回空字典"""
+        row = self._rows.get(path, -1)
+        if row < 0 or not self._estimates['est_size'][row]:
+            return {}
+        return {name: column[row] for name, column in self._estimates.items()}
+
+    def clear_estimates(self) -> List[int]:
+        """
+        清除所有预估结果（编码设置变化后预估不再有效）
+
+        Returns:
+            被清除的行号
+        """
+        rows = [row for row, size in enumerate(self._estimates['est_size']) if size]
+        for name, column in self._estimates.items():
+            self._estimates[name] = array('d', bytes(len(column) * column.itemsize))
+        return rows
+
+    def probe_level(self, path: str) -> int:
+        row = self._rows.get(path)
+        return PROBE_NONE if row is None else self._probe[row]
+
+    def probe_level_at(self, row: int) -> int:
+        return self._probe[row]
+
+    def value(self, row: int, name: str):
+        """单个数值字段（包括预估结果）"""
+        if name in self._estimates:
+            return self._estimates[name][row]
+        return self._numeric[name][row]
+
+    def code_name(self, row: int, name: str) -> str:
+        """单个编码字段的名称（如 video_codec）"""
+        return self.code_tables[name].decode(self._codes[name][row])
+
+    def duration_at(self, row: int) -> float:
+        """总时长（与 FFmpegHandler.parse_duration 相同的优先顺序）"""
+        return (self._numeric['format_duration'][row] or self._numeric['video_duration'][row]
+                or self._numeric['audio_duration'][row])
+
+    def info(self, path: str) -> dict:
+        """
+        以字典形式返回文件信息（与 FFmpegHandler.get_detailed_video_info 的格式相同）
+
+        尚未探测或探测失败时返回空字典；只有快速探测结果时只包含格式级字段且 'quick' 为 True。
+        """
+        row = self._rows.get(path)
+        if row is None:
+            return {}
+        level = self._probe[row]
+        if level in (PROBE_NONE, PROBE_FAILED):
+            return {}
+        info = {'file_path': path}
+        for name, column in self._numeric.items():
+            if level == PROBE_QUICK and name not in FORMAT_FIELDS:
+                continue
+            info[name] = column[row]
+        if level == PROBE_QUICK:
+            info['quick'] = True
+        else:
+            for name in STREAM_CODE_FIELDS:
+                code = self._codes[name][row]
+                if code:
+                    info[name] = self.code_tables[name].decode(code)
+        return info
+
+    # ---------- 批量查询 ----------
+
+    def column(self, name: str):
+        """
+        整列数据的副本：NumPy 数组（已安装时）或 array
+
+        name 可以是数值字段、编码字段（返回编码）、'probe' 或 'duration'（总时长）
+        """
+        if name == 'duration':
+            return self._durations()
+        if name == 'probe':
+            source = self._probe
+        elif name in self._codes:
+            source = self._codes[name]
+        elif name in self._estimates:
+            source = self._estimates[name]
+        else:
+            source = self._numeric[name]
+        if HAS_NUMPY:
+            np = numpy_module()
+            return np.frombuffer(source, dtype=source.typecode).copy() if len(source) else np.zeros(0, source.typecode)
+        return array(source.typecode, source)
+
+    def _durations(self):
+        fmt, video, audio = (self.column(n) for n in ('format_duration', 'video_duration', 'audio_duration'))
+        if HAS_NUMPY:
+            np = numpy_module()
+            return np.where(fmt > 0, fmt, np.where(video > 0, video, audio).astype(np.float64))
+        return array('d', (f or v or a for f, v, a in zip(fmt, video, audio)))
+
+    def rows_where(self, name: str, op: str, value, rows: Optional[Sequence[int]] = None) -> List[int]:
+        """
+        满足 “字段 op 值” 的行，例如 rows_where('bits_per_10000_pixels', '>', 0.5)
+
+        Args:
+            rows: 只在这些行中查找，None 表示所有行
+        """
+        compare = _OPERATORS[op]
+        values = self.column(name)
+        if HAS_NUMPY:
+            np = numpy_module()
+            mask = compare(values, value)
+            if rows is None:
+                return np.flatnonzero(mask).tolist()
+            rows = np.asarray(rows, dtype=np.int64)
+            return rows[mask[rows]].tolist()
+        candidates = range(len(values)) if rows is None else rows
+        return [row for row in candidates if compare(values[row], value)]
+
+    def rows_with_codes(self, name: str, names: Iterable[str]) -> List[int]:
+        """编码字段等于给定名称之一的行"""
+        table = self.code_tables[name]
+        codes = [c for c in (table.lookup(n) for n in names) if c >= 0]
+        if not codes:
+            return []
+        values = self.column(name)
+        if HAS_NUMPY:
+            np = numpy_module()
+            return np.flatnonzero(np.isin(values, codes)).tolist()
+        code_set = set(codes)
+        return [row for row, code in enumerate(values) if code in code_set]
+
+    def total(self, name: str, rows: Optional[Sequence[int]] = None):
+        """字段合计（例如 total('file_size')）"""
+        if not self._paths or rows is not None and not len(rows):
+            return 0
+        values = self.column(name)
+        if HAS_NUMPY:
+            np = numpy_module()
+            if rows is not None:
+                values = values[np.asarray(rows, dtype=np.int64)]
+            return values.sum().item() if len(values) else 0
+        if rows is not None:
+            return sum(values[row] for row in rows)
+        return sum(values)
+
+    def argsort(self, key, rows: Optional[Sequence[int]] = None, descending: bool = False) -> List[int]:
+        """
+        按排序键排列行号（稳定排序）
+
+        Args:
+            key: column() 返回的整列数值，或按行号取值的函数（用于字符串列）
+            rows: 参与排序的行，None 表示所有行
+        """
+        if rows is None:
+            rows = range(len(self._paths))
+        if callable(key):
+            return sorted(rows, key=key, reverse=descending)
+        if HAS_NUMPY:
+            np = numpy_module()
+            rows = np.asarray(rows, dtype=np.int64)
+            values = np.asarray(key)[rows]
+            if descending:
+                # 取反后升序排序，保持相等值的原有顺序
+                order = np.argsort(-values.astype(np.float64), kind='stable')
+            else:
+                order = np.argsort(values, kind='stable')
+            return rows[order].tolist()
+        return sorted(rows, key=lambda row: key[row], reverse=descending)
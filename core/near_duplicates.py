@@ -0,0 +1,245 @@
+"""
+相似视频检测 - 找出同一内容的不同版本（重新封装、重新编码、不同分辨率等）
+
+每个文件用一次 FFmpeg 调用在若干相对位置各取一帧，缩小为 32x32 灰度图，以 rawvideo 输出；
+所有文件的帧一起用 NumPy 计算感知哈希（DCT 低频系数与中位数比较，64 位），
+再按对应帧的平均汉明距离和时长差异聚类。
+
+需要 NumPy（可选依赖），未安装时 HAS_NUMPY 为 False。
+"""
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+from core.ffmpeg_capabilities import ffmpeg_version, fps_mode_args
+from core.ffmpeg_handler import CREATE_NO_WINDOW
+
+# 每个文件抽取的帧数和帧尺寸
+FRAMES_PER_FILE = 8
+FRAME_SIZE = 32
+# 感知哈希使用的 DCT 低频区域边长（8x8 = 64 位）
+HASH_SIZE = 8
+# 对应帧平均汉明距离不超过该值（共 64 位）时视为相似
+HASH_DISTANCE_THRESHOLD = 6.0
+# 时长差异容差：不超过该秒数或较长时长的该比例
+DURATION_TOLERANCE_SECONDS = 2.0
+DURATION_TOLERANCE_RATIO = 0.02
+# 抽帧超时（秒）
+EXTRACT_TIMEOUT = 60
+
+
+def build_frame_command(ffmpeg_path: str, video_path: str, duration: float,
+                        count: int = FRAMES_PER_FILE, size: int = FRAME_SIZE) -> list:
+    """
+    构建抽帧命令：输出 count 帧 size x size 灰度图（rawvideo）
+
+    时长已知时对每个位置使用输入端快速定位（-ss），各帧纵向拼接为一张图输出；
+    时长未知时从开头按固定间隔取帧（逐帧输出，帧率模式参数按 FFmpeg 版本选择）。
+    """
+    scale = f"scale={size}:{size}:flags=area,setsar=1,format=gray"
+    cmd = [ffmpeg_path, "-v", "error", "-nostdin"]
+    if duration > 0:
+        filters = []
+        for i in range(count):
+            position = duration * (i + 0.5) / count
+            cmd += ["-ss", f"{position:.3f}", "-i", video_path]
+            filters.append(f"[{i}:v:0]trim=end_frame=1,setpts=0,{scale}[v{i}]")
+        stack = "".join(f"[v{i}]" for i in range(count))
+        filters.append(f"{stack}vstack=inputs={count}[out]" if count > 1 else f"{stack}null[out]")
+        cmd += ["-filter_complex", ";".join(filters), "-map", "[out]", "-frames:v", "1"]
+    else:
+        cmd += ["-i", video_path, "-map", "0:v:0", "-vf", f"select='not(mod(n\\,50))',{scale}",
+                *fps_mode_args(ffmpeg_version(ffmpeg_path), "passthrough"), "-frames:v", str(count)]
+    cmd += ["-f", "rawvideo", "-pix_fmt", "gray", "-"]
+    return cmd
+
+
+def extract_frames(ffmpeg_path: str, video_path: str, duration: float,
+                   count: int = FRAMES_PER_FILE, size: int = FRAME_SIZE):
+    """
+    抽取灰度小图
+
+    Returns:
+        形状为 (count, size, size) 的 uint8 数组（帧数不足时重复最后一帧），失败时返回 None
+    """
+    run_kwargs = {'capture_output': True, 'timeout': EXTRACT_TIMEOUT}
+    if sys.platform == 'win32':
+        run_kwargs['creationflags'] = CREATE_NO_WINDOW
+    try:
+        result = subprocess.run(build_frame_command(ffmpeg_path, video_path, duration, count, size), **run_kwargs)
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"抽取视频帧失败: {video_path}: {e}")
+        return None
+    frame_bytes = size * size
+    available = len(result.stdout) // frame_bytes
+    if available == 0:
+        return None
+    frames = np.frombuffer(result.stdout[:available * frame_bytes], dtype=np.uint8).reshape(available, size, size)
+    if available < count:
+        frames = np.concatenate([frames, np.repeat(frames[-1:], count - available, axis=0)])
+    return frames[:count]
+
+
+def _dct_matrix(n: int):
+    """正交 DCT-II 变换矩阵"""
+    k = np.arange(n)[:, None]
+    x = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * x + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix
+
+
+def phash_frames(frames):
+    """
+    批量计算感知哈希
+
+    Args:
+        frames: 形状为 (M, size, size) 的灰度帧
+
+    Returns:
+        形状为 (M,) 的 uint64 哈希
+    """
+    size = frames.shape[-1]
+    dct = _dct_matrix(size).astype(np.float32)
+    coefficients = dct @ frames.astype(np.float32) @ dct.T
+    low = coefficients[:, :HASH_SIZE, :HASH_SIZE].reshape(len(frames), -1)
+    # 与除直流分量外的低频系数中位数比较
+    median = np.median(low[:, 1:], axis=1, keepdims=True)
+    bits = np.packbits(low > median, axis=1)
+    return bits.view('>u8').ravel().astype(np.uint64)
+
+
+def _popcount(values):
+    """逐元素统计 uint64 中为 1 的位数"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    table = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    return table[values.view(np.uint8)].reshape(values.shape + (8,)).sum(axis=-1)
+
+
+def distance_matrix(hashes, chunk_rows: int = 256):
+    """
+    文件之间的距离：对应位置帧的平均汉明距离
+
+    Args:
+        hashes: 形状为 (F, K) 的 uint64 哈希
+
+    Returns:
+        形状为 (F, F) 的 float32 距离矩阵
+    """
+    count = len(hashes)
+    distances = np.empty((count, count), dtype=np.float32)
+    for start in range(0, count, chunk_rows):
+        block = hashes[start:start + chunk_rows, None, :] ^ hashes[None, :, :]
+        distances[start:start + chunk_rows] = _popcount(block).mean(axis=-1)
+    return distances
+
+
+def cluster_signatures(paths: List[str], hashes, durations: List[float],
+                       threshold: float = HASH_DISTANCE_THRESHOLD) -> List[List[str]]:
+    """
+    按哈希距离和时长聚类（并查集，满足条件的文件对传递合并）
+
+    Returns:
+        包含两个及以上文件的组，组内保持输入顺序
+    """
+    if len(paths) < 2:
+        return []
+    distances = distance_matrix(hashes)
+    duration_array = np.asarray(durations, dtype=np.float64)
+    longer = np.maximum(duration_array[:, None], duration_array[None, :])
+    tolerance = np.maximum(DURATION_TOLERANCE_SECONDS, longer * DURATION_TOLERANCE_RATIO)
+    # 任一文件时长未知时只按画面判断
+    unknown = (duration_array[:, None] <= 0) | (duration_array[None, :] <= 0)
+    duration_ok = unknown | (np.abs(duration_array[:, None] - duration_array[None, :]) <= tolerance)
+    similar = np.triu((distances <= threshold) & duration_ok, k=1)
+
+    parent = list(range(len(paths)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in zip(*np.nonzero(similar)):
+        root_i, root_j = find(int(i)), find(int(j))
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    groups: Dict[int, List[str]] = {}
+    for i, path in enumerate(paths):
+        groups.setdefault(find(i), []).append(path)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def source_quality_key(info: dict) -> Tuple[int, int, int]:
+    """源文件质量排序键：分辨率、码率、文件大小（越大越好）"""
+    pixels = int(info.get('width', 0) or 0) * int(info.get('height', 0) or 0)
+    bitrate = int(info.get('format_bitrate', 0) or info.get('video_bitrate', 0) or 0)
+    return pixels, bitrate, int(info.get('file_size', 0) or 0)
+
+
+def rank_cluster(paths: List[str], infos: Dict[str, dict]) -> List[str]:
+    """将一组相似文件按源质量从高到低排序（第一个为建议保留的文件）"""
+    def key(path: str):
+        info = dict(infos.get(path) or {})
+        if not info.get('file_size') and os.path.exists(path):
+            info['file_size'] = os.path.getsize(path)
+        return source_quality_key(info)
+    return sorted(paths, key=key, reverse=True)
+
+
+class NearDuplicateAnalyzer:
+    """相似视频分析器：并行抽帧，批量计算哈希并聚类"""
+
+    def __init__(self, ffmpeg_path: str, max_workers: int = 4, threshold: float = HASH_DISTANCE_THRESHOLD):
+        if not HAS_NUMPY:
+            raise RuntimeError("相似视频检测需要 NumPy")
+        self.ffmpeg_path = ffmpeg_path
+        self.max_workers = max(1, max_workers)
+        self.threshold = threshold
+
+    def analyze(self, paths: List[str], durations: Dict[str, float],
+                progress_callback: Optional[Callable[[int, int, str], None]] = None,
+                cancel_flag: Optional[Callable[[], bool]] = None) -> List[List[str]]:
+        """
+        分析文件并返回相似文件组
+
+        Args:
+            paths: 文件路径列表
+            durations: 已知的时长 {文件路径: 秒}，缺失或为 0 表示未知
+            progress_callback: 抽帧进度回调 (current, total, file_path)
+            cancel_flag: 返回 True 时停止分析（返回空列表）
+        """
+        total = len(paths)
+        frames: Dict[str, object] = {}
+
+        def extract(path: str):
+            if cancel_flag and cancel_flag():
+                return path, None
+            return path, extract_frames(self.ffmpeg_path, path, durations.get(path, 0) or 0)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for done, (path, result) in enumerate(executor.map(extract, paths), 1):
+                if result is not None:
+                    frames[path] = result
+                if progress_callback:
+                    progress_callback(done, total, path)
+        if (cancel_flag and cancel_flag()) or len(frames) < 2:
+            return []
+
+        valid_paths = [p for p in paths if p in frames]
+        stacked = np.stack([frames[p] for p in valid_paths])
+        hashes = phash_frames(stacked.reshape(-1, FRAME_SIZE, FRAME_SIZE)).reshape(len(valid_paths), -1)
+        return cluster_signatures(valid_paths, hashes, [durations.get(p, 0) or 0 for p in valid_paths],
+                                  self.threshold)
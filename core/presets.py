@@ -0,0 +1,69 @@
+"""
+预设序列和复杂度档位的调整 - 不依赖 NumPy，编码、命令行和截止时间规划可以直接导入
+
+复杂度档位由 core.complexity 分析得出（需要 NumPy），这里只定义档位和各档对应的 CRF / 预设调整。
+"""
+from typing import Dict, Optional
+
+# 复杂度档位（0 表示尚未分析）
+TIER_LOW = 1
+TIER_MEDIUM = 2
+TIER_HIGH = 3
+TIER_NAMES = {TIER_LOW: "low", TIER_MEDIUM: "medium", TIER_HIGH: "high"}
+
+# 各档的调整：CRF 偏移和预设快慢（正数为更慢的预设），未列出的档位不调整
+DEFAULT_TIERS = {
+    "low": {"crf_offset": 2, "preset_steps": -1},
+    "high": {"crf_offset": -2, "preset_steps": 1},
+}
+# 按从快到慢排列的预设（调整预设时在所属序列中移动，其它预设不调整）
+PRESET_LADDERS = (
+    ("ultrafast", "superfast", "veryfast", "faster", "fast", "medium", "slow", "slower", "veryslow"),
+    ("p1", "p2", "p3", "p4", "p5", "p6", "p7"),
+)
+CRF_RANGE = (0, 63)
+
+
+def shift_crf(crf: str, offset: int) -> str:
+    """CRF 加上偏移（限制在 CRF_RANGE 内），无法解析时返回空字符串"""
+    try:
+        value = float(crf) + offset
+    except (TypeError, ValueError):
+        return ""
+    value = min(max(value, CRF_RANGE[0]), CRF_RANGE[1])
+    return str(int(value)) if value == int(value) else f"{value:g}"
+
+
+def shift_preset(preset: str, steps: int) -> str:
+    """在预设所属的序列中移动（正数为更慢），不在已知序列中时返回空字符串"""
+    for ladder in PRESET_LADDERS:
+        if preset in ladder:
+            index = min(max(ladder.index(preset) + steps, 0), len(ladder) - 1)
+            return ladder[index]
+    return ""
+
+
+def tier_overrides(tier: int, encode_kwargs: dict, tiers: Optional[Dict[str, dict]] = None) -> Dict[str, str]:
+    """
+    复杂度档位对应的文件级参数（video_crf / video_preset），无需调整时返回空字典
+
+    Args:
+        tier: 复杂度档位
+        encode_kwargs: 文件的编码参数（在其 CRF 和预设的基础上调整）
+        tiers: 各档的调整 {"low": {"crf_offset": 2, "preset_steps": -1}, ...}，None 表示 DEFAULT_TIERS
+    """
+    adjust = (DEFAULT_TIERS if tiers is None else tiers).get(TIER_NAMES.get(tier, ""), {})
+    if not adjust or encode_kwargs.get("video_codec") == "copy" or encode_kwargs.get("use_custom"):
+        return {}
+    overrides = {}
+    offset = int(adjust.get("crf_offset") or 0)
+    if offset:
+        crf = shift_crf(encode_kwargs.get("video_crf", ""), offset)
+        if crf:
+            overrides["video_crf"] = crf
+    steps = int(adjust.get("preset_steps") or 0)
+    if steps:
+        preset = shift_preset(encode_kwargs.get("video_preset", ""), steps)
+        if preset and preset != encode_kwargs.get("video_preset"):
+            overrides["video_preset"] = preset
+    return overrides
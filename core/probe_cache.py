@@ -0,0 +1,110 @@
+"""
+探测结果缓存 - 按文件路径缓存 ffprobe 解析后的视频信息
+
+缓存项记录文件大小和修改时间，文件变化后自动失效；目录快照索引发现的删除和修改会显式清除对应项。
+"""
+import json
+import os
+import threading
+from typing import Dict, Iterable, Optional
+
+# 缓存文件名（与配置文件位于同一目录）
+PROBE_CACHE_FILE = "probe_cache.json"
+# 缓存格式版本（2: 增加 pix_fmt）
+CACHE_VERSION = 2
+
+
+class ProbeCache:
+    """视频信息缓存（线程安全，首次使用时加载）"""
+
+    # 最多保留的缓存项，超出时丢弃最早加入的项
+    MAX_ENTRIES = 50000
+
+    def __init__(self, cache_file: Optional[str] = None):
+        """
+        Args:
+            cache_file: 缓存文件路径，None 表示只保存在内存中
+        """
+        self.cache_file = cache_file
+        self._entries: Optional[Dict[str, dict]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, dict]:
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        if self.cache_file and os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") == CACHE_VERSION:
+                    self._entries = data.get("entries", {})
+            except (OSError, ValueError) as e:
+                print(f"加载探测缓存失败: {e}")
+        return self._entries
+
+    def get(self, path: str) -> Optional[dict]:
+        """返回缓存的视频信息，文件不存在或已变化时返回 None"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._load().get(path)
+            if entry is None:
+                return None
+            if entry["size"] != st.st_size or entry["mtime_ns"] != st.st_mtime_ns:
+                del self._entries[path]
+                self._dirty = True
+                return None
+            return dict(entry["info"])
+
+    def put(self, path: str, info: dict):
+        """缓存视频信息（空信息表示探测失败，不缓存）"""
+        if not info:
+            return
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        with self._lock:
+            entries = self._load()
+            entries.pop(path, None)
+            entries[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "info": info}
+            while len(entries) > self.MAX_ENTRIES:
+                del entries[next(iter(entries))]
+            self._dirty = True
+
+    def update(self, path: str, fields: dict):
+        """向已缓存的视频信息中补充字段（如黑边检测结果），没有有效缓存项时忽略"""
+        if not fields or self.get(path) is None:
+            return
+        with self._lock:
+            entry = self._load().get(path)
+            if entry is not None:
+                entry["info"].update(fields)
+                self._dirty = True
+
+    def invalidate(self, paths: Iterable[str]):
+        """清除指定文件的缓存"""
+        with self._lock:
+            entries = self._load()
+            for path in paths:
+                if entries.pop(path, None) is not None:
+                    self._dirty = True
+
+    def save(self):
+        """保存缓存（无变化时不写入）"""
+        with self._lock:
+            if not self._dirty or not self.cache_file or self._entries is None:
+                return
+            data = {"version": CACHE_VERSION, "entries": dict(self._entries)}
+            self._dirty = False
+        try:
+            tmp_path = self.cache_file + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            print(f"保存探测缓存失败: {e}")
@@ -0,0 +1,110 @@
+"""
+分级探测调度 - 先快速探测所有文件的格式信息，再按优先级获取详细流信息
+
+快速探测（第一级）只读取文件开头少量数据，得到时长、码率和大小，使队列立即可用；
+详细探测（第二级）在后台按优先级进行：表格中可见的行优先，其次按编码顺序。
+"""
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+# 探测级别
+TIER_QUICK = "quick"
+TIER_DETAILED = "detailed"
+
+
+class ProbeScheduler:
+    """探测任务队列（线程安全）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._quick: "OrderedDict[str, None]" = OrderedDict()
+        self._detailed: "OrderedDict[str, None]" = OrderedDict()
+        self._urgent: "OrderedDict[str, None]" = OrderedDict()
+        self._done = 0
+
+    def add(self, paths: Iterable[str]):
+        """加入新文件（两级探测都需要进行）"""
+        with self._lock:
+            for path in paths:
+                self._quick[path] = None
+                self._detailed[path] = None
+
+    def add_detailed(self, paths: Iterable[str]):
+        """只需要重新获取详细信息的文件（如内容已修改的文件），排在最前"""
+        with self._lock:
+            for path in paths:
+                self._detailed[path] = None
+                self._detailed.move_to_end(path, last=False)
+
+    def prioritize(self, paths: Iterable[str]):
+        """设置优先获取详细信息的文件（如表格中当前可见的行），替换之前的设置"""
+        with self._lock:
+            self._urgent = OrderedDict((p, None) for p in paths if p in self._detailed)
+
+    def reorder(self, paths: Iterable[str]):
+        """按给定顺序（如编码顺序）将文件移到详细探测队列前部"""
+        with self._lock:
+            for path in reversed(list(paths)):
+                if path in self._detailed:
+                    self._detailed.move_to_end(path, last=False)
+
+    def discard(self, paths: Iterable[str]):
+        """移除文件的所有探测任务"""
+        with self._lock:
+            for path in paths:
+                self._quick.pop(path, None)
+                self._detailed.pop(path, None)
+                self._urgent.pop(path, None)
+
+    def mark_detailed(self, path: str):
+        """文件已有详细信息（如命中探测缓存），不再需要详细探测"""
+        with self._lock:
+            if self._detailed.pop(path, False) is None:
+                self._done += 1
+            self._urgent.pop(path, None)
+
+    def clear(self):
+        with self._lock:
+            self._quick.clear()
+            self._detailed.clear()
+            self._urgent.clear()
+            self._done = 0
+
+    def next_job(self) -> Optional[Tuple[str, str]]:
+        """
+        取出下一个任务：可见行的详细探测 > 快速探测 > 按编码顺序的详细探测
+
+        Returns:
+            (文件路径, 探测级别)，没有任务时返回 None
+        """
+        with self._lock:
+            if self._urgent:
+                path, _ = self._urgent.popitem(last=False)
+                self._detailed.pop(path, None)
+                self._quick.pop(path, None)
+                tier = TIER_DETAILED
+            elif self._quick:
+                path, _ = self._quick.popitem(last=False)
+                tier = TIER_QUICK
+            elif self._detailed:
+                path, _ = self._detailed.popitem(last=False)
+                tier = TIER_DETAILED
+            else:
+                return None
+            if tier == TIER_DETAILED:
+                self._done += 1
+            return path, tier
+
+    def pending(self) -> int:
+        """尚未完成详细探测的文件数"""
+        with self._lock:
+            return len(self._detailed)
+
+    def progress(self) -> Tuple[int, int]:
+        """(已完成详细探测数, 总数)，队列清空后重新计数"""
+        with self._lock:
+            if not self._detailed:
+                self._done = 0
+                return 0, 0
+            return self._done, self._done + len(self._detailed)
@@ -0,0 +1,129 @@
+"""
+队列进度和剩余时间 - 按预测耗时加权整体进度，并用实际速度不断修正每个文件和整个队列的剩余时间
+
+每个文件的权重为速度模型（core.speed_model）预测的编码耗时；时长未知的文件使用其他文件预测值的平均值，
+都未知时所有文件权重相同（即按文件数计算，与不加权时一致）。
+
+实际耗时与预测之比（偏差比例）由已完成的文件和正在编码的文件（已用时间 / 已完成部分的预测耗时）共同得出，
+尚未开始的文件的剩余时间为预测值乘以偏差比例。正在编码的文件的总耗时在“预测值 × 偏差比例”和
+“已用时间 / 进度”之间过渡，进度达到 CONFIDENT_PROGRESS 后完全按实际速度推算。
+"""
+import time
+from typing import Dict, Optional
+
+# 进度达到该百分比后完全按当前文件的实际速度推算其剩余时间
+CONFIDENT_PROGRESS = 20.0
+# 编码开始后至少经过该秒数才按实际速度推算（开头的进程启动和探测不代表编码速度）
+MIN_ELAPSED = 2.0
+
+
+class QueueEta:
+    """一次编码队列的加权进度和剩余时间（在界面线程中使用）"""
+
+    def __init__(self, predicted: Dict[str, float]):
+        """
+        Args:
+            predicted: 各文件的预测编码耗时 {文件路径: 秒数}，0 表示无法预测
+        """
+        self._predicted: Dict[str, float] = {}
+        self._progress: Dict[str, float] = {}
+        self._started: Dict[str, float] = {}
+        self._finished: Dict[str, float] = {}
+        self.set_predictions(predicted)
+
+    def set_predictions(self, predicted: Dict[str, float]):
+        """设置（或在重新规划后更新）文件的预测耗时，新文件加入队列"""
+        for path, seconds in predicted.items():
+            self._predicted[path] = max(0.0, seconds)
+            self._progress.setdefault(path, 0.0)
+
+    @property
+    def calibrated(self) -> bool:
+        """是否有任何文件的预测耗时"""
+        return any(seconds > 0 for seconds in self._predicted.values())
+
+    def _weight(self, path: str) -> float:
+        seconds = self._predicted.get(path, 0.0)
+        if seconds > 0:
+            return seconds
+        known = [s for s in self._predicted.values() if s > 0]
+        return sum(known) / len(known) if known else 1.0
+
+    def start(self, path: str, now: Optional[float] = None):
+        """文件开始编码"""
+        self._progress.setdefault(path, 0.0)
+        self._predicted.setdefault(path, 0.0)
+        self._started[path] = now if now is not None else time.monotonic()
+
+    def update(self, path: str, progress: float, now: Optional[float] = None):
+        """文件的编码进度（0-100）"""
+        if path not in self._started:
+            self.start(path, now)
+        self._progress[path] = max(self._progress.get(path, 0.0), min(progress, 100.0))
+
+    def finish(self, path: str, now: Optional[float] = None):
+        """文件结束编码（成功或失败）"""
+        now = now if now is not None else time.monotonic()
+        self._progress[path] = 100.0
+        self._predicted.setdefault(path, 0.0)
+        started = self._started.pop(path, None)
+        # 没有开始时间的文件（例如重新连接后台编码时已完成的文件）不参与偏差比例
+        self._finished[path] = now - started if started is not None else 0.0
+
+    def overall(self) -> float:
+        """按预测耗时加权的整体进度（0-100）"""
+        total = sum(self._weight(path) for path in self._progress)
+        if total <= 0:
+            return 0.0
+        return sum(self._weight(path) * progress for path, progress in self._progress.items()) / total
+
+    def drift(self, now: Optional[float] = None) -> Optional[float]:
+        """实际耗时与预测之比，尚无实际数据时为 None"""
+        now = now if now is not None else time.monotonic()
+        actual = expected = 0.0
+        for path, elapsed in self._finished.items():
+            if elapsed > 0:
+                actual += elapsed
+                expected += self._weight(path)
+        for path, started in self._started.items():
+            elapsed, progress = now - started, self._progress.get(path, 0.0)
+            if elapsed >= MIN_ELAPSED and progress > 0:
+                actual += elapsed
+                expected += self._weight(path) * progress / 100
+        return actual / expected if expected > 0 else None
+
+    def file_remaining(self, path: str, now: Optional[float] = None) -> Optional[float]:
+        """文件的剩余时间（秒），无法估计时为 None"""
+        if path in self._finished:
+            return 0.0
+        now = now if now is not None else time.monotonic()
+        drift = self.drift(now)
+        if drift is None and self.calibrated:
+            drift = 1.0
+        predicted_total = self._weight(path) * drift if drift is not None else None
+        started = self._started.get(path)
+        if started is None:
+            return predicted_total
+        elapsed, progress = now - started, self._progress.get(path, 0.0)
+        observed_total = elapsed * 100 / progress if progress > 0 and elapsed >= MIN_ELAPSED else None
+        if observed_total is None and predicted_total is None:
+            return None
+        if observed_total is None:
+            total = predicted_total
+        elif predicted_total is None:
+            total = observed_total
+        else:
+            confidence = min(1.0, progress / CONFIDENT_PROGRESS)
+            total = predicted_total * (1 - confidence) + observed_total * confidence
+        return max(0.0, total - elapsed)
+
+    def queue_remaining(self, now: Optional[float] = None) -> Optional[float]:
+        """整个队列的剩余时间（秒），无法估计时为 None（按顺序编码，各文件剩余时间之和）"""
+        now = now if now is not None else time.monotonic()
+        total = 0.0
+        for path in self._progress:
+            remaining = self.file_remaining(path, now)
+            if remaining is None:
+                return None
+            total += remaining
+        return total
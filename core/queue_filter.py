@@ -0,0 +1,358 @@
+"""
+队列过滤表达式 - 按视频信息筛选 MediaStore 中的文件
+
+表达式由 “字段 运算符 值” 的比较和 and / or / not / 括号组成，例如：
+
+    height < 720 and status = waiting
+    codec = hevc,vp9 and bitrate > 6M
+    path ~ */archive/* or name ~ *.flv
+    status = failed
+
+比较在整列上进行（安装 NumPy 时向量化计算），10 万行的队列也能即时得到结果。
+尚未获取所需信息的文件（例如还没有详细探测结果时比较分辨率）不满足任何比较。
+"""
+import fnmatch
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from core.media_store import MediaStore, HAS_NUMPY, PROBE_NONE, PROBE_QUICK, PROBE_DETAILED, numpy_module
+
+# 值的类型
+VALUE_CODE = "code"          # 编码名称（逗号分隔多个值，~ 为通配符匹配）
+VALUE_TEXT = "text"          # 路径/文件名（~ 为通配符匹配，不含通配符时匹配子串）
+VALUE_NUMBER = "number"      # 普通数值
+VALUE_BITRATE = "bitrate"    # 码率：k/M/G（1000 进制），可带 bps
+VALUE_SIZE = "size"          # 大小：KB/MB/GB/TB（1024 进制）
+VALUE_DURATION = "duration"  # 时长：秒，或带 s/m/h，或 [h:]mm:ss
+VALUE_HEIGHT = "height"      # 高度：720 / 720p / 1280x720（取高度）
+
+# 字段名 -> (MediaStore 列, 值类型, 需要的探测级别)
+# 列名 'bitrate'（总码率，缺失时用视频码率，与表格的码率列一致）、'path'、'name' 由本模块计算
+FIELDS: Dict[str, Tuple[str, str, int]] = {
+    'codec': ('video_codec', VALUE_CODE, PROBE_DETAILED),
+    'vcodec': ('video_codec', VALUE_CODE, PROBE_DETAILED),
+    'acodec': ('audio_codec', VALUE_CODE, PROBE_DETAILED),
+    'status': ('status', VALUE_CODE, PROBE_NONE),
+    'width': ('width', VALUE_NUMBER, PROBE_DETAILED),
+    'height': ('height', VALUE_HEIGHT, PROBE_DETAILED),
+    'res': ('height', VALUE_HEIGHT, PROBE_DETAILED),
+    'resolution': ('height', VALUE_HEIGHT, PROBE_DETAILED),
+    'fps': ('fps', VALUE_NUMBER, PROBE_DETAILED),
+    'bitrate': ('bitrate', VALUE_BITRATE, PROBE_QUICK),
+    'vbitrate': ('video_bitrate', VALUE_BITRATE, PROBE_DETAILED),
+    'abitrate': ('audio_bitrate', VALUE_BITRATE, PROBE_DETAILED),
+    'bpp': ('bits_per_10000_pixels', VALUE_NUMBER, PROBE_DETAILED),
+    'duration': ('duration', VALUE_DURATION, PROBE_QUICK),
+    'size': ('file_size', VALUE_SIZE, PROBE_NONE),
+    'path': ('path', VALUE_TEXT, PROBE_NONE),
+    'name': ('name', VALUE_TEXT, PROBE_NONE),
+}
+
+# 常用的编码器名称 -> ffprobe 报告的编码名称
+CODEC_ALIASES = {
+    'h265': 'hevc', 'x265': 'hevc', 'avc': 'h264', 'x264': 'h264', 'avc1': 'h264',
+}
+
+# 各类型支持的运算符
+_COMPARE_OPERATORS = ('<', '<=', '>', '>=', '=', '!=')
+_MATCH_OPERATORS = ('=', '!=', '~', '!~')
+
+# 数值单位
+_UNITS = {
+    VALUE_BITRATE: {'': 1, 'b': 1, 'bps': 1, 'k': 1e3, 'kb': 1e3, 'kbps': 1e3,
+                    'm': 1e6, 'mb': 1e6, 'mbps': 1e6, 'g': 1e9, 'gb': 1e9, 'gbps': 1e9},
+    VALUE_SIZE: {'': 1, 'b': 1, 'k': 1024, 'kb': 1024, 'kib': 1024, 'm': 1024 ** 2, 'mb': 1024 ** 2,
+                 'mib': 1024 ** 2, 'g': 1024 ** 3, 'gb': 1024 ** 3, 'gib': 1024 ** 3,
+                 't': 1024 ** 4, 'tb': 1024 ** 4, 'tib': 1024 ** 4},
+    VALUE_DURATION: {'': 1, 's': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600},
+    VALUE_HEIGHT: {'': 1, 'p': 1},
+    VALUE_NUMBER: {'': 1},
+}
+
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<paren>[()])
+      | (?P<op><=|>=|!=|==|!~|=|<|>|~)
+      | "(?P<dquote>[^"]*)"
+      | '(?P<squote>[^']*)'
+      | (?P<word>[^\s()<>=!~"']+)
+    )""", re.VERBOSE)
+_NUMBER_RE = re.compile(r"^(\d+(?:\.\d*)?|\.\d+)\s*([a-z]*)$")
+_KEYWORDS = ('and', 'or', 'not')
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    """拆分为 (类型, 文本) 列表，类型为 paren / op / value / word"""
+    tokens = []
+    pos = 0
+    expression = expression.rstrip()
+    while pos < len(expression):
+        match = _TOKEN_RE.match(expression, pos)
+        if not match:
+            raise ValueError(f"无法识别: {expression[pos:].strip()}")
+        pos = match.end()
+        if match.group('paren'):
+            tokens.append(('paren', match.group('paren')))
+        elif match.group('op'):
+            op = match.group('op')
+            tokens.append(('op', '=' if op == '==' else op))
+        elif match.group('dquote') is not None:
+            tokens.append(('value', match.group('dquote')))
+        elif match.group('squote') is not None:
+            tokens.append(('value', match.group('squote')))
+        else:
+            tokens.append(('word', match.group('word')))
+    return tokens
+
+
+def _parse_number(text: str, kind: str) -> float:
+    """解析带单位的数值，例如 6M、1.5GB、90m、1:30:00、720p、1280x720"""
+    text = text.strip().lower()
+    if kind == VALUE_DURATION and ':' in text:
+        parts = text.split(':')
+        try:
+            seconds = 0.0
+            for part in parts:
+                seconds = seconds * 60 + float(part)
+            return seconds
+        except ValueError:
+            raise ValueError(f"无效的时长: {text}")
+    if kind == VALUE_HEIGHT and 'x' in text:
+        text = text.split('x', 1)[1]
+    match = _NUMBER_RE.match(text)
+    units = _UNITS[kind]
+    if not match or match.group(2) not in units:
+        raise ValueError(f"无效的数值: {text}")
+    return float(match.group(1)) * units[match.group(2)]
+
+
+def _glob_regex(pattern: str):
+    """通配符模式（不区分大小写）；不含通配符时匹配子串"""
+    if not any(c in pattern for c in '*?['):
+        pattern = f"*{pattern}*"
+    return re.compile(fnmatch.translate(pattern), re.IGNORECASE)
+
+
+class _Parser:
+    """递归下降解析：or < and < not < 比较/括号"""
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _keyword(self, word: str) -> bool:
+        token = self._peek()
+        if token and token[0] == 'word' and token[1].lower() == word:
+            self.pos += 1
+            return True
+        return False
+
+    def parse(self):
+        node = self._or()
+        if self._peek() is not None:
+            raise ValueError(f"多余的内容: {self._peek()[1]}")
+        return node
+
+    def _or(self):
+        node = self._and()
+        while self._keyword('or'):
+            node = ('or', node, self._and())
+        return node
+
+    def _and(self):
+        node = self._not()
+        while self._keyword('and'):
+            node = ('and', node, self._not())
+        return node
+
+    def _not(self):
+        if self._keyword('not'):
+            return ('not', self._not())
+        token = self._peek()
+        if token == ('paren', '('):
+            self.pos += 1
+            node = self._or()
+            if self._peek() != ('paren', ')'):
+                raise ValueError("缺少右括号")
+            self.pos += 1
+            return node
+        return self._comparison()
+
+    def _comparison(self):
+        token = self._peek()
+        if token is None:
+            raise ValueError("表达式不完整")
+        if token[0] != 'word' or token[1].lower() in _KEYWORDS:
+            raise ValueError(f"此处应为字段名: {token[1]}")
+        field = token[1].lower()
+        if field not in FIELDS:
+            raise ValueError(f"未知字段: {token[1]}")
+        self.pos += 1
+        token = self._peek()
+        if token is None or token[0] != 'op':
+            raise ValueError(f"字段 {field} 后缺少运算符")
+        op = token[1]
+        self.pos += 1
+        token = self._peek()
+        if token is None or token[0] not in ('word', 'value'):
+            raise ValueError(f"字段 {field} 缺少比较值")
+        self.pos += 1
+        return self._compile(field, op, token[1])
+
+    @staticmethod
+    def _compile(field: str, op: str, text: str):
+        column, kind, level = FIELDS[field]
+        if kind in (VALUE_CODE, VALUE_TEXT):
+            if op not in _MATCH_OPERATORS:
+                raise ValueError(f"字段 {field} 不支持运算符 {op}")
+            if kind == VALUE_CODE:
+                names = [n.strip().lower() for n in text.split(',') if n.strip()]
+                if not names:
+                    raise ValueError(f"字段 {field} 缺少比较值")
+                value = [CODEC_ALIASES.get(n, n) for n in names] if column != 'status' else names
+            else:
+                value = text
+        else:
+            if op not in _COMPARE_OPERATORS:
+                raise ValueError(f"字段 {field} 不支持运算符 {op}")
+            value = _parse_number(text, kind)
+        return ('cmp', column, kind, level, op, value)
+
+
+class QueueFilter:
+    """已解析的过滤表达式（空表达式匹配所有文件）"""
+
+    def __init__(self, expression: str = ""):
+        """
+        Args:
+            expression: 过滤表达式
+
+        Raises:
+            ValueError: 表达式有误（消息说明原因）
+        """
+        self.expression = expression.strip()
+        self._tree = _Parser(_tokenize(self.expression)).parse() if self.expression else None
+
+    def is_empty(self) -> bool:
+        return self._tree is None
+
+    def mask(self, store: MediaStore):
+        """每行是否满足条件：NumPy 布尔数组（已安装时）或布尔值列表"""
+        if self._tree is None:
+            return numpy_module().ones(len(store), dtype=bool) if HAS_NUMPY else [True] * len(store)
+        return _Evaluator(store).evaluate(self._tree)
+
+    def rows(self, store: MediaStore) -> List[int]:
+        """满足条件的行（队列顺序）"""
+        if self._tree is None:
+            return list(range(len(store)))
+        mask = self.mask(store)
+        if HAS_NUMPY:
+            return numpy_module().flatnonzero(mask).tolist()
+        return [row for row, matched in enumerate(mask) if matched]
+
+
+class _Evaluator:
+    """在 MediaStore 的整列上计算表达式（同一次计算中的列只读取一次）"""
+
+    def __init__(self, store: MediaStore):
+        self.store = store
+        self._columns = {}
+
+    def _column(self, name: str):
+        if name not in self._columns:
+            store = self.store
+            if name == 'bitrate':
+                total, video = store.column('format_bitrate'), store.column('video_bitrate')
+                if HAS_NUMPY:
+                    values = numpy_module().where(total > 0, total, video)
+                else:
+                    values = [t or v for t, v in zip(total, video)]
+            elif name == 'path':
+                values = store.paths()
+            elif name == 'name':
+                values = [os.path.basename(p) for p in store.paths()]
+            else:
+                values = store.column(name)
+            self._columns[name] = values
+        return self._columns[name]
+
+    def evaluate(self, node):
+        kind = node[0]
+        if kind == 'and' or kind == 'or':
+            left, right = self.evaluate(node[1]), self.evaluate(node[2])
+            if HAS_NUMPY:
+                return left & right if kind == 'and' else left | right
+            if kind == 'and':
+                return [a and b for a, b in zip(left, right)]
+            return [a or b for a, b in zip(left, right)]
+        if kind == 'not':
+            inner = self.evaluate(node[1])
+            return ~inner if HAS_NUMPY else [not a for a in inner]
+        _, column, value_kind, level, op, value = node
+        if value_kind == VALUE_CODE:
+            mask = self._match_codes(column, op, value)
+        elif value_kind == VALUE_TEXT:
+            mask = self._match_text(column, op, value)
+        else:
+            mask = self._compare(column, op, value)
+        if level == PROBE_NONE:
+            return mask
+        # 尚未获取所需信息的行不满足比较
+        probe = self._column('probe')
+        if HAS_NUMPY:
+            known = probe == PROBE_DETAILED if level == PROBE_DETAILED else (probe == PROBE_QUICK) | (probe == PROBE_DETAILED)
+            return mask & known
+        allowed = (PROBE_DETAILED,) if level == PROBE_DETAILED else (PROBE_QUICK, PROBE_DETAILED)
+        return [m and p in allowed for m, p in zip(mask, probe)]
+
+    def _compare(self, column: str, op: str, value: float):
+        values = self._column(column)
+        if HAS_NUMPY:
+            if op == '<':
+                return values < value
+            if op == '<=':
+                return values <= value
+            if op == '>':
+                return values > value
+            if op == '>=':
+                return values >= value
+            if op == '=':
+                return values == value
+            return values != value
+        compare = {
+            '<': lambda a: a < value, '<=': lambda a: a <= value, '>': lambda a: a > value,
+            '>=': lambda a: a >= value, '=': lambda a: a == value, '!=': lambda a: a != value,
+        }[op]
+        return [compare(a) for a in values]
+
+    def _match_codes(self, column: str, op: str, names: List[str]):
+        table = self.store.code_tables[column]
+        if op in ('~', '!~'):
+            patterns = [_glob_regex(n) for n in names]
+            codes = [code for code, n in enumerate(table.names) if n and any(p.match(n) for p in patterns)]
+        else:
+            codes = [table.lookup(n) for n in names]
+        codes = [c for c in codes if c >= 0]
+        values = self._column(column)
+        if HAS_NUMPY:
+            mask = numpy_module().isin(values, codes)
+            return ~mask if op.startswith('!') else mask
+        code_set = set(codes)
+        negate = op.startswith('!')
+        return [(code in code_set) != negate for code in values]
+
+    def _match_text(self, column: str, op: str, text: str):
+        values = self._column(column)
+        negate = op.startswith('!')
+        if op in ('~', '!~'):
+            match = _glob_regex(text).match
+            mask = [(match(v) is not None) != negate for v in values]
+        else:
+            target = os.path.normcase(text)
+            mask = [(os.path.normcase(v) == target) != negate for v in values]
+        return numpy_module().array(mask, dtype=bool) if HAS_NUMPY else mask
@@ -0,0 +1,129 @@
+"""
+队列清单 - 以 JSON Lines 格式导入/导出编码队列（可选 gzip 压缩）
+
+每行一个任务：
+    {"path": "D:/in/a.mp4", "output": "E:/out/a.mp4", "status": "waiting",
+     "settings": {"video_crf": 26}, "probe": {"width": 1920, "height": 1080, ...}}
+
+只有 path 是必需的：output 为空时按当前输出目录计算，settings 为文件级配置项覆盖，
+probe 为 FFmpegHandler 解析后的视频信息（导入时不再探测）。第一行可以是清单头
+{"manifest": "vvenc-queue", "version": 1}。
+
+读取和写入都是逐行进行的，清单大小不影响内存占用；文件名以 .gz 结尾时使用 gzip 压缩
+（读取时按文件内容判断）。
+"""
+import gzip
+import json
+from typing import Any, Dict, Iterator, Optional
+
+MANIFEST_FORMAT = "vvenc-queue"
+MANIFEST_VERSION = 1
+
+# gzip 文件头
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def open_manifest(path: str, mode: str = "r"):
+    """
+    以文本方式打开清单文件
+
+    Args:
+        mode: "r" 读取（按文件内容判断是否为 gzip）或 "w" 写入（文件名以 .gz 结尾时压缩）
+    """
+    if mode == "r":
+        with open(path, "rb") as f:
+            compressed = f.read(2) == _GZIP_MAGIC
+    else:
+        compressed = path.lower().endswith(".gz")
+    if compressed:
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="\n")
+    return open(path, mode, encoding="utf-8", newline="\n")
+
+
+class ManifestWriter:
+    """逐行写入清单（用作上下文管理器）"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._stream = None
+
+    def __enter__(self) -> "ManifestWriter":
+        self._stream = open_manifest(self.path, "w")
+        self._write_line({"manifest": MANIFEST_FORMAT, "version": MANIFEST_VERSION})
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stream.close()
+        self._stream = None
+
+    def _write_line(self, record: Dict[str, Any]):
+        self._stream.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def write(self, path: str, output: str = "", status: str = "",
+              settings: Optional[Dict[str, Any]] = None, probe: Optional[Dict[str, Any]] = None):
+        """写入一个任务（空字段省略）"""
+        record: Dict[str, Any] = {"path": path}
+        if output:
+            record["output"] = output
+        if status:
+            record["status"] = status
+        if settings:
+            record["settings"] = settings
+        if probe:
+            record["probe"] = {k: v for k, v in probe.items() if k != "file_path"}
+        self._write_line(record)
+        self.count += 1
+
+
+class ManifestReader:
+    """
+    逐行读取清单，迭代得到规范化的任务字典
+    {"path", "output", "status", "settings", "probe"}（缺少的字段为空字符串/空字典）
+
+    无效的行被跳过并计入 errors，first_error 记录第一个错误的行号和原因。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self.errors = 0
+        self.first_error = ""
+
+    def _error(self, line_number: int, message: str):
+        self.errors += 1
+        if not self.first_error:
+            self.first_error = f"第 {line_number} 行: {message}"
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with open_manifest(self.path, "r") as stream:
+            for line_number, line in enumerate(stream, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    self._error(line_number, f"JSON 格式错误 ({e})")
+                    continue
+                if not isinstance(record, dict):
+                    self._error(line_number, "应为 JSON 对象")
+                    continue
+                if "manifest" in record:
+                    if record.get("manifest") != MANIFEST_FORMAT or record.get("version", 1) > MANIFEST_VERSION:
+                        raise ValueError(f"不支持的清单格式: {record.get('manifest')} v{record.get('version')}")
+                    continue
+                path = record.get("path")
+                if not isinstance(path, str) or not path:
+                    self._error(line_number, "缺少 path")
+                    continue
+                settings = record.get("settings")
+                probe = record.get("probe")
+                self.count += 1
+                yield {
+                    "path": path,
+                    "output": record.get("output") if isinstance(record.get("output"), str) else "",
+                    "status": record.get("status") if isinstance(record.get("status"), str) else "",
+                    "settings": settings if isinstance(settings, dict) else {},
+                    "probe": probe if isinstance(probe, dict) else {},
+                }
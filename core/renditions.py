@@ -0,0 +1,187 @@
+"""
+多码率输出（Renditions） - 一次解码，通过 split 滤镜分出多路编码，每路输出一个文件
+
+每个输出规格是一个字典：name 为输出文件名后缀，其余键覆盖全局编码参数，例如
+    [{"name": "1080p", "video_resolution": "-2:1080", "video_crf": "21"},
+     {"name": "720p", "video_resolution": "-2:720", "video_crf": "23"},
+     {"name": "480p", "video_resolution": "-2:480", "video_codec": "libx264", "video_crf": "26"}]
+输入 clip.mkv、基础输出 clip.mp4 时分别输出 clip_1080p.mp4、clip_720p.mp4、clip_480p.mp4。
+
+所有分支共用的前置滤镜（例如相同的降帧 fps）放在 split 之前，只执行一次。
+"""
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.filter_graph import DEFAULT_SCALE_FLAGS, plan_video_filters, target_pix_fmt
+
+# 输出规格可以覆盖的编码参数
+RENDITION_FIELDS = (
+    "video_codec", "video_preset", "video_crf", "video_resolution", "video_bit_depth", "video_framerate"
+)
+
+# 后缀中不允许出现的字符（路径分隔符和 Windows 保留字符）
+_INVALID_NAME_CHARS = re.compile(r'[\\/:*?"<>|\s]+')
+
+
+def normalize_renditions(value: Any) -> List[Dict[str, str]]:
+    """
+    整理输出规格列表
+
+    Args:
+        value: 规格列表或其 JSON 字符串（命令行 --set renditions=...）
+
+    Returns:
+        有效的规格列表：没有名称的规格被忽略，名称中的非法字符替换为 "-"，重复的名称只保留第一个
+    """
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return []
+        value = json.loads(value)
+    renditions = []
+    names = set()
+    for item in value or []:
+        if not isinstance(item, dict):
+            continue
+        name = _INVALID_NAME_CHARS.sub("-", str(item.get("name", "")).strip()).strip("-.")
+        if not name or name.lower() in names:
+            continue
+        names.add(name.lower())
+        rendition = {"name": name}
+        for key in RENDITION_FIELDS:
+            if item.get(key) not in (None, ""):
+                rendition[key] = str(item[key])
+        renditions.append(rendition)
+    return renditions
+
+
+def active_renditions(encode_kwargs: Dict[str, Any]) -> List[Dict[str, str]]:
+    """任务实际使用的输出规格（使用自定义命令模板时不生效）"""
+    if encode_kwargs.get("use_custom") and encode_kwargs.get("custom_template"):
+        return []
+    return normalize_renditions(encode_kwargs.get("renditions"))
+
+
+def rendition_output_path(output_path: str, name: str) -> str:
+    """在基础输出文件名后加上规格后缀：clip.mp4 -> clip_720p.mp4"""
+    root, ext = os.path.splitext(output_path)
+    return f"{root}_{name}{ext}"
+
+
+def rendition_outputs(output_path: str, renditions: Any) -> List[Tuple[str, str]]:
+    """
+    任务实际写出的文件
+
+    Returns:
+        [(规格名称, 输出路径)]；没有配置多码率输出时为 [("", 基础输出路径)]
+    """
+    renditions = normalize_renditions(renditions)
+    if not renditions:
+        return [("", output_path)]
+    return [(r["name"], rendition_output_path(output_path, r["name"])) for r in renditions]
+
+
+def rendition_kwargs(encode_kwargs: Dict[str, Any], rendition: Dict[str, str]) -> Dict[str, Any]:
+    """合并全局编码参数和单个规格的覆盖，得到该分支的编码参数（不再包含 renditions）"""
+    kwargs = dict(encode_kwargs)
+    kwargs.pop("renditions", None)
+    for key in RENDITION_FIELDS:
+        if key in rendition:
+            kwargs[key] = rendition[key]
+    return kwargs
+
+
+def build_split_graph(
+    branches: List[Dict[str, Any]],
+    scale_flags: str = DEFAULT_SCALE_FLAGS,
+    source: Optional[Dict[str, Any]] = None
+) -> Tuple[str, List[str]]:
+    """
+    为各分支生成 -filter_complex 滤镜图
+
+    Args:
+        branches: 各分支的编码参数（rendition_kwargs 的结果）
+        scale_flags: 缩放算法
+        source: 源视频信息
+
+    Returns:
+        (滤镜图, 各分支 -map 使用的视频来源)；直接复制视频或无需滤镜的分支使用 "0:v:0"，
+        没有分支需要滤镜时滤镜图为空字符串
+    """
+    chains = {}
+    for index, kwargs in enumerate(branches):
+        video_codec = kwargs.get("video_codec", "")
+        if not video_codec or video_codec == "copy":
+            continue
+        steps = plan_video_filters(
+            kwargs.get("video_resolution", ""),
+            target_pix_fmt(video_codec, kwargs.get("video_bit_depth", "8")),
+            kwargs.get("video_framerate", ""),
+            kwargs.get("scale_flags", scale_flags),
+            source,
+            kwargs.get("crop", ""),
+            kwargs.get("mpdecimate", "")
+        ).steps
+        chains[index] = [step.expression for step in steps]
+
+    sources = ["0:v:0"] * len(branches)
+    if not any(chains.values()):
+        return "", sources
+
+    # 所有编码分支共同的前置滤镜只执行一次
+    shared: List[str] = []
+    for expressions in zip(*chains.values()):
+        if len(set(expressions)) != 1:
+            break
+        shared.append(expressions[0])
+    for index in chains:
+        chains[index] = chains[index][len(shared):]
+
+    if len(chains) == 1:
+        # 只有一个编码分支时整条滤镜链都是“共用”的，不需要 split
+        index = next(iter(chains))
+        sources[index] = f"[v{index}]"
+        return f"[0:v:0]{','.join(shared)}[v{index}]", sources
+
+    head = "[0:v:0]" + "".join(expression + "," for expression in shared)
+    graph = [head + f"split={len(chains)}" + "".join(f"[s{index}]" for index in chains)]
+    for index, expressions in chains.items():
+        if expressions:
+            graph.append(f"[s{index}]{','.join(expressions)}[v{index}]")
+            sources[index] = f"[v{index}]"
+        else:
+            sources[index] = f"[s{index}]"
+    return ";".join(graph), sources
+
+
+def _format_size(size: int) -> str:
+    for unit in ("KB", "MB", "GB"):
+        size /= 1024.0
+        if size < 1024.0 or unit == "GB":
+            return f"{size:.1f} {unit}"
+
+
+def check_outputs(output_path: str, renditions: Any) -> Tuple[bool, str]:
+    """
+    FFmpeg 成功退出后逐个检查各规格的输出文件
+
+    Returns:
+        (所有输出都存在且非空, 消息)，消息列出每个规格的结果，例如
+        "Success: 1080p 12.3 MB, 720p 6.1 MB" 或 "Failed: 480p missing"
+    """
+    results = []
+    missing = []
+    for name, path in rendition_outputs(output_path, renditions):
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        if size > 0:
+            results.append(f"{name} {_format_size(size)}")
+        else:
+            missing.append(f"{name} missing")
+    if missing:
+        return False, "Failed: " + ", ".join(missing + results)
+    return True, "Success: " + ", ".join(results)
@@ -0,0 +1,204 @@
+"""
+抽样试编码预估 - 在每个文件中抽取几个短窗口，用实际的编码参数试编码，推算整个文件的输出大小和编码耗时
+
+每个窗口的命令就是 FFmpegHandler.build_command 生成的编码命令（包括文件级设置、滤镜、多码率输出），
+只是在 -i 之前加上 -ss 快速定位、在输入之后加上 -t 限制长度，输出写入临时目录，测量后删除。
+所有文件的窗口在同一个有上限的线程池中并行运行。
+
+每个窗口得到“每秒源视频的输出字节数”和“每秒源视频的编码耗时”，按时长加权平均后乘以文件时长即为推算值；
+各窗口中最小和最大的比率乘以文件时长作为范围：画面复杂度在文件中变化越大，范围越宽。
+
+编码耗时是与其他窗口并行运行时测得的墙钟时间，按并行的窗口数折算为单独编码时的耗时（假设 CPU 被充分利用）；
+短窗口中包含进程启动和编码器初始化的时间，耗时略偏高。
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.crop_detect import sample_offsets
+
+# 默认每个文件的窗口数、窗口时长（秒）和同时运行的窗口数
+DEFAULT_SAMPLES = 3
+DEFAULT_WINDOW = 5.0
+DEFAULT_WORKERS = 2
+# 每个窗口的超时（秒）
+WINDOW_TIMEOUT = 600
+
+if sys.platform == 'win32':
+    CREATE_NO_WINDOW = 0x08000000
+else:
+    CREATE_NO_WINDOW = 0
+
+# 一个窗口的测量结果：(源视频秒数, 输出字节数, 编码耗时秒数)
+Window = Tuple[float, int, float]
+
+
+def build_sample_command(command: List[str], offset: float, window: float) -> List[str]:
+    """
+    在编码命令中加入快速定位和时长限制
+
+    Raises:
+        ValueError: 命令中没有 -i（例如不含输入的自定义命令模板）
+    """
+    index = command.index("-i")
+    return (command[:index] + ["-ss", f"{offset:.3f}"] + command[index:index + 2]
+            + ["-t", f"{window:.3f}"] + command[index + 2:])
+
+
+class SampleEstimate:
+    """一个文件的抽样试编码结果及推算值"""
+
+    def __init__(self, duration: float, windows: List[Window], parallel: int = 1):
+        """
+        Args:
+            duration: 文件时长（秒）
+            windows: 各窗口的测量结果
+            parallel: 测量时同时运行的窗口数（用于折算单独编码的耗时）
+        """
+        self.duration = duration
+        self.windows = [w for w in windows if w[0] > 0 and w[1] > 0]
+        seconds = sum(w[0] for w in self.windows)
+        parallel = max(1, parallel)
+        size_rates = [w[1] / w[0] for w in self.windows]
+        time_rates = [w[2] / w[0] / parallel for w in self.windows]
+        if not seconds:
+            size_rates = time_rates = [0.0]
+        self.size = sum(w[1] for w in self.windows) / seconds * duration if seconds else 0.0
+        self.size_low, self.size_high = min(size_rates) * duration, max(size_rates) * duration
+        self.time = sum(w[2] for w in self.windows) / seconds / parallel * duration if seconds else 0.0
+        self.time_low, self.time_high = min(time_rates) * duration, max(time_rates) * duration
+
+    @property
+    def ok(self) -> bool:
+        return bool(self.windows) and self.duration > 0
+
+    def to_fields(self) -> Dict[str, float]:
+        """MediaStore.set_estimate 使用的字段"""
+        return {
+            "est_size": self.size, "est_size_low": self.size_low, "est_size_high": self.size_high,
+            "est_time": self.time, "est_time_low": self.time_low, "est_time_high": self.time_high,
+        }
+
+
+def summarize(estimates: List[Dict[str, float]], concurrency: int = 1) -> Dict[str, float]:
+    """
+    汇总多个文件的预估（to_fields 的结果）
+
+    范围为各文件范围之和（各文件的偏差同向时的最坏情况）；耗时按同时编码的文件数折算。
+    """
+    concurrency = max(1, concurrency)
+    total = {name: 0.0 for name in ("est_size", "est_size_low", "est_size_high",
+                                     "est_time", "est_time_low", "est_time_high")}
+    for fields in estimates:
+        for name in total:
+            total[name] += fields.get(name, 0.0)
+    for name in ("est_time", "est_time_low", "est_time_high"):
+        total[name] /= concurrency
+    return total
+
+
+class SampleEstimator:
+    """在有上限的线程池中运行所有文件的试编码窗口"""
+
+    def __init__(
+        self,
+        build_command: Callable[..., list],
+        workers: int = DEFAULT_WORKERS,
+        samples: int = DEFAULT_SAMPLES,
+        window: float = DEFAULT_WINDOW
+    ):
+        """
+        Args:
+            build_command: FFmpegHandler.build_command
+            workers: 同时运行的窗口数
+            samples: 每个文件的窗口数
+            window: 窗口时长（秒）
+        """
+        self.build_command = build_command
+        self.workers = max(1, workers)
+        self.samples = samples
+        self.window = window
+        self._cancelled = False
+
+    def cancel(self):
+        """取消：尚未开始的窗口不再运行，正在运行的窗口被终止"""
+        self._cancelled = True
+
+    def _run_window(self, input_path: str, output_path: str, kwargs: dict, offset: float,
+                    seconds: float) -> Optional[Window]:
+        if self._cancelled:
+            return None
+        temp_dir = tempfile.mkdtemp(prefix="vvenc_sample_")
+        try:
+            # 多码率输出时各规格的输出都写在临时目录中，合计大小
+            sample_output = os.path.join(temp_dir, "sample" + os.path.splitext(output_path)[1])
+            cmd = build_sample_command(self.build_command(input_path, sample_output, **kwargs), offset, seconds)
+            start = time.monotonic()
+            process = subprocess.Popen(
+                cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                creationflags=CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+            )
+            while process.poll() is None:
+                if self._cancelled or time.monotonic() - start > WINDOW_TIMEOUT:
+                    process.kill()
+                    process.wait()
+                    return None
+                time.sleep(0.05)
+            elapsed = time.monotonic() - start
+            if process.returncode != 0:
+                return None
+            size = sum(os.path.getsize(os.path.join(temp_dir, name)) for name in os.listdir(temp_dir))
+            return seconds, size, elapsed
+        except (OSError, ValueError) as e:
+            print(f"试编码失败: {e}")
+            return None
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def run(
+        self,
+        jobs: List[Tuple[str, str, dict, float]],
+        on_result: Callable[[str, Optional[SampleEstimate]], None]
+    ):
+        """
+        试编码所有文件（阻塞直到完成或取消）
+
+        Args:
+            jobs: [(输入文件, 输出文件, build_command 的编码参数, 时长)]；时长未知（0）的文件无法推算，结果为 None
+            on_result: 每个文件的所有窗口完成后调用（在线程池的线程中），无法预估时结果为 None
+        """
+        windows: Dict[str, List[Optional[Window]]] = {}
+        remaining: Dict[str, int] = {}
+        lock = threading.Lock()
+        tasks = []
+        for input_path, output_path, kwargs, duration in jobs:
+            offsets = sample_offsets(duration, self.samples, self.window) if duration > 0 else []
+            if not offsets:
+                on_result(input_path, None)
+                continue
+            windows[input_path] = []
+            remaining[input_path] = len(offsets)
+            for offset in offsets:
+                seconds = min(self.window, duration - offset)
+                tasks.append((input_path, output_path, kwargs, offset, seconds, duration))
+        parallel = min(self.workers, len(tasks)) or 1
+
+        def run_task(task):
+            input_path, output_path, kwargs, offset, seconds, duration = task
+            result = self._run_window(input_path, output_path, kwargs, offset, seconds)
+            with lock:
+                windows[input_path].append(result)
+                remaining[input_path] -= 1
+                done = remaining[input_path] == 0
+            if done and not self._cancelled:
+                estimate = SampleEstimate(duration, [w for w in windows[input_path] if w], parallel)
+                on_result(input_path, estimate if estimate.ok else None)
+
+        with ThreadPoolExecutor(max_workers=parallel) as executor:
+            list(executor.map(run_task, tasks))
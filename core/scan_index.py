@@ -0,0 +1,221 @@
+"""
+目录快照索引 - 记录每个扫描根目录的目录修改时间和视频文件 (大小, 修改时间, inode)
+
+再次扫描时只列出修改时间发生变化的目录（目录中增删或重命名文件会更新其修改时间），
+未变化的目录直接沿用快照中的子目录和文件列表，并返回与上次扫描相比新增、删除和修改的视频。
+"""
+import json
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 索引文件名（与配置文件位于同一目录）
+SCAN_INDEX_FILE = "scan_index.json"
+# 索引格式版本
+INDEX_VERSION = 1
+
+
+class ScanDelta:
+    """两次扫描之间的变化（绝对路径）"""
+
+    def __init__(self, added: Optional[List[str]] = None, removed: Optional[List[str]] = None,
+                 modified: Optional[List[str]] = None, initial: bool = False):
+        """
+        Args:
+            added: 新增的视频
+            removed: 已删除的视频
+            modified: 大小或修改时间变化的视频
+            initial: 是否为该目录的首次扫描（此时所有文件都在 added 中）
+        """
+        self.added = added or []
+        self.removed = removed or []
+        self.modified = modified or []
+        self.initial = initial
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.modified)
+
+    def __repr__(self):
+        return (f"ScanDelta(added={len(self.added)}, removed={len(self.removed)}, "
+                f"modified={len(self.modified)}, initial={self.initial})")
+
+
+class DirectorySnapshot:
+    """单个根目录的快照"""
+
+    def __init__(self, root: str, dirs: Optional[Dict[str, int]] = None,
+                 files: Optional[Dict[str, List[int]]] = None):
+        """
+        Args:
+            root: 根目录绝对路径
+            dirs: {相对目录路径（根目录为 ""）: 修改时间 ns}
+            files: {相对文件路径: [大小, 修改时间 ns, inode]}
+        """
+        self.root = root
+        self.dirs = dirs if dirs is not None else {}
+        self.files = files if files is not None else {}
+
+    def to_dict(self) -> dict:
+        return {"root": self.root, "dirs": self.dirs, "files": self.files}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DirectorySnapshot":
+        return cls(data["root"], data.get("dirs", {}), data.get("files", {}))
+
+    def rescan(self, is_video: Callable[[str], bool],
+               verify_files: bool = True) -> Tuple["DirectorySnapshot", ScanDelta]:
+        """
+        与磁盘比较并生成新快照
+
+        Args:
+            is_video: 判断文件名是否为视频文件
+            verify_files: 是否检查未变化目录中已知文件的大小和修改时间（用于发现内容被修改的文件）
+
+        Returns:
+            (新快照, 变化)
+        """
+        initial = not self.dirs
+        # 快照中每个目录的子目录和文件（目录未变化时直接使用）
+        child_dirs: Dict[str, List[str]] = {}
+        for rel_dir in self.dirs:
+            if rel_dir:
+                child_dirs.setdefault(os.path.dirname(rel_dir), []).append(rel_dir)
+        child_files: Dict[str, List[str]] = {}
+        for rel_path in self.files:
+            child_files.setdefault(os.path.dirname(rel_path), []).append(rel_path)
+
+        new_dirs: Dict[str, int] = {}
+        new_files: Dict[str, List[int]] = {}
+        added: List[str] = []
+        modified: List[str] = []
+
+        def record(rel_path: str, entry: List[int]):
+            new_files[rel_path] = entry
+            old = self.files.get(rel_path)
+            if old is None:
+                added.append(os.path.join(self.root, rel_path))
+            elif old[0] != entry[0] or old[1] != entry[1]:
+                modified.append(os.path.join(self.root, rel_path))
+
+        stack = [""]
+        while stack:
+            rel_dir = stack.pop()
+            abs_dir = os.path.join(self.root, rel_dir) if rel_dir else self.root
+            try:
+                dir_mtime = os.stat(abs_dir).st_mtime_ns
+            except OSError:
+                continue
+            new_dirs[rel_dir] = dir_mtime
+
+            if self.dirs.get(rel_dir) == dir_mtime:
+                # 目录内容未增删：不列目录，沿用快照
+                for rel_path in child_files.get(rel_dir, []):
+                    if not verify_files:
+                        new_files[rel_path] = self.files[rel_path]
+                        continue
+                    try:
+                        st = os.stat(os.path.join(self.root, rel_path))
+                    except OSError:
+                        continue
+                    record(rel_path, [st.st_size, st.st_mtime_ns, st.st_ino])
+                stack.extend(reversed(child_dirs.get(rel_dir, [])))
+                continue
+
+            subdirs = []
+            try:
+                with os.scandir(abs_dir) as entries:
+                    for entry in entries:
+                        rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                        try:
+                            # 与 os.walk 一致：不进入指向目录的符号链接
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirs.append(rel_path)
+                            elif entry.is_file() and is_video(entry.name):
+                                st = entry.stat()
+                                record(rel_path, [st.st_size, st.st_mtime_ns, st.st_ino])
+                        except OSError:
+                            continue
+            except OSError as e:
+                print(f"扫描目录失败: {abs_dir}: {e}")
+                continue
+            stack.extend(reversed(subdirs))
+
+        removed = [os.path.join(self.root, p) for p in self.files if p not in new_files]
+        return DirectorySnapshot(self.root, new_dirs, new_files), ScanDelta(added, removed, modified, initial)
+
+    def paths(self) -> List[str]:
+        """快照中所有视频的绝对路径"""
+        return [os.path.join(self.root, p) for p in self.files]
+
+
+class ScanIndex:
+    """所有扫描根目录的快照索引（持久化为 JSON，首次使用时加载）"""
+
+    def __init__(self, index_file: Optional[str] = None):
+        """
+        Args:
+            index_file: 索引文件路径，None 表示只保存在内存中
+        """
+        self.index_file = index_file
+        self._snapshots: Optional[Dict[str, DirectorySnapshot]] = None
+        self._dirty = False
+
+    def _load(self) -> Dict[str, DirectorySnapshot]:
+        if self._snapshots is not None:
+            return self._snapshots
+        self._snapshots = {}
+        if self.index_file and os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_VERSION:
+                    for key, snapshot in data.get("roots", {}).items():
+                        self._snapshots[key] = DirectorySnapshot.from_dict(snapshot)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"加载目录索引失败: {e}")
+        return self._snapshots
+
+    @staticmethod
+    def _key(root: str) -> str:
+        return os.path.normcase(os.path.abspath(root))
+
+    def scan(self, root: str, is_video: Callable[[str], bool],
+             verify_files: bool = True) -> Tuple[List[str], ScanDelta]:
+        """
+        扫描根目录（增量）
+
+        Returns:
+            (目录中所有视频的绝对路径, 与上次扫描相比的变化)
+        """
+        snapshots = self._load()
+        key = self._key(root)
+        old = snapshots.get(key) or DirectorySnapshot(os.path.abspath(root))
+        new, delta = old.rescan(is_video, verify_files)
+        if new.dirs:
+            snapshots[key] = new
+        else:
+            # 根目录已不存在
+            snapshots.pop(key, None)
+        if not delta.is_empty() or new.dirs != old.dirs:
+            self._dirty = True
+        return new.paths(), delta
+
+    def forget(self, root: str):
+        """删除根目录的快照"""
+        if self._load().pop(self._key(root), None) is not None:
+            self._dirty = True
+
+    def save(self):
+        """保存索引（无变化时不写入）"""
+        if not self._dirty or not self.index_file or self._snapshots is None:
+            return
+        try:
+            tmp_path = self.index_file + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "version": INDEX_VERSION,
+                    "roots": {key: s.to_dict() for key, s in self._snapshots.items()}
+                }, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_file)
+            self._dirty = False
+        except OSError as e:
+            print(f"保存目录索引失败: {e}")
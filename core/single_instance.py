@@ -0,0 +1,168 @@
+"""
+单实例 - 通过本地套接字（Windows 命名管道 / Unix 域套接字）保证每个用户只运行一个窗口
+
+第二次启动时将命令行中的路径转发给已运行的实例后立即退出；
+本模块不依赖 PyQt5，必须在导入界面模块之前调用，以保证第二个实例能在毫秒级退出。
+消息使用 JSON 编码（不使用 pickle），避免执行其它进程发来的数据。
+"""
+import getpass
+import json
+import os
+import stat
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+from typing import Callable, List, Optional
+
+# 连接超时和消息大小限制
+MAX_MESSAGE_BYTES = 4 * 1024 * 1024
+# 接受连接出错后重试前的等待时间（秒）
+ACCEPT_RETRY_INTERVAL = 0.5
+
+
+def _user_name() -> str:
+    try:
+        name = getpass.getuser()
+    except Exception:
+        name = "user"
+    return "".join(c for c in name if c.isalnum() or c in "-_") or "user"
+
+
+def _is_private_dir(path: str) -> bool:
+    """目录是否为当前用户所有、不是符号链接，且组和其他用户没有任何权限"""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def instance_address(app_name: str = "vvenc") -> Optional[str]:
+    """
+    当前用户的单实例地址
+
+    Returns:
+        地址；临时目录中的套接字目录不安全（其他用户创建、符号链接或权限过宽）时返回 None，跳过单实例检查
+    """
+    if sys.platform == 'win32':
+        return rf'\\.\pipe\{app_name}-{_user_name()}'
+    # Unix 域套接字放在仅当前用户可访问的目录中
+    base_dir = os.environ.get("XDG_RUNTIME_DIR") or ""
+    if not base_dir or not os.path.isdir(base_dir):
+        base_dir = os.path.join(tempfile.gettempdir(), f"{app_name}-{_user_name()}")
+        try:
+            os.makedirs(base_dir, mode=0o700)
+        except FileExistsError:
+            pass
+        except OSError as e:
+            print(f"创建单实例目录失败: {e}")
+            return None
+        # 临时目录所有用户都可写入：目录可能是其他用户预先创建的，确认安全后才使用
+        if not _is_private_dir(base_dir):
+            print(f"单实例目录不安全，跳过单实例检查: {base_dir}")
+            return None
+    return os.path.join(base_dir, f"{app_name}.sock")
+
+
+class SingleInstance:
+    """单实例守护"""
+
+    def __init__(self, address: Optional[str] = None):
+        # 为 None 时（无法安全地确定地址）不转发也不监听，每次启动都是独立的窗口
+        self.address = address or instance_address()
+        self._listener: Optional[Listener] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def forward(self, paths: List[str]) -> bool:
+        """
+        尝试将路径转发给已运行的实例
+
+        Returns:
+            True 表示已有实例在运行并已接收路径（当前进程应退出）
+        """
+        if self.address is None:
+            return False
+        try:
+            conn = Client(self.address)
+        except (OSError, EOFError):
+            return False
+        try:
+            conn.send_bytes(json.dumps({"paths": paths}, ensure_ascii=False).encode('utf-8'))
+            # 等待确认，保证路径已被接收后再退出
+            return conn.poll(2) and conn.recv_bytes(16) == b"ok"
+        except (OSError, EOFError):
+            return False
+        finally:
+            conn.close()
+
+    def listen(self, on_paths: Callable[[List[str]], None]) -> bool:
+        """
+        成为主实例并在后台线程中接收其它实例转发的路径
+
+        Args:
+            on_paths: 收到路径时的回调 (paths) -> None，在监听线程中调用
+
+        Returns:
+            False 表示无法监听（例如另一个实例刚好同时启动），此时仍可正常运行
+        """
+        if self.address is None:
+            return False
+        try:
+            self._listener = Listener(self.address)
+        except OSError:
+            # Unix 域套接字文件可能是崩溃的实例遗留的：确认无人监听后删除重试
+            if sys.platform == 'win32' or self._is_alive():
+                return False
+            try:
+                os.remove(self.address)
+                self._listener = Listener(self.address)
+            except OSError as e:
+                print(f"单实例监听失败: {e}")
+                return False
+        self._thread = threading.Thread(target=self._serve, args=(on_paths,), name="SingleInstance", daemon=True)
+        self._thread.start()
+        return True
+
+    def _is_alive(self) -> bool:
+        try:
+            Client(self.address).close()
+            return True
+        except (OSError, EOFError):
+            return False
+
+    def _serve(self, on_paths: Callable[[List[str]], None]):
+        while self._listener is not None:
+            try:
+                conn = self._listener.accept()
+            except EOFError:
+                continue
+            except OSError as e:
+                # close() 关闭监听后退出；其他错误等待片刻后重试，避免空转
+                if self._listener is None:
+                    return
+                print(f"单实例接受连接失败: {e}")
+                time.sleep(ACCEPT_RETRY_INTERVAL)
+                continue
+            try:
+                data = json.loads(conn.recv_bytes(MAX_MESSAGE_BYTES).decode('utf-8'))
+                paths = [str(p) for p in data.get("paths", [])]
+                conn.send_bytes(b"ok")
+            except (OSError, EOFError, ValueError, AttributeError):
+                continue
+            finally:
+                conn.close()
+            try:
+                on_paths(paths)
+            except Exception as e:
+                print(f"处理转发的路径失败: {e}")
+
+    def close(self):
+        """停止监听"""
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            try:
+                listener.close()
+            except OSError:
+                pass
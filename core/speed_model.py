@@ -0,0 +1,275 @@
+"""
+编码速度模型 - 记录本机实际编码的速度，用于预测编码耗时
+
+按 编码器 | 预设 | 分辨率档 | 位深 分组，每组记录“媒体秒数 / 墙钟秒数”，即整台机器每秒能编码多少秒视频。
+媒体秒数按 30fps 折算（60fps 的视频每秒计为 2 秒），不同帧率的视频可以共用同一组数据；
+多个文件同时编码时，墙钟时间按同时编码的文件数折算（假设 CPU 被充分利用）。
+
+每次编码成功后加入一个样本：已有数据先乘以衰减系数，再加上新样本，较新的运行占更大的权重。
+模型保存在配置目录的 speed_model.json 中；保存时重新读取文件并合并新样本，
+界面、命令行和后台编码服务可以共用同一个文件。
+
+预测时优先使用完全匹配的分组；没有数据时用同一编码器（其次是任意编码器）样本最多的分组，
+按预设、分辨率和位深的先验比例换算；本机还没有任何数据时使用默认速度，结果标记为未校准。
+"""
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.crop_detect import job_crop
+from core.filter_graph import output_dimensions, parse_rate
+from core.renditions import active_renditions, rendition_kwargs
+
+# 模型文件名（与配置文件位于同一目录）
+SPEED_MODEL_FILE = "speed_model.json"
+# 模型格式版本
+MODEL_VERSION = 1
+
+# 媒体秒数折算的参考帧率
+REFERENCE_FPS = 30.0
+# 分辨率档（画面短边），输出分辨率归入不小于短边的最小一档，未知时按 1080
+RESOLUTION_BUCKETS = (360, 480, 720, 1080, 1440, 2160, 4320)
+DEFAULT_BUCKET = 1080
+# 加入新样本时已有数据的衰减系数
+DECAY = 0.8
+# 短于该时长（墙钟秒数）的编码不记录（进程启动和编码器初始化占比过大）
+MIN_SAMPLE_SECONDS = 2.0
+
+# 本机没有任何数据时的默认速度（libx264 medium 1080p 8bit，折算后的媒体秒数 / 墙钟秒数）
+DEFAULT_SPEED = 2.0
+# 直接复制视频时的速度（只受磁盘速度限制）
+COPY_SPEED = 200.0
+
+# 各预设相对于 medium / p4 的速度（先验值，只在换算其他分组的数据时使用）
+PRESET_SPEED = {
+    "ultrafast": 8.0, "superfast": 5.5, "veryfast": 3.5, "faster": 2.0, "fast": 1.5,
+    "medium": 1.0, "slow": 0.6, "slower": 0.3, "veryslow": 0.15, "placebo": 0.05,
+    "p1": 2.0, "p2": 1.7, "p3": 1.3, "p4": 1.0, "p5": 0.8, "p6": 0.6, "p7": 0.45,
+}
+# 各编码器相对于 libx264 的速度（先验值）
+CODEC_SPEED = {
+    "libx264": 1.0, "libx265": 0.25, "libsvtav1": 0.35, "libaom-av1": 0.03, "libvpx-vp9": 0.1,
+    "h264_nvenc": 8.0, "hevc_nvenc": 7.0, "av1_nvenc": 6.0,
+}
+# 10bit 相对于 8bit 的速度（先验值）
+TEN_BIT_SPEED = 0.8
+
+# 预测结果的来源
+SOURCE_LEARNED = "learned"
+SOURCE_SCALED = "scaled"
+SOURCE_DEFAULT = "default"
+
+
+def resolution_bucket(width: int, height: int) -> int:
+    """输出分辨率所属的分辨率档"""
+    short_side = min(width, height) if width and height else 0
+    if short_side <= 0:
+        return DEFAULT_BUCKET
+    for bucket in RESOLUTION_BUCKETS:
+        if short_side <= bucket:
+            return bucket
+    return RESOLUTION_BUCKETS[-1]
+
+
+def job_profile(kwargs: Dict[str, Any], info: Optional[dict]) -> Tuple[str, str, int, str]:
+    """
+    任务的分组参数
+
+    Returns:
+        (编码器, 预设, 分辨率档, 位深)
+    """
+    info = info or {}
+    width, height = int(info.get("width") or 0), int(info.get("height") or 0)
+    crop = job_crop(kwargs, info)
+    if crop:
+        width, height = (int(v) for v in crop.split(":")[:2])
+    width, height = output_dimensions(width, height, kwargs.get("video_resolution", "") or "")
+    return (kwargs.get("video_codec", "libx264") or "libx264", kwargs.get("video_preset", "") or "",
+            resolution_bucket(width, height), str(kwargs.get("video_bit_depth", "8") or "8"))
+
+
+def profile_key(profile: Tuple[str, str, int, str]) -> str:
+    """分组在模型文件中的键，例如 "libx264|medium|1080|8" """
+    return "|".join(str(part) for part in profile)
+
+
+def media_seconds(seconds: float, kwargs: Dict[str, Any], info: Optional[dict]) -> float:
+    """源视频秒数按参考帧率折算（帧率未知时按参考帧率）"""
+    fps = parse_rate(kwargs.get("video_framerate") or 0) or float((info or {}).get("fps") or 0)
+    return seconds * (fps or REFERENCE_FPS) / REFERENCE_FPS
+
+
+def learnable(kwargs: Dict[str, Any]) -> bool:
+    """编码结果是否可以作为样本（直接复制、自定义命令和多码率输出的耗时不代表单一分组）"""
+    return not (kwargs.get("video_codec") == "copy" or kwargs.get("use_custom") or active_renditions(kwargs))
+
+
+def _prior(profile: Tuple[str, str, int, str]) -> float:
+    """分组的先验相对速度（用于在分组之间换算）"""
+    codec, preset, bucket, depth = profile
+    speed = CODEC_SPEED.get(codec, 1.0) * PRESET_SPEED.get(preset, 1.0) / float(bucket * bucket)
+    return speed * (TEN_BIT_SPEED if depth == "10" else 1.0)
+
+
+class SpeedModel:
+    """本机编码速度模型（线程安全，首次使用时加载）"""
+
+    def __init__(self, model_file: Optional[str] = None):
+        """
+        Args:
+            model_file: 模型文件路径，None 表示只保存在内存中
+        """
+        self.model_file = model_file
+        self._entries: Optional[Dict[str, dict]] = None
+        # 上次保存之后加入的样本（保存时合并到文件中的最新数据）
+        self._pending: List[Tuple[str, float, float]] = []
+        self._lock = threading.Lock()
+
+    def _read_file(self) -> Dict[str, dict]:
+        if not self.model_file or not os.path.exists(self.model_file):
+            return {}
+        try:
+            with open(self.model_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == MODEL_VERSION:
+                return data.get("entries", {})
+        except (OSError, ValueError) as e:
+            print(f"加载速度模型失败: {e}")
+        return {}
+
+    def _load(self) -> Dict[str, dict]:
+        if self._entries is None:
+            self._entries = self._read_file()
+        return self._entries
+
+    @staticmethod
+    def _apply(entries: Dict[str, dict], key: str, media: float, wall: float):
+        entry = entries.get(key)
+        if entry is None:
+            entry = entries[key] = {"media": 0.0, "wall": 0.0, "samples": 0}
+        entry["media"] = entry["media"] * DECAY + media
+        entry["wall"] = entry["wall"] * DECAY + wall
+        entry["samples"] += 1
+        entry["updated"] = time.time()
+
+    def record(self, kwargs: Dict[str, Any], info: Optional[dict], seconds: float, wall_seconds: float,
+               concurrency: int = 1) -> bool:
+        """
+        加入一次成功编码的样本
+
+        Args:
+            kwargs: 编码参数
+            info: 源视频信息
+            seconds: 编码的源视频秒数
+            wall_seconds: 编码耗时（墙钟秒数）
+            concurrency: 编码期间同时编码的文件数
+
+        Returns:
+            是否记录（不可作为样本或时间过短时不记录）
+        """
+        if seconds <= 0 or wall_seconds < MIN_SAMPLE_SECONDS or not learnable(kwargs):
+            return False
+        key = profile_key(job_profile(kwargs, info))
+        media = media_seconds(seconds, kwargs, info)
+        wall = wall_seconds / max(1, concurrency)
+        with self._lock:
+            self._apply(self._load(), key, media, wall)
+            self._pending.append((key, media, wall))
+        return True
+
+    def speed(self, kwargs: Dict[str, Any], info: Optional[dict]) -> Tuple[float, str]:
+        """
+        预测整台机器的编码速度（折算后的媒体秒数 / 墙钟秒数）
+
+        Returns:
+            (速度, 来源 SOURCE_LEARNED / SOURCE_SCALED / SOURCE_DEFAULT)
+        """
+        if kwargs.get("video_codec") == "copy" and not kwargs.get("use_custom"):
+            return COPY_SPEED, SOURCE_LEARNED
+        profile = job_profile(kwargs, info)
+        with self._lock:
+            entries = dict(self._load())
+        entry = entries.get(profile_key(profile))
+        if entry and entry["wall"] > 0:
+            return entry["media"] / entry["wall"], SOURCE_LEARNED
+        # 同一编码器优先，其次位深相同，再其次样本最多
+        best, best_rank = None, None
+        for key, candidate in entries.items():
+            parts = key.split("|")
+            if len(parts) != 4 or candidate.get("wall", 0) <= 0:
+                continue
+            other = (parts[0], parts[1], int(parts[2]), parts[3])
+            rank = (other[0] == profile[0], other[3] == profile[3], candidate.get("samples", 0))
+            if best_rank is None or rank > best_rank:
+                best, best_rank = (other, candidate), rank
+        if best is not None:
+            other, candidate = best
+            return candidate["media"] / candidate["wall"] * _prior(profile) / _prior(other), SOURCE_SCALED
+        reference = ("libx264", "medium", DEFAULT_BUCKET, "8")
+        return DEFAULT_SPEED * _prior(profile) / _prior(reference), SOURCE_DEFAULT
+
+    def predict(self, kwargs: Dict[str, Any], info: Optional[dict], seconds: Optional[float] = None,
+                share: float = 1.0) -> Tuple[float, str]:
+        """
+        预测编码耗时
+
+        Args:
+            kwargs: 编码参数
+            info: 源视频信息
+            seconds: 源视频秒数，None 表示使用 info 中的时长
+            share: 该任务可以使用的机器比例（同时编码 n 个文件时约为 1/n）
+
+        Returns:
+            (墙钟秒数, 来源)；多码率输出时为各规格之和，来源取最不确定的一个；时长未知时为 0
+        """
+        info = info or {}
+        if seconds is None:
+            seconds = float(info.get("format_duration") or info.get("video_duration") or 0)
+        if seconds <= 0:
+            return 0.0, SOURCE_DEFAULT
+        renditions = active_renditions(kwargs)
+        if renditions:
+            total, sources = 0.0, []
+            for rendition in renditions:
+                predicted, source = self.predict(rendition_kwargs(kwargs, rendition), info, seconds, share)
+                total += predicted
+                sources.append(source)
+            order = (SOURCE_LEARNED, SOURCE_SCALED, SOURCE_DEFAULT)
+            return total, max(sources, key=order.index)
+        speed, source = self.speed(kwargs, info)
+        return media_seconds(seconds, kwargs, info) / (speed * max(share, 0.01)), source
+
+    def refresh(self):
+        """重新读取模型文件（其他进程写入的数据），尚未保存的样本保留"""
+        with self._lock:
+            entries = self._read_file()
+            for key, media, wall in self._pending:
+                self._apply(entries, key, media, wall)
+            self._entries = entries
+
+    @property
+    def calibrated(self) -> bool:
+        """本机是否已有任何数据"""
+        with self._lock:
+            return bool(self._load())
+
+    def save(self):
+        """保存新样本（重新读取文件，合并其他进程写入的数据，无新样本时不写入）"""
+        with self._lock:
+            if not self._pending or not self.model_file:
+                return
+            entries = self._read_file()
+            for key, media, wall in self._pending:
+                self._apply(entries, key, media, wall)
+            self._pending = []
+            self._entries = entries
+            data = {"version": MODEL_VERSION, "entries": dict(entries)}
+        try:
+            tmp_path = f"{self.model_file}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.model_file)
+        except OSError as e:
+            print(f"保存速度模型失败: {e}")
@@ -0,0 +1,55 @@
+"""
+启动耗时统计 - 使用 --startup-profile 启动时记录各阶段的导入和初始化耗时
+
+在 main.py 中最先导入本模块，计时从此刻开始；未启用时 mark() 不做任何事。
+"""
+import os
+import sys
+import time
+from typing import List, Optional, Tuple
+
+_START = time.perf_counter()
+
+
+class StartupProfiler:
+    """启动阶段计时器"""
+
+    def __init__(self):
+        self.enabled = False
+        self.start = _START
+        # [(阶段名称, 时间点, 已加载模块数)]
+        self.marks: List[Tuple[str, float, int]] = []
+
+    def enable(self):
+        """启用计时"""
+        self.enabled = True
+
+    def mark(self, name: str):
+        """记录一个阶段结束"""
+        if self.enabled:
+            self.marks.append((name, time.perf_counter(), len(sys.modules)))
+
+    def report(self) -> str:
+        """生成耗时报告（每个阶段的耗时、累计耗时和已加载模块数）"""
+        lines = [f"{'phase':<28}{'step ms':>10}{'total ms':>10}{'modules':>9}"]
+        previous = self.start
+        for name, when, modules in self.marks:
+            lines.append(f"{name:<28}{(when - previous) * 1000:>10.1f}{(when - self.start) * 1000:>10.1f}{modules:>9}")
+            previous = when
+        return "\n".join(lines)
+
+    def write_report(self, path: Optional[str] = None):
+        """输出报告：有标准错误输出时打印，否则（无控制台的打包程序）写入文件"""
+        text = self.report()
+        if sys.stderr is not None and path is None:
+            print(text, file=sys.stderr)
+            return
+        path = path or os.path.abspath("startup_profile.txt")
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text + "\n")
+        except OSError as e:
+            print(f"保存启动耗时报告失败: {e}")
+
+
+PROFILER = StartupProfiler()
@@ -0,0 +1,182 @@
+"""
+编码计划对话框 - 列出每个任务的输出路径、问题、估算工作量和 FFmpeg 命令，并可导出为脚本或队列清单
+"""
+import os
+import shlex
+import sys
+import subprocess
+from typing import Callable, List
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QCheckBox,
+    QTableView, QHeaderView, QAbstractItemView
+)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor, QBrush
+from core.encode_plan import (
+    EncodePlan, PlannedJob, ISSUE_COLLISION, ISSUE_IN_PLACE, ISSUE_INPUT_OVERWRITE, ISSUE_EXISTS
+)
+from gui.media_table_model import format_duration
+
+# 各问题的翻译键
+ISSUE_KEYS = {
+    ISSUE_COLLISION: 'PLAN_ISSUE_COLLISION',
+    ISSUE_IN_PLACE: 'PLAN_ISSUE_IN_PLACE',
+    ISSUE_INPUT_OVERWRITE: 'PLAN_ISSUE_INPUT_OVERWRITE',
+    ISSUE_EXISTS: 'PLAN_ISSUE_EXISTS',
+}
+
+PLAN_COLUMN_KEYS = [
+    'COL_FILENAME', 'PLAN_COL_OUTPUT', 'PLAN_COL_ISSUES', 'COL_DURATION', 'PLAN_COL_COST', 'PLAN_COL_FILTERS', 'PLAN_COL_COMMAND'
+]
+_COL_ISSUES = 2
+_COL_FILTERS = 5
+
+BLOCKED_BG = QColor('#FAD4D4')  # 浅红：必须解决
+WARNING_BG = QColor('#FFF9CC')  # 浅黄：输出已存在
+
+
+def format_command(command: List[str]) -> str:
+    """按当前平台的引号规则显示命令"""
+    if sys.platform == 'win32':
+        return subprocess.list2cmdline(command)
+    return " ".join(shlex.quote(arg) for arg in command)
+
+
+class EncodePlanModel(QAbstractTableModel):
+    """编码计划表格模型（只为可见的单元格生成文本）"""
+
+    def __init__(self, plan: EncodePlan, tr_func, parent=None):
+        super().__init__(parent)
+        self.plan = plan
+        self.tr_func = tr_func
+        self._jobs: List[PlannedJob] = plan.jobs
+
+    def set_only_issues(self, only_issues: bool):
+        self.beginResetModel()
+        self._jobs = [job for job in self.plan.jobs if job.issues] if only_issues else self.plan.jobs
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._jobs)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(PLAN_COLUMN_KEYS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.tr_func(PLAN_COLUMN_KEYS[section])
+        return None
+
+    def _issue_text(self, job: PlannedJob) -> str:
+        text = "; ".join(self.tr_func(ISSUE_KEYS[issue]) for issue in job.issues)
+        if job.conflicts_with:
+            text += " (" + ", ".join(os.path.basename(p) for p in job.conflicts_with) + ")"
+        return text
+
+    def _filter_reason(self, decision) -> str:
+        """滤镜选择的说明（翻译键为 PLAN_FILTER_ 加原因代码）"""
+        return self.tr_func('PLAN_FILTER_' + decision.reason.upper()).format(**decision.params)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        job = self._jobs[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return os.path.basename(job.input_path)
+            if column == 1:
+                # 多码率输出时列出各规格的输出文件
+                return "; ".join(job.outputs)
+            if column == _COL_ISSUES:
+                return self._issue_text(job)
+            if column == 3:
+                return format_duration(job.duration)
+            if column == 4:
+                return format_duration(job.cost)
+            if column == _COL_FILTERS:
+                if job.filters is None:
+                    return ""
+                return job.filters.filter_chain() or self.tr_func('PLAN_NO_FILTERS')
+            return format_command(job.command)
+        if role == Qt.ToolTipRole:
+            if column == 0:
+                return job.input_path
+            if column == 1:
+                return "\n".join(job.outputs)
+            if column == _COL_ISSUES and job.conflicts_with:
+                return "\n".join(job.conflicts_with)
+            if column == _COL_FILTERS and job.filters is not None:
+                return "\n".join(self._filter_reason(decision) for decision in job.filters.decisions)
+            if column == 6:
+                return format_command(job.command)
+            return None
+        if role == Qt.BackgroundRole and job.issues:
+            return QBrush(BLOCKED_BG if job.blocked else WARNING_BG)
+        return None
+
+
+class EncodePlanDialog(QDialog):
+    """编码计划对话框"""
+
+    def __init__(self, plan: EncodePlan, tr_func, export_script: Callable[[], None],
+                 export_manifest: Callable[[], None], parent=None):
+        """
+        Args:
+            plan: 编码计划
+            tr_func: 翻译函数
+            export_script: 导出脚本（由主窗口选择文件并记录日志）
+            export_manifest: 导出队列清单
+        """
+        super().__init__(parent)
+        self.tr_func = tr_func
+        self.setWindowTitle(self.tr_func('PLAN_DIALOG_TITLE'))
+        self.resize(1000, 520)
+
+        layout = QVBoxLayout(self)
+        summary = plan.summary()
+        summary_label = QLabel(self.tr_func('PLAN_SUMMARY').format(
+            count=summary['total'],
+            duration=format_duration(plan.total_duration),
+            cost=format_duration(plan.total_cost),
+            unknown=summary['unknown'],
+            collisions=summary[ISSUE_COLLISION],
+            overwrites=summary[ISSUE_IN_PLACE] + summary[ISSUE_INPUT_OVERWRITE],
+            exists=summary[ISSUE_EXISTS]
+        ))
+        summary_label.setWordWrap(True)
+        layout.addWidget(summary_label)
+
+        self.only_issues_check = QCheckBox(self.tr_func('PLAN_ONLY_ISSUES'))
+        self.only_issues_check.setEnabled(any(job.issues for job in plan.jobs))
+        layout.addWidget(self.only_issues_check)
+
+        self.model = EncodePlanModel(plan, tr_func, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setWordWrap(False)
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setDefaultSectionSize(self.table.fontMetrics().height() + 8)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        for column, width in enumerate((200, 280, 200, 80, 80, 260)):
+            self.table.setColumnWidth(column, width)
+        layout.addWidget(self.table)
+        self.only_issues_check.toggled.connect(self.model.set_only_issues)
+        if plan.blocked_jobs():
+            self.only_issues_check.setChecked(True)
+
+        button_layout = QHBoxLayout()
+        self.export_script_btn = QPushButton(self.tr_func('PLAN_EXPORT_SCRIPT'))
+        self.export_script_btn.clicked.connect(export_script)
+        self.export_manifest_btn = QPushButton(self.tr_func('PLAN_EXPORT_MANIFEST'))
+        self.export_manifest_btn.clicked.connect(export_manifest)
+        button_layout.addWidget(self.export_script_btn)
+        button_layout.addWidget(self.export_manifest_btn)
+        button_layout.addStretch()
+        self.close_btn = QPushButton(self.tr_func('PLAN_CLOSE'))
+        self.close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(self.close_btn)
+        layout.addLayout(button_layout)
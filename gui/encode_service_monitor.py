@@ -0,0 +1,134 @@
+"""
+后台编码服务监视器 - 在界面线程中轮询后台编码服务的共享内存状态表
+"""
+import time
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from core.async_engine import JOB_PROBING, JOB_ENCODING
+from core.encode_service import EncodeServiceClient, FINAL_STATES
+
+
+class EncodeServiceMonitor(QObject):
+    """后台编码服务监视器（信号与 EncodeWorker 相同），每帧轮询共享内存中的任务状态"""
+    progress_updated = pyqtSignal(int, int, str, float, str)  # current, total, file, progress, message
+    file_started = pyqtSignal(int, int, str)  # current, total, file_path
+    file_finished = pyqtSignal(int, int, str, bool, str)  # current, total, file_path, success, message
+    finished = pyqtSignal(list)  # results
+    
+    POLL_INTERVAL_MS = 33  # 约每帧一次
+    CONNECT_TIMEOUT = 15.0  # 等待服务进程启动的最长时间（秒）
+    
+    def __init__(self, client: EncodeServiceClient, parent=None):
+        super().__init__(parent)
+        self.client = client
+        self.cancelled = False
+        self._running = False
+        self._started_at = 0.0
+        self._jobs = None  # 服务端任务快照 [{"index", "input", "output", "state", "started", "success", "message"}]
+        self._results = None
+        self._emitted_started = set()
+        self._emitted_finished = set()
+        self._last_progress = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.POLL_INTERVAL_MS)
+        self._timer.timeout.connect(self._poll)
+    
+    def start(self):
+        """开始轮询"""
+        self._running = True
+        self._started_at = time.time()
+        self._timer.start()
+    
+    def isRunning(self) -> bool:
+        """是否仍在编码（接口与 QThread 一致）"""
+        return self._running
+    
+    def cancel(self):
+        """取消编码"""
+        self.cancelled = True
+        self.client.cancel()
+    
+    def update_pending(self, updates: dict):
+        """修改尚未开始的文件的编码参数 {文件路径: {参数名: 值}}"""
+        self.client.update_jobs(updates)
+    
+    def detach(self):
+        """断开与服务的连接，服务继续在后台编码"""
+        self._timer.stop()
+        self._running = False
+        self.client.detach()
+    
+    def _poll(self):
+        """读取管道消息和共享内存状态，转换为与 EncodeWorker 相同的信号"""
+        if not self.client.connected:
+            if self.client.connect():
+                return
+            if time.time() - self._started_at > self.CONNECT_TIMEOUT or not self.client.is_alive():
+                self._finish_lost()
+            return
+        
+        for message in self.client.poll_messages():
+            kind = message[0]
+            if kind == "snapshot":
+                self._jobs = message[1]["jobs"]
+                if message[1].get("finished"):
+                    self._results = message[1].get("results") or []
+            elif kind == "file_finished" and self._jobs is not None:
+                self._jobs[message[1]["index"] - 1] = message[1]
+            elif kind == "finished":
+                self._results = message[1]
+        if self._jobs is None:
+            if self.client.lost:
+                self._finish_lost()
+            return
+        
+        total = len(self._jobs)
+        statuses = self.client.read_status()
+        for i, job in enumerate(self._jobs):
+            status = statuses[i] if i < len(statuses) else None
+            state = status["state"] if status else job["state"]
+            index = i + 1
+            started = job.get("started") or state in (JOB_PROBING, JOB_ENCODING)
+            if started and index not in self._emitted_started:
+                self._emitted_started.add(index)
+                if not self.cancelled:
+                    self.file_started.emit(index, total, job["input"])
+            if job["state"] in FINAL_STATES and job.get("started") and index not in self._emitted_finished:
+                self._emitted_finished.add(index)
+                if not self.cancelled:
+                    self.file_finished.emit(index, total, job["input"], bool(job["success"]), job["message"])
+            elif state == JOB_ENCODING and status and not self.cancelled:
+                progress = status["progress"]
+                message = f"Encoding: {progress:.1f}%"
+                if status["fps"] > 0:
+                    message += f", {status['fps']:.1f} fps"
+                if status["speed"] > 0:
+                    message += f", {status['speed']:.2f}x"
+                if (index, message) != self._last_progress:
+                    self._last_progress = (index, message)
+                    self.progress_updated.emit(index, total, job["input"], progress, message)
+        
+        if self._results is not None:
+            self._complete([tuple(r) for r in self._results])
+        elif self.client.lost:
+            self._finish_lost()
+    
+    def _finish_lost(self):
+        """服务进程意外退出：优先使用状态文件中的结果，否则将未完成的任务记为失败"""
+        state = self.client.reload_state()
+        if state.get("finished"):
+            self._complete([tuple(r) for r in state.get("results") or []])
+            return
+        results = []
+        for job in self._jobs or []:
+            if job.get("started") or job["index"] in self._emitted_started:
+                if job["state"] in FINAL_STATES:
+                    results.append((job["input"], job["output"], bool(job["success"]), job["message"]))
+                else:
+                    results.append((job["input"], job["output"], False, "Encode service exited unexpectedly"))
+        self._complete(results)
+    
+    def _complete(self, results: list):
+        """结束轮询并发送结果"""
+        self.detach()
+        self.client.cleanup()
+        self.finished.emit(results)
@@ -4,15 +4,18 @@
 import os
 import sys
 import subprocess
+import threading
+import time
+from collections import OrderedDict
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QProgressBar, QLabel,
     QFileDialog, QMessageBox, QGroupBox,
-    QTextEdit, QDialog, QTableWidget, QTableWidgetItem, QHeaderView, QMenu, QApplication
+    QTextEdit, QDialog, QTableView, QHeaderView, QMenu,
+    QProgressDialog, QAbstractItemView, QLineEdit
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QMimeData, QUrl
-from PyQt5.QtGui import QDragEnterEvent, QDropEvent, QColor, QBrush, QIcon
-from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
+from PyQt5.QtCore import Qt, QThread, QObject, QTimer, QEvent, pyqtSignal, QMimeData, QUrl
+from PyQt5.QtGui import QDragEnterEvent, QDropEvent, QIcon
 
 # Windows 任务栏进度条支持（仅 Windows）
 if sys.platform == 'win32':
@@ -24,147 +27,276 @@ if sys.platform == 'win32':
 else:
     HAS_WIN_TASKBAR = False
 from core.config_manager import ConfigManager
+from core.startup_profile import PROFILER
 from core.ffmpeg_handler import FFmpegHandler
 from core.file_processor import FileProcessor
-from gui.settings_dialog import SettingsDialog
+from core.probe_cache import ProbeCache, PROBE_CACHE_FILE
+from core.probe_scheduler import ProbeScheduler, TIER_QUICK, TIER_DETAILED
+from core.media_store import MediaStore, HAS_NUMPY, PROBE_DETAILED, PROBE_FAILED
+from core.queue_manifest import ManifestReader, ManifestWriter
+from core.queue_filter import QueueFilter
+from core.encode_plan import build_plan, ISSUE_EXISTS
+from core.renditions import active_renditions, rendition_outputs
+from core.presets import tier_overrides
+from core.crop_detect import crop_filter, crop_rect
+from core.crf_search import CRF_CACHE_FILE, CrfSearch, CrfSearchCache, searchable
+from core.deadline_planner import DeadlineTracker, core_share, parse_deadline, plan_deadline
+from core.speed_model import SPEED_MODEL_FILE, SpeedModel
+from core.queue_eta import QueueEta
+from core.sample_estimate import DEFAULT_SAMPLES, DEFAULT_WINDOW, DEFAULT_WORKERS, SampleEstimator, summarize
+from core.clip_batch import DEFAULT_BATCH_MAX_DURATION, DEFAULT_BATCH_MAX_FILES, group_batches
+from core.scan_index import ScanIndex, SCAN_INDEX_FILE
+from core.folder_watcher import FolderWatcher
+from gui.media_table_model import (
+    MediaTableModel, format_duration, format_file_size, format_bitrate,
+    COL_FILENAME, COL_STATUS, COL_RESOLUTION, COL_BITRATE, COL_FRAMERATE, COL_DURATION, COL_VIDEO_CODEC,
+    COL_FILE_SIZE, COL_AUDIO_CODEC, COL_AUDIO_BITRATE, COL_BITS_PER_PIXEL, COL_PATH, COL_CROP, COL_EST_SIZE, COL_EST_TIME,
+    COL_COMPLEXITY,
+    STATUS_WAITING, STATUS_ENCODING, STATUS_DONE, STATUS_FAILED, STATUS_PAUSED, STATUS_DUPLICATE
+)
 from translations import LanguageManager
-from typing import Optional, Dict
+from typing import Callable, Optional, Dict, List
+
+
+# 后台编码服务状态文件（与配置文件位于同一目录）
+ENCODE_SERVICE_STATE_FILE = "encode_service.json"
 
 
-class NumericTableWidgetItem(QTableWidgetItem):
-    """支持数值排序的表格项"""
-    def __lt__(self, other):
-        # 优先使用UserRole中的数值进行排序
-        self_data = self.data(Qt.UserRole)
-        other_data = other.data(Qt.UserRole)
-        
-        # 如果UserRole有值，使用数值排序
-        if self_data is not None and other_data is not None:
+class FileInfoWorker(QThread):
+    """文件信息获取工作线程：按探测队列的优先级依次进行快速探测和详细探测，队列为空时结束"""
+    file_info_ready = pyqtSignal(str, dict, bool)  # file_path, info, 是否为详细信息
+    finished = pyqtSignal()
+    
+    def __init__(self, ffmpeg_handler, scheduler: ProbeScheduler):
+        super().__init__()
+        self.ffmpeg_handler = ffmpeg_handler
+        self.scheduler = scheduler
+        self.cancelled = False
+    
+    def run(self):
+        """获取文件信息"""
+        while not self.cancelled:
+            job = self.scheduler.next_job()
+            if job is None:
+                break
+            file_path, tier = job
             try:
-                return float(self_data) < float(other_data)
-            except (ValueError, TypeError):
-                pass
+                if tier == TIER_QUICK:
+                    info = self.ffmpeg_handler.get_quick_video_info(file_path)
+                else:
+                    info = self.ffmpeg_handler.get_detailed_video_info(file_path)
+            except Exception as e:
+                print(f"获取文件信息失败: {e}")
+                info = {}
+            detailed = tier == TIER_DETAILED or bool(info and not info.get('quick'))
+            if tier == TIER_QUICK and detailed:
+                # 命中探测缓存，已有详细信息
+                self.scheduler.mark_detailed(file_path)
+            self.file_info_ready.emit(file_path, info, detailed)
         
-        # 否则使用文本排序
-        return super().__lt__(other)
+        self.finished.emit()
+    
+    def cancel(self):
+        """取消获取"""
+        self.cancelled = True
 
 
-# 表格列索引常量
-COL_FILENAME = 0
-COL_STATUS = 1
-COL_RESOLUTION = 2
-COL_BITRATE = 3
-COL_FRAMERATE = 4
-COL_DURATION = 5
-COL_VIDEO_CODEC = 6
-COL_FILE_SIZE = 7
-COL_AUDIO_CODEC = 8
-COL_AUDIO_BITRATE = 9
-COL_BITS_PER_PIXEL = 10
-COL_PATH = 11
+class CropDetectWorker(QThread):
+    """黑边检测工作线程：依次检测待检测队列中的文件，队列为空时结束"""
+    crop_ready = pyqtSignal(str, dict)  # file_path, 检测结果（crop_* 字段，空字典表示无法判断）
+    finished = pyqtSignal()
+    
+    def __init__(self, ffmpeg_handler, pending: "OrderedDict[str, dict]", lock: threading.Lock):
+        super().__init__()
+        self.ffmpeg_handler = ffmpeg_handler
+        self.pending = pending
+        self.lock = lock
+        self.cancelled = False
+    
+    def run(self):
+        while not self.cancelled:
+            with self.lock:
+                if not self.pending:
+                    break
+                file_path, info = self.pending.popitem(last=False)
+            try:
+                fields = self.ffmpeg_handler.detect_crop(file_path, info)
+            except Exception as e:
+                print(f"黑边检测失败: {e}")
+                fields = {}
+            self.crop_ready.emit(file_path, fields)
+        self.finished.emit()
+    
+    def cancel(self):
+        self.cancelled = True
 
 
-# 文件状态代码
-STATUS_WAITING = "waiting"
-STATUS_ENCODING = "encoding"
-STATUS_DONE = "done"
-STATUS_FAILED = "failed"
-STATUS_PAUSED = "paused"
+class ComplexityWorker(QThread):
+    """内容复杂度分析线程：依次分析待分析队列中的文件，队列为空时结束"""
+    complexity_ready = pyqtSignal(str, dict)  # file_path, 分析结果（complexity_* 字段，空字典表示无法分析）
+    finished = pyqtSignal()
+    
+    def __init__(self, ffmpeg_handler, pending: "OrderedDict[str, dict]", lock: threading.Lock):
+        super().__init__()
+        self.ffmpeg_handler = ffmpeg_handler
+        self.pending = pending
+        self.lock = lock
+        self.cancelled = False
+    
+    def run(self):
+        while not self.cancelled:
+            with self.lock:
+                if not self.pending:
+                    break
+                file_path, info = self.pending.popitem(last=False)
+            try:
+                fields = self.ffmpeg_handler.analyze_complexity(file_path, info, lambda: self.cancelled)
+            except Exception as e:
+                print(f"复杂度分析失败: {e}")
+                fields = {}
+            if not self.cancelled:
+                self.complexity_ready.emit(file_path, fields)
+        self.finished.emit()
+    
+    def cancel(self):
+        self.cancelled = True
 
-STATUS_KEY_MAP = {
-    STATUS_WAITING: 'STATUS_WAITING',
-    STATUS_ENCODING: 'STATUS_ENCODING',
-    STATUS_DONE: 'STATUS_DONE',
-    STATUS_FAILED: 'STATUS_FAILED',
-    STATUS_PAUSED: 'STATUS_PAUSED',
-}
 
-# 各状态对应的浅色背景
-STATUS_BG_COLORS = {
-    STATUS_WAITING: QColor('#FFF9CC'),   # 浅黄
-    STATUS_ENCODING: QColor('#DDEEFF'),  # 浅蓝
-    STATUS_DONE: QColor('#E5F8E5'),      # 浅绿
-    STATUS_FAILED: QColor('#FAD4D4'),    # 浅红
-    STATUS_PAUSED: QColor('#F0E6FF'),    # 浅紫
-}
+class SampleEstimateWorker(QThread):
+    """抽样试编码线程：在有上限的线程池中试编码各文件的几个短窗口，推算输出大小和编码耗时"""
+    estimate_ready = pyqtSignal(str, dict)  # file_path, 预估字段（est_* 字段，空字典表示无法预估）
+    finished = pyqtSignal()
+    
+    def __init__(self, ffmpeg_handler, jobs: list, workers: int, samples: int, window: float):
+        """
+        Args:
+            jobs: [(输入文件, 输出文件, 编码参数, 时长)]；时长为 0 的文件先读取时长
+        """
+        super().__init__()
+        self.ffmpeg_handler = ffmpeg_handler
+        self.jobs = jobs
+        self.estimator = SampleEstimator(ffmpeg_handler.build_command, workers, samples, window)
+        self.cancelled = False
+    
+    def run(self):
+        jobs = []
+        for input_path, output_path, kwargs, duration in self.jobs:
+            if self.cancelled:
+                break
+            if duration <= 0:
+                duration = self.ffmpeg_handler.get_duration(input_path)
+            jobs.append((input_path, output_path, kwargs, duration))
+        if not self.cancelled:
+            self.estimator.run(jobs, self._on_result)
+        self.finished.emit()
+    
+    def _on_result(self, file_path: str, estimate):
+        if not self.cancelled:
+            self.estimate_ready.emit(file_path, estimate.to_fields() if estimate else {})
+    
+    def cancel(self):
+        self.cancelled = True
+        self.estimator.cancel()
 
 
-class FileInfoWorker(QThread):
-    """文件信息获取工作线程"""
-    progress_updated = pyqtSignal(int, int, str)  # current, total, file_path
-    file_info_ready = pyqtSignal(str, dict)  # file_path, info
+class CrfSearchWorker(QThread):
+    """按片源搜索 CRF 的线程：逐个文件搜索（每个候选 CRF 的抽样窗口并行试编码）"""
+    crf_ready = pyqtSignal(str, object)  # file_path, CrfResult（无法搜索时为 None）
     finished = pyqtSignal()
     
-    def __init__(self, ffmpeg_handler, files: list):
+    def __init__(self, ffmpeg_handler, config_manager, jobs: list, cache: CrfSearchCache):
+        """
+        Args:
+            jobs: [(输入文件, 编码参数（含 source_info）, 时长)]
+        """
         super().__init__()
         self.ffmpeg_handler = ffmpeg_handler
-        self.files = files
+        self.config_manager = config_manager
+        self.jobs = jobs
+        self.cache = cache
+        self.search = None
         self.cancelled = False
     
     def run(self):
-        """获取文件信息"""
-        total = len(self.files)
-        for current, file_path in enumerate(self.files, 1):
+        from core.ffmpeg_capabilities import CAPABILITY_CACHE_FILE
+        capabilities = self.ffmpeg_handler.get_capabilities(self.config_manager.get_data_path(CAPABILITY_CACHE_FILE))
+        has_vmaf = capabilities is not None and capabilities.has_filter("libvmaf")
+        self.search = CrfSearch.from_config(self.config_manager, self.ffmpeg_handler, has_vmaf, self.cache)
+        for file_path, kwargs, duration in self.jobs:
             if self.cancelled:
                 break
-            self.progress_updated.emit(current, total, file_path)
-            
-            if self.ffmpeg_handler:
-                try:
-                    info = self.ffmpeg_handler.get_detailed_video_info(file_path)
-                    self.file_info_ready.emit(file_path, info)
-                except Exception:
-                    self.file_info_ready.emit(file_path, {})
-            else:
-                self.file_info_ready.emit(file_path, {})
-        
+            try:
+                result = self.search.search(file_path, kwargs, duration)
+            except Exception as e:
+                print(f"CRF 搜索失败: {e}")
+                result = None
+            if not self.cancelled:
+                self.crf_ready.emit(file_path, result)
+        self.cache.save()
         self.finished.emit()
     
     def cancel(self):
-        """取消获取"""
         self.cancelled = True
+        if self.search is not None:
+            self.search.cancel()
 
 
-class LoadingDialog(QDialog):
-    """加载对话框"""
-    def __init__(self, parent=None, tr_func=None):
-        super().__init__(parent)
-        self.tr_func = tr_func or (lambda key, default=None: default or key)
-        self.setWindowTitle(self.tr_func('LOADING_FILES', '加载中...'))
-        self.setWindowFlags(Qt.Dialog | Qt.WindowTitleHint | Qt.CustomizeWindowHint)
-        self.setModal(True)
-        
-        # 根据父窗口大小设置对话框大小
-        if parent:
-            parent_width = parent.width()
-            dialog_width = int(parent_width * 0.8)
-            # 高度大约5行：标签（2行）+ 进度条 + 间距
-            font_metrics = self.fontMetrics()
-            line_height = font_metrics.lineSpacing()
-            dialog_height = line_height * 5 + 40  # 5行高度 + 边距
-            self.setFixedSize(dialog_width, dialog_height)
-        else:
-            # 如果没有父窗口，使用默认大小
-            self.setFixedSize(400, 150)
-        
-        layout = QVBoxLayout(self)
-        layout.setSpacing(10)
-        self.label = QLabel(self.tr_func('LOADING_FILES_INIT', '正在载入文件信息...'))
-        self.label.setAlignment(Qt.AlignCenter)
-        self.label.setWordWrap(True)  # 允许文本换行
-        layout.addWidget(self.label)
-        
-        self.progress_bar = QProgressBar()
-        self.progress_bar.setRange(0, 0)  # 不确定进度模式
-        layout.addWidget(self.progress_bar)
-    
-    def update_progress(self, current: int, total: int, file_path: str = ""):
-        """更新进度"""
-        filename = os.path.basename(file_path) if file_path else ""
-        loading_text = self.tr_func('LOADING_FILES_PROGRESS', '正在载入 {current}/{total} 文件')
-        self.label.setText(f"{loading_text.format(current=current, total=total)}\n{filename}")
-        self.progress_bar.setRange(0, total)
-        self.progress_bar.setValue(current)
+class ManifestImportWorker(QThread):
+    """队列清单导入线程：逐行读取清单，按批转交界面线程加入队列"""
+    batch_ready = pyqtSignal(object)  # 清单项列表（按引用传递，不转换为 QVariantList）
+    finished = pyqtSignal(int, int, str, str)  # 任务数, 无效行数, 第一个无效行的说明, 读取失败的原因
+    
+    BATCH_SIZE = 5000
+    # 界面线程尚未处理的批次上限（读取不会远远领先于加入队列，内存占用与清单大小无关）
+    MAX_PENDING_BATCHES = 8
+    
+    def __init__(self, manifest_path: str):
+        super().__init__()
+        self.manifest_path = manifest_path
+        self.cancelled = False
+        self._slots = threading.Semaphore(self.MAX_PENDING_BATCHES)
+    
+    def _emit_batch(self, batch: list):
+        while not self._slots.acquire(timeout=0.1):
+            if self.cancelled:
+                return
+        self.batch_ready.emit(batch)
+    
+    def batch_done(self):
+        """界面线程已处理完一批"""
+        self._slots.release()
+    
+    def run(self):
+        reader = ManifestReader(self.manifest_path)
+        batch = []
+        error = ""
+        try:
+            for entry in reader:
+                if self.cancelled:
+                    break
+                batch.append(entry)
+                if len(batch) >= self.BATCH_SIZE:
+                    self._emit_batch(batch)
+                    batch = []
+        except (OSError, EOFError, ValueError) as e:
+            print(f"读取队列清单失败: {e}")
+            error = str(e)
+        if batch and not self.cancelled:
+            self._emit_batch(batch)
+        self.finished.emit(reader.count, reader.errors, reader.first_error, error)
+    
+    def cancel(self):
+        self.cancelled = True
+
+
+class WatchBridge(QObject):
+    """将监视线程中的回调转发到 GUI 线程"""
+    file_ready = pyqtSignal(str, dict)  # file_path, watch folder
+
+
+class InstanceBridge(QObject):
+    """将单实例监听线程收到的路径转发到 GUI 线程"""
+    paths_received = pyqtSignal(list)  # paths
 
 
 class EncodeWorker(QThread):
@@ -175,13 +307,23 @@ class EncodeWorker(QThread):
     finished = pyqtSignal(list)  # results
     
     def __init__(self, file_processor: FileProcessor, files: list, output_dir: str, encode_kwargs: dict,
-                 per_file_options: Optional[Dict[str, Dict[str, object]]] = None):
+                 per_file_options: Optional[Dict[str, Dict[str, object]]] = None,
+                 output_paths: Optional[Dict[str, str]] = None,
+                 batch_options: Optional[Dict[str, object]] = None,
+                 info: Optional[Callable[[str], Optional[dict]]] = None,
+                 fallback_audio: Optional[Dict[str, tuple]] = None):
         super().__init__()
         self.file_processor = file_processor
         self.files = files
         self.output_dir = output_dir
         self.encode_kwargs = encode_kwargs
         self.per_file_options = per_file_options or {}
+        self.output_paths = output_paths or {}
+        # 小文件批量模式参数（batch_max_duration / batch_max_files）和已知的视频信息
+        self.batch_options = batch_options or {}
+        self.info = info
+        # 开始编码时尚未完成详细探测、编码时再决定是否使用备用音频的文件 {文件路径: (备用音频编码, 码率)}
+        self.fallback_audio = fallback_audio or {}
         self.cancelled = False
     
     def run(self):
@@ -194,6 +336,10 @@ class EncodeWorker(QThread):
             file_finished_callback=self.on_file_finished,
             cancel_flag=lambda: self.cancelled,
             per_file_options=self.per_file_options,
+            output_paths=self.output_paths,
+            info=self.info,
+            fallback_audio=self.fallback_audio,
+            **self.batch_options,
             **self.encode_kwargs
         )
         # 发送结果（无论是否取消都发送）
@@ -217,24 +363,70 @@ class EncodeWorker(QThread):
     def cancel(self):
         """取消编码"""
         self.cancelled = True
+    
+    def update_pending(self, updates: Dict[str, Dict[str, object]]):
+        """修改尚未开始的文件的编码参数 {文件路径: {参数名: 值}}（每个文件开始编码时才读取文件级参数）"""
+        for file_path, options in updates.items():
+            self.per_file_options[file_path] = dict(self.per_file_options.get(file_path, {}), **options)
 
 
 class MainWindow(QMainWindow):
     """主窗口"""
     
-    def __init__(self, i18n_manager: LanguageManager = None):
+    startup_finished = pyqtSignal()  # 首次绘制后的延迟初始化（FFmpeg 检测等）完成
+    
+    def __init__(self, i18n_manager: LanguageManager = None, config_manager: ConfigManager = None):
         super().__init__()
-        self.config_manager = ConfigManager()
+        self._first_paint_seen = False
+        self._startup_done = False
+        # 由 main() 传入已加载的配置，避免重复读取 config.json
+        self.config_manager = config_manager or ConfigManager()
         self.i18n_manager = i18n_manager or LanguageManager()
         self.ffmpeg_handler = None
         self.file_processor = None
         self.encode_worker = None
-        self.file_list = []  # 待编码文件列表
-        self.file_info_dict = {}  # 文件信息字典 {文件路径: 详细信息}
-        self.file_status = {}  # 文件状态 {文件路径: 状态代码}
+        self.media_store = MediaStore()  # 队列文件的路径、状态和视频信息（列式存储）
         self._last_encoded_total_size = None  # 最近一次编码后的总大小（字节），用于语言切换时刷新显示
         self.file_info_worker = None  # 文件信息获取工作线程
-        self.loading_dialog = None  # 加载对话框
+        self.probe_scheduler = ProbeScheduler()  # 文件信息探测队列（先快速探测，再按优先级详细探测）
+        self._probe_updated_rows = set()  # 探测结果已更新、尚未刷新到表格的行
+        self.crop_worker = None  # 黑边检测线程
+        self._crop_pending = OrderedDict()  # 待检测黑边的文件 {文件路径: 视频信息}
+        self._crop_lock = threading.Lock()
+        self.complexity_worker = None  # 内容复杂度分析线程
+        self._complexity_pending = OrderedDict()  # 待分析复杂度的文件 {文件路径: 视频信息}
+        self._complexity_lock = threading.Lock()
+        self.estimate_worker = None  # 抽样试编码线程
+        self._estimate_paths = []  # 本次试编码的文件
+        self._estimate_failed = 0  # 本次无法预估的文件数
+        self.crf_worker = None  # 按片源搜索 CRF 的线程
+        self._crf_results = None  # 本次开始编码前搜索得到的 CRF {文件路径: CrfResult}，None 表示尚未搜索
+        self.crf_cache = CrfSearchCache(self.config_manager.get_data_path(CRF_CACHE_FILE))
+        # 本机编码速度模型（前台编码成功后记录，后台编码服务写入同一文件）
+        self.speed_model = SpeedModel(self.config_manager.get_data_path(SPEED_MODEL_FILE))
+        self._deadline_plan = None  # 本次准备的截止时间计划 (DeadlinePlan, 截止时间戳)，未启用时为 None
+        self._deferred_audio = {}  # 本次准备中音频编码推迟到编码时决定的文件 {文件路径: (备用音频编码, 码率)}
+        self._deadline_tracker = None  # 编码过程中的截止时间跟踪器
+        self._deadline_kwargs = {}  # 截止时间计划中各文件的编码参数（重新规划时使用）
+        self._file_started_at = {}  # 本次编码各文件的开始时间（time.monotonic）
+        self._queue_eta = None  # 本次编码的加权进度和剩余时间（core.queue_eta.QueueEta）
+        self.file_output_paths = {}  # 指定了输出路径的文件 {文件路径: 输出路径}（监视文件夹）
+        self.file_settings = {}  # 文件级配置项覆盖 {文件路径: {配置键: 值}}（监视文件夹）
+        self.file_duplicates = {}  # 重复文件 {重复文件路径: 原件路径}
+        self.similar_worker = None  # 相似视频分析线程
+        self.manifest_worker = None  # 队列清单导入线程
+        self._manifest_stats = {"added": 0, "probed": 0}  # 本次导入新增的文件数和自带视频信息的文件数
+        self.scanned_roots = []  # 已添加的文件夹（用于刷新队列）
+        # 目录快照索引和视频信息缓存（首次使用时才读取文件）
+        self.scan_index = ScanIndex(self.config_manager.get_data_path(SCAN_INDEX_FILE))
+        self.probe_cache = ProbeCache(self.config_manager.get_data_path(PROBE_CACHE_FILE))
+        self._duplicate_outputs = {}  # 本次编码中原件完成后需要链接/复制的输出 {原件路径: [(重复文件路径, 输出路径)]}
+        self._job_output_paths = {}  # 本次编码各文件的输出路径
+        self._job_renditions = {}  # 本次编码各文件的多码率输出规格 {文件路径: [规格]}（未启用时不记录）
+        self.folder_watcher = None  # 监视文件夹
+        self._pending_instance_paths = []  # 启动完成前收到的路径
+        self.watch_bridge = WatchBridge()
+        self.watch_bridge.file_ready.connect(self._on_watch_file_ready)
         
         # 设置窗口图标（窗口左上角图标）
         # 处理 PyInstaller 打包后的路径
@@ -257,32 +449,42 @@ class MainWindow(QMainWindow):
             self.taskbar_progress.setValue(0)
             self.taskbar_progress.setVisible(False)
         
-        self.init_ffmpeg()
+        # FFmpeg 检测在窗口首次绘制后进行（见 event / _finish_startup），不阻塞窗口显示
         self.init_ui()
         self.load_output_dir()
+        PROFILER.mark("MainWindow.init_ui")
+    
+    def event(self, event):
+        """窗口首次绘制后开始延迟初始化"""
+        if not self._first_paint_seen and event.type() == QEvent.Paint:
+            self._first_paint_seen = True
+            PROFILER.mark("first paint")
+            QTimer.singleShot(0, self._finish_startup)
+        return super().event(event)
+    
+    def _finish_startup(self):
+        """延迟初始化：检测 FFmpeg、处理启动期间收到的路径、重新连接后台编码"""
+        self.init_ffmpeg()
+        PROFILER.mark("ffmpeg discovery")
+        self._startup_done = True
+        if self._pending_instance_paths:
+            paths, self._pending_instance_paths = self._pending_instance_paths, []
+            self.add_paths(paths)
+        # 重新连接上次关闭（或崩溃）时仍在后台运行的编码
+        self._reattach_encode_service()
+        PROFILER.mark("startup finished")
+        self.startup_finished.emit()
     
     def tr(self, key: str, default: str = None) -> str:
         """翻译函数"""
         return self.i18n_manager.tr(key, default)
     
-    def format_duration(self, seconds: float) -> str:
-        """格式化时长"""
-        if seconds <= 0:
-            return "N/A"
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        if hours > 0:
-            return f"{hours:02d}:{minutes:02d}:{secs:02d}"
-        else:
-            return f"{minutes:02d}:{secs:02d}"
-    
     def load_table_settings(self):
         """加载表格设置（列顺序和列宽）"""
         column_order = self.config_manager.get("table_column_order", None)
         column_widths = self.config_manager.get("table_column_widths", None)
         
-        if column_order and isinstance(column_order, list) and len(column_order) == self.file_table.columnCount():
+        if column_order and isinstance(column_order, list) and len(column_order) == self.file_model.columnCount():
             # 恢复列顺序（需要在所有列创建后执行）
             # 这里先保存顺序，稍后在init_ui完成后应用
             self._pending_column_order = column_order
@@ -293,7 +495,7 @@ class MainWindow(QMainWindow):
             # 恢复列宽
             for col_index_str, width in column_widths.items():
                 col_index = int(col_index_str)
-                if 0 <= col_index < self.file_table.columnCount():
+                if 0 <= col_index < self.file_model.columnCount():
                     self.file_table.setColumnWidth(col_index, int(width))
     
     def apply_pending_column_order(self):
@@ -302,8 +504,9 @@ class MainWindow(QMainWindow):
             # column_order存储的是逻辑索引的顺序
             # 需要将逻辑索引移动到对应的视觉位置
             header = self.file_table.horizontalHeader()
+            column_count = self.file_model.columnCount()
             for visual_pos, logical_index in enumerate(self._pending_column_order):
-                if visual_pos < self.file_table.columnCount() and logical_index < self.file_table.columnCount():
+                if visual_pos < column_count and logical_index < column_count:
                     current_visual = header.visualIndex(logical_index)
                     if current_visual != visual_pos:
                         header.moveSection(current_visual, visual_pos)
@@ -312,13 +515,13 @@ class MainWindow(QMainWindow):
         """保存表格设置（列顺序和列宽）"""
         # 获取当前列顺序（逻辑索引的顺序）
         column_order = []
-        for i in range(self.file_table.columnCount()):
+        for i in range(self.file_model.columnCount()):
             logical_index = self.file_table.horizontalHeader().logicalIndex(i)
             column_order.append(logical_index)
         
         # 获取当前列宽
         column_widths = {}
-        for i in range(self.file_table.columnCount()):
+        for i in range(self.file_model.columnCount()):
             column_widths[i] = self.file_table.columnWidth(i)
         
         # 保存到配置
@@ -337,9 +540,7 @@ class MainWindow(QMainWindow):
     def init_ffmpeg(self):
         """初始化FFmpeg处理器"""
         try:
-            ffmpeg_path = self.config_manager.get("ffmpeg_path", "")
-            self.ffmpeg_handler = FFmpegHandler(ffmpeg_path if ffmpeg_path else "")
-            self.file_processor = FileProcessor(self.ffmpeg_handler)
+            self._create_ffmpeg_handler()
         except FileNotFoundError as e:
             QMessageBox.warning(
                 self,
@@ -347,6 +548,14 @@ class MainWindow(QMainWindow):
                 f"{str(e)}\n\n" + self.tr('MSG_FFMPEG_NOT_INIT')
             )
     
+    def _create_ffmpeg_handler(self):
+        """按当前配置创建 FFmpeg 处理器和文件处理器（共用视频信息缓存和目录索引）"""
+        ffmpeg_path = self.config_manager.get("ffmpeg_path", "")
+        self.ffmpeg_handler = FFmpegHandler(ffmpeg_path if ffmpeg_path else "")
+        self.ffmpeg_handler.probe_cache = self.probe_cache
+        self.ffmpeg_handler.speed_model = self.speed_model
+        self.file_processor = FileProcessor(self.ffmpeg_handler, self.scan_index)
+    
     def init_ui(self):
         """初始化UI"""
         self.setWindowTitle(self.tr('MAIN_WINDOW_TITLE'))
@@ -389,6 +598,35 @@ class MainWindow(QMainWindow):
         self.clear_btn.clicked.connect(self.clear_list)
         toolbar_layout.addWidget(self.clear_btn)
         
+        self.refresh_btn = QPushButton(self.tr('REFRESH_FOLDERS'))
+        self.refresh_btn.setToolTip(self.tr('REFRESH_FOLDERS_TOOLTIP'))
+        self.refresh_btn.clicked.connect(self.refresh_folders)
+        toolbar_layout.addWidget(self.refresh_btn)
+        
+        self.similar_btn = QPushButton(self.tr('FIND_SIMILAR'))
+        self.similar_btn.setToolTip(self.tr('FIND_SIMILAR_TOOLTIP'))
+        self.similar_btn.clicked.connect(self.find_similar_videos)
+        toolbar_layout.addWidget(self.similar_btn)
+        
+        self.manifest_btn = QPushButton(self.tr('QUEUE_MANIFEST'))
+        self.manifest_btn.setToolTip(self.tr('QUEUE_MANIFEST_TOOLTIP'))
+        manifest_menu = QMenu(self)
+        self.import_manifest_action = manifest_menu.addAction(self.tr('IMPORT_QUEUE'), self.import_manifest)
+        self.export_manifest_action = manifest_menu.addAction(self.tr('EXPORT_QUEUE'), self.export_manifest)
+        self.manifest_btn.setMenu(manifest_menu)
+        toolbar_layout.addWidget(self.manifest_btn)
+        # 导入的文件合并刷新到表格（避免每批都重新排序）
+        self._manifest_flush_timer = QTimer(self)
+        self._manifest_flush_timer.setSingleShot(True)
+        self._manifest_flush_timer.setInterval(300)
+        self._manifest_flush_timer.timeout.connect(self._flush_manifest_entries)
+        
+        self.watch_btn = QPushButton(self.tr('WATCH_FOLDERS'))
+        self.watch_btn.setCheckable(True)
+        self.watch_btn.setToolTip(self.tr('WATCH_FOLDERS_TOOLTIP'))
+        self.watch_btn.toggled.connect(self.toggle_watch)
+        toolbar_layout.addWidget(self.watch_btn)
+        
         toolbar_layout.addStretch()
         
         # 语言切换按钮（固定显示为"Language"）
@@ -406,17 +644,39 @@ class MainWindow(QMainWindow):
         self.list_group = QGroupBox(self.tr('FILE_LIST_TITLE'))
         list_layout = QVBoxLayout()
         
-        self.file_table = QTableWidget()
-        self.file_table.setColumnCount(12)  # 文件名 + 状态 + 其它信息 + 路径列
-        self.file_table.setHorizontalHeaderLabels([
-            self.tr('COL_FILENAME'), self.tr('COL_STATUS'), self.tr('COL_RESOLUTION'), self.tr('COL_BITRATE'),
-            self.tr('COL_FRAMERATE'), self.tr('COL_DURATION'), self.tr('COL_VIDEO_CODEC'),
-            self.tr('COL_FILE_SIZE'), self.tr('COL_AUDIO_CODEC'), self.tr('COL_AUDIO_BITRATE'),
-            self.tr('COL_BITS_PER_PIXEL'), self.tr('COL_PATH')
-        ])
+        # 过滤栏：按视频信息筛选显示的文件，并对所有匹配的文件批量操作
+        filter_layout = QHBoxLayout()
+        self.filter_label = QLabel(self.tr('FILTER_LABEL'))
+        filter_layout.addWidget(self.filter_label)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.setPlaceholderText(self.tr('FILTER_PLACEHOLDER'))
+        self.filter_edit.setToolTip(self.tr('FILTER_HELP'))
+        filter_layout.addWidget(self.filter_edit, 1)
+        self.filter_match_label = QLabel()
+        self.filter_match_label.setStyleSheet("color: gray;")
+        filter_layout.addWidget(self.filter_match_label)
+        self.filter_actions_btn = QPushButton(self.tr('FILTER_ACTIONS'))
+        self.filter_actions_btn.setEnabled(False)
+        self.filter_actions_btn.clicked.connect(self.show_filter_actions_menu)
+        filter_layout.addWidget(self.filter_actions_btn)
+        list_layout.addLayout(filter_layout)
+        # 输入停顿后再应用过滤条件
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(200)
+        self._filter_timer.timeout.connect(self._apply_filter)
+        self.filter_edit.textChanged.connect(self._filter_timer.start)
+        self.filter_edit.returnPressed.connect(self._apply_filter)
+        
+        # 表格只显示可见行，内容直接从 media_store 读取（文件名 + 状态 + 其它信息 + 路径列）
+        self.file_model = MediaTableModel(self.media_store, self.tr, self)
+        self.file_table = QTableView()
+        self.file_table.setModel(self.file_model)
         self.file_table.horizontalHeader().setStretchLastSection(True)
-        self.file_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.file_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.file_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.file_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.file_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.file_table.setAlternatingRowColors(True)
         # 启用表头排序
         self.file_table.setSortingEnabled(True)
@@ -426,9 +686,25 @@ class MainWindow(QMainWindow):
         # 连接列移动信号，保存列顺序
         self.file_table.horizontalHeader().sectionMoved.connect(self.on_column_moved)
         self.file_table.horizontalHeader().sectionResized.connect(self.on_column_resized)
+        # 滚动或排序后，优先获取可见行的详细信息
+        self._visible_rows_timer = QTimer(self)
+        self._visible_rows_timer.setSingleShot(True)
+        self._visible_rows_timer.setInterval(150)
+        self._visible_rows_timer.timeout.connect(self._prioritize_visible_rows)
+        self.file_table.verticalScrollBar().valueChanged.connect(self._visible_rows_timer.start)
+        self.file_table.horizontalHeader().sortIndicatorChanged.connect(self._visible_rows_timer.start)
+        # 探测结果合并刷新到表格（避免每个文件都重新排序）
+        self._probe_flush_timer = QTimer(self)
+        self._probe_flush_timer.setSingleShot(True)
+        self._probe_flush_timer.setInterval(100)
+        self._probe_flush_timer.timeout.connect(self._flush_file_info)
         # 表格右键菜单（用于修改状态）
         self.file_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.file_table.customContextMenuRequested.connect(self.on_table_context_menu)
+        # 显示的行数变化后更新过滤栏的匹配数
+        self.file_model.layoutChanged.connect(self._update_filter_status)
+        self.file_model.modelReset.connect(self._update_filter_status)
+        self.file_model.rowsInserted.connect(self._update_filter_status)
         
         # 加载保存的列顺序和列宽
         self.load_table_settings()
@@ -446,6 +722,10 @@ class MainWindow(QMainWindow):
             COL_AUDIO_CODEC: 100,    # 音频编码
             COL_AUDIO_BITRATE: 100,  # 音频码率
             COL_BITS_PER_PIXEL: 150, # 每帧/10000像素bit数
+            COL_CROP: 130,           # 黑边裁剪
+            COL_EST_SIZE: 200,       # 预估大小
+            COL_EST_TIME: 170,       # 预估耗时
+            COL_COMPLEXITY: 100,     # 内容复杂度
         }
         
         # 应用列宽
@@ -461,7 +741,15 @@ class MainWindow(QMainWindow):
         self.total_size_label = QLabel()
         self.total_size_label.setStyleSheet("font-weight: bold; color: #0066cc;")
         self.update_total_size_display()
-        list_layout.addWidget(self.total_size_label)
+        # 后台探测进度（探测期间仍可排序、筛选和开始编码）
+        self.probe_status_label = QLabel()
+        self.probe_status_label.setStyleSheet("color: gray;")
+        self.probe_status_label.setVisible(False)
+        size_layout = QHBoxLayout()
+        size_layout.addWidget(self.total_size_label)
+        size_layout.addStretch()
+        size_layout.addWidget(self.probe_status_label)
+        list_layout.addLayout(size_layout)
         
         self.list_group.setLayout(list_layout)
         layout.addWidget(self.list_group)
@@ -542,6 +830,16 @@ class MainWindow(QMainWindow):
         control_layout = QHBoxLayout()
         control_layout.addStretch()
         
+        self.plan_btn = QPushButton(self.tr('ENCODE_PLAN'))
+        self.plan_btn.setToolTip(self.tr('ENCODE_PLAN_TOOLTIP'))
+        self.plan_btn.clicked.connect(self.show_encode_plan)
+        control_layout.addWidget(self.plan_btn)
+        
+        self.estimate_btn = QPushButton(self.tr('ESTIMATE'))
+        self.estimate_btn.setToolTip(self.tr('ESTIMATE_TOOLTIP'))
+        self.estimate_btn.clicked.connect(self.toggle_estimate)
+        control_layout.addWidget(self.estimate_btn)
+        
         self.start_btn = QPushButton(self.tr('START_ENCODING'))
         self.start_btn.clicked.connect(self.start_encoding)
         self.start_btn.setStyleSheet("""
@@ -570,14 +868,11 @@ class MainWindow(QMainWindow):
     
     def dragEnterEvent(self, event: QDragEnterEvent):
         """拖放进入事件"""
-        if event.mimeData().hasUrls() and not self._is_loading_file_info():
+        if event.mimeData().hasUrls():
             event.acceptProposedAction()
     
     def dropEvent(self, event: QDropEvent):
         """拖放事件"""
-        if self._is_loading_file_info():
-            event.ignore()
-            return
         urls = event.mimeData().urls()
         paths = []
         for url in urls:
@@ -596,15 +891,24 @@ class MainWindow(QMainWindow):
         """批量添加路径（文件或文件夹），合并处理避免多个进度条冲突"""
         if not paths:
             return
+        if not self._startup_done:
+            # FFmpeg 尚未检测完成（窗口刚显示），完成后再添加
+            self._pending_instance_paths.extend(paths)
+            return
         if not self.file_processor:
             QMessageBox.warning(self, self.tr('MSG_ERROR'), self.tr('MSG_FFMPEG_NOT_INIT'))
             return
         
-        # 合并扫描所有路径的文件
+        # 合并扫描所有路径的文件（文件夹使用目录快照索引，只列出有变化的目录）
         all_files = []
         for path in paths:
-            files = self.file_processor.scan_files(path)
+            files, delta = self.file_processor.scan_files_with_delta(path)
             all_files.extend(files)
+            if delta is not None:
+                if path not in self.scanned_roots:
+                    self.scanned_roots.append(path)
+                self._apply_scan_delta(delta)
+        self.scan_index.save()
         
         if not all_files:
             QMessageBox.information(self, self.tr('MSG_INFO'), self.tr('MSG_NO_VIDEO_FILES'))
@@ -614,33 +918,24 @@ class MainWindow(QMainWindow):
         seen = set()
         new_files = []
         for f in all_files:
-            if f not in self.file_list and f not in seen:
+            if f not in self.media_store and f not in seen:
                 seen.add(f)
                 new_files.append(f)
         
         if not new_files:
             return
         
-        # 添加到列表，初始状态为等待编码
-        for file_path in new_files:
-            self.file_list.append(file_path)
-            self.file_status[file_path] = STATUS_WAITING
-            # 先添加到表格（显示基本信息）
-            self.add_file_to_table(file_path)
+        # 可选：检测内容相同的文件，重复的文件不单独编码
+        duplicates = self._find_duplicate_files(new_files) if self.config_manager.get("dedupe_on_add", False) else {}
         
-        # 如果文件数量较多，使用异步加载并显示进度对话框
-        if len(new_files) > 5:
-            self._load_file_info_async(new_files)
-        else:
-            # 文件数量少，直接同步加载（加载期间同样禁用拖入和添加按钮，避免竞态）
-            self._set_file_info_loading_ui(True)
-            try:
-                for file_path in new_files:
-                    self._load_single_file_info(file_path)
-                    # 处理事件，保持界面响应
-                    QApplication.processEvents()
-            finally:
-                self._set_file_info_loading_ui(False)
+        # 添加到列表，初始状态为等待编码（表格先显示文件名和大小）
+        self.media_store.add(new_files, STATUS_WAITING)
+        self.media_store.set_status(duplicates, STATUS_DUPLICATE)
+        self.file_duplicates.update(duplicates)
+        self.file_model.rows_appended(len(new_files))
+        
+        # 后台获取文件信息：先快速探测所有文件，再按优先级获取详细信息
+        self._queue_file_info(new_files)
         
         # 记录最后一个文件的目录路径到配置
         if new_files:
@@ -652,99 +947,247 @@ class MainWindow(QMainWindow):
         
         self.update_total_size_display()
         self.log(self.tr('LOG_FILES_ADDED').format(count=len(new_files)), "info")
+        if duplicates:
+            self.log(self.tr('LOG_DUPLICATES_FOUND').format(count=len(duplicates)), "warning")
+            for file_path, original in duplicates.items():
+                self.log(self.tr('LOG_DUPLICATE_FILE').format(
+                    filename=os.path.basename(file_path), original=original
+                ), "info")
+    
+    def refresh_folders(self):
+        """重新扫描已添加的文件夹：加入新文件，移除已删除的文件，重新读取被修改文件的信息"""
+        roots = [p for p in self.scanned_roots if os.path.isdir(p)]
+        if not roots:
+            QMessageBox.information(self, self.tr('MSG_INFO'), self.tr('MSG_NO_SCANNED_FOLDERS'))
+            return
+        self.add_paths(roots)
+    
+    def _apply_scan_delta(self, delta):
+        """根据目录扫描的变化更新视频信息缓存和队列"""
+        if delta.initial or delta.is_empty():
+            return
+        self.probe_cache.invalidate(delta.removed + delta.modified)
+        # 已从磁盘删除的文件移出队列（正在编码的除外）
+        removed = {p for p in delta.removed if self.media_store.status(p) not in (None, STATUS_ENCODING)}
+        if removed:
+            self._remove_files(removed)
+        # 被修改的文件重新读取信息
+        self._queue_file_info(
+            [p for p in delta.modified if self.media_store.status(p) == STATUS_WAITING], detailed_only=True
+        )
+        self.log(self.tr('LOG_SCAN_DELTA').format(
+            added=len(delta.added), removed=len(delta.removed), modified=len(delta.modified)
+        ), "info")
     
-    def _is_loading_file_info(self) -> bool:
-        """是否正在加载文件信息"""
-        return self.file_info_worker is not None and self.file_info_worker.isRunning()
+    def _find_duplicate_files(self, new_files: list) -> Dict[str, str]:
+        """
+        在新文件中查找与等待编码的文件或其它新文件内容相同的文件
+        
+        Returns:
+            {重复的新文件路径: 原件路径}（原件总是已在队列中的文件或更早添加的新文件）
+        """
+        from core.dedupe import find_duplicates
+        candidates = [
+            p for p in self.media_store.paths_with_status(STATUS_WAITING) if p not in self.file_output_paths
+        ]
+        candidates.extend(new_files)
+        duplicates = find_duplicates(candidates, use_full_hash=self.config_manager.get("dedupe_full_hash", False))
+        new_set = set(new_files)
+        return {p: original for p, original in duplicates.items() if p in new_set}
     
-    def _set_file_info_loading_ui(self, loading: bool):
-        """设置加载期间的 UI 状态（禁用/恢复拖入和添加按钮）"""
-        self.setAcceptDrops(not loading)
-        self.add_files_btn.setEnabled(not loading)
-        self.add_folder_btn.setEnabled(not loading)
+    def _release_orphan_duplicates(self):
+        """原件被移除后，其重复文件恢复为等待编码"""
+        for file_path, original in list(self.file_duplicates.items()):
+            if file_path in self.media_store and original in self.media_store:
+                continue
+            del self.file_duplicates[file_path]
+            if self.media_store.status(file_path) == STATUS_DUPLICATE:
+                self._set_file_status(file_path, STATUS_WAITING)
     
-    def _load_file_info_async(self, files: list):
-        """异步加载文件信息（显示进度对话框）"""
-        self._set_file_info_loading_ui(True)
-        try:
-            # 创建并显示加载对话框
-            self.loading_dialog = LoadingDialog(self, tr_func=self.tr)
-            # 创建工作线程
-            self.file_info_worker = FileInfoWorker(self.ffmpeg_handler, files)
-            self.file_info_worker.progress_updated.connect(self._on_file_info_progress)
-            self.file_info_worker.file_info_ready.connect(self._on_file_info_ready)
-            self.file_info_worker.finished.connect(self._on_file_info_finished)
-            # 显示对话框并启动线程
-            self.loading_dialog.show()
-            self.file_info_worker.start()
-        except Exception:
-            self._set_file_info_loading_ui(False)
-            if self.loading_dialog:
-                self.loading_dialog.close()
-                self.loading_dialog = None
-            self.file_info_worker = None
-            raise
-    
-    def _load_single_file_info(self, file_path: str):
-        """同步加载单个文件信息"""
-        row = self._find_file_row(file_path)
-        if row < 0:
+    def on_instance_paths(self, paths: list):
+        """其它启动转发过来的路径：激活窗口并加入队列"""
+        if self.isMinimized():
+            self.showNormal()
+        self.raise_()
+        self.activateWindow()
+        paths = [p for p in paths if os.path.exists(p)]
+        if not paths:
             return
+        self.add_paths(paths)
+    
+    def _queue_file_info(self, files: list, detailed_only: bool = False):
+        """
+        将文件加入后台探测队列
         
-        if self.ffmpeg_handler:
-            try:
-                info = self.ffmpeg_handler.get_detailed_video_info(file_path)
-                self.file_info_dict[file_path] = info
-                self.file_table.setSortingEnabled(False)
-                self.update_file_info(row, file_path, info)
-                self.file_table.setSortingEnabled(True)
-            except Exception as e:
-                filename = os.path.basename(file_path)
-                self.log(f"获取文件信息失败 {filename}: {str(e)}", "error")
-                self.file_table.setSortingEnabled(False)
-                self.update_file_info(row, file_path, {})
-                self.file_table.setSortingEnabled(True)
+        Args:
+            files: 文件路径列表
+            detailed_only: 只重新获取详细信息（跳过快速探测）
+        """
+        if not files:
+            return
+        if not self.ffmpeg_handler:
+            # 没有 FFmpeg 时无法探测，显示 N/A（文件大小仍然显示）
+            for file_path in files:
+                self.media_store.set_info(file_path, {})
+            self.file_model.rows_changed([self.media_store.row(p) for p in files])
+            return
+        if detailed_only:
+            self.probe_scheduler.add_detailed(files)
         else:
-            # 如果没有FFmpeg，至少显示文件大小
-            self.file_table.setSortingEnabled(False)
-            file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
-            size_str = self.format_file_size(file_size)
-            size_item = NumericTableWidgetItem(size_str)
-            size_item.setData(Qt.UserRole, file_size)
-            size_item.setToolTip(size_str)
-            self.file_table.setItem(row, COL_FILE_SIZE, size_item)
-            self.update_file_info(row, file_path, {})
-            self.file_table.setSortingEnabled(True)
-    
-    def _find_file_row(self, file_path: str) -> int:
-        """查找文件在表格中的行号"""
-        for row in range(self.file_table.rowCount()):
-            path_item = self.file_table.item(row, COL_PATH)
-            if path_item and path_item.text() == file_path:
-                return row
-        return -1
-    
-    def _on_file_info_progress(self, current: int, total: int, file_path: str):
-        """文件信息获取进度更新"""
-        if self.loading_dialog:
-            self.loading_dialog.update_progress(current, total, file_path)
-    
-    def _on_file_info_ready(self, file_path: str, info: dict):
-        """单个文件信息获取完成"""
-        self.file_info_dict[file_path] = info
-        row = self._find_file_row(file_path)
-        if row >= 0:
-            self.file_table.setSortingEnabled(False)
-            self.update_file_info(row, file_path, info)
-            self.file_table.setSortingEnabled(True)
+            self.probe_scheduler.add(files)
+        self._start_file_info_worker()
+        self._visible_rows_timer.start()
+        self._update_probe_status()
+    
+    def _start_file_info_worker(self):
+        """启动探测线程（已在运行时由其继续处理队列）"""
+        if self.file_info_worker is not None and self.file_info_worker.isRunning():
+            return
+        self.file_info_worker = FileInfoWorker(self.ffmpeg_handler, self.probe_scheduler)
+        self.file_info_worker.file_info_ready.connect(self._on_file_info_ready)
+        self.file_info_worker.finished.connect(self._on_file_info_finished)
+        self.file_info_worker.start()
+    
+    def _prioritize_visible_rows(self):
+        """优先获取表格中当前可见行的详细信息"""
+        first_row = self.file_table.rowAt(0)
+        if first_row < 0:
+            return
+        last_row = self.file_table.rowAt(self.file_table.viewport().height() - 1)
+        if last_row < 0:
+            last_row = self.file_model.rowCount() - 1
+        self.probe_scheduler.prioritize(self.file_model.path_at(row) for row in range(first_row, last_row + 1))
+    
+    def _on_file_info_ready(self, file_path: str, info: dict, detailed: bool):
+        """单个文件信息获取完成（合并后刷新到表格）"""
+        row = self.media_store.row(file_path)
+        if row < 0:
+            # 探测期间已从队列中移除
+            return
+        if not detailed and self.media_store.probe_level_at(row) in (PROBE_DETAILED, PROBE_FAILED):
+            return
+        self.media_store.set_info(file_path, info)
+        self._probe_updated_rows.add(row)
+        if not self._probe_flush_timer.isActive():
+            self._probe_flush_timer.start()
+        if detailed and info:
+            self._queue_crop_detection([file_path])
+            self._queue_complexity_analysis([file_path])
+    
+    def _queue_crop_detection(self, paths):
+        """启用自动裁剪黑边时，将已有详细信息、尚未检测的文件加入黑边检测队列"""
+        if not self.config_manager.get("auto_crop", False) or not self.ffmpeg_handler:
+            return
+        with self._crop_lock:
+            for file_path in paths:
+                if self.media_store.probe_level(file_path) != PROBE_DETAILED:
+                    continue
+                info = self.media_store.info(file_path)
+                if not crop_rect(info):
+                    self._crop_pending[file_path] = info
+            if not self._crop_pending:
+                return
+        if self.crop_worker is not None and self.crop_worker.isRunning():
+            return
+        self.crop_worker = CropDetectWorker(self.ffmpeg_handler, self._crop_pending, self._crop_lock)
+        self.crop_worker.crop_ready.connect(self._on_crop_ready)
+        self.crop_worker.finished.connect(self._on_crop_worker_finished)
+        self.crop_worker.start()
+    
+    def _on_crop_ready(self, file_path: str, fields: dict):
+        """单个文件的黑边检测完成（与探测结果一起合并刷新到表格）"""
+        if not fields:
+            return
+        row = self.media_store.set_fields(file_path, fields)
+        if row < 0:
+            return
+        self._probe_updated_rows.add(row)
+        if not self._probe_flush_timer.isActive():
+            self._probe_flush_timer.start()
+    
+    def _on_crop_worker_finished(self):
+        self.crop_worker = None
+        self.probe_cache.save()
+        with self._crop_lock:
+            pending = list(self._crop_pending)
+        if pending:
+            self._queue_crop_detection(pending)
+    
+    def _queue_complexity_analysis(self, paths):
+        """启用内容复杂度分析时，将已有详细信息、尚未分析的文件加入分析队列"""
+        if not self.config_manager.get("complexity_analysis", False) or not self.ffmpeg_handler:
+            return
+        # 只检查 NumPy 是否已安装，分析时才在分析线程中导入
+        if not HAS_NUMPY:
+            return
+        with self._complexity_lock:
+            for file_path in paths:
+                row = self.media_store.row(file_path)
+                if row < 0 or self.media_store.probe_level_at(row) != PROBE_DETAILED:
+                    continue
+                if not self.media_store.value(row, 'complexity_tier'):
+                    self._complexity_pending[file_path] = self.media_store.info(file_path)
+            if not self._complexity_pending:
+                return
+        if self.complexity_worker is not None and self.complexity_worker.isRunning():
+            return
+        self.complexity_worker = ComplexityWorker(self.ffmpeg_handler, self._complexity_pending, self._complexity_lock)
+        self.complexity_worker.complexity_ready.connect(self._on_complexity_ready)
+        self.complexity_worker.finished.connect(self._on_complexity_worker_finished)
+        self.complexity_worker.start()
+    
+    def _on_complexity_ready(self, file_path: str, fields: dict):
+        """单个文件的复杂度分析完成（与探测结果一起合并刷新到表格）"""
+        from core.complexity import COMPLEXITY_FIELDS
+        fields = {name: fields[name] for name in COMPLEXITY_FIELDS if name in fields}
+        if not fields:
+            return
+        row = self.media_store.set_fields(file_path, fields)
+        if row < 0:
+            return
+        self._probe_updated_rows.add(row)
+        if not self._probe_flush_timer.isActive():
+            self._probe_flush_timer.start()
+    
+    def _on_complexity_worker_finished(self):
+        self.complexity_worker = None
+        self.probe_cache.save()
+        with self._complexity_lock:
+            pending = list(self._complexity_pending)
+        if pending:
+            self._queue_complexity_analysis(pending)
+    
+    def _flush_file_info(self):
+        """将累积的探测结果一次性更新到表格"""
+        rows, self._probe_updated_rows = self._probe_updated_rows, set()
+        if rows:
+            self.file_model.rows_changed(list(rows))
+            # 按探测结果排序时重新排序
+            self.file_model.resort(probe_changed=True)
+        self._update_probe_status()
     
     def _on_file_info_finished(self):
-        """所有文件信息获取完成"""
-        if self.loading_dialog:
-            self.loading_dialog.close()
-            self.loading_dialog = None
+        """探测队列已处理完（或线程被取消）"""
         self.file_info_worker = None
-        self._set_file_info_loading_ui(False)
+        self.probe_cache.save()
+        # 线程退出前加入的任务
+        if self.probe_scheduler.pending():
+            self._start_file_info_worker()
+        self._update_probe_status()
+    
+    def _update_probe_status(self):
+        """更新后台探测进度显示"""
+        done, total = self.probe_scheduler.progress()
+        if total:
+            self.probe_status_label.setText(self.tr('PROBE_STATUS').format(done=done, total=total))
+        self.probe_status_label.setVisible(bool(total))
+    
+    def _detailed_file_info(self, file_path: str) -> Optional[dict]:
+        """已获取的详细信息，尚未完成详细探测时返回 None"""
+        level = self.media_store.probe_level(file_path)
+        if level not in (PROBE_DETAILED, PROBE_FAILED):
+            return None
+        return self.media_store.info(file_path)
     
     def add_files(self):
         """添加文件"""
@@ -773,47 +1216,244 @@ class MainWindow(QMainWindow):
         if folder:
             self.add_path(folder)
     
+    def import_manifest(self):
+        """导入队列清单（JSON Lines，可为 .gz）：自带视频信息的文件不再探测"""
+        if self.manifest_worker is not None:
+            return
+        manifest_path, _ = QFileDialog.getOpenFileName(
+            self, self.tr('IMPORT_QUEUE'), self.config_manager.get("last_file_dir", ""), self.tr('MANIFEST_FILES_FILTER')
+        )
+        if not manifest_path:
+            return
+        self._manifest_stats = {"added": 0, "probed": 0}
+        self.import_manifest_action.setEnabled(False)
+        self.log(self.tr('LOG_MANIFEST_IMPORT_STARTED').format(path=manifest_path), "info")
+        self._manifest_flush_timer.setInterval(300)
+        self.manifest_worker = ManifestImportWorker(manifest_path)
+        self.manifest_worker.batch_ready.connect(self._on_manifest_batch)
+        self.manifest_worker.finished.connect(self._on_manifest_finished)
+        self.manifest_worker.start()
+    
+    def _on_manifest_batch(self, entries: list):
+        """将读取到的一批清单项加入队列（表格合并刷新）"""
+        if self.manifest_worker is not None:
+            self.manifest_worker.batch_done()
+        batch = {}
+        for entry in entries:
+            if entry["path"] not in self.media_store:
+                batch[entry["path"]] = entry
+        if not batch:
+            return
+        paths = list(batch)
+        self.media_store.add(paths, STATUS_WAITING, [batch[p]["probe"] for p in paths])
+        # 清单中的状态：正在编码和重复文件（与原件的对应关系未保存）恢复为等待编码
+        by_status = {}
+        for file_path, entry in batch.items():
+            if entry["status"] in (STATUS_DONE, STATUS_FAILED, STATUS_PAUSED):
+                by_status.setdefault(entry["status"], []).append(file_path)
+        for status, status_paths in by_status.items():
+            self.media_store.set_status(status_paths, status)
+        to_probe = []
+        to_detail = []
+        for file_path, entry in batch.items():
+            if entry["output"]:
+                self.file_output_paths[file_path] = entry["output"]
+            if entry["settings"]:
+                self.file_settings[file_path] = dict(entry["settings"])
+            if not entry["probe"]:
+                to_probe.append(file_path)
+            elif entry["probe"].get("quick"):
+                to_detail.append(file_path)
+        self._manifest_stats["added"] += len(paths)
+        self._manifest_stats["probed"] += len(paths) - len(to_probe) - len(to_detail)
+        self._queue_file_info(to_probe)
+        self._queue_file_info(to_detail, detailed_only=True)
+        if not self._manifest_flush_timer.isActive():
+            self._manifest_flush_timer.start()
+    
+    def _flush_manifest_entries(self):
+        """将已导入的文件显示到表格"""
+        self._manifest_flush_timer.stop()
+        started = time.time()
+        self.file_model.sync_rows()
+        self.update_total_size_display()
+        # 队列很大时表格重新排序较慢，相应拉长刷新间隔
+        self._manifest_flush_timer.setInterval(max(300, int((time.time() - started) * 3000)))
+    
+    def _on_manifest_finished(self, count: int, invalid: int, first_invalid: str, error: str):
+        self.manifest_worker = None
+        self._flush_manifest_entries()
+        self.import_manifest_action.setEnabled(True)
+        if error:
+            QMessageBox.warning(self, self.tr('MSG_ERROR'), self.tr('MSG_MANIFEST_IMPORT_FAILED').format(error=error))
+        if invalid:
+            self.log(self.tr('LOG_MANIFEST_INVALID_LINES').format(count=invalid, error=first_invalid), "warning")
+        self.log(self.tr('LOG_MANIFEST_IMPORTED').format(
+            count=count, added=self._manifest_stats["added"], probed=self._manifest_stats["probed"]
+        ), "info")
+    
+    def export_manifest(self):
+        """导出队列清单：过滤栏有条件时只导出显示的文件；文件名以 .gz 结尾时压缩"""
+        if not len(self.media_store):
+            QMessageBox.warning(self, self.tr('MSG_WARNING'), self.tr('MSG_NO_FILES_ADDED'))
+            return
+        manifest_path, _ = QFileDialog.getSaveFileName(
+            self, self.tr('EXPORT_QUEUE'), self.config_manager.get("last_file_dir", ""), self.tr('MANIFEST_FILES_FILTER')
+        )
+        if not manifest_path:
+            return
+        if not manifest_path.lower().endswith((".jsonl", ".gz")):
+            manifest_path += ".jsonl"
+        store = self.media_store
+        rows = self.file_model.visible_store_rows() if self.file_model.is_filtered() else range(len(store))
+        try:
+            with ManifestWriter(manifest_path) as writer:
+                for row in rows:
+                    file_path = store.path(row)
+                    writer.write(
+                        file_path,
+                        output=self.file_output_paths.get(file_path, ""),
+                        status=store.status_at(row),
+                        settings=self.file_settings.get(file_path),
+                        probe=store.info(file_path)
+                    )
+        except OSError as e:
+            QMessageBox.warning(self, self.tr('MSG_ERROR'), self.tr('MSG_MANIFEST_EXPORT_FAILED').format(error=e))
+            return
+        self.log(self.tr('LOG_MANIFEST_EXPORTED').format(count=writer.count, path=manifest_path), "info")
+    
     def remove_selected(self):
         """移除选中的文件"""
-        selected_rows = set()
-        for item in self.file_table.selectedItems():
-            selected_rows.add(item.row())
-        
-        # 从后往前删除，避免索引变化
-        for row in sorted(selected_rows, reverse=True):
-            if row < len(self.file_list):
-                file_path = self.file_list.pop(row)
-                if file_path in self.file_info_dict:
-                    del self.file_info_dict[file_path]
-                if file_path in self.file_status:
-                    del self.file_status[file_path]
-                self.file_table.removeRow(row)
-        
+        self._remove_files(set(self._selected_paths()))
+    
+    def _selected_paths(self) -> list:
+        """表格中选中的文件（按显示顺序）"""
+        rows = sorted(index.row() for index in self.file_table.selectionModel().selectedRows())
+        return [self.file_model.path_at(row) for row in rows]
+    
+    def _remove_files(self, paths: set):
+        """从队列和表格中移除文件"""
+        if not paths:
+            return
+        self.probe_scheduler.discard(paths)
+        with self._crop_lock:
+            for file_path in paths:
+                self._crop_pending.pop(file_path, None)
+        with self._complexity_lock:
+            for file_path in paths:
+                self._complexity_pending.pop(file_path, None)
+        # 删除后行号会变化，丢弃待刷新的行号（表格会整体重置）
+        self._probe_updated_rows.clear()
+        for file_path in paths:
+            self.file_output_paths.pop(file_path, None)
+            self.file_settings.pop(file_path, None)
+        self.media_store.remove(paths)
+        self.file_model.reset()
+        
+        self._release_orphan_duplicates()
         self.update_total_size_display()
     
     def clear_list(self):
         """清空列表"""
-        self.file_list.clear()
-        self.file_info_dict.clear()
-        self.file_status.clear()
-        self.file_table.setRowCount(0)
+        self.media_store.clear()
+        self.probe_scheduler.clear()
+        with self._crop_lock:
+            self._crop_pending.clear()
+        with self._complexity_lock:
+            self._complexity_pending.clear()
+        self._probe_updated_rows.clear()
+        self.file_output_paths.clear()
+        self.file_settings.clear()
+        self.file_duplicates.clear()
+        self.scanned_roots.clear()
+        self.file_model.reset()
         self.update_total_size_display()
+        self._update_probe_status()
 
-    def on_table_context_menu(self, pos):
-        """文件列表右键菜单：用于修改状态（等待编码 / 挂起）、打开文件、定位文件"""
-        indexes = self.file_table.selectedIndexes()
-        if not indexes:
+    def find_similar_videos(self):
+        """检测等待编码的文件中内容相似的视频（不同封装/编码/分辨率），审核后只保留每组中最好的源"""
+        if self.similar_worker is not None and self.similar_worker.isRunning():
+            return
+        if not self.ffmpeg_handler:
+            QMessageBox.warning(self, self.tr('MSG_ERROR'), self.tr('MSG_FFMPEG_NOT_INIT'))
+            return
+        # 延迟导入：依赖 NumPy（可选）
+        from core.near_duplicates import HAS_NUMPY
+        if not HAS_NUMPY:
+            QMessageBox.warning(self, self.tr('MSG_WARNING'), self.tr('MSG_NUMPY_REQUIRED'))
+            return
+        files = self.media_store.paths_with_status(STATUS_WAITING)
+        if len(files) < 2:
+            QMessageBox.information(self, self.tr('MSG_INFO'), self.tr('MSG_SIMILAR_NEED_FILES'))
             return
-        rows = sorted({idx.row() for idx in indexes})
         
-        # 获取选中行的文件路径（只处理第一行，如果多选则只对第一行操作）
-        if rows:
-            path_item = self.file_table.item(rows[0], COL_PATH)
-            if not path_item:
-                return
-            file_path = path_item.text()
-        else:
+        from gui.near_duplicate_dialog import NearDuplicateWorker
+        durations = {p: self.media_store.duration_at(self.media_store.row(p)) for p in files}
+        self.similar_worker = NearDuplicateWorker(self.ffmpeg_handler.ffmpeg_path, files, durations)
+        progress = QProgressDialog(
+            self.tr('SIMILAR_ANALYZING').format(current=0, total=len(files)), self.tr('CANCEL'), 0, len(files), self
+        )
+        progress.setWindowTitle(self.tr('FIND_SIMILAR'))
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.canceled.connect(self.similar_worker.cancel)
+        
+        def on_progress(current: int, total: int, file_path: str):
+            progress.setValue(current)
+            progress.setLabelText(
+                self.tr('SIMILAR_ANALYZING').format(current=current, total=total) + "\n" + os.path.basename(file_path)
+            )
+        
+        def on_finished(clusters: list):
+            cancelled = self.similar_worker.cancelled
+            progress.canceled.disconnect()
+            progress.close()
+            self.similar_worker = None
+            if not cancelled:
+                self._review_similar_videos(clusters)
+        
+        self.similar_worker.progress_updated.connect(on_progress)
+        self.similar_worker.finished.connect(on_finished)
+        self.similar_worker.start()
+    
+    def _review_similar_videos(self, clusters: list):
+        """显示相似视频审核对话框，未勾选的文件设为挂起"""
+        if not clusters:
+            QMessageBox.information(self, self.tr('MSG_INFO'), self.tr('MSG_NO_SIMILAR_VIDEOS'))
+            return
+        from core.near_duplicates import rank_cluster
+        from gui.near_duplicate_dialog import NearDuplicateDialog
+        ranked = [
+            rank_cluster(cluster, {p: self.media_store.info(p) for p in cluster}) for cluster in clusters
+        ]
+        
+        def describe(file_path: str) -> list:
+            info = self.media_store.info(file_path)
+            width, height = info.get('width', 0), info.get('height', 0)
+            file_size = info.get('file_size') or (os.path.getsize(file_path) if os.path.exists(file_path) else 0)
+            return [
+                os.path.basename(file_path),
+                f"{width}x{height}" if width and height else "N/A",
+                format_bitrate(info.get('format_bitrate', 0)),
+                format_duration(FFmpegHandler.parse_duration(info)),
+                format_file_size(file_size),
+                file_path,
+            ]
+        
+        dialog = NearDuplicateDialog(ranked, describe, self.tr, self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        skipped = [p for p in dialog.unchecked_paths() if self.media_store.status(p) == STATUS_WAITING]
+        self._set_files_status(skipped, STATUS_PAUSED)
+        self.log(self.tr('LOG_SIMILAR_PAUSED').format(groups=len(ranked), count=len(skipped)), "info")
+    
+    def on_table_context_menu(self, pos):
+        """文件列表右键菜单：用于修改状态（等待编码 / 挂起）、打开文件、定位文件"""
+        selected_paths = self._selected_paths()
+        if not selected_paths:
             return
+        # 打开/定位文件只对第一个选中的文件操作，修改状态对所有选中的文件生效
+        file_path = selected_paths[0]
         
         # 构建菜单
         menu = QMenu(self)
@@ -839,15 +1479,63 @@ class MainWindow(QMainWindow):
             self._reveal_source_file(file_path)
         # 处理状态操作
         elif action == action_waiting:
-            for row in rows:
-                path_item = self.file_table.item(row, COL_PATH)
-                if path_item:
-                    self._set_file_status(path_item.text(), STATUS_WAITING)
+            self._set_files_status(selected_paths, STATUS_WAITING)
+        elif action == action_paused:
+            self._set_files_status(selected_paths, STATUS_PAUSED)
+    
+    def _apply_filter(self):
+        """解析过滤栏的表达式并只显示匹配的文件"""
+        self._filter_timer.stop()
+        text = self.filter_edit.text()
+        try:
+            queue_filter = QueueFilter(text)
+        except ValueError as e:
+            self.filter_edit.setStyleSheet("border: 1px solid #cc3333;")
+            self.filter_edit.setToolTip(self.tr('FILTER_INVALID').format(error=e))
+            return
+        self.filter_edit.setStyleSheet("")
+        self.filter_edit.setToolTip(self.tr('FILTER_HELP'))
+        self.file_model.set_filter(queue_filter)
+        self._update_filter_status()
+        self._visible_rows_timer.start()
+    
+    def _update_filter_status(self, *args):
+        """更新匹配数和批量操作按钮"""
+        filtered = self.file_model.is_filtered()
+        self.filter_actions_btn.setEnabled(filtered and self.file_model.rowCount() > 0)
+        if filtered:
+            self.filter_match_label.setText(self.tr('FILTER_MATCHES').format(
+                count=self.file_model.rowCount(), total=len(self.media_store)
+            ))
+        else:
+            self.filter_match_label.clear()
+    
+    def show_filter_actions_menu(self):
+        """对所有匹配过滤条件的文件批量操作（正在编码的文件不修改状态、不移除）"""
+        menu = QMenu(self)
+        action_select = menu.addAction(self.tr('FILTER_SELECT_MATCHES'))
+        menu.addSeparator()
+        action_waiting = menu.addAction(self.tr('FILTER_SET_WAITING'))
+        action_paused = menu.addAction(self.tr('FILTER_SET_PAUSED'))
+        menu.addSeparator()
+        action_remove = menu.addAction(self.tr('FILTER_REMOVE_MATCHES'))
+        action = menu.exec_(self.filter_actions_btn.mapToGlobal(self.filter_actions_btn.rect().bottomLeft()))
+        if not action:
+            return
+        if action == action_select:
+            self.file_table.selectAll()
+            return
+        rows = self.file_model.visible_store_rows()
+        paths = [
+            self.media_store.path(row) for row in rows if self.media_store.status_at(row) != STATUS_ENCODING
+        ]
+        if action == action_waiting:
+            self._set_files_status(paths, STATUS_WAITING)
         elif action == action_paused:
-            for row in rows:
-                path_item = self.file_table.item(row, COL_PATH)
-                if path_item:
-                    self._set_file_status(path_item.text(), STATUS_PAUSED)
+            self._set_files_status(paths, STATUS_PAUSED)
+        elif action == action_remove:
+            self._remove_files(set(paths))
+        self.log(self.tr('LOG_FILTER_APPLIED').format(action=action.text(), count=len(paths)), "info")
     
     def _open_source_file(self, file_path: str):
         """使用系统默认程序打开源文件"""
@@ -887,33 +1575,9 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, self.tr('MSG_ERROR'), 
                              self.tr('MSG_REVEAL_FILE_FAILED').format(error=str(e)))
     
-    def format_file_size(self, size_bytes: int) -> str:
-        """格式化文件大小"""
-        if size_bytes == 0:
-            return "0 B"
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.2f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.2f} PB"
-    
-    def format_bitrate(self, bitrate: int) -> str:
-        """格式化码率（根据量级在 Kbps 与 Mbps 间切换，视频常用 Mbps，音频常用 Kbps）"""
-        if bitrate == 0:
-            return "N/A"
-        mbps = bitrate / 1000000.0
-        if mbps < 1:
-            kbps = int(round(bitrate / 1000.0))
-            return f"{kbps} Kbps"
-        return f"{mbps:.2f} Mbps"
-    
     def calculate_total_size(self) -> int:
         """计算列表中所有文件的总大小（字节）"""
-        total_size = 0
-        for file_path in self.file_list:
-            if os.path.exists(file_path):
-                total_size += os.path.getsize(file_path)
-        return total_size
+        return self.media_store.total('file_size')
     
     def update_total_size_display(self, encoded_total_size: int = None):
         """更新文件大小总计显示
@@ -925,8 +1589,8 @@ class MainWindow(QMainWindow):
             # 记录最近一次编码后的总大小，便于语言切换时刷新
             self._last_encoded_total_size = encoded_total_size
             original_total = self.calculate_total_size()
-            encoded_size_str = self.format_file_size(encoded_total_size)
-            original_size_str = self.format_file_size(original_total)
+            encoded_size_str = format_file_size(encoded_total_size)
+            original_size_str = format_file_size(original_total)
             self.total_size_label.setText(
                 self.tr('TOTAL_SIZE_ENCODED').format(
                     original=original_size_str,
@@ -937,192 +1601,18 @@ class MainWindow(QMainWindow):
             # 只显示源文件总大小
             self._last_encoded_total_size = None
             total_size = self.calculate_total_size()
-            size_str = self.format_file_size(total_size)
+            size_str = format_file_size(total_size)
             self.total_size_label.setText(
                 self.tr('TOTAL_SIZE').format(size=size_str)
             )
     
-    def _find_row_by_path(self, file_path: str) -> int:
-        """根据文件路径查找所在行索引，找不到返回 -1"""
-        for row in range(self.file_table.rowCount()):
-            item = self.file_table.item(row, self.file_table.columnCount() - 1)  # 路径列始终为最后一列
-            if item and item.text() == file_path:
-                return row
-        return -1
-
     def _set_file_status(self, file_path: str, status_code: str):
         """设置文件状态并更新表格中的显示"""
-        self.file_status[file_path] = status_code
-        row = self._find_row_by_path(file_path)
-        if row == -1:
-            return
-        status_key = STATUS_KEY_MAP.get(status_code, 'STATUS_WAITING')
-        status_text = self.tr(status_key)
-        item = self.file_table.item(row, COL_STATUS)
-        if item is None:
-            # 还没有状态单元格，创建并插入
-            item = QTableWidgetItem()
-            item.setTextAlignment(Qt.AlignCenter)
-            self.file_table.setItem(row, COL_STATUS, item)
-        # 更新已有单元格内容
-        item.setText(status_text)
-        item.setToolTip(status_text)
-        item.setData(Qt.UserRole, status_code)
-
-        # 设置整行背景色
-        color = STATUS_BG_COLORS.get(status_code)
-        brush = QBrush(color) if color is not None else QBrush()
-        for col in range(self.file_table.columnCount()):
-            cell = self.file_table.item(row, col)
-            if cell is None:
-                cell = QTableWidgetItem()
-                self.file_table.setItem(row, col, cell)
-            cell.setBackground(brush)
-    
-    def add_file_to_table(self, file_path: str):
-        """添加文件到表格（仅显示基本信息，详细信息由异步加载）"""
-        row = self.file_table.rowCount()
-        self.file_table.insertRow(row)
-        
-        # 先显示基本信息
-        filename = os.path.basename(file_path)
-        filename_item = QTableWidgetItem(filename)
-        filename_item.setToolTip(filename)  # 设置tooltip显示完整文件名
-        self.file_table.setItem(row, COL_FILENAME, filename_item)
-
-        # 状态列（先插入占位，具体文字和颜色通过 _set_file_status 统一处理）
-        status_code = self.file_status.get(file_path, STATUS_WAITING)
-        self.file_status[file_path] = status_code
-        status_item = QTableWidgetItem()
-        status_item.setTextAlignment(Qt.AlignCenter)
-        self.file_table.setItem(row, COL_STATUS, status_item)
-        
-        # 为其余列设置初始占位文本
-        fetching_text = self.tr('FETCHING_INFO')
-        for col in range(COL_RESOLUTION, COL_BITS_PER_PIXEL + 1):
-            # 状态列已单独设置，这里只设置其它列
-            if col in (COL_VIDEO_CODEC, COL_AUDIO_CODEC):
-                item = QTableWidgetItem(fetching_text)
-            else:
-                item = NumericTableWidgetItem(fetching_text)
-            item.setToolTip(fetching_text)
-            self.file_table.setItem(row, col, item)
-        
-        path_item = QTableWidgetItem(file_path)
-        path_item.setToolTip(file_path)  # 路径列的完整tooltip
-        self.file_table.setItem(row, COL_PATH, path_item)
-
-        # 应用当前状态的文本与颜色
-        self._set_file_status(file_path, status_code)
-        
-        # 至少显示文件大小（即使没有FFmpeg）
-        if os.path.exists(file_path):
-            file_size = os.path.getsize(file_path)
-            size_str = self.format_file_size(file_size)
-            size_item = NumericTableWidgetItem(size_str)
-            size_item.setData(Qt.UserRole, file_size)
-            size_item.setToolTip(size_str)
-            self.file_table.setItem(row, COL_FILE_SIZE, size_item)
-    
-    def update_file_info(self, row: int, file_path: str, info: dict):
-        """更新文件信息到表格"""
-        na_text = self.tr('NA')
-        if not info:
-            # 如果信息为空，显示N/A
-            for col in [COL_RESOLUTION, COL_BITRATE, COL_FRAMERATE, COL_DURATION, COL_AUDIO_BITRATE, COL_BITS_PER_PIXEL]:
-                item = NumericTableWidgetItem(na_text)
-                item.setToolTip(na_text)
-                self.file_table.setItem(row, col, item)
-            for col in [COL_VIDEO_CODEC, COL_AUDIO_CODEC]:
-                item = QTableWidgetItem(na_text)
-                item.setToolTip(na_text)
-                self.file_table.setItem(row, col, item)
-            # 至少显示文件大小
-            file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
-            size_str = self.format_file_size(file_size)
-            size_item = NumericTableWidgetItem(size_str)
-            size_item.setData(Qt.UserRole, file_size)
-            size_item.setToolTip(size_str)
-            self.file_table.setItem(row, COL_FILE_SIZE, size_item)
-            return
-        
-        # 分辨率 - 使用数字格式以便正确排序
-        width = info.get('width', 0)
-        height = info.get('height', 0)
-        resolution = f"{width}x{height}" if width > 0 and height > 0 else "N/A"
-        resolution_item = NumericTableWidgetItem(resolution)
-        resolution_item.setData(Qt.UserRole, width * height)  # 存储像素总数用于排序
-        resolution_item.setToolTip(resolution)  # 设置tooltip
-        self.file_table.setItem(row, COL_RESOLUTION, resolution_item)
-        
-        # 码率（总码率）- 存储原始数值用于排序
-        bitrate = info.get('format_bitrate', 0) or info.get('video_bitrate', 0)
-        bitrate_str = self.format_bitrate(bitrate)
-        bitrate_item = NumericTableWidgetItem(bitrate_str)
-        bitrate_item.setData(Qt.UserRole, bitrate)  # 存储原始码率值
-        bitrate_item.setToolTip(bitrate_str)  # 设置tooltip
-        self.file_table.setItem(row, COL_BITRATE, bitrate_item)
-        
-        # 帧率 - 存储原始数值用于排序
-        fps = info.get('fps', 0)
-        fps_str = f"{fps:.2f} fps" if fps > 0 else "N/A"
-        fps_item = NumericTableWidgetItem(fps_str)
-        fps_item.setData(Qt.UserRole, fps)  # 存储原始帧率值
-        fps_item.setToolTip(fps_str)  # 设置tooltip
-        self.file_table.setItem(row, COL_FRAMERATE, fps_item)
-        
-        # 总时长 - 存储原始秒数用于排序
-        duration = info.get('format_duration', 0) or info.get('video_duration', 0) or info.get('audio_duration', 0)
-        duration_str = self.format_duration(duration)
-        duration_item = NumericTableWidgetItem(duration_str)
-        duration_item.setData(Qt.UserRole, duration)  # 存储原始秒数
-        duration_item.setToolTip(duration_str)  # 设置tooltip
-        self.file_table.setItem(row, COL_DURATION, duration_item)
-        
-        # 视频编码
-        video_codec = info.get('video_codec', 'N/A')
-        video_codec_item = QTableWidgetItem(video_codec)
-        video_codec_item.setToolTip(video_codec)  # 设置tooltip
-        self.file_table.setItem(row, COL_VIDEO_CODEC, video_codec_item)
-        
-        # 文件大小 - 存储原始字节数用于排序
-        file_size = info.get('file_size', 0)
-        if file_size == 0:
-            file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
-        size_str = self.format_file_size(file_size)
-        size_item = NumericTableWidgetItem(size_str)
-        size_item.setData(Qt.UserRole, file_size)  # 存储原始字节数
-        size_item.setToolTip(size_str)  # 设置tooltip
-        self.file_table.setItem(row, COL_FILE_SIZE, size_item)
-        
-        # 音频编码
-        audio_codec = info.get('audio_codec', 'N/A')
-        audio_codec_item = QTableWidgetItem(audio_codec)
-        audio_codec_item.setToolTip(audio_codec)  # 设置tooltip
-        self.file_table.setItem(row, COL_AUDIO_CODEC, audio_codec_item)
-        
-        # 音频码率 - 存储原始数值用于排序
-        audio_bitrate = info.get('audio_bitrate', 0)
-        audio_bitrate_str = self.format_bitrate(audio_bitrate)
-        audio_bitrate_item = NumericTableWidgetItem(audio_bitrate_str)
-        audio_bitrate_item.setData(Qt.UserRole, audio_bitrate)  # 存储原始音频码率值
-        audio_bitrate_item.setToolTip(audio_bitrate_str)  # 设置tooltip
-        self.file_table.setItem(row, COL_AUDIO_BITRATE, audio_bitrate_item)
-        
-        # 每帧每10000像素点所用的bit数 - 存储原始数值用于排序
-        bits_per_10000 = info.get('bits_per_10000_pixels', 0)
-        if bits_per_10000 > 0:
-            bits_str = f"{bits_per_10000:.2f} bits"
-        else:
-            bits_str = "N/A"
-        bits_item = NumericTableWidgetItem(bits_str)
-        bits_item.setData(Qt.UserRole, bits_per_10000)  # 存储原始值
-        bits_item.setToolTip(bits_str)  # 设置tooltip
-        self.file_table.setItem(row, COL_BITS_PER_PIXEL, bits_item)
-
-        # 更新完所有单元格后，重新应用状态对应的整行背景色
-        status_code = self.file_status.get(file_path, STATUS_WAITING)
-        self._set_file_status(file_path, status_code)
+        self._set_files_status([file_path], status_code)
+    
+    def _set_files_status(self, paths, status_code: str):
+        """批量设置文件状态并更新表格中的显示"""
+        self.file_model.rows_changed(self.media_store.set_status(paths, status_code))
     
     def select_output_dir(self):
         """选择输出目录"""
@@ -1161,6 +1651,8 @@ class MainWindow(QMainWindow):
     
     def show_settings(self):
         """显示设置对话框"""
+        # 设置对话框在首次打开时才加载
+        from gui.settings_dialog import SettingsDialog
         dialog = SettingsDialog(self.config_manager, self.i18n_manager, self)
         # 兼容不同Python版本的exec_()调用
         try:
@@ -1172,12 +1664,17 @@ class MainWindow(QMainWindow):
         if result == QDialog.Accepted:
             # 重新初始化FFmpeg处理器
             try:
-                ffmpeg_path = self.config_manager.get("ffmpeg_path", "")
-                self.ffmpeg_handler = FFmpegHandler(ffmpeg_path if ffmpeg_path else "")
-                self.file_processor = FileProcessor(self.ffmpeg_handler)
+                self._create_ffmpeg_handler()
                 self.log(self.tr('LOG_FFMPEG_UPDATED'), "success")
             except FileNotFoundError as e:
                 QMessageBox.warning(self, self.tr('MSG_ERROR'), f"{self.tr('MSG_FFMPEG_INIT_FAILED')}: {str(e)}")
+            # 刚启用自动裁剪黑边时检测队列中已有的文件
+            self._queue_crop_detection(self.media_store.paths())
+            self._queue_complexity_analysis(self.media_store.paths())
+            # 预估依赖编码设置，设置变更后清除
+            rows = self.media_store.clear_estimates()
+            if rows:
+                self.file_model.rows_changed(rows)
     
     def show_language_menu(self):
         """显示语言选择菜单"""
@@ -1207,19 +1704,33 @@ class MainWindow(QMainWindow):
         self.add_folder_btn.setText(self.tr('ADD_FOLDER'))
         self.remove_btn.setText(self.tr('REMOVE_SELECTED'))
         self.clear_btn.setText(self.tr('CLEAR_LIST'))
+        self.refresh_btn.setText(self.tr('REFRESH_FOLDERS'))
+        self.refresh_btn.setToolTip(self.tr('REFRESH_FOLDERS_TOOLTIP'))
+        self.similar_btn.setText(self.tr('FIND_SIMILAR'))
+        self.similar_btn.setToolTip(self.tr('FIND_SIMILAR_TOOLTIP'))
+        self.manifest_btn.setText(self.tr('QUEUE_MANIFEST'))
+        self.manifest_btn.setToolTip(self.tr('QUEUE_MANIFEST_TOOLTIP'))
+        self.import_manifest_action.setText(self.tr('IMPORT_QUEUE'))
+        self.export_manifest_action.setText(self.tr('EXPORT_QUEUE'))
+        self.watch_btn.setText(self.tr('WATCH_FOLDERS'))
+        self.watch_btn.setToolTip(self.tr('WATCH_FOLDERS_TOOLTIP'))
         self.language_btn.setText("Language")  # 固定显示为"Language"
         self.settings_btn.setText(self.tr('SETTINGS'))
         self.output_dir_btn.setText(self.tr('SELECT_OUTPUT_DIR'))
+        self.plan_btn.setText(self.tr('ENCODE_PLAN'))
+        self.plan_btn.setToolTip(self.tr('ENCODE_PLAN_TOOLTIP'))
+        self.estimate_btn.setText(self.tr('ESTIMATE_STOP' if self.estimate_worker is not None else 'ESTIMATE'))
+        self.estimate_btn.setToolTip(self.tr('ESTIMATE_TOOLTIP'))
         self.start_btn.setText(self.tr('START_ENCODING'))
         self.stop_btn.setText(self.tr('STOP'))
         
-        # 更新表格列标题
-        self.file_table.setHorizontalHeaderLabels([
-            self.tr('COL_FILENAME'), self.tr('COL_STATUS'), self.tr('COL_RESOLUTION'), self.tr('COL_BITRATE'),
-            self.tr('COL_FRAMERATE'), self.tr('COL_DURATION'), self.tr('COL_VIDEO_CODEC'),
-            self.tr('COL_FILE_SIZE'), self.tr('COL_AUDIO_CODEC'), self.tr('COL_AUDIO_BITRATE'),
-            self.tr('COL_BITS_PER_PIXEL'), self.tr('COL_PATH')
-        ])
+        # 更新表格列标题和状态文字
+        self.file_model.refresh_all()
+        # 过滤栏
+        self.filter_label.setText(self.tr('FILTER_LABEL'))
+        self.filter_edit.setPlaceholderText(self.tr('FILTER_PLACEHOLDER'))
+        self.filter_actions_btn.setText(self.tr('FILTER_ACTIONS'))
+        self._apply_filter()
         
         # 更新分组标题（使用保存的引用）
         if hasattr(self, 'list_group'):
@@ -1250,94 +1761,575 @@ class MainWindow(QMainWindow):
             self.update_total_size_display(self._last_encoded_total_size)
         else:
             self.update_total_size_display()
+        self._update_probe_status()
+
+    def _is_watching(self) -> bool:
+        """是否正在监视文件夹"""
+        return self.folder_watcher is not None and self.folder_watcher.is_running()
     
-    def start_encoding(self):
-        """开始编码"""
-        if not self.file_list:
-            QMessageBox.warning(self, self.tr('MSG_WARNING'), self.tr('MSG_NO_FILES_ADDED'))
+    def toggle_watch(self, checked: bool):
+        """开启/关闭监视文件夹"""
+        if not checked:
+            if self.folder_watcher:
+                self.folder_watcher.stop()
+                self.folder_watcher = None
+                self.log(self.tr('LOG_WATCH_STOPPED'), "info")
             return
         
+        if not self.file_processor:
+            QMessageBox.warning(self, self.tr('MSG_ERROR'), self.tr('MSG_FFMPEG_NOT_INIT'))
+            self.watch_btn.setChecked(False)
+            return
+        folders = [f for f in self.config_manager.get("watch_folders", []) or [] if f.get("path")]
+        if not folders:
+            QMessageBox.information(self, self.tr('MSG_INFO'), self.tr('MSG_NO_WATCH_FOLDERS'))
+            self.watch_btn.setChecked(False)
+            return
+        
+        # 回调在监视线程中执行，通过信号转发到 GUI 线程
+        self.folder_watcher = FolderWatcher(
+            folders,
+            lambda path, folder: self.watch_bridge.file_ready.emit(path, folder),
+            self.file_processor.is_video_file,
+            stable_seconds=float(self.config_manager.get("watch_stable_seconds", 5)),
+            poll_interval=float(self.config_manager.get("watch_poll_interval", 2)),
+            process_existing=bool(self.config_manager.get("watch_process_existing", False))
+        )
+        self.folder_watcher.start()
+        self.log(self.tr('LOG_WATCH_STARTED').format(
+            count=len(folders), backend=self.folder_watcher.backend_name
+        ), "info")
+    
+    def _on_watch_file_ready(self, file_path: str, folder: dict):
+        """监视文件夹中的文件写入完成：按文件夹设置加入队列并开始编码"""
+        filename = os.path.basename(file_path)
+        output_base = folder.get("output_dir") or self.config_manager.get("output_dir", "")
+        if not output_base:
+            self.log(self.tr('LOG_WATCH_NO_OUTPUT_DIR').format(filename=filename), "error")
+            return
+        
+        # 使用与拖入目录相同的目录结构保留逻辑，以监视文件夹为基础路径
+        self.file_output_paths[file_path] = self.file_processor.calculate_output_path(
+            file_path, folder["path"], output_base
+        )
+        self.file_settings[file_path] = dict(folder.get("settings") or {})
+        
+        if file_path in self.media_store:
+            # 已在列表中的文件再次写入完成，重新等待编码
+            if self.media_store.status(file_path) != STATUS_ENCODING:
+                self._set_file_status(file_path, STATUS_WAITING)
+        else:
+            self.media_store.add([file_path], STATUS_WAITING)
+            self.file_model.rows_appended(1)
+            self._queue_file_info([file_path])
+            self.update_total_size_display()
+        self.log(self.tr('LOG_WATCH_FILE_QUEUED').format(filename=filename), "info")
+        self._start_watch_encoding()
+    
+    def _start_watch_encoding(self):
+        """监视模式下，若当前没有编码任务且存在等待编码的文件，则开始编码"""
+        if not self._is_watching():
+            return
+        if self.encode_worker is not None and self.encode_worker.isRunning():
+            return
+        if self.crf_worker is not None:
+            return
+        if self.media_store.count_status(STATUS_WAITING):
+            self.start_encoding()
+    
+    def _prepare_jobs(self, log_audio_fallback: bool = True):
+        """
+        计算待编码文件的输出路径和文件级编码参数（开始编码和编码计划共用）
+
+        Returns:
+            (待编码文件, 输出目录, 全局编码参数, 文件级参数, 输出路径, 重复文件)；无法编码时提示并返回 None
+        """
+        if not len(self.media_store):
+            QMessageBox.warning(self, self.tr('MSG_WARNING'), self.tr('MSG_NO_FILES_ADDED'))
+            return None
+        
+        # 仅对状态为“等待编码”的文件进行编码
+        files_to_encode = self.media_store.paths_with_status(STATUS_WAITING)
         output_dir = self.config_manager.get("output_dir", "")
-        if not output_dir:
+        # 监视文件夹中的文件已有各自的输出路径，不依赖全局输出目录
+        needs_output_dir = any(p not in self.file_output_paths for p in files_to_encode)
+        if not output_dir and needs_output_dir:
             QMessageBox.warning(self, self.tr('MSG_WARNING'), self.tr('MSG_NO_OUTPUT_DIR'))
-            return
+            return None
         
         if not self.file_processor:
             QMessageBox.warning(self, self.tr('MSG_ERROR'), self.tr('MSG_FFMPEG_NOT_INIT'))
-            return
+            return None
         
         # 获取全局编码参数
-        video_codec = self.config_manager.get("video_codec", "libx264")
-        video_preset = self.config_manager.get("video_preset", "medium")
-        video_crf = self.config_manager.get("video_crf", "23")
-        video_bit_depth = self.config_manager.get("video_bit_depth", "8")
-        video_resolution = self.config_manager.get("video_resolution", "")
-        video_framerate = self.config_manager.get("video_framerate", "")
-        base_audio_codec = self.config_manager.get("audio_codec", "copy")
-        base_audio_bitrate = self.config_manager.get("audio_bitrate", "")
+        encode_kwargs = self.config_manager.get_encode_kwargs()
+        base_audio_codec = encode_kwargs["audio_codec"]
+        base_audio_bitrate = encode_kwargs["audio_bitrate"]
         # 备用音频编码参数（当主编码为 copy 且不兼容 MP4 容器时使用）
         fallback_audio_codec = self.config_manager.get("fallback_audio_codec", "aac")
         fallback_audio_bitrate = self.config_manager.get("fallback_audio_bitrate", "192k")
-        subtitle_mode = self.config_manager.get("subtitle_mode", "copy")
-        custom_args = self.config_manager.get("custom_args", "")
-        use_custom = self.config_manager.get("use_custom_command", False)
-        custom_template = self.config_manager.get("custom_command_template", "")
-
-        encode_kwargs = {
-            "video_codec": video_codec,
-            "video_preset": video_preset,
-            "video_crf": video_crf,
-            "video_bit_depth": video_bit_depth,
-            "video_resolution": video_resolution,
-            "video_framerate": video_framerate,
-            "audio_codec": base_audio_codec,
-            "audio_bitrate": base_audio_bitrate,
-            "subtitle_mode": subtitle_mode,
-            "custom_args": custom_args,
-            "use_custom": use_custom,
-            "custom_template": custom_template
-        }
         
-        # 仅对状态为“等待编码”的文件进行编码
-        files_to_encode = [
-            path for path in self.file_list
-            if self.file_status.get(path, STATUS_WAITING) == STATUS_WAITING
-        ]
         if not files_to_encode:
             QMessageBox.information(self, self.tr('MSG_INFO'), self.tr('MSG_NO_FILES_ADDED'))
-            return
+            return None
+        # 尚未完成详细探测的文件按编码顺序优先探测
+        self.probe_scheduler.reorder(files_to_encode)
 
-        # 针对每个文件，根据源音频编码决定是否可以直接 copy，或需要使用备用音频编码方案
+        # 内容复杂度档位对应的 CRF / 预设调整（未启用时为 None）
+        complexity_tiers = None
+        if self.config_manager.get("complexity_analysis", False) and HAS_NUMPY:
+            complexity_tiers = self.config_manager.get("complexity_tiers") or {}
+        unanalyzed = 0
+
+        # 针对每个文件，根据源音频编码决定是否可以直接 copy，或需要使用备用音频编码方案；
+        # 尚未完成详细探测的文件不在界面线程中探测，保留 copy 并由编码线程（或后台编码服务）在编码前决定
         per_file_options: Dict[str, Dict[str, object]] = {}
+        self._deferred_audio = {}
         for file_path in files_to_encode:
-            info = self.file_info_dict.get(file_path, {})
-            src_audio_codec = (info.get("audio_codec", "") or "").lower()
-
-            audio_codec = base_audio_codec
-            audio_bitrate = base_audio_bitrate
+            file_options: Dict[str, object] = {}
+            file_audio_codec = base_audio_codec
+            file_audio_bitrate = base_audio_bitrate
+            file_fallback_codec = fallback_audio_codec
+            file_fallback_bitrate = fallback_audio_bitrate
+            # 来自监视文件夹的文件使用其文件夹的专属设置
+            settings = self.file_settings.get(file_path)
+            if settings:
+                file_options = self.config_manager.get_encode_kwargs(settings)
+                file_audio_codec = file_options["audio_codec"]
+                file_audio_bitrate = file_options["audio_bitrate"]
+                file_fallback_codec = settings.get("fallback_audio_codec", fallback_audio_codec)
+                file_fallback_bitrate = settings.get("fallback_audio_bitrate", fallback_audio_bitrate)
+            detailed = self._detailed_file_info(file_path)
+            if detailed is None and file_audio_codec == "copy":
+                self._deferred_audio[file_path] = (file_fallback_codec, file_fallback_bitrate)
+                audio_codec, audio_bitrate, used_fallback = file_audio_codec, file_audio_bitrate, False
+            else:
+                audio_codec, audio_bitrate, used_fallback = self.file_processor.resolve_audio_options(
+                    file_path,
+                    file_audio_codec,
+                    file_audio_bitrate,
+                    file_fallback_codec,
+                    file_fallback_bitrate,
+                    info=detailed
+                )
+            if used_fallback and log_audio_fallback:
+                self.log(self.tr('LOG_AUDIO_CODEC_AUTO_AAC').format(bitrate=audio_bitrate), "warning")
+            file_options["audio_codec"] = audio_codec
+            file_options["audio_bitrate"] = audio_bitrate
+            # 已检测过黑边的文件直接使用检测结果，编码时不再检测
+            if file_options.get("auto_crop", encode_kwargs["auto_crop"]) and not file_options.get("crop"):
+                detected = self.media_store.info(file_path)
+                if crop_rect(detected):
+                    file_options["auto_crop"] = False
+                    file_options["crop"] = crop_filter(detected)
+            # 按内容复杂度档位调整 CRF 和预设（监视文件夹或队列清单中明确设置的项不调整）
+            if complexity_tiers is not None:
+                tier = self.media_store.value(self.media_store.row(file_path), 'complexity_tier')
+                if not tier:
+                    unanalyzed += 1
+                overrides = tier_overrides(tier, dict(encode_kwargs, **file_options), complexity_tiers)
+                for key, value in overrides.items():
+                    if key not in (settings or {}):
+                        file_options[key] = value
+            # 按片源搜索得到的 CRF（在复杂度档位的预设下搜索，优先于档位的 CRF 偏移）
+            result = (self._crf_results or {}).get(file_path)
+            if result is not None:
+                file_options["video_crf"] = str(result.crf)
+            per_file_options[file_path] = file_options
+        if unanalyzed and log_audio_fallback:
+            self.log(self.tr('LOG_COMPLEXITY_PENDING').format(count=unanalyzed), "warning")
 
-            # 仅当设置为 copy 时，才考虑是否需要启用备用方案
-            if base_audio_codec == "copy":
-                # 能够安全 copy 到 MP4 容器的常见音频编码
-                safe_copy_codecs = {"aac", "mp3", "ac3", "eac3"}
-                if src_audio_codec not in safe_copy_codecs:
-                    # 使用备用音频编码器和码率
-                    audio_codec = fallback_audio_codec or "aac"
-                    audio_bitrate = fallback_audio_bitrate or "192k"
-                    self.log(self.tr('LOG_AUDIO_CODEC_AUTO_AAC').format(bitrate=audio_bitrate), "warning")
-            per_file_options[file_path] = {
-                "audio_codec": audio_codec,
-                "audio_bitrate": audio_bitrate,
-            }
+        # 截止时间规划：按本机速度模型为每个文件选择预设（监视文件夹或队列清单中明确设置了预设的文件不调整）
+        self._deadline_plan = None
+        if self.config_manager.get("deadline_planning", False):
+            deadline = parse_deadline(self.config_manager.get("deadline", ""))
+            if deadline is None:
+                QMessageBox.warning(self, self.tr('MSG_WARNING'), self.tr('MSG_DEADLINE_INVALID'))
+                return None
+            self.speed_model.refresh()
+            plan = plan_deadline(
+                [(p, dict(encode_kwargs, **per_file_options[p]), self.media_store.info(p)) for p in files_to_encode],
+                self.speed_model, deadline.timestamp() - time.time(),
+                core_share(int(self.config_manager.get("deadline_cores", 0) or 0)),
+                fixed=[p for p in files_to_encode if "video_preset" in self.file_settings.get(p, {})]
+            )
+            for file_path, preset in plan.presets().items():
+                per_file_options[file_path]["video_preset"] = preset
+            self._deadline_plan = (plan, deadline.timestamp())
 
-        # 创建编码工作线程
-        self.encode_worker = EncodeWorker(
-            self.file_processor,
-            files_to_encode,
-            output_dir,
-            encode_kwargs,
-            per_file_options=per_file_options
+        # 重复文件不编码，原件完成后将其输出链接（或复制）到重复文件的输出路径
+        encode_set = set(files_to_encode)
+        duplicate_files = [
+            p for p in self.media_store.paths_with_status(STATUS_DUPLICATE)
+            if self.file_duplicates.get(p) in encode_set
+        ]
+        
+        fixed_output_paths = {p: self.file_output_paths[p] for p in files_to_encode if p in self.file_output_paths}
+        # 重复文件一起计算输出路径，保证目录结构与不去重时一致
+        output_paths = self.file_processor.calculate_output_paths(
+            [p for p in files_to_encode + duplicate_files if p not in fixed_output_paths], output_dir
+        )
+        output_paths.update(fixed_output_paths)
+        return files_to_encode, output_dir, encode_kwargs, per_file_options, output_paths, duplicate_files
+    
+    def _build_encode_plan(self, files_to_encode, output_paths, encode_kwargs, per_file_options):
+        """为待编码文件生成编码计划（输出冲突、已存在的输出和估算工作量）"""
+        return build_plan(
+            self.ffmpeg_handler.build_command, files_to_encode, output_paths, encode_kwargs,
+            per_file_options, info=self.media_store.info
+        )
+    
+    def show_encode_plan(self, plan=None):
+        """显示编码计划；未给出计划时按当前队列和设置生成"""
+        if plan is None:
+            prepared = self._prepare_jobs(log_audio_fallback=False)
+            if prepared is None:
+                return
+            files_to_encode, _, encode_kwargs, per_file_options, output_paths, _ = prepared
+            plan = self._build_encode_plan(files_to_encode, output_paths, encode_kwargs, per_file_options)
+        from gui.encode_plan_dialog import EncodePlanDialog
+        dialog = EncodePlanDialog(
+            plan, self.tr,
+            export_script=lambda: self._export_plan_script(plan, dialog),
+            export_manifest=lambda: self._export_plan_manifest(plan, dialog),
+            parent=self
+        )
+        dialog.exec_()
+    
+    def _export_plan_script(self, plan, parent):
+        """将编码计划导出为批处理（Windows）或 Shell 脚本"""
+        default_name = "vvenc_plan.bat" if sys.platform == 'win32' else "vvenc_plan.sh"
+        script_path, _ = QFileDialog.getSaveFileName(
+            parent, self.tr('PLAN_EXPORT_SCRIPT'),
+            os.path.join(self.config_manager.get("last_file_dir", ""), default_name), self.tr('PLAN_SCRIPT_FILES_FILTER')
+        )
+        if not script_path:
+            return
+        try:
+            count = plan.write_script(script_path)
+        except OSError as e:
+            QMessageBox.warning(parent, self.tr('MSG_ERROR'), self.tr('MSG_PLAN_EXPORT_FAILED').format(error=e))
+            return
+        self.log(self.tr('LOG_PLAN_EXPORTED').format(count=count, path=script_path), "info")
+    
+    def _export_plan_manifest(self, plan, parent):
+        """将编码计划导出为队列清单（固定输出路径，跳过存在冲突的任务）"""
+        manifest_path, _ = QFileDialog.getSaveFileName(
+            parent, self.tr('PLAN_EXPORT_MANIFEST'), self.config_manager.get("last_file_dir", ""),
+            self.tr('MANIFEST_FILES_FILTER')
+        )
+        if not manifest_path:
+            return
+        if not manifest_path.lower().endswith((".jsonl", ".gz")):
+            manifest_path += ".jsonl"
+        try:
+            count = plan.write_manifest(manifest_path, self.file_settings, self.media_store.info)
+        except OSError as e:
+            QMessageBox.warning(parent, self.tr('MSG_ERROR'), self.tr('MSG_PLAN_EXPORT_FAILED').format(error=e))
+            return
+        self.log(self.tr('LOG_PLAN_EXPORTED').format(count=count, path=manifest_path), "info")
+    
+    def toggle_estimate(self):
+        """开始或停止抽样试编码预估"""
+        if self.estimate_worker is not None:
+            self.estimate_worker.cancel()
+            self.estimate_btn.setEnabled(False)
+            return
+        prepared = self._prepare_jobs(log_audio_fallback=False)
+        if prepared is None:
+            return
+        files_to_encode, _, encode_kwargs, per_file_options, output_paths, _ = prepared
+        # 有选中的等待编码文件时只预估这些文件；与编码计划使用相同的文件级参数和视频信息
+        selected = set(self._selected_paths())
+        paths = [p for p in files_to_encode if p in selected] or files_to_encode
+        plan = self._build_encode_plan(paths, output_paths, encode_kwargs, per_file_options)
+        jobs = [
+            (job.input_path, job.output_path, dict(job.kwargs, source_info=self.media_store.info(job.input_path) or None),
+             job.duration)
+            for job in plan.jobs
+        ]
+        self._estimate_paths = paths
+        self._estimate_failed = 0
+        self.estimate_worker = SampleEstimateWorker(
+            self.ffmpeg_handler, jobs,
+            workers=int(self.config_manager.get("estimate_workers", DEFAULT_WORKERS)),
+            samples=int(self.config_manager.get("estimate_samples", DEFAULT_SAMPLES)),
+            window=float(self.config_manager.get("estimate_window", DEFAULT_WINDOW))
+        )
+        self.estimate_worker.estimate_ready.connect(self._on_estimate_ready)
+        self.estimate_worker.finished.connect(self._on_estimate_finished)
+        self.estimate_btn.setText(self.tr('ESTIMATE_STOP'))
+        self.log(self.tr('LOG_ESTIMATE_STARTED').format(count=len(paths)), "info")
+        self.estimate_worker.start()
+    
+    def _on_estimate_ready(self, file_path: str, fields: dict):
+        """单个文件的试编码完成（与探测结果一起合并刷新到表格）"""
+        if not fields:
+            self._estimate_failed += 1
+            self.log(self.tr('LOG_ESTIMATE_FAILED').format(filename=os.path.basename(file_path)), "warning")
+            return
+        row = self.media_store.set_estimate(file_path, fields)
+        if row < 0:
+            return
+        self._probe_updated_rows.add(row)
+        if not self._probe_flush_timer.isActive():
+            self._probe_flush_timer.start()
+    
+    def _on_estimate_finished(self):
+        """试编码结束：汇总已预估的文件"""
+        cancelled = self.estimate_worker.cancelled
+        self.estimate_worker = None
+        self.estimate_btn.setText(self.tr('ESTIMATE'))
+        self.estimate_btn.setEnabled(True)
+        if cancelled:
+            self.log(self.tr('LOG_ESTIMATE_CANCELLED'), "warning")
+            return
+        estimated = [p for p in self._estimate_paths if self.media_store.estimate(p)]
+        if not estimated:
+            return
+        total = summarize([self.media_store.estimate(p) for p in estimated])
+        source = self.media_store.total('file_size', [self.media_store.row(p) for p in estimated])
+        change = int(round((total["est_size"] / source - 1) * 100)) if source else 0
+        message = self.tr('ESTIMATE_SUMMARY').format(
+            count=len(estimated), failed=self._estimate_failed,
+            size=format_file_size(total["est_size"]), size_low=format_file_size(total["est_size_low"]),
+            size_high=format_file_size(total["est_size_high"]), source=format_file_size(source), change=change,
+            time=format_duration(total["est_time"]), time_low=format_duration(total["est_time_low"]),
+            time_high=format_duration(total["est_time_high"])
+        )
+        self.log(message, "success")
+        QMessageBox.information(self, self.tr('ESTIMATE_SUMMARY_TITLE'), message)
+    
+    def start_encoding(self):
+        """开始编码（启用按片源搜索 CRF 时先搜索，完成后再次调用本方法开始编码）"""
+        if self.crf_worker is not None:
+            return
+        searching = self._crf_results is None and self.config_manager.get("crf_search", False)
+        prepared = self._prepare_jobs(log_audio_fallback=not searching)
+        if prepared is None:
+            self._crf_results = None
+            return
+        files_to_encode, output_dir, encode_kwargs, per_file_options, output_paths, duplicate_files = prepared
+        if searching:
+            self._start_crf_search(files_to_encode, output_paths, encode_kwargs, per_file_options)
+            return
+        self._crf_results = None
+        
+        # 开始前检查输出路径：多个输入输出到同一文件、或输出会覆盖输入文件时不开始编码
+        plan = self._build_encode_plan(files_to_encode, output_paths, encode_kwargs, per_file_options)
+        blocked = plan.blocked_jobs()
+        if blocked:
+            QMessageBox.warning(self, self.tr('MSG_WARNING'), self.tr('MSG_PLAN_BLOCKED').format(count=len(blocked)))
+            self.show_encode_plan(plan)
+            return
+        existing = plan.count(ISSUE_EXISTS)
+        if existing:
+            self.log(self.tr('LOG_PLAN_EXISTING_OUTPUTS').format(count=existing), "warning")
+        
+        self._job_output_paths = output_paths
+        self._job_renditions = {
+            job.input_path: active_renditions(job.kwargs) for job in plan.jobs if active_renditions(job.kwargs)
+        }
+        self._duplicate_outputs = {}
+        for file_path in duplicate_files:
+            self._duplicate_outputs.setdefault(self.file_duplicates[file_path], []).append(
+                (file_path, output_paths[file_path])
+            )
+        
+        # 开始前检查编码器、滤镜和封装格式是否可用，避免队列运行到一半才失败
+        if not self._validate_jobs(files_to_encode, output_paths, encode_kwargs, per_file_options):
+            return
+        
+        worker = None
+        if self.config_manager.get("encode_in_background_process", True):
+            # 在独立进程中编码：界面卡顿或崩溃不影响编码，重新打开后可以重新连接
+            planned = {job.input_path: job for job in plan.jobs}
+            jobs = []
+            for batch_id, group in enumerate(self._batch_groups(files_to_encode, lambda p: planned[p].kwargs)):
+                for file_path in group:
+                    job = planned[file_path]
+                    spec = {"input": job.input_path, "output": job.output_path, "kwargs": job.kwargs}
+                    if file_path in self._deferred_audio:
+                        spec["fallback_audio"] = list(self._deferred_audio[file_path])
+                    if len(group) > 1:
+                        spec["batch"] = batch_id
+                    jobs.append(spec)
+            try:
+                # 延迟导入：后台编码服务依赖 asyncio，只在首次编码时加载
+                from core.encode_service import EncodeServiceClient
+                from gui.encode_service_monitor import EncodeServiceMonitor
+                client = EncodeServiceClient.launch(
+                    self.config_manager.get_data_path(ENCODE_SERVICE_STATE_FILE), jobs, ffmpeg_path=self.ffmpeg_handler.ffmpeg_path
+                )
+                worker = EncodeServiceMonitor(client, self)
+            except Exception as e:
+                self.log(self.tr('LOG_ENCODE_SERVICE_FALLBACK').format(error=str(e)), "warning")
+        if worker is None:
+            # 创建编码工作线程
+            worker = EncodeWorker(
+                self.file_processor,
+                files_to_encode,
+                output_dir,
+                encode_kwargs,
+                per_file_options=per_file_options,
+                output_paths=output_paths,
+                batch_options=self._batch_options(),
+                info=self.media_store.info,
+                fallback_audio=self._deferred_audio
+            )
+        self._start_queue_eta([(job.input_path, job.kwargs) for job in plan.jobs])
+        self._start_encode_worker(worker)
+        self.log(self.tr('LOG_START_ENCODING').format(count=len(self.media_store)), "info")
+        self._start_deadline_tracking(files_to_encode, per_file_options, encode_kwargs)
+    
+    def _start_queue_eta(self, jobs):
+        """按速度模型预测各文件的编码耗时 [(文件路径, 编码参数)]，用于加权整体进度和估计剩余时间"""
+        self.speed_model.refresh()
+        self._queue_eta = QueueEta({
+            file_path: self.speed_model.predict(kwargs, self.media_store.info(file_path))[0] for file_path, kwargs in jobs
+        })
+    
+    def _start_deadline_tracking(self, files_to_encode, per_file_options, encode_kwargs):
+        """记录截止时间计划，编码过程中据此重新规划（小文件批量组内的文件不调整）"""
+        self._deadline_tracker = None
+        self._file_started_at = {}
+        if self._deadline_plan is None:
+            return
+        plan, deadline = self._deadline_plan
+        self._deadline_plan = None
+        self._deadline_tracker = DeadlineTracker(plan, deadline, self.speed_model)
+        batched = {
+            p for group in self._batch_groups(files_to_encode, lambda p: dict(encode_kwargs, **per_file_options[p]))
+            if len(group) > 1 for p in group
+        }
+        self._deadline_kwargs = {
+            job.input_path: dict(job.kwargs, video_preset=job.preset) for job in plan.jobs if job.input_path not in batched
+        }
+        self.log(self.tr('LOG_DEADLINE_PLAN').format(
+            deadline=time.strftime("%H:%M", time.localtime(deadline)), available=format_duration(plan.available),
+            predicted=format_duration(plan.total_seconds), presets=self._preset_counts(plan)
+        ), "info")
+        if not plan.feasible:
+            self.log(self.tr('LOG_DEADLINE_INFEASIBLE'), "warning")
+        if not plan.calibrated:
+            self.log(self.tr('LOG_DEADLINE_UNCALIBRATED'), "warning")
+    
+    @staticmethod
+    def _preset_counts(plan) -> str:
+        """计划中各预设的文件数，例如 "slow ×3, medium ×1" """
+        return ", ".join(f"{preset} ×{count}" for preset, count in plan.summary()["presets"].items()) or "-"
+    
+    def _replan_deadline(self, file_path: str):
+        """文件完成后比较实际耗时与预测，偏差过大时重新规划尚未开始的文件"""
+        started = self._file_started_at.pop(file_path, None)
+        if started is None or not self._deadline_tracker.finished(file_path, time.monotonic() - started):
+            return
+        waiting = [p for p in self.media_store.paths_with_status(STATUS_WAITING) if p in self._deadline_kwargs]
+        if not waiting:
+            return
+        plan = self._deadline_tracker.replan([(p, self._deadline_kwargs[p]) for p in waiting])
+        updates = {}
+        for path, preset in plan.presets().items():
+            if preset != self._deadline_kwargs[path].get("video_preset"):
+                self._deadline_kwargs[path]["video_preset"] = preset
+                updates[path] = {"video_preset": preset}
+        if updates and self.encode_worker is not None:
+            self.encode_worker.update_pending(updates)
+        if updates and self._queue_eta is not None:
+            self._queue_eta.set_predictions({
+                path: self.speed_model.predict(self._deadline_kwargs[path], self.media_store.info(path))[0]
+                for path in updates
+            })
+        self.log(self.tr('LOG_DEADLINE_REPLAN').format(
+            ratio=f"{self._deadline_tracker.slowdown:.0%}", count=len(updates), presets=self._preset_counts(plan)
+        ), "warning" if not plan.feasible else "info")
+    
+    def _start_crf_search(self, files_to_encode, output_paths, encode_kwargs, per_file_options):
+        """按片源搜索 CRF（监视文件夹或队列清单中明确设置了 video_crf 的文件不搜索）"""
+        plan = self._build_encode_plan(files_to_encode, output_paths, encode_kwargs, per_file_options)
+        jobs = [
+            (job.input_path, dict(job.kwargs, source_info=self.media_store.info(job.input_path) or None), job.duration)
+            for job in plan.jobs
+            if searchable(job.kwargs) and "video_crf" not in self.file_settings.get(job.input_path, {})
+        ]
+        self._crf_results = {}
+        self.crf_worker = CrfSearchWorker(self.ffmpeg_handler, self.config_manager, jobs, self.crf_cache)
+        self.crf_worker.crf_ready.connect(self._on_crf_ready)
+        self.crf_worker.finished.connect(self._on_crf_search_finished)
+        self.start_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self.log(self.tr('LOG_CRF_SEARCH_STARTED').format(count=len(jobs)), "info")
+        self.crf_worker.start()
+    
+    def _on_crf_ready(self, file_path: str, result):
+        """单个文件的 CRF 搜索完成"""
+        filename = os.path.basename(file_path)
+        if result is None:
+            self.log(self.tr('LOG_CRF_SEARCH_FAILED').format(filename=filename), "warning")
+            return
+        self._crf_results[file_path] = result
+        self.log(self.tr('LOG_CRF_SELECTED').format(filename=filename, result=result.summary()),
+                 "info" if result.met else "warning")
+    
+    def _on_crf_search_finished(self):
+        """CRF 搜索结束：未取消时使用搜索结果开始编码"""
+        cancelled = self.crf_worker.cancelled
+        self.crf_worker = None
+        self.start_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        if cancelled:
+            self._crf_results = None
+            return
+        self.start_encoding()
+    
+    def _batch_options(self) -> Dict[str, object]:
+        """小文件批量模式的参数（process_files 的 batch_max_duration / batch_max_files），未启用时为空"""
+        if not self.config_manager.get("batch_small_files", False):
+            return {}
+        return {
+            "batch_max_duration": float(self.config_manager.get("batch_max_duration", DEFAULT_BATCH_MAX_DURATION)),
+            "batch_max_files": int(self.config_manager.get("batch_max_files", DEFAULT_BATCH_MAX_FILES)),
+        }
+    
+    def _batch_groups(self, files_to_encode, kwargs_for) -> List[List[str]]:
+        """按小文件批量模式分组（未启用时每个文件一组）"""
+        options = self._batch_options()
+        if not options:
+            return [[p] for p in files_to_encode]
+        return group_batches(
+            files_to_encode, kwargs_for, options["batch_max_duration"], options["batch_max_files"],
+            lambda p: float((self.media_store.info(p) or {}).get("format_duration") or 0)
+        )
+    
+    def _validate_jobs(self, files_to_encode, output_paths, encode_kwargs, per_file_options) -> bool:
+        """
+        使用缓存的 FFmpeg 能力信息检查编码任务
+        
+        Returns:
+            False 表示存在无法执行的任务（已提示用户）；无法检测能力时不阻止编码
+        """
+        from core.ffmpeg_capabilities import CAPABILITY_CACHE_FILE
+        capabilities = self.ffmpeg_handler.get_capabilities(self.config_manager.get_data_path(CAPABILITY_CACHE_FILE))
+        if capabilities is None:
+            return True
+        problems = []
+        for file_path in files_to_encode:
+            job_kwargs = dict(encode_kwargs)
+            job_kwargs.update(per_file_options.get(file_path, {}))
+            for problem in capabilities.validate_job(job_kwargs, output_paths.get(file_path, "")):
+                if problem not in problems:
+                    problems.append(problem)
+        if not problems:
+            return True
+        QMessageBox.warning(
+            self, self.tr('MSG_ERROR'),
+            self.tr('MSG_JOB_VALIDATION_FAILED').format(version=capabilities.version, problems="\n".join(problems))
         )
+        return False
+    
+    def _start_encode_worker(self, worker):
+        """连接编码工作线程（或后台编码服务监视器）的信号并开始编码"""
+        self.encode_worker = worker
         self.encode_worker.progress_updated.connect(self.on_progress_updated)
         self.encode_worker.file_started.connect(self.on_file_started)
         self.encode_worker.file_finished.connect(self.on_file_finished)
@@ -1358,10 +2350,50 @@ class MainWindow(QMainWindow):
         
         # 启动编码
         self.encode_worker.start()
-        self.log(self.tr('LOG_START_ENCODING').format(count=len(self.file_list)), "info")
+    
+    def _reattach_encode_service(self):
+        """检查后台编码服务状态文件：重新连接仍在运行的编码，或显示关闭期间完成的结果"""
+        state_path = self.config_manager.get_data_path(ENCODE_SERVICE_STATE_FILE)
+        if not os.path.exists(state_path):
+            return
+        from core.encode_service import EncodeServiceClient
+        client = EncodeServiceClient.find_existing(state_path)
+        if client is None:
+            return
+        if client.finished:
+            results = client.state.get("results") or []
+            success_count = sum(1 for r in results if r[2])
+            self.log(self.tr('LOG_ENCODE_SERVICE_FINISHED_OFFLINE').format(
+                success=success_count, failed=len(results) - success_count
+            ), "info")
+            for file_path, _, success, msg in results:
+                status = "✓" if success else "✗"
+                log_type = "success" if success else "error"
+                self.log(f"{status} {os.path.basename(file_path)}: {msg}", log_type)
+            client.cleanup()
+            return
+        if not client.is_alive():
+            client.cleanup()
+            return
+        
+        # 将后台任务加入文件列表，输出路径与服务端保持一致
+        jobs = client.state.get("jobs", [])
+        for job in jobs:
+            self.file_output_paths[job["input"]] = job["output"]
+        new_paths = [job["input"] for job in jobs if job["input"] not in self.media_store]
+        if new_paths and self.file_processor:
+            self.add_paths(new_paths)
+        self.log(self.tr('LOG_ENCODE_SERVICE_REATTACHED').format(count=len(jobs)), "info")
+        self._start_queue_eta([(job["input"], job.get("kwargs", {})) for job in jobs])
+        from gui.encode_service_monitor import EncodeServiceMonitor
+        self._start_encode_worker(EncodeServiceMonitor(client, self))
     
     def stop_encoding(self):
         """停止编码"""
+        if self.crf_worker is not None:
+            self.crf_worker.cancel()
+            self.log(self.tr('STOPPING'), "warning")
+            return
         if self.encode_worker:
             self.encode_worker.cancel()
             self.log(self.tr('STOPPING'), "warning")
@@ -1375,6 +2407,10 @@ class MainWindow(QMainWindow):
         filename = os.path.basename(file_path)
         # 更新状态为"正在编码"
         self._set_file_status(file_path, STATUS_ENCODING)
+        if self._queue_eta is not None:
+            self._queue_eta.start(file_path)
+        if self._deadline_tracker is not None:
+            self._file_started_at[file_path] = time.monotonic()
         self.log(self.tr('LOG_FILE_STARTED').format(
             current=current, total=total, filename=filename
         ), "info")
@@ -1382,12 +2418,18 @@ class MainWindow(QMainWindow):
     def on_file_finished(self, current: int, total: int, file_path: str, success: bool, message: str):
         """文件结束编码"""
         filename = os.path.basename(file_path)
+        if self._queue_eta is not None:
+            self._queue_eta.finish(file_path)
         if success:
             # 更新状态为"编码完成"
             self._set_file_status(file_path, STATUS_DONE)
             self.log(self.tr('LOG_FILE_FINISHED_SUCCESS').format(
                 current=current, total=total, filename=filename, message=message
             ), "success")
+            self._log_rendition_outputs(file_path)
+            self._materialize_duplicates(file_path)
+            if self._deadline_tracker is not None:
+                self._replan_deadline(file_path)
         else:
             # 更新状态为"编码失败"
             self._set_file_status(file_path, STATUS_FAILED)
@@ -1396,22 +2438,78 @@ class MainWindow(QMainWindow):
                 current=current, total=total, filename=filename, message=message
             ), "error")
     
+    def _job_outputs(self, file_path: str, output_path: str) -> List[str]:
+        """任务实际写出的文件（多码率输出时为各规格的输出）"""
+        return FileProcessor.rendition_output_paths(output_path, self._job_renditions.get(file_path))
+    
+    def _log_rendition_outputs(self, file_path: str):
+        """多码率输出完成后逐个记录各规格的输出文件和大小"""
+        renditions = self._job_renditions.get(file_path)
+        output_path = self._job_output_paths.get(file_path)
+        if not renditions or not output_path:
+            return
+        for name, path in rendition_outputs(output_path, renditions):
+            try:
+                size = format_file_size(os.path.getsize(path))
+            except OSError:
+                self.log(self.tr('LOG_RENDITION_MISSING').format(name=name, output=path), "error")
+                continue
+            self.log(self.tr('LOG_RENDITION_OUTPUT').format(name=name, output=path, size=size), "success")
+    
+    def _materialize_duplicates(self, original: str):
+        """原件编码完成后，为其重复文件提供输出（硬链接，不支持时复制；多码率输出时逐个规格处理）"""
+        copies = self._duplicate_outputs.pop(original, [])
+        source = self._job_output_paths.get(original)
+        if not copies or not source:
+            return
+        sources = self._job_outputs(original, source)
+        if not all(os.path.exists(path) for path in sources):
+            return
+        from core.dedupe import link_or_copy
+        for file_path, output_path in copies:
+            filename = os.path.basename(file_path)
+            try:
+                targets = FileProcessor.rendition_output_paths(output_path, self._job_renditions.get(original))
+                for source_path, target_path in zip(sources, targets):
+                    method = link_or_copy(source_path, target_path)
+            except OSError as e:
+                self._set_file_status(file_path, STATUS_FAILED)
+                self.log(self.tr('LOG_DUPLICATE_OUTPUT_FAILED').format(filename=filename, error=str(e)), "error")
+                continue
+            self._set_file_status(file_path, STATUS_DONE)
+            key = 'LOG_DUPLICATE_OUTPUT_LINKED' if method == "hardlink" else 'LOG_DUPLICATE_OUTPUT_COPIED'
+            self.log(self.tr(key).format(filename=filename, output=output_path), "success")
+    
     def on_progress_updated(self, current: int, total: int, file_path: str, progress: float, message: str):
         """进度更新"""
+        file_eta = queue_eta = None
+        if self._queue_eta is not None:
+            # 总体进度按各文件的预测编码耗时加权（短片段和长片不再按相同比重计算）
+            self._queue_eta.update(file_path, progress)
+            overall_progress = self._queue_eta.overall()
+            file_eta = self._queue_eta.file_remaining(file_path)
+            queue_eta = self._queue_eta.queue_remaining()
+        else:
+            # 总体进度 = (已完成文件数 * 100 + 当前文件进度) / 总文件数
+            overall_progress = ((current - 1) * 100 + progress) / total if total > 0 else 0
+        
         # 更新当前文件进度条
         self.current_file_progress_bar.setValue(int(progress))
+        if file_eta is not None and progress < 100:
+            message += self.tr('ETA_SUFFIX').format(eta=format_duration(max(1.0, file_eta)))
         self.current_file_label.setText(self.tr('CURRENT_FILE_FORMAT').format(
             filename=os.path.basename(file_path), message=message
         ))
         
-        # 计算并更新总体进度条
-        # 总体进度 = (已完成文件数 * 100 + 当前文件进度) / 总文件数
-        overall_progress = ((current - 1) * 100 + progress) / total if total > 0 else 0
+        # 更新总体进度条
         overall_progress_int = int(overall_progress)
         self.overall_progress_bar.setValue(overall_progress_int)
-        self.overall_progress_label.setText(self.tr('PROGRESS_FORMAT').format(
-            current=current, total=total, percent=overall_progress_int
-        ))
+        text = self.tr('PROGRESS_FORMAT').format(current=current, total=total, percent=overall_progress_int)
+        if queue_eta is not None:
+            text += self.tr('QUEUE_ETA_SUFFIX').format(
+                eta=format_duration(max(1.0, queue_eta)), finish=time.strftime("%H:%M", time.localtime(time.time() + queue_eta))
+            )
+        self.overall_progress_label.setText(text)
         
         # 更新任务栏进度条（仅 Windows）
         if HAS_WIN_TASKBAR and hasattr(self, 'taskbar_progress'):
@@ -1421,6 +2519,9 @@ class MainWindow(QMainWindow):
         """编码完成"""
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
+        self._deadline_tracker = None
+        self._queue_eta = None
+        self.speed_model.save()
         
         # 统计结果
         success_count = sum(1 for _, _, success, _ in results if success)
@@ -1428,10 +2529,12 @@ class MainWindow(QMainWindow):
 
         # 计算编码后文件总大小
         encoded_total_size = 0
-        for _, output_path, success, _ in results:
-            if success and output_path and os.path.exists(output_path):
+        for file_path, output_path, success, _ in results:
+            if not success or not output_path:
+                continue
+            for path in self._job_outputs(file_path, output_path):
                 try:
-                    encoded_total_size += os.path.getsize(output_path)
+                    encoded_total_size += os.path.getsize(path)
                 except OSError:
                     pass
         # 更新文件大小总计显示（源文件加编码后总大小）
@@ -1453,6 +2556,16 @@ class MainWindow(QMainWindow):
         # 队列完成后根据设置播放提示音（在显示消息框之前播放）
         self.play_completion_sound()
         
+        # 监视模式下不弹出结果对话框，编码期间新加入的文件继续编码
+        if self._is_watching():
+            for file_path, _, success, msg in results:
+                status = "✓" if success else "✗"
+                log_type = "success" if success else "error"
+                self.log(f"{status} {os.path.basename(file_path)}: {msg}", log_type)
+            self.encode_worker = None
+            QTimer.singleShot(0, self._start_watch_encoding)
+            return
+        
         # 显示结果（使用QMessageBox.information，确保不会导致程序退出）
         msg_box = QMessageBox(self)
         # 使用NoIcon避免触发Windows系统提示音
@@ -1509,7 +2622,12 @@ class MainWindow(QMainWindow):
         if not sound_file or not os.path.exists(sound_file):
             return
 
-        # 懒加载播放器，避免在未使用时初始化多媒体模块
+        # 懒加载多媒体模块和播放器，避免启动时加载 QtMultimedia
+        try:
+            from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
+        except ImportError as e:
+            print(f"加载多媒体模块失败: {e}")
+            return
         player = getattr(self, "_notification_player", None)
         if player is None:
             player = QMediaPlayer(self)
@@ -1532,6 +2650,45 @@ class MainWindow(QMainWindow):
     
     def closeEvent(self, event):
         """窗口关闭时保存窗口大小和位置"""
+        if hasattr(self.encode_worker, "detach") and self.encode_worker.isRunning():
+            # 后台编码服务在独立进程中运行，可以在关闭窗口后继续编码
+            reply = QMessageBox.question(
+                self,
+                self.tr('MSG_INFO'),
+                self.tr('MSG_ENCODE_CONTINUE_IN_BACKGROUND'),
+                QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel,
+                QMessageBox.Yes
+            )
+            if reply == QMessageBox.Cancel:
+                event.ignore()
+                return
+            if reply == QMessageBox.No:
+                self.encode_worker.cancel()
+            self.encode_worker.detach()
+        if self.folder_watcher:
+            self.folder_watcher.stop()
+            self.folder_watcher = None
+        if self.file_info_worker is not None:
+            self.file_info_worker.cancel()
+            self.file_info_worker.wait()
+        if self.crop_worker is not None:
+            self.crop_worker.cancel()
+            self.crop_worker.wait()
+        if self.complexity_worker is not None:
+            self.complexity_worker.cancel()
+            self.complexity_worker.wait()
+        if self.manifest_worker is not None:
+            self.manifest_worker.cancel()
+            self.manifest_worker.wait()
+        if self.estimate_worker is not None:
+            self.estimate_worker.cancel()
+            self.estimate_worker.wait()
+        if self.crf_worker is not None:
+            self.crf_worker.cancel()
+            self.crf_worker.wait()
+        self.probe_cache.save()
+        self.scan_index.save()
+        self.speed_model.save()
         try:
             size = self.size()
             pos = self.pos()
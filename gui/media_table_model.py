@@ -0,0 +1,440 @@
+"""
+文件列表表格模型 - 直接从列式媒体信息库（core.media_store.MediaStore）读取显示内容
+
+只为可见的单元格生成文本；过滤和排序在整列上计算行顺序（安装 NumPy 时为向量计算），不复制每个单元格。
+"""
+import os
+from bisect import bisect_left
+from typing import List, Optional
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor, QBrush
+from core.presets import TIER_NAMES
+from core.crop_detect import CROP_FIELDS, crop_filter, crop_rect, crop_savings
+from core.media_store import MediaStore, HAS_NUMPY, PROBE_NONE, PROBE_QUICK, PROBE_FAILED, numpy_module
+from core.queue_filter import QueueFilter
+
+# 表格列索引常量
+COL_FILENAME = 0
+COL_STATUS = 1
+COL_RESOLUTION = 2
+COL_BITRATE = 3
+COL_FRAMERATE = 4
+COL_DURATION = 5
+COL_VIDEO_CODEC = 6
+COL_FILE_SIZE = 7
+COL_AUDIO_CODEC = 8
+COL_AUDIO_BITRATE = 9
+COL_BITS_PER_PIXEL = 10
+COL_PATH = 11
+COL_CROP = 12  # 黑边检测结果（排在隐藏的路径列之后，已保存的列宽不受影响）
+COL_EST_SIZE = 13  # 抽样试编码预估的输出大小
+COL_EST_TIME = 14  # 抽样试编码预估的编码耗时
+COL_COMPLEXITY = 15  # 内容复杂度档位
+
+# 各列标题的翻译键
+COLUMN_TITLE_KEYS = [
+    'COL_FILENAME', 'COL_STATUS', 'COL_RESOLUTION', 'COL_BITRATE', 'COL_FRAMERATE', 'COL_DURATION',
+    'COL_VIDEO_CODEC', 'COL_FILE_SIZE', 'COL_AUDIO_CODEC', 'COL_AUDIO_BITRATE', 'COL_BITS_PER_PIXEL', 'COL_PATH',
+    'COL_CROP', 'COL_EST_SIZE', 'COL_EST_TIME', 'COL_COMPLEXITY'
+]
+
+# 需要详细探测才有的列（快速探测后仍显示“获取中”）
+STREAM_COLUMNS = {COL_RESOLUTION, COL_FRAMERATE, COL_VIDEO_CODEC, COL_AUDIO_CODEC, COL_AUDIO_BITRATE, COL_BITS_PER_PIXEL}
+# 排序依据为探测结果的列（探测结果更新后需要重新排序）
+PROBE_COLUMNS = STREAM_COLUMNS | {COL_BITRATE, COL_DURATION, COL_FILE_SIZE, COL_CROP, COL_EST_SIZE, COL_EST_TIME, COL_COMPLEXITY}
+# 预估列 -> 推算值字段（范围字段加 _low / _high 后缀）
+ESTIMATE_COLUMNS = {COL_EST_SIZE: 'est_size', COL_EST_TIME: 'est_time'}
+
+# 文件状态代码
+STATUS_WAITING = "waiting"
+STATUS_ENCODING = "encoding"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_PAUSED = "paused"
+STATUS_DUPLICATE = "duplicate"  # 与队列中另一文件内容相同，使用其编码结果
+
+STATUS_KEY_MAP = {
+    STATUS_WAITING: 'STATUS_WAITING',
+    STATUS_ENCODING: 'STATUS_ENCODING',
+    STATUS_DONE: 'STATUS_DONE',
+    STATUS_FAILED: 'STATUS_FAILED',
+    STATUS_PAUSED: 'STATUS_PAUSED',
+    STATUS_DUPLICATE: 'STATUS_DUPLICATE',
+}
+
+# 各状态对应的浅色背景
+STATUS_BG_COLORS = {
+    STATUS_WAITING: QColor('#FFF9CC'),   # 浅黄
+    STATUS_ENCODING: QColor('#DDEEFF'),  # 浅蓝
+    STATUS_DONE: QColor('#E5F8E5'),      # 浅绿
+    STATUS_FAILED: QColor('#FAD4D4'),    # 浅红
+    STATUS_PAUSED: QColor('#F0E6FF'),    # 浅紫
+    STATUS_DUPLICATE: QColor('#EEEEEE'), # 浅灰
+}
+
+
+def format_duration(seconds: float) -> str:
+    """格式化时长"""
+    if seconds <= 0:
+        return "N/A"
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    secs = int(seconds % 60)
+    if hours > 0:
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+    else:
+        return f"{minutes:02d}:{secs:02d}"
+
+
+def format_file_size(size_bytes: int) -> str:
+    """格式化文件大小"""
+    if size_bytes == 0:
+        return "0 B"
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if size_bytes < 1024.0:
+            return f"{size_bytes:.2f} {unit}"
+        size_bytes /= 1024.0
+    return f"{size_bytes:.2f} PB"
+
+
+def format_bitrate(bitrate: int) -> str:
+    """格式化码率（根据量级在 Kbps 与 Mbps 间切换，视频常用 Mbps，音频常用 Kbps）"""
+    if bitrate == 0:
+        return "N/A"
+    mbps = bitrate / 1000000.0
+    if mbps < 1:
+        kbps = int(round(bitrate / 1000.0))
+        return f"{kbps} Kbps"
+    return f"{mbps:.2f} Mbps"
+
+
+class MediaTableModel(QAbstractTableModel):
+    """文件列表模型：视图行按 _order 映射到 MediaStore 的行（只包含满足过滤条件的行）"""
+
+    def __init__(self, store: MediaStore, tr_func, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.tr_func = tr_func
+        self._order: List[int] = []
+        self._view_rows: Optional[List[int]] = None  # MediaStore 行 -> 视图行，-1 表示被过滤（按需重建）
+        self._filter: Optional[QueueFilter] = None
+        self._known = 0  # 已通知到模型的 MediaStore 行数（之后追加的行在 rows_appended 后才显示）
+        self._names: List[str] = []  # 文件名排序键（随追加的行延长，行被删除后重建）
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
+
+    # ---------- Qt 模型接口 ----------
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._order)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(COLUMN_TITLE_KEYS)
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.tr_func(COLUMN_TITLE_KEYS[section])
+        return super().headerData(section, orientation, role)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._order[index.row()]
+        column = index.column()
+        if role == Qt.ToolTipRole and column == COL_CROP:
+            crop = crop_filter(self._crop_info(row))
+            return f"crop={crop}" if crop else None
+        if role == Qt.ToolTipRole and column == COL_EST_SIZE:
+            size = self.store.value(row, 'est_size')
+            source = self.store.value(row, 'file_size')
+            if not size or not source:
+                return None
+            return self.tr_func('EST_SIZE_TOOLTIP').format(
+                size=format_file_size(size), source=format_file_size(source),
+                change=int(round((size / source - 1) * 100))
+            )
+        if role == Qt.ToolTipRole and column == COL_COMPLEXITY:
+            if not self.store.value(row, 'complexity_tier'):
+                return None
+            return self.tr_func('COMPLEXITY_TOOLTIP').format(
+                spatial=self.store.value(row, 'complexity_spatial'),
+                temporal=self.store.value(row, 'complexity_temporal'),
+                cuts=self.store.value(row, 'complexity_cuts')
+            )
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return self._cell_text(row, column)
+        if role == Qt.BackgroundRole:
+            color = STATUS_BG_COLORS.get(self.store.status_at(row))
+            return QBrush(color) if color is not None else None
+        if role == Qt.TextAlignmentRole and column == COL_STATUS:
+            return Qt.AlignCenter
+        if role == Qt.UserRole:
+            return self.store.path(row)
+        return None
+
+    def _crop_info(self, row: int) -> dict:
+        store = self.store
+        return {name: store.value(row, name) for name in ('width', 'height') + CROP_FIELDS}
+
+    def _cell_text(self, row: int, column: int) -> str:
+        store = self.store
+        if column == COL_CROP:
+            # 尚未检测时为空
+            info = self._crop_info(row)
+            rect = crop_rect(info)
+            if rect is None:
+                return ""
+            if not crop_filter(info):
+                return self.tr_func('CROP_NONE')
+            return f"{rect[0]}x{rect[1]} (-{crop_savings(info) * 100:.0f}%)"
+        if column in ESTIMATE_COLUMNS:
+            # 尚未预估时为空，否则显示推算值和范围
+            name = ESTIMATE_COLUMNS[column]
+            value = store.value(row, name)
+            if not value:
+                return ""
+            fmt = format_file_size if column == COL_EST_SIZE else format_duration
+            return f"{fmt(value)} ({fmt(store.value(row, name + '_low'))} – {fmt(store.value(row, name + '_high'))})"
+        if column == COL_COMPLEXITY:
+            # 尚未分析时为空
+            tier = TIER_NAMES.get(store.value(row, 'complexity_tier'))
+            return self.tr_func(f'COMPLEXITY_{tier.upper()}') if tier else ""
+        if column == COL_FILENAME:
+            return os.path.basename(store.path(row))
+        if column == COL_PATH:
+            return store.path(row)
+        if column == COL_STATUS:
+            return self.tr_func(STATUS_KEY_MAP.get(store.status_at(row), 'STATUS_WAITING'))
+        if column == COL_FILE_SIZE:
+            return format_file_size(store.value(row, 'file_size'))
+        level = store.probe_level_at(row)
+        if level == PROBE_NONE or (level == PROBE_QUICK and column in STREAM_COLUMNS):
+            return self.tr_func('FETCHING_INFO')
+        if level == PROBE_FAILED:
+            return self.tr_func('NA')
+        if column == COL_RESOLUTION:
+            width, height = store.value(row, 'width'), store.value(row, 'height')
+            return f"{width}x{height}" if width > 0 and height > 0 else "N/A"
+        if column == COL_BITRATE:
+            return format_bitrate(store.value(row, 'format_bitrate') or store.value(row, 'video_bitrate'))
+        if column == COL_FRAMERATE:
+            fps = store.value(row, 'fps')
+            return f"{fps:.2f} fps" if fps > 0 else "N/A"
+        if column == COL_DURATION:
+            return format_duration(store.duration_at(row))
+        if column == COL_VIDEO_CODEC:
+            return store.code_name(row, 'video_codec') or "N/A"
+        if column == COL_AUDIO_CODEC:
+            return store.code_name(row, 'audio_codec') or "N/A"
+        if column == COL_AUDIO_BITRATE:
+            return format_bitrate(store.value(row, 'audio_bitrate'))
+        if column == COL_BITS_PER_PIXEL:
+            bits = store.value(row, 'bits_per_10000_pixels')
+            return f"{bits:.2f} bits" if bits > 0 else "N/A"
+        return ""
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        """按列排序（保持选中行）"""
+        self._sort_column = column
+        self._sort_order = order
+        self._relayout()
+
+    def _relayout(self, presorted: bool = False):
+        """
+        重新计算过滤和排序后的行顺序（保持仍然显示的选中行）
+
+        Args:
+            presorted: 当前顺序除末尾新追加的行外已按当前列排好，在其基础上排序（只需合并）
+        """
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        rows = [self._order[index.row()] for index in persistent]
+        self._apply_sort(presorted)
+        view_rows = self._inverse()
+        self.changePersistentIndexList(persistent, [
+            self.index(view_rows[row], index.column()) if view_rows[row] >= 0 else QModelIndex()
+            for row, index in zip(rows, persistent)
+        ])
+        self.layoutChanged.emit()
+
+    # ---------- 过滤 ----------
+
+    def set_filter(self, queue_filter: Optional[QueueFilter]):
+        """只显示满足条件的行，None 或空表达式表示显示全部"""
+        if queue_filter is not None and queue_filter.is_empty():
+            queue_filter = None
+        self._filter = queue_filter
+        self._relayout()
+
+    def is_filtered(self) -> bool:
+        return self._filter is not None
+
+    def _refilter_if_needed(self, rows: List[int]):
+        """这些行的内容变化后，若其中有行是否满足条件发生了变化则重新过滤"""
+        mask = self._filter.mask(self.store)
+        view_rows = self._inverse()
+        if any(bool(mask[row]) != (view_rows[row] >= 0) for row in rows if row < self._known):
+            self._relayout()
+
+    # ---------- 排序 ----------
+
+    def _sort_key(self, column: int):
+        """整列排序键：数值列返回 MediaStore.column() 的结果，字符串列返回按行取值的函数"""
+        store = self.store
+        if column == COL_FILENAME:
+            names = self._names
+            names.extend(os.path.basename(store.path(row)) for row in range(len(names), len(store)))
+            return names.__getitem__
+        if column == COL_PATH:
+            return store.path
+        if column == COL_STATUS:
+            return lambda row: self.tr_func(STATUS_KEY_MAP.get(store.status_at(row), 'STATUS_WAITING'))
+        if column == COL_VIDEO_CODEC:
+            return lambda row: store.code_name(row, 'video_codec')
+        if column == COL_AUDIO_CODEC:
+            return lambda row: store.code_name(row, 'audio_codec')
+        if column == COL_RESOLUTION:
+            width, height = store.column('width'), store.column('height')
+            if HAS_NUMPY:
+                np = numpy_module()
+                return width.astype(np.int64) * height
+            return [w * h for w, h in zip(width, height)]
+        if column == COL_BITRATE:
+            total, video = store.column('format_bitrate'), store.column('video_bitrate')
+            if HAS_NUMPY:
+                np = numpy_module()
+                return np.where(total > 0, total, video)
+            return [t or v for t, v in zip(total, video)]
+        if column == COL_CROP:
+            # 按少处理的像素比例排序，尚未检测的排在没有黑边的之前
+            width, height = store.column('width'), store.column('height')
+            crop_w, crop_h = store.column('crop_width'), store.column('crop_height')
+            if HAS_NUMPY:
+                np = numpy_module()
+                pixels = width.astype(np.float64) * height
+                cropped = crop_w.astype(np.float64) * crop_h
+                return np.where((pixels > 0) & (cropped > 0), 1 - cropped / np.maximum(pixels, 1), -1.0)
+            return [1 - cw * ch / (w * h) if w * h and cw * ch else -1.0
+                    for w, h, cw, ch in zip(width, height, crop_w, crop_h)]
+        names = {
+            COL_FRAMERATE: 'fps', COL_DURATION: 'duration', COL_FILE_SIZE: 'file_size',
+            COL_AUDIO_BITRATE: 'audio_bitrate', COL_BITS_PER_PIXEL: 'bits_per_10000_pixels',
+            COL_EST_SIZE: 'est_size', COL_EST_TIME: 'est_time', COL_COMPLEXITY: 'complexity_tier',
+        }
+        return store.column(names[column])
+
+    def _apply_sort(self, presorted: bool = False):
+        self._view_rows = None
+        if presorted and self._filter is None and self._sort_column >= 0:
+            # 已排序的部分在排序时作为一段有序序列，只需与新行合并
+            self._order = self.store.argsort(
+                self._sort_key(self._sort_column), rows=self._order,
+                descending=self._sort_order == Qt.DescendingOrder
+            )
+            return
+        if self._filter is not None:
+            rows = self._filter.rows(self.store)
+            if len(rows) and rows[-1] >= self._known:
+                rows = rows[:bisect_left(rows, self._known)]
+        else:
+            rows = range(self._known)
+        if self._sort_column < 0 or self._known == 0:
+            self._order = list(rows)
+            return
+        self._order = self.store.argsort(
+            self._sort_key(self._sort_column), rows=rows, descending=self._sort_order == Qt.DescendingOrder
+        )
+
+    def _inverse(self) -> List[int]:
+        if self._view_rows is None:
+            # 空队列（例如启动时）不使用 NumPy，避免启动时导入
+            if HAS_NUMPY and self._order:
+                np = numpy_module()
+                view_rows = np.full(len(self.store), -1, dtype=np.int64)
+                view_rows[np.asarray(self._order, dtype=np.int64)] = np.arange(len(self._order))
+                self._view_rows = view_rows.tolist()
+            else:
+                view_rows = [-1] * len(self.store)
+                for view_row, row in enumerate(self._order):
+                    view_rows[row] = view_row
+                self._view_rows = view_rows
+        return self._view_rows
+
+    def resort(self, probe_changed: bool = False):
+        """
+        重新应用当前排序
+
+        Args:
+            probe_changed: 只有探测结果变化（当前排序列不依赖探测结果时无需重新排序）
+        """
+        if self._sort_column < 0:
+            return
+        if probe_changed and self._sort_column not in PROBE_COLUMNS:
+            return
+        self.sort(self._sort_column, self._sort_order)
+
+    # ---------- 数据变化通知 ----------
+
+    def reset(self):
+        """MediaStore 中的行被删除或清空后重建视图"""
+        self.beginResetModel()
+        self._known = len(self.store)
+        self._names = []
+        self._apply_sort()
+        self.endResetModel()
+
+    def rows_appended(self, count: int):
+        """MediaStore 末尾追加了 count 行"""
+        count = min(count, len(self.store) - self._known)
+        if count <= 0:
+            return
+        if self._filter is not None:
+            self._known += count
+            self._relayout()
+            return
+        first = len(self._order)
+        self.beginInsertRows(QModelIndex(), first, first + count - 1)
+        self._order.extend(range(self._known, self._known + count))
+        self._known += count
+        self._view_rows = None
+        self.endInsertRows()
+        if self._sort_column >= 0:
+            self._relayout(presorted=True)
+
+    def sync_rows(self):
+        """显示 MediaStore 中所有尚未通知的追加行（用于分批导入时合并刷新）"""
+        self.rows_appended(len(self.store) - self._known)
+
+    def rows_changed(self, rows: List[int]):
+        """MediaStore 中这些行的内容已变化"""
+        if not rows:
+            return
+        if self._filter is not None:
+            self._refilter_if_needed(rows)
+        view_rows = self._inverse()
+        visible = [view_rows[row] for row in rows if row < len(view_rows) and view_rows[row] >= 0]
+        if not visible:
+            return
+        self.dataChanged.emit(
+            self.index(min(visible), 0), self.index(max(visible), self.columnCount() - 1)
+        )
+
+    def refresh_all(self):
+        """语言切换后刷新表头和所有单元格"""
+        self.headerDataChanged.emit(Qt.Horizontal, 0, self.columnCount() - 1)
+        if self._order:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._order) - 1, self.columnCount() - 1))
+
+    # ---------- 查询 ----------
+
+    def path_at(self, view_row: int) -> str:
+        return self.store.path(self._order[view_row])
+
+    def view_row(self, path: str) -> int:
+        """文件在视图中的行，不存在或被过滤时返回 -1"""
+        row = self.store.row(path)
+        return -1 if row < 0 else self._inverse()[row]
+
+    def visible_store_rows(self) -> List[int]:
+        """当前显示的 MediaStore 行（视图顺序）"""
+        return list(self._order)
@@ -0,0 +1,104 @@
+"""
+相似视频检测 - 后台分析线程和审核对话框
+"""
+from typing import Callable, Dict, List
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QTreeWidget, QTreeWidgetItem, QHeaderView
+)
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from core.near_duplicates import NearDuplicateAnalyzer
+
+
+class NearDuplicateWorker(QThread):
+    """相似视频分析线程"""
+    progress_updated = pyqtSignal(int, int, str)  # current, total, file_path
+    finished = pyqtSignal(list)  # 相似文件组 [[file_path, ...], ...]
+
+    def __init__(self, ffmpeg_path: str, files: list, durations: Dict[str, float]):
+        super().__init__()
+        self.analyzer = NearDuplicateAnalyzer(ffmpeg_path)
+        self.files = files
+        self.durations = durations
+        self.cancelled = False
+
+    def run(self):
+        """抽帧、计算哈希并聚类"""
+        try:
+            clusters = self.analyzer.analyze(
+                self.files,
+                self.durations,
+                progress_callback=self.progress_updated.emit,
+                cancel_flag=lambda: self.cancelled
+            )
+        except Exception as e:
+            print(f"相似视频分析失败: {e}")
+            clusters = []
+        self.finished.emit([] if self.cancelled else clusters)
+
+    def cancel(self):
+        """取消分析"""
+        self.cancelled = True
+
+
+class NearDuplicateDialog(QDialog):
+    """相似视频审核对话框：每组默认只勾选质量最好的源文件"""
+
+    def __init__(self, clusters: List[List[str]], describe: Callable[[str], List[str]], tr_func, parent=None):
+        """
+        Args:
+            clusters: 相似文件组，每组按源质量从高到低排序
+            describe: 返回文件各列显示文本 [文件名, 分辨率, 码率, 时长, 文件大小, 路径]
+            tr_func: 翻译函数
+        """
+        super().__init__(parent)
+        self.tr_func = tr_func
+        self.setWindowTitle(self.tr_func('SIMILAR_DIALOG_TITLE'))
+        self.resize(900, 480)
+
+        layout = QVBoxLayout(self)
+        hint_label = QLabel(self.tr_func('SIMILAR_DIALOG_HINT'))
+        hint_label.setWordWrap(True)
+        layout.addWidget(hint_label)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels([
+            self.tr_func('COL_FILENAME'), self.tr_func('COL_RESOLUTION'), self.tr_func('COL_BITRATE'),
+            self.tr_func('COL_DURATION'), self.tr_func('COL_FILE_SIZE'), self.tr_func('COL_PATH')
+        ])
+        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        self.tree.header().setStretchLastSection(True)
+        self._file_items: List[QTreeWidgetItem] = []
+        for index, cluster in enumerate(clusters, 1):
+            group_item = QTreeWidgetItem([
+                self.tr_func('SIMILAR_GROUP').format(index=index, count=len(cluster))
+            ])
+            group_item.setFirstColumnSpanned(True)
+            group_item.setFlags(Qt.ItemIsEnabled)
+            self.tree.addTopLevelItem(group_item)
+            for rank, file_path in enumerate(cluster):
+                item = QTreeWidgetItem(describe(file_path))
+                item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsUserCheckable | Qt.ItemIsSelectable)
+                item.setCheckState(0, Qt.Checked if rank == 0 else Qt.Unchecked)
+                item.setData(0, Qt.UserRole, file_path)
+                group_item.addChild(item)
+                self._file_items.append(item)
+            group_item.setExpanded(True)
+        layout.addWidget(self.tree)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        self.keep_btn = QPushButton(self.tr_func('SIMILAR_KEEP_CHECKED'))
+        self.keep_btn.clicked.connect(self.accept)
+        self.cancel_btn = QPushButton(self.tr_func('CANCEL'))
+        self.cancel_btn.clicked.connect(self.reject)
+        button_layout.addWidget(self.keep_btn)
+        button_layout.addWidget(self.cancel_btn)
+        layout.addLayout(button_layout)
+
+    def unchecked_paths(self) -> List[str]:
+        """未勾选（不保留）的文件"""
+        return [
+            item.data(0, Qt.UserRole) for item in self._file_items
+            if item.checkState(0) != Qt.Checked
+        ]
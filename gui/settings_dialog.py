@@ -3,9 +3,10 @@
 """
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
-    QLineEdit, QPushButton, QComboBox, QSpinBox,
+    QLineEdit, QPushButton, QComboBox, QSpinBox, QDoubleSpinBox,
     QCheckBox, QTextEdit, QFileDialog, QGroupBox,
-    QLabel, QMessageBox, QFrame, QApplication
+    QLabel, QMessageBox, QFrame, QApplication, QListWidget,
+    QTableWidget, QTableWidgetItem, QHeaderView
 )
 from PyQt5.QtCore import Qt
 import os
@@ -15,8 +16,22 @@ import re
 from typing import Optional
 from core.config_manager import ConfigManager
 from core.ffmpeg_handler import FFmpegHandler
+from core.media_store import HAS_NUMPY as HAS_COMPLEXITY
+from core.presets import DEFAULT_TIERS
+from core.crf_search import METRIC_AUTO, METRIC_SSIM, METRIC_VMAF
+from core.deadline_planner import parse_deadline
+from core.filter_graph import DEFAULT_SCALE_FLAGS, SCALE_FLAGS
+from core.renditions import normalize_renditions
 from translations import LanguageManager
 
+# 多码率输出表格的列：(规格中的键, 列标题翻译键)，留空的参数使用上方的全局设置
+RENDITION_COLUMNS = [
+    ("name", 'RENDITION_NAME'),
+    ("video_resolution", 'RESOLUTION'),
+    ("video_codec", 'VIDEO_CODEC'),
+    ("video_crf", 'CRF_QUALITY'),
+]
+
 
 class SettingsDialog(QDialog):
     """设置对话框"""
@@ -29,6 +44,7 @@ class SettingsDialog(QDialog):
         self.setMinimumWidth(600)
         self.init_ui()
         self.load_settings()
+        self._update_codec_availability()
     
     def tr(self, key: str, default: str = None) -> str:
         """翻译函数"""
@@ -100,6 +116,33 @@ class SettingsDialog(QDialog):
                 )
                 self.ffmpeg_path_status_label.setStyleSheet("color: #DC143C; padding: 5px;")
     
+    def _update_codec_availability(self):
+        """根据当前 FFmpeg 的能力（带缓存）显示版本信息，并置灰不可用的编码器"""
+        manual_path = self.ffmpeg_path_edit.text().strip()
+        ffmpeg_path = manual_path if manual_path and os.path.exists(manual_path) else self._check_ffmpeg_in_path()[1]
+        capabilities = None
+        if ffmpeg_path:
+            from core.ffmpeg_capabilities import CAPABILITY_CACHE_FILE, get_capabilities
+            capabilities = get_capabilities(ffmpeg_path, self.config_manager.get_data_path(CAPABILITY_CACHE_FILE))
+        if capabilities is None:
+            self.ffmpeg_capabilities_label.setText("")
+        else:
+            self.ffmpeg_capabilities_label.setText(
+                self.tr('FFMPEG_CAPABILITIES_INFO').format(
+                    version=capabilities.version or "?",
+                    encoders=len(capabilities.encoders),
+                    hwaccels=", ".join(capabilities.hwaccels) or "-"
+                )
+            )
+        unavailable_tip = self.tr('CODEC_UNAVAILABLE_TOOLTIP')
+        for combo in (self.video_codec_combo, self.audio_codec_combo, self.fallback_audio_codec_combo):
+            model = combo.model()
+            for row in range(combo.count()):
+                item = model.item(row)
+                available = capabilities is None or capabilities.has_encoder(combo.itemText(row))
+                item.setEnabled(available)
+                item.setToolTip("" if available else unavailable_tip)
+    
     def init_ui(self):
         """初始化UI"""
         layout = QVBoxLayout(self)
@@ -126,6 +169,13 @@ class SettingsDialog(QDialog):
         self._update_ffmpeg_path_status()
         layout.addWidget(self.ffmpeg_path_status_label)
         
+        # FFmpeg 版本和能力摘要（不可用的编码器在下拉框中置灰）
+        self.ffmpeg_capabilities_label = QLabel()
+        self.ffmpeg_capabilities_label.setWordWrap(True)
+        self.ffmpeg_capabilities_label.setStyleSheet("color: #666666; padding: 0 5px;")
+        layout.addWidget(self.ffmpeg_capabilities_label)
+        self.ffmpeg_path_edit.editingFinished.connect(self._update_codec_availability)
+        
         # FFmpeg 下载链接
         ffmpeg_download_label = QLabel()
         ffmpeg_download_label.setOpenExternalLinks(True)
@@ -176,6 +226,18 @@ class SettingsDialog(QDialog):
         self.video_resolution_edit.setToolTip(self.tr('RESOLUTION_TOOLTIP'))
         video_layout.addRow(self.tr('RESOLUTION') + ":", self.video_resolution_edit)
         
+        self.scale_flags_combo = QComboBox()
+        self.scale_flags_combo.addItems(list(SCALE_FLAGS))
+        # 可直接填写 FFmpeg 的 flags，例如 lanczos+accurate_rnd
+        self.scale_flags_combo.setEditable(True)
+        self.scale_flags_combo.setToolTip(self.tr('SCALE_FLAGS_TOOLTIP'))
+        video_layout.addRow(self.tr('SCALE_FLAGS') + ":", self.scale_flags_combo)
+        
+        # 抽样检测黑边，在缩放之前裁掉
+        self.auto_crop_check = QCheckBox(self.tr('AUTO_CROP'))
+        self.auto_crop_check.setToolTip(self.tr('AUTO_CROP_TOOLTIP'))
+        video_layout.addRow(self.auto_crop_check)
+        
         self.video_framerate_edit = QLineEdit()
         self.video_framerate_edit.setPlaceholderText(self.tr('FRAMERATE_PLACEHOLDER', '例如: 30 或 29.97，留空保持原始帧率'))
         self.video_framerate_edit.setToolTip(self.tr('FRAMERATE_TOOLTIP', '视频帧率（fps）。留空则保持原始帧率。例如: 30, 29.97, 24'))
@@ -184,6 +246,145 @@ class SettingsDialog(QDialog):
         video_group.setLayout(video_layout)
         layout.addWidget(video_group)
         
+        # 丢弃重复帧（屏幕录制）
+        decimate_group = QGroupBox(self.tr('DECIMATE_SETTINGS'))
+        decimate_layout = QFormLayout()
+        self.decimate_check = QCheckBox(self.tr('DECIMATE'))
+        self.decimate_check.setToolTip(self.tr('DECIMATE_TOOLTIP'))
+        decimate_layout.addRow(self.decimate_check)
+        self.decimate_hi_spin = QSpinBox()
+        self.decimate_hi_spin.setRange(1, 64 * 255)
+        self.decimate_hi_spin.setToolTip(self.tr('DECIMATE_HI_TOOLTIP'))
+        decimate_layout.addRow(self.tr('DECIMATE_HI') + ":", self.decimate_hi_spin)
+        self.decimate_lo_spin = QSpinBox()
+        self.decimate_lo_spin.setRange(1, 64 * 255)
+        self.decimate_lo_spin.setToolTip(self.tr('DECIMATE_LO_TOOLTIP'))
+        decimate_layout.addRow(self.tr('DECIMATE_LO') + ":", self.decimate_lo_spin)
+        self.decimate_frac_spin = QDoubleSpinBox()
+        self.decimate_frac_spin.setRange(0.01, 1.0)
+        self.decimate_frac_spin.setSingleStep(0.05)
+        self.decimate_frac_spin.setDecimals(2)
+        decimate_layout.addRow(self.tr('DECIMATE_FRAC') + ":", self.decimate_frac_spin)
+        self.decimate_max_spin = QSpinBox()
+        self.decimate_max_spin.setRange(0, 10000)
+        self.decimate_max_spin.setSpecialValueText(self.tr('DECIMATE_MAX_UNLIMITED'))
+        self.decimate_max_spin.setToolTip(self.tr('DECIMATE_MAX_TOOLTIP'))
+        decimate_layout.addRow(self.tr('DECIMATE_MAX') + ":", self.decimate_max_spin)
+        for widget in (self.decimate_hi_spin, self.decimate_lo_spin, self.decimate_frac_spin, self.decimate_max_spin):
+            self.decimate_check.toggled.connect(widget.setEnabled)
+        decimate_group.setLayout(decimate_layout)
+        layout.addWidget(decimate_group)
+        
+        # 按片源搜索 CRF（抽样试编码 + 质量评分）
+        crf_search_group = QGroupBox(self.tr('CRF_SEARCH_SETTINGS'))
+        crf_search_layout = QFormLayout()
+        self.crf_search_check = QCheckBox(self.tr('CRF_SEARCH'))
+        self.crf_search_check.setToolTip(self.tr('CRF_SEARCH_TOOLTIP'))
+        crf_search_layout.addRow(self.crf_search_check)
+        self.crf_search_metric_combo = QComboBox()
+        for metric in (METRIC_AUTO, METRIC_SSIM, METRIC_VMAF):
+            self.crf_search_metric_combo.addItem(self.tr(f'CRF_SEARCH_METRIC_{metric.upper()}'), metric)
+        crf_search_layout.addRow(self.tr('CRF_SEARCH_METRIC') + ":", self.crf_search_metric_combo)
+        self.crf_search_ssim_spin = QDoubleSpinBox()
+        self.crf_search_ssim_spin.setRange(0.8, 0.999)
+        self.crf_search_ssim_spin.setSingleStep(0.005)
+        self.crf_search_ssim_spin.setDecimals(3)
+        crf_search_layout.addRow(self.tr('CRF_SEARCH_TARGET_SSIM') + ":", self.crf_search_ssim_spin)
+        self.crf_search_vmaf_spin = QDoubleSpinBox()
+        self.crf_search_vmaf_spin.setRange(50, 99)
+        self.crf_search_vmaf_spin.setDecimals(1)
+        crf_search_layout.addRow(self.tr('CRF_SEARCH_TARGET_VMAF') + ":", self.crf_search_vmaf_spin)
+        self.crf_search_min_spin = QSpinBox()
+        self.crf_search_min_spin.setRange(0, 63)
+        self.crf_search_max_spin = QSpinBox()
+        self.crf_search_max_spin.setRange(0, 63)
+        crf_range_layout = QHBoxLayout()
+        crf_range_layout.addWidget(self.crf_search_min_spin)
+        crf_range_layout.addWidget(QLabel("–"))
+        crf_range_layout.addWidget(self.crf_search_max_spin)
+        crf_range_layout.addStretch()
+        crf_search_layout.addRow(self.tr('CRF_SEARCH_RANGE') + ":", crf_range_layout)
+        for widget in (self.crf_search_metric_combo, self.crf_search_ssim_spin, self.crf_search_vmaf_spin,
+                       self.crf_search_min_spin, self.crf_search_max_spin):
+            self.crf_search_check.toggled.connect(widget.setEnabled)
+        crf_search_group.setLayout(crf_search_layout)
+        layout.addWidget(crf_search_group)
+
+        # 内容复杂度分析：按档位调整 CRF 和预设
+        complexity_group = QGroupBox(self.tr('COMPLEXITY_SETTINGS'))
+        complexity_layout = QFormLayout()
+        self.complexity_check = QCheckBox(self.tr('COMPLEXITY_ANALYSIS'))
+        self.complexity_check.setToolTip(self.tr('COMPLEXITY_ANALYSIS_TOOLTIP'))
+        complexity_layout.addRow(self.complexity_check)
+        self.complexity_tier_spins = {}
+        for tier in ("low", "high"):
+            crf_spin = QSpinBox()
+            crf_spin.setRange(-10, 10)
+            preset_spin = QSpinBox()
+            preset_spin.setRange(-4, 4)
+            preset_spin.setToolTip(self.tr('COMPLEXITY_PRESET_STEPS_TOOLTIP'))
+            tier_layout = QHBoxLayout()
+            tier_layout.addWidget(QLabel(self.tr('COMPLEXITY_CRF_OFFSET') + ":"))
+            tier_layout.addWidget(crf_spin)
+            tier_layout.addWidget(QLabel(self.tr('COMPLEXITY_PRESET_STEPS') + ":"))
+            tier_layout.addWidget(preset_spin)
+            tier_layout.addStretch()
+            complexity_layout.addRow(self.tr(f'COMPLEXITY_{tier.upper()}') + ":", tier_layout)
+            self.complexity_tier_spins[tier] = (crf_spin, preset_spin)
+            for widget in (crf_spin, preset_spin):
+                self.complexity_check.toggled.connect(widget.setEnabled)
+        if not HAS_COMPLEXITY:
+            self.complexity_check.setEnabled(False)
+            self.complexity_check.setToolTip(self.tr('MSG_COMPLEXITY_NUMPY_REQUIRED'))
+        complexity_group.setLayout(complexity_layout)
+        layout.addWidget(complexity_group)
+
+        # 截止时间规划：按本机速度为每个文件选择预设
+        deadline_group = QGroupBox(self.tr('DEADLINE_SETTINGS'))
+        deadline_layout = QFormLayout()
+        self.deadline_check = QCheckBox(self.tr('DEADLINE_PLANNING'))
+        self.deadline_check.setToolTip(self.tr('DEADLINE_PLANNING_TOOLTIP'))
+        deadline_layout.addRow(self.deadline_check)
+        self.deadline_edit = QLineEdit()
+        self.deadline_edit.setPlaceholderText("23:30 / +2h / 2026-10-20 08:00")
+        deadline_layout.addRow(self.tr('DEADLINE_TIME') + ":", self.deadline_edit)
+        self.deadline_cores_spin = QSpinBox()
+        self.deadline_cores_spin.setRange(0, os.cpu_count() or 1)
+        self.deadline_cores_spin.setSpecialValueText(self.tr('DEADLINE_ALL_CORES'))
+        deadline_layout.addRow(self.tr('DEADLINE_CORES') + ":", self.deadline_cores_spin)
+        for widget in (self.deadline_edit, self.deadline_cores_spin):
+            self.deadline_check.toggled.connect(widget.setEnabled)
+        deadline_group.setLayout(deadline_layout)
+        layout.addWidget(deadline_group)
+        
+        # 多码率输出（一次解码输出多个文件）
+        rendition_group = QGroupBox(self.tr('RENDITION_SETTINGS'))
+        rendition_layout = QVBoxLayout()
+        rendition_table_layout = QHBoxLayout()
+        self.rendition_table = QTableWidget(0, len(RENDITION_COLUMNS))
+        self.rendition_table.setHorizontalHeaderLabels([self.tr(key) for _, key in RENDITION_COLUMNS])
+        self.rendition_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.rendition_table.verticalHeader().setVisible(False)
+        self.rendition_table.setMaximumHeight(110)
+        self.rendition_table.setToolTip(self.tr('RENDITION_TABLE_TOOLTIP'))
+        rendition_table_layout.addWidget(self.rendition_table)
+        rendition_btn_layout = QVBoxLayout()
+        self.rendition_add_btn = QPushButton(self.tr('RENDITION_ADD'))
+        self.rendition_add_btn.clicked.connect(lambda: self._add_rendition_row({}))
+        self.rendition_remove_btn = QPushButton(self.tr('RENDITION_REMOVE'))
+        self.rendition_remove_btn.clicked.connect(self.remove_rendition)
+        rendition_btn_layout.addWidget(self.rendition_add_btn)
+        rendition_btn_layout.addWidget(self.rendition_remove_btn)
+        rendition_btn_layout.addStretch()
+        rendition_table_layout.addLayout(rendition_btn_layout)
+        rendition_layout.addLayout(rendition_table_layout)
+        rendition_hint_label = QLabel(self.tr('RENDITION_HINT'))
+        rendition_hint_label.setWordWrap(True)
+        rendition_hint_label.setStyleSheet("color: #666666;")
+        rendition_layout.addWidget(rendition_hint_label)
+        rendition_group.setLayout(rendition_layout)
+        layout.addWidget(rendition_group)
+        
         # 音频编码参数
         audio_group = QGroupBox(self.tr('AUDIO_ENCODING_PARAMS'))
         audio_layout = QFormLayout()
@@ -237,6 +438,73 @@ class SettingsDialog(QDialog):
 
         notify_group.setLayout(notify_layout)
         layout.addWidget(notify_group)
+
+        # 监视文件夹
+        watch_group = QGroupBox(self.tr('WATCH_SETTINGS'))
+        watch_layout = QVBoxLayout()
+
+        self.watch_folder_list = QListWidget()
+        self.watch_folder_list.setMaximumHeight(80)
+        watch_list_layout = QHBoxLayout()
+        watch_list_layout.addWidget(self.watch_folder_list)
+        watch_btn_layout = QVBoxLayout()
+        self.watch_add_btn = QPushButton(self.tr('WATCH_ADD_FOLDER'))
+        self.watch_add_btn.clicked.connect(self.add_watch_folder)
+        self.watch_remove_btn = QPushButton(self.tr('WATCH_REMOVE_FOLDER'))
+        self.watch_remove_btn.clicked.connect(self.remove_watch_folder)
+        watch_btn_layout.addWidget(self.watch_add_btn)
+        watch_btn_layout.addWidget(self.watch_remove_btn)
+        watch_btn_layout.addStretch()
+        watch_list_layout.addLayout(watch_btn_layout)
+        watch_layout.addLayout(watch_list_layout)
+
+        watch_form = QFormLayout()
+        self.watch_stable_spin = QSpinBox()
+        self.watch_stable_spin.setRange(1, 3600)
+        self.watch_stable_spin.setToolTip(self.tr('WATCH_STABLE_SECONDS_TOOLTIP'))
+        watch_form.addRow(self.tr('WATCH_STABLE_SECONDS') + ":", self.watch_stable_spin)
+        self.watch_existing_check = QCheckBox(self.tr('WATCH_PROCESS_EXISTING'))
+        watch_form.addRow(self.watch_existing_check)
+        watch_layout.addLayout(watch_form)
+
+        watch_hint_label = QLabel(self.tr('WATCH_FOLDERS_HINT'))
+        watch_hint_label.setWordWrap(True)
+        watch_hint_label.setStyleSheet("color: #666666;")
+        watch_layout.addWidget(watch_hint_label)
+
+        watch_group.setLayout(watch_layout)
+        layout.addWidget(watch_group)
+        
+        # 重复文件检测
+        dedupe_group = QGroupBox(self.tr('DEDUPE_SETTINGS'))
+        dedupe_layout = QFormLayout()
+        self.dedupe_check = QCheckBox(self.tr('DEDUPE_ON_ADD'))
+        self.dedupe_check.setToolTip(self.tr('DEDUPE_ON_ADD_TOOLTIP'))
+        dedupe_layout.addRow(self.dedupe_check)
+        self.dedupe_full_hash_check = QCheckBox(self.tr('DEDUPE_FULL_HASH'))
+        self.dedupe_full_hash_check.setToolTip(self.tr('DEDUPE_FULL_HASH_TOOLTIP'))
+        self.dedupe_check.toggled.connect(self.dedupe_full_hash_check.setEnabled)
+        dedupe_layout.addRow(self.dedupe_full_hash_check)
+        dedupe_group.setLayout(dedupe_layout)
+        layout.addWidget(dedupe_group)
+        
+        # 小文件批量模式
+        batch_group = QGroupBox(self.tr('BATCH_SETTINGS'))
+        batch_layout = QFormLayout()
+        self.batch_check = QCheckBox(self.tr('BATCH_SMALL_FILES'))
+        self.batch_check.setToolTip(self.tr('BATCH_SMALL_FILES_TOOLTIP'))
+        batch_layout.addRow(self.batch_check)
+        self.batch_duration_spin = QSpinBox()
+        self.batch_duration_spin.setRange(1, 600)
+        self.batch_duration_spin.setSuffix(" s")
+        batch_layout.addRow(self.tr('BATCH_MAX_DURATION') + ":", self.batch_duration_spin)
+        self.batch_files_spin = QSpinBox()
+        self.batch_files_spin.setRange(2, 64)
+        batch_layout.addRow(self.tr('BATCH_MAX_FILES') + ":", self.batch_files_spin)
+        self.batch_check.toggled.connect(self.batch_duration_spin.setEnabled)
+        self.batch_check.toggled.connect(self.batch_files_spin.setEnabled)
+        batch_group.setLayout(batch_layout)
+        layout.addWidget(batch_group)
         
         # 字幕设置
         subtitle_group = QGroupBox(self.tr('SUBTITLE_SETTINGS'))
@@ -397,6 +665,54 @@ class SettingsDialog(QDialog):
         if path:
             self.notify_sound_edit.setText(path)
     
+    def add_watch_folder(self):
+        """添加监视文件夹"""
+        folder = QFileDialog.getExistingDirectory(self, self.tr('SELECT_FOLDER'), "")
+        if folder and not self.watch_folder_list.findItems(folder, Qt.MatchExactly):
+            self.watch_folder_list.addItem(folder)
+
+    def remove_watch_folder(self):
+        """移除选中的监视文件夹"""
+        for item in self.watch_folder_list.selectedItems():
+            self.watch_folder_list.takeItem(self.watch_folder_list.row(item))
+
+    def _add_rendition_row(self, rendition: dict):
+        """在多码率输出表格中添加一行"""
+        row = self.rendition_table.rowCount()
+        self.rendition_table.insertRow(row)
+        for column, (key, _) in enumerate(RENDITION_COLUMNS):
+            self.rendition_table.setItem(row, column, QTableWidgetItem(str(rendition.get(key, ""))))
+
+    def remove_rendition(self):
+        """移除选中的多码率输出规格"""
+        for row in sorted({index.row() for index in self.rendition_table.selectedIndexes()}, reverse=True):
+            self.rendition_table.removeRow(row)
+
+    def _collect_renditions(self) -> list:
+        """收集多码率输出规格，保留配置中同名规格在表格之外的参数（如预设、帧率）"""
+        existing = {r["name"]: r for r in normalize_renditions(self.config_manager.get("renditions", []))}
+        renditions = []
+        for row in range(self.rendition_table.rowCount()):
+            values = {}
+            for column, (key, _) in enumerate(RENDITION_COLUMNS):
+                item = self.rendition_table.item(row, column)
+                values[key] = item.text().strip() if item else ""
+            rendition = {k: v for k, v in existing.get(values["name"], {}).items() if k not in values}
+            rendition.update(values)
+            renditions.append(rendition)
+        return normalize_renditions(renditions)
+
+    def _collect_watch_folders(self) -> list:
+        """收集监视文件夹列表，保留已有文件夹在配置中的专属输出目录和设置"""
+        existing = {
+            f.get("path"): f for f in self.config_manager.get("watch_folders", []) or [] if f.get("path")
+        }
+        folders = []
+        for i in range(self.watch_folder_list.count()):
+            path = self.watch_folder_list.item(i).text()
+            folders.append(existing.get(path, {"path": path, "output_dir": "", "settings": {}}))
+        return folders
+    
     def load_settings(self):
         """加载设置"""
         self.ffmpeg_path_edit.setText(self.config_manager.get("ffmpeg_path", ""))
@@ -408,6 +724,8 @@ class SettingsDialog(QDialog):
         self.video_crf_spin.setValue(int(self.config_manager.get("video_crf", "23")))
         self.video_bit_depth_combo.setCurrentText(self.config_manager.get("video_bit_depth", "8"))
         self.video_resolution_edit.setText(self.config_manager.get("video_resolution", ""))
+        self.scale_flags_combo.setCurrentText(self.config_manager.get("scale_flags", DEFAULT_SCALE_FLAGS))
+        self.auto_crop_check.setChecked(bool(self.config_manager.get("auto_crop", False)))
         self.video_framerate_edit.setText(self.config_manager.get("video_framerate", ""))
         self.audio_codec_combo.setCurrentText(self.config_manager.get("audio_codec", "copy"))
         self.audio_bitrate_edit.setText(self.config_manager.get("audio_bitrate", ""))
@@ -421,6 +739,53 @@ class SettingsDialog(QDialog):
         self.use_custom_check.setChecked(self.config_manager.get("use_custom_command", False))
         self.custom_command_edit.setPlainText(self.config_manager.get("custom_command_template", ""))
         self.custom_args_edit.setText(self.config_manager.get("custom_args", ""))
+        self.rendition_table.setRowCount(0)
+        for rendition in normalize_renditions(self.config_manager.get("renditions", [])):
+            self._add_rendition_row(rendition)
+        self.watch_folder_list.clear()
+        for folder in self.config_manager.get("watch_folders", []) or []:
+            if folder.get("path"):
+                self.watch_folder_list.addItem(folder["path"])
+        self.watch_stable_spin.setValue(int(self.config_manager.get("watch_stable_seconds", 5)))
+        self.watch_existing_check.setChecked(bool(self.config_manager.get("watch_process_existing", False)))
+        self.dedupe_check.setChecked(bool(self.config_manager.get("dedupe_on_add", False)))
+        self.dedupe_full_hash_check.setChecked(bool(self.config_manager.get("dedupe_full_hash", False)))
+        self.dedupe_full_hash_check.setEnabled(self.dedupe_check.isChecked())
+        self.batch_check.setChecked(bool(self.config_manager.get("batch_small_files", False)))
+        self.batch_duration_spin.setValue(int(float(self.config_manager.get("batch_max_duration", 30))))
+        self.batch_files_spin.setValue(int(self.config_manager.get("batch_max_files", 16)))
+        self.batch_duration_spin.setEnabled(self.batch_check.isChecked())
+        self.batch_files_spin.setEnabled(self.batch_check.isChecked())
+        self.decimate_check.setChecked(bool(self.config_manager.get("decimate", False)))
+        self.decimate_hi_spin.setValue(int(self.config_manager.get("decimate_hi", 768)))
+        self.decimate_lo_spin.setValue(int(self.config_manager.get("decimate_lo", 320)))
+        self.decimate_frac_spin.setValue(float(self.config_manager.get("decimate_frac", 0.33)))
+        self.decimate_max_spin.setValue(int(self.config_manager.get("decimate_max", 0)))
+        for widget in (self.decimate_hi_spin, self.decimate_lo_spin, self.decimate_frac_spin, self.decimate_max_spin):
+            widget.setEnabled(self.decimate_check.isChecked())
+        self.crf_search_check.setChecked(bool(self.config_manager.get("crf_search", False)))
+        index = self.crf_search_metric_combo.findData(self.config_manager.get("crf_search_metric", METRIC_AUTO))
+        self.crf_search_metric_combo.setCurrentIndex(max(0, index))
+        self.crf_search_ssim_spin.setValue(float(self.config_manager.get("crf_search_target_ssim", 0.98)))
+        self.crf_search_vmaf_spin.setValue(float(self.config_manager.get("crf_search_target_vmaf", 93)))
+        self.crf_search_min_spin.setValue(int(self.config_manager.get("crf_search_min", 18)))
+        self.crf_search_max_spin.setValue(int(self.config_manager.get("crf_search_max", 36)))
+        for widget in (self.crf_search_metric_combo, self.crf_search_ssim_spin, self.crf_search_vmaf_spin,
+                       self.crf_search_min_spin, self.crf_search_max_spin):
+            widget.setEnabled(self.crf_search_check.isChecked())
+        self.complexity_check.setChecked(HAS_COMPLEXITY and bool(self.config_manager.get("complexity_analysis", False)))
+        tiers = self.config_manager.get("complexity_tiers", DEFAULT_TIERS) or {}
+        for tier, (crf_spin, preset_spin) in self.complexity_tier_spins.items():
+            adjust = tiers.get(tier) or {}
+            crf_spin.setValue(int(adjust.get("crf_offset") or 0))
+            preset_spin.setValue(int(adjust.get("preset_steps") or 0))
+            crf_spin.setEnabled(self.complexity_check.isChecked())
+            preset_spin.setEnabled(self.complexity_check.isChecked())
+        self.deadline_check.setChecked(bool(self.config_manager.get("deadline_planning", False)))
+        self.deadline_edit.setText(str(self.config_manager.get("deadline", "+2h") or ""))
+        self.deadline_cores_spin.setValue(int(self.config_manager.get("deadline_cores", 0) or 0))
+        for widget in (self.deadline_edit, self.deadline_cores_spin):
+            widget.setEnabled(self.deadline_check.isChecked())
     
     def save_settings(self):
         """保存设置"""
@@ -430,7 +795,16 @@ class SettingsDialog(QDialog):
             import os
             if not os.path.exists(ffmpeg_path):
                 QMessageBox.warning(self, self.tr('MSG_WARNING'), self.tr('MSG_FFMPEG_PATH_NOT_EXISTS'))
-        
+        deadline = self.deadline_edit.text().strip()
+        if self.deadline_check.isChecked() and parse_deadline(deadline) is None:
+            QMessageBox.warning(self, self.tr('MSG_WARNING'), self.tr('MSG_DEADLINE_INVALID'))
+            return
+
+        # 复杂度档位：界面中的 low / high 覆盖到已有配置上（保留手动配置的其它档位）
+        complexity_tiers = dict(self.config_manager.get("complexity_tiers", DEFAULT_TIERS) or {})
+        for tier, (crf_spin, preset_spin) in self.complexity_tier_spins.items():
+            complexity_tiers[tier] = {"crf_offset": crf_spin.value(), "preset_steps": preset_spin.value()}
+
         # 保存配置
         self.config_manager.update({
             "ffmpeg_path": ffmpeg_path,
@@ -439,6 +813,9 @@ class SettingsDialog(QDialog):
             "video_crf": str(self.video_crf_spin.value()),
             "video_bit_depth": self.video_bit_depth_combo.currentText(),
             "video_resolution": self.video_resolution_edit.text().strip(),
+            "scale_flags": self.scale_flags_combo.currentText().strip() or DEFAULT_SCALE_FLAGS,
+            "auto_crop": self.auto_crop_check.isChecked(),
+            "renditions": self._collect_renditions(),
             "video_framerate": self.video_framerate_edit.text().strip(),
             "audio_codec": self.audio_codec_combo.currentText(),
             "audio_bitrate": self.audio_bitrate_edit.text().strip(),
@@ -449,7 +826,31 @@ class SettingsDialog(QDialog):
             "subtitle_mode": self.subtitle_combo.currentText(),
             "use_custom_command": self.use_custom_check.isChecked(),
             "custom_command_template": self.custom_command_edit.toPlainText().strip(),
-            "custom_args": self.custom_args_edit.text().strip()
+            "custom_args": self.custom_args_edit.text().strip(),
+            "watch_folders": self._collect_watch_folders(),
+            "watch_stable_seconds": self.watch_stable_spin.value(),
+            "watch_process_existing": self.watch_existing_check.isChecked(),
+            "dedupe_on_add": self.dedupe_check.isChecked(),
+            "dedupe_full_hash": self.dedupe_full_hash_check.isChecked(),
+            "batch_small_files": self.batch_check.isChecked(),
+            "batch_max_duration": self.batch_duration_spin.value(),
+            "batch_max_files": self.batch_files_spin.value(),
+            "decimate": self.decimate_check.isChecked(),
+            "decimate_hi": self.decimate_hi_spin.value(),
+            "decimate_lo": self.decimate_lo_spin.value(),
+            "decimate_frac": self.decimate_frac_spin.value(),
+            "decimate_max": self.decimate_max_spin.value(),
+            "crf_search": self.crf_search_check.isChecked(),
+            "crf_search_metric": self.crf_search_metric_combo.currentData(),
+            "crf_search_target_ssim": self.crf_search_ssim_spin.value(),
+            "crf_search_target_vmaf": self.crf_search_vmaf_spin.value(),
+            "crf_search_min": min(self.crf_search_min_spin.value(), self.crf_search_max_spin.value()),
+            "crf_search_max": max(self.crf_search_min_spin.value(), self.crf_search_max_spin.value()),
+            "complexity_analysis": self.complexity_check.isChecked(),
+            "complexity_tiers": complexity_tiers,
+            "deadline_planning": self.deadline_check.isChecked(),
+            "deadline": deadline,
+            "deadline_cores": self.deadline_cores_spin.value()
         })
         
         if self.config_manager.save_config():
@@ -513,6 +914,13 @@ class SettingsDialog(QDialog):
                 video_resolution=video_resolution,
                 video_bit_depth=video_bit_depth,
                 video_framerate=video_framerate,
+                scale_flags=self.scale_flags_combo.currentText(),
+                renditions=self._collect_renditions(),
+                decimate=self.decimate_check.isChecked(),
+                decimate_hi=self.decimate_hi_spin.value(),
+                decimate_lo=self.decimate_lo_spin.value(),
+                decimate_frac=self.decimate_frac_spin.value(),
+                decimate_max=self.decimate_max_spin.value(),
                 audio_codec=audio_codec,
                 audio_bitrate=audio_bitrate,
                 subtitle_mode=subtitle_mode,
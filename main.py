@@ -1,23 +1,42 @@
 """
 批量视频编码工具 - 主入口
 """
+from core.startup_profile import PROFILER
 import sys
 import os
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtGui import QIcon
-from gui.main_window import MainWindow
-from core.config_manager import ConfigManager
-from translations import LanguageManager
+from core.single_instance import SingleInstance
 
 
 def main():
     """主函数"""
+    # --startup-profile：输出各启动阶段的耗时后退出（不参与单实例）
+    profile = "--startup-profile" in sys.argv[1:]
+    if profile:
+        PROFILER.enable()
+
+    # 单实例：已有窗口在运行时，将命令行中的路径交给它处理后立即退出（此时尚未导入 PyQt5）
+    paths = [os.path.abspath(arg) for arg in sys.argv[1:] if not arg.startswith("-")]
+    instance = None if profile else SingleInstance()
+    if instance is not None and instance.forward(paths):
+        sys.exit(0)
+    PROFILER.mark("single-instance check")
+
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtGui import QIcon
+    PROFILER.mark("import PyQt5")
+    from core.config_manager import ConfigManager
+    from translations import LanguageManager
+    from gui.main_window import MainWindow, InstanceBridge
+    PROFILER.mark("import gui")
+
     app = QApplication(sys.argv)
-    
+    PROFILER.mark("QApplication")
+
     # 设置应用程序信息
     app.setApplicationName("VvEnc")
     app.setOrganizationName("vevanSoft")
-    
+
     # 设置应用程序图标（任务栏图标）
     # 处理 PyInstaller 打包后的路径
     if getattr(sys, 'frozen', False):
@@ -26,28 +45,47 @@ def main():
     else:
         # 开发环境
         base_path = os.path.dirname(__file__)
-    
+
     icon_path = os.path.join(base_path, "icon.ico")
     if os.path.exists(icon_path):
         app.setWindowIcon(QIcon(icon_path))
-    
-    # 加载配置
+
+    # 加载配置（只加载一次，传给主窗口）
     config_manager = ConfigManager()
-    
+    PROFILER.mark("config")
+
     # 初始化语言管理器
     language = config_manager.get("language", "zh_CN")
     i18n_manager = LanguageManager(language)
-    
-    # 创建主窗口（传入语言管理器）
-    window = MainWindow(i18n_manager=i18n_manager)
-    window.show()
-    
-    sys.exit(app.exec_())
-
 
-if __name__ == "__main__":
-    main()
+    # 创建主窗口（传入语言管理器和配置）
+    window = MainWindow(i18n_manager=i18n_manager, config_manager=config_manager)
+    PROFILER.mark("MainWindow")
+    window.show()
+    PROFILER.mark("show")
 
+    if profile:
+        def on_startup_finished():
+            PROFILER.write_report()
+            app.quit()
+        window.startup_finished.connect(on_startup_finished)
+    else:
+        # 接收后续启动转发过来的路径（在监听线程中收到，通过信号转到界面线程）
+        instance_bridge = InstanceBridge()
+        instance_bridge.paths_received.connect(window.on_instance_paths)
+        instance.listen(instance_bridge.paths_received.emit)
+    if paths:
+        QTimer.singleShot(0, lambda: window.on_instance_paths(paths))
 
+    exit_code = app.exec_()
+    if instance is not None:
+        instance.close()
+    sys.exit(exit_code)
 
 
+if __name__ == "__main__":
+    # 打包后的可执行文件也用于启动后台编码服务进程
+    if len(sys.argv) == 3 and sys.argv[1] == "--encode-service":
+        from core.encode_service import service_main
+        sys.exit(service_main(sys.argv[2]))
+    main()
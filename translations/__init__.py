@@ -16,7 +16,14 @@ class LanguageManager:
     
     def __init__(self, default_language: str = 'zh_CN'):
         self.current_language = default_language
-        self.translations = self._load_language(default_language)
+        self._translations = None  # 首次翻译时才导入语言模块
+    
+    @property
+    def translations(self):
+        """当前语言的翻译对象（首次访问时加载）"""
+        if self._translations is None:
+            self._translations = self._load_language(self.current_language)
+        return self._translations
     
     def _load_language(self, lang_code: str):
         """加载指定语言的翻译"""
@@ -50,7 +57,7 @@ class LanguageManager:
         """设置当前语言"""
         if lang_code in self.SUPPORTED_LANGUAGES:
             self.current_language = lang_code
-            self.translations = self._load_language(lang_code)
+            self._translations = self._load_language(lang_code)
             return True
         return False
     
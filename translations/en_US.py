@@ -46,9 +46,6 @@ class Translations:
     ENCODING_COMPLETE = "Encoding Complete"
     STOPPING = "Stopping encoding..."
     LOG_TITLE = "Log"
-    LOADING_FILES = "Loading..."
-    LOADING_FILES_INIT = "Loading file information..."
-    LOADING_FILES_PROGRESS = "Loading {current}/{total} files"
     
     # Control buttons
     START_ENCODING = "Start Encoding"
@@ -277,3 +274,232 @@ class Translations:
     ENCODING_COMPLETE_FORMAT = "Encoding Complete: {success}/{total} successful"
     CURRENT_FILE_FORMAT = "{filename} - {message}"
 
+    # ========== Watch Folders ==========
+    WATCH_FOLDERS = "Watch Folders"
+    WATCH_FOLDERS_TOOLTIP = "When enabled, new files in the configured watch folders are added and encoded automatically once they stop growing"
+    WATCH_SETTINGS = "Watch Folders"
+    WATCH_ADD_FOLDER = "Add..."
+    WATCH_REMOVE_FOLDER = "Remove"
+    WATCH_STABLE_SECONDS = "Stable time (seconds)"
+    WATCH_STABLE_SECONDS_TOOLTIP = "A file is considered complete once its size and modification time have not changed for this many seconds"
+    WATCH_PROCESS_EXISTING = "Also encode files already in the folders when watching starts"
+    WATCH_FOLDERS_HINT = "Files are written to the global output directory with the folder structure preserved. Per-folder output_dir and settings can be set in config.json."
+    MSG_NO_WATCH_FOLDERS = "No watch folders configured. Please add them in Settings first."
+    LOG_WATCH_STARTED = "Watching {count} folder(s) ({backend})"
+    LOG_WATCH_STOPPED = "Stopped watching folders"
+    LOG_WATCH_FILE_QUEUED = "New file from watch folder: {filename}"
+    LOG_WATCH_NO_OUTPUT_DIR = "No output directory for watch folder, skipped: {filename}"
+
+    # ========== Background Encoding ==========
+    LOG_ENCODE_SERVICE_FALLBACK = "Could not start the background encode process ({error}); encoding in this window instead"
+    LOG_ENCODE_SERVICE_REATTACHED = "Re-attached to background encoding ({count} file(s))"
+    LOG_ENCODE_SERVICE_FINISHED_OFFLINE = "Background encoding finished while the window was closed: {success} succeeded, {failed} failed"
+    MSG_ENCODE_CONTINUE_IN_BACKGROUND = "Encoding is still running.\n\nYes: keep encoding in the background (reopen VvEnc to see progress)\nNo: stop encoding and exit\nCancel: return to the window"
+
+    # ========== FFmpeg Capabilities ==========
+    FFMPEG_CAPABILITIES_INFO = "FFmpeg {version}, {encoders} encoders, hardware acceleration: {hwaccels}"
+    CODEC_UNAVAILABLE_TOOLTIP = "This encoder is not available in the current FFmpeg"
+    MSG_JOB_VALIDATION_FAILED = "The current FFmpeg ({version}) cannot run the encoding jobs:\n\n{problems}\n\nPlease change the encoding settings or use another FFmpeg build."
+
+    # ========== Duplicate Detection ==========
+    STATUS_DUPLICATE = "Duplicate"
+    DEDUPE_SETTINGS = "Duplicate Files"
+    DEDUPE_ON_ADD = "Detect files with identical content when adding and encode them once"
+    DEDUPE_ON_ADD_TOOLTIP = "Duplicates are detected by file size and a sampled hash (head, middle and tail); hard links and symlinks to the same file are recognised without reading. When the original finishes, its output is hard-linked (or copied if linking is not supported) to each duplicate's output path."
+    DEDUPE_FULL_HASH = "Compare full file contents after a sample match (more reliable, slower)"
+    DEDUPE_FULL_HASH_TOOLTIP = "Files whose sampled hashes match are fully hashed, which reads the whole file"
+    LOG_DUPLICATES_FOUND = "Found {count} duplicate file(s); they will reuse the original's output"
+    LOG_DUPLICATE_FILE = "Duplicate: {filename} (original: {original})"
+    LOG_DUPLICATE_OUTPUT_LINKED = "Output for duplicate {filename} hard-linked: {output}"
+    LOG_DUPLICATE_OUTPUT_COPIED = "Output for duplicate {filename} copied: {output}"
+    LOG_DUPLICATE_OUTPUT_FAILED = "Failed to create output for duplicate {filename}: {error}"
+
+    # ========== Similar Videos ==========
+    FIND_SIMILAR = "Find Similar Videos"
+    FIND_SIMILAR_TOOLTIP = "Sample a few thumbnail frames from each waiting file and compare perceptual hashes to find versions of the same content (different container, codec or resolution)"
+    MSG_NUMPY_REQUIRED = "Similar video detection requires NumPy. Install it with: pip install numpy"
+    MSG_SIMILAR_NEED_FILES = "At least two waiting files are required"
+    MSG_NO_SIMILAR_VIDEOS = "No similar videos found"
+    SIMILAR_ANALYZING = "Analyzing {current}/{total} files..."
+    SIMILAR_DIALOG_TITLE = "Similar Videos"
+    SIMILAR_DIALOG_HINT = "The files in each group have matching pictures and durations and are probably versions of the same content. The file with the highest resolution and bitrate is checked in each group; unchecked files will be paused and not encoded."
+    SIMILAR_GROUP = "Group {index} ({count} files)"
+    SIMILAR_KEEP_CHECKED = "Keep Checked, Pause Others"
+    LOG_SIMILAR_PAUSED = "Similar videos: {groups} group(s), {count} file(s) paused"
+
+    # ========== Directory Snapshot Index ==========
+    REFRESH_FOLDERS = "Refresh Folders"
+    REFRESH_FOLDERS_TOOLTIP = "Rescan the added folders (only changed directories are listed): add new files, remove deleted ones and reload info for modified ones"
+    MSG_NO_SCANNED_FOLDERS = "No folders have been added yet"
+    LOG_SCAN_DELTA = "Folder changes: {added} added, {removed} removed, {modified} modified"
+
+    # ========== Tiered Probing ==========
+    PROBE_STATUS = "Fetching stream details {done}/{total} (you can sort and start encoding meanwhile)"
+
+    # ========== Filter Bar ==========
+    FILTER_LABEL = "Filter:"
+    FILTER_PLACEHOLDER = "e.g. height < 720 and status = waiting"
+    FILTER_HELP = ("Fields: codec, acodec, status, width, height/res, fps, bitrate, vbitrate, abitrate, bpp, duration, size, path, name\n"
+                   "Operators: < <= > >= = !=; path/name/codec/status also support ~ (wildcard match) and !~\n"
+                   "Combine with: and, or, not, parentheses\n"
+                   "Examples: codec = hevc and bitrate > 6M | status = failed | path ~ */archive/* | duration > 30m | size > 2GB")
+    FILTER_INVALID = "Invalid filter: {error}"
+    FILTER_MATCHES = "{count} / {total} match"
+    FILTER_ACTIONS = "Bulk Actions"
+    FILTER_SELECT_MATCHES = "Select All Matches"
+    FILTER_SET_WAITING = "Set Matches to Waiting"
+    FILTER_SET_PAUSED = "Set Matches to Paused"
+    FILTER_REMOVE_MATCHES = "Remove Matches from List"
+    LOG_FILTER_APPLIED = "Bulk action \"{action}\": {count} files"
+
+    # ========== Queue Manifest ==========
+    QUEUE_MANIFEST = "Queue Manifest"
+    QUEUE_MANIFEST_TOOLTIP = "Import/export the queue as a JSON Lines file (paths, output paths, per-file settings, video info and status) to hand it to another machine or generate it from a script"
+    IMPORT_QUEUE = "Import Queue..."
+    EXPORT_QUEUE = "Export Queue..."
+    MANIFEST_FILES_FILTER = "Queue Manifests (*.jsonl *.jsonl.gz);;All Files (*.*)"
+    MSG_MANIFEST_IMPORT_FAILED = "Failed to read queue manifest: {error}"
+    MSG_MANIFEST_EXPORT_FAILED = "Failed to export queue manifest: {error}"
+    LOG_MANIFEST_IMPORT_STARTED = "Importing queue manifest: {path}"
+    LOG_MANIFEST_IMPORTED = "Queue manifest imported: {count} jobs, {added} files added, {probed} of them with video info (no probing needed)"
+    LOG_MANIFEST_INVALID_LINES = "Skipped {count} invalid lines in the queue manifest ({error})"
+    LOG_MANIFEST_EXPORTED = "Exported {count} jobs to queue manifest: {path}"
+
+    # ========== Encode plan ==========
+    ENCODE_PLAN = "Encode Plan"
+    ENCODE_PLAN_TOOLTIP = "Preview each job's output path, FFmpeg command and estimated cost without encoding, and check for output conflicts"
+    PLAN_DIALOG_TITLE = "Encode Plan"
+    PLAN_SUMMARY = "{count} jobs, total duration {duration}, estimated cost {cost} (1080p30 equivalent, {unknown} jobs with unknown duration). Output collisions: {collisions}, overwriting inputs: {overwrites}, existing outputs: {exists}."
+    PLAN_ONLY_ISSUES = "Show only jobs with problems"
+    PLAN_COL_OUTPUT = "Output File"
+    PLAN_COL_ISSUES = "Problems"
+    PLAN_COL_COST = "Cost"
+    PLAN_COL_COMMAND = "FFmpeg Command"
+    PLAN_ISSUE_COLLISION = "Same output file as another job"
+    PLAN_ISSUE_IN_PLACE = "Output file is the input file"
+    PLAN_ISSUE_INPUT_OVERWRITE = "Overwrites the input file of another job"
+    PLAN_ISSUE_EXISTS = "Output file exists and will be overwritten"
+    PLAN_EXPORT_SCRIPT = "Export Script..."
+    PLAN_EXPORT_MANIFEST = "Export Queue Manifest..."
+    PLAN_SCRIPT_FILES_FILTER = "Scripts (*.bat *.cmd *.sh);;All Files (*.*)"
+    PLAN_CLOSE = "Close"
+    MSG_PLAN_BLOCKED = "{count} jobs write to the same output file as another job or would overwrite an input file, so encoding was not started.\nReview them in the encode plan, then change the output directory or set the extra files to paused."
+    MSG_PLAN_EXPORT_FAILED = "Failed to export encode plan: {error}"
+    LOG_PLAN_EXISTING_OUTPUTS = "Output files of {count} jobs already exist and will be overwritten"
+    LOG_PLAN_EXPORTED = "Exported encode plan ({count} jobs): {path}"
+
+    # ========== Video filter planning ==========
+    SCALE_FLAGS = "Scaler"
+    SCALE_FLAGS_TOOLTIP = "FFmpeg scaling algorithm used when changing the resolution. Default bicubic matches FFmpeg's default. auto: the faster but slightly softer bilinear when downscaling, bicubic when upscaling. You can also enter FFmpeg scale filter flags directly, e.g. lanczos"
+    PLAN_COL_FILTERS = "Video Filters"
+    PLAN_NO_FILTERS = "None (same as source)"
+    PLAN_FILTER_FPS_DROP_FIRST = "Frame rate {source} → {target} fps: fps goes first, so later filters process {saved}% fewer frames"
+    PLAN_FILTER_FPS_UNKNOWN_FIRST = "Source frame rate unknown: fps is treated as a reduction and goes first"
+    PLAN_FILTER_FPS_RAISE_LAST = "Frame rate {source} → {target} fps: fps goes last to avoid scaling duplicated frames"
+    PLAN_FILTER_FPS_SAME = "Source is already {target} fps, fps skipped"
+    PLAN_FILTER_SCALE = "Scale {source} → {target} with {flags}"
+    PLAN_FILTER_SCALE_UNKNOWN = "Scale to {target} (source resolution unknown) with {flags}"
+    PLAN_FILTER_SCALE_SAME = "Source is already {target}, scale skipped"
+    PLAN_FILTER_FORMAT_MERGED = "Pixel format {source} → {target}: directly after scale, done in the same scaling pass"
+    PLAN_FILTER_FORMAT = "Pixel format {source} → {target}"
+    PLAN_FILTER_FORMAT_SAME = "Source pixel format is already {target}, format skipped"
+
+    # ========== Multiple renditions ==========
+    RENDITION_SETTINGS = "Multiple Renditions (one decode, several outputs)"
+    RENDITION_NAME = "Suffix"
+    RENDITION_ADD = "Add"
+    RENDITION_REMOVE = "Remove"
+    RENDITION_TABLE_TOOLTIP = "Each row is one output file. Empty cells use the video settings above, e.g. suffix 720p, resolution -2:720"
+    RENDITION_HINT = "When renditions are configured, every file is decoded once and split into all of them: clip.mkv is encoded to clip_1080p.mp4, clip_720p.mp4 and so on. Leave the table empty for a single output."
+    LOG_RENDITION_OUTPUT = "  ✓ {name}: {output} ({size})"
+    LOG_RENDITION_MISSING = "  ✗ {name}: output file missing {output}"
+
+    # ========== Small-file batching ==========
+    BATCH_SETTINGS = "Small-File Batching"
+    BATCH_SMALL_FILES = "Encode several small files in one FFmpeg process"
+    BATCH_SMALL_FILES_TOOLTIP = "For clips of a few seconds, starting FFmpeg and the encoder takes longer than the encode itself. Small files are grouped and each group is encoded by one process; if the process fails, its files are encoded again one by one."
+    BATCH_MAX_DURATION = "Small file up to"
+    BATCH_MAX_FILES = "Files per process"
+
+    # ========== Black-bar crop detection ==========
+    COL_CROP = "Crop"
+    CROP_NONE = "No black bars"
+    AUTO_CROP = "Detect and crop black bars"
+    AUTO_CROP_TOOLTIP = "Runs cropdetect on a few short windows sampled across each file (in parallel, with fast seeking) and crops the stable black bars before scaling, so the encoder does not spend bits on them. The result is cached with the probe data and shown in the Crop column."
+    PLAN_FILTER_CROP = "Crop black bars {source} → {target}: {saved}% fewer pixels to process"
+    PLAN_FILTER_CROP_UNKNOWN = "Crop black bars to {target} (source resolution unknown)"
+
+    # ========== Duplicate-frame decimation ==========
+    DECIMATE_SETTINGS = "Duplicate Frames (screen recordings)"
+    DECIMATE = "Drop duplicate frames (mpdecimate, variable frame rate output)"
+    DECIMATE_TOOLTIP = "In screen recordings most frames are identical to the previous one. mpdecimate drops them before cropping and scaling, so the encoder only processes frames that changed. The output uses a variable frame rate: kept frames keep their timestamps and the MP4 plays at the original pace. The log reports how many frames were dropped."
+    DECIMATE_HI = "Block difference (hi)"
+    DECIMATE_HI_TOOLTIP = "A frame counts as changed if any 8x8 block differs by more than this value (FFmpeg default 768 = 64*12)"
+    DECIMATE_LO = "Block difference (lo)"
+    DECIMATE_LO_TOOLTIP = "A frame also counts as changed if the share of blocks differing by more than this value exceeds the fraction below (FFmpeg default 320 = 64*5)"
+    DECIMATE_FRAC = "Changed block fraction"
+    DECIMATE_MAX = "Max consecutive drops"
+    DECIMATE_MAX_UNLIMITED = "Unlimited"
+    DECIMATE_MAX_TOOLTIP = "Keep at least one frame after this many dropped frames, so a long still picture is still refreshed regularly"
+    PLAN_FILTER_FPS_DECIMATE_FIRST = "Frame rate {target} fps: placed before mpdecimate, which drops the duplicates"
+    PLAN_FILTER_DECIMATE = "mpdecimate drops frames identical to the previous one, later filters only process changed frames (variable frame rate output)"
+
+    # ========== Sampled test-encode estimate ==========
+    COL_EST_SIZE = "Est. size"
+    COL_EST_TIME = "Est. encode time"
+    EST_SIZE_TOOLTIP = "Estimated output {size} from {source} ({change:+d}%)"
+    ESTIMATE = "Estimate"
+    ESTIMATE_STOP = "Stop estimate"
+    ESTIMATE_TOOLTIP = "Test-encode a few short windows from each selected waiting file (all waiting files if none are selected) with the current settings, and extrapolate the output size and encode time with a range. Nothing is written to the output directory."
+    ESTIMATE_SUMMARY_TITLE = "Estimate"
+    ESTIMATE_SUMMARY = "Estimated {count} files ({failed} could not be estimated)\nOutput size: {size} ({size_low} – {size_high}), source {source} ({change:+d}%)\nEncode time: {time} ({time_low} – {time_high})"
+    LOG_ESTIMATE_STARTED = "Test-encoding sample windows from {count} files..."
+    LOG_ESTIMATE_FAILED = "Could not estimate {filename} (duration unknown or test encode failed)"
+    LOG_ESTIMATE_CANCELLED = "Estimate stopped"
+
+    # ========== Per-title CRF search ==========
+    CRF_SEARCH_SETTINGS = "Per-title CRF"
+    CRF_SEARCH = "Search each file for the highest CRF that meets the target quality"
+    CRF_SEARCH_TOOLTIP = "Before encoding, a few short windows of each file are test-encoded at candidate CRFs with the current settings and compared with the source (SSIM, or VMAF when FFmpeg has libvmaf). A binary search picks the highest CRF (smallest file) whose average score meets the target, and that CRF is used for the file. Scores are cached, so a re-run does not encode the samples again."
+    CRF_SEARCH_METRIC = "Quality metric"
+    CRF_SEARCH_METRIC_AUTO = "Auto (VMAF if available, otherwise SSIM)"
+    CRF_SEARCH_METRIC_SSIM = "SSIM"
+    CRF_SEARCH_METRIC_VMAF = "VMAF"
+    CRF_SEARCH_TARGET_SSIM = "Target SSIM"
+    CRF_SEARCH_TARGET_VMAF = "Target VMAF"
+    CRF_SEARCH_RANGE = "CRF range"
+    LOG_CRF_SEARCH_STARTED = "Searching CRF for {count} files..."
+    LOG_CRF_SEARCH_FAILED = "CRF search failed for {filename}, using the configured CRF"
+    LOG_CRF_SELECTED = "{filename}: {result}"
+
+    # ========== Content complexity analysis ==========
+    COMPLEXITY_SETTINGS = "Content Complexity"
+    COMPLEXITY_ANALYSIS = "Analyze content complexity and adjust CRF / preset per file"
+    COMPLEXITY_ANALYSIS_TOOLTIP = "After a file is probed it is decoded once, downscaled and frame-skipped, and its spatial complexity (detail), temporal complexity (motion) and scene cuts are computed with NumPy. This is much faster than real time on a single core. Each file is classified as low, medium or high complexity and the CRF and preset of that tier are adjusted as set below. Results are cached with the video information."
+    COMPLEXITY_LOW = "Low"
+    COMPLEXITY_MEDIUM = "Medium"
+    COMPLEXITY_HIGH = "High"
+    COMPLEXITY_CRF_OFFSET = "CRF offset"
+    COMPLEXITY_PRESET_STEPS = "Preset steps"
+    COMPLEXITY_PRESET_STEPS_TOOLTIP = "Positive values move to a slower preset (e.g. medium → slow), negative values to a faster one"
+    MSG_COMPLEXITY_NUMPY_REQUIRED = "Content complexity analysis requires NumPy. Install it with: pip install numpy"
+    COL_COMPLEXITY = "Complexity"
+    COMPLEXITY_TOOLTIP = "Spatial {spatial:.1f} · temporal {temporal:.1f} · {cuts} scene cuts"
+    LOG_COMPLEXITY_PENDING = "{count} files have not been analyzed for complexity yet and use the base CRF and preset"
+
+    # ========== Deadline planning ==========
+    DEADLINE_SETTINGS = "Deadline Planning"
+    DEADLINE_PLANNING = "Choose a preset per file to meet a deadline"
+    DEADLINE_PLANNING_TOOLTIP = "When encoding starts, the time of each file is predicted from the encode speeds recorded on this machine, and each file gets the slowest (best compressing) preset that still lets the whole queue finish before the deadline. If the actual speed drifts from the prediction, the files that have not started yet are re-planned. Until this machine has speed data a default speed is assumed; every finished encode calibrates the model."
+    DEADLINE_TIME = "Deadline"
+    DEADLINE_CORES = "Cores available"
+    DEADLINE_ALL_CORES = "All"
+    MSG_DEADLINE_INVALID = "Invalid deadline. Use a format such as 23:30, +2h, +90m or 2026-10-20 08:00"
+    LOG_DEADLINE_PLAN = "Deadline {deadline}: {available} available, {predicted} predicted, presets {presets}"
+    LOG_DEADLINE_INFEASIBLE = "The queue cannot finish before the deadline even with the fastest presets"
+    LOG_DEADLINE_UNCALIBRATED = "No speed data on this machine for some encode settings yet; a default speed is assumed and the plan is revised from the actual speed"
+    LOG_DEADLINE_REPLAN = "Actual time is {ratio} of the prediction; changed the preset of {count} pending files: {presets}"
+
+    # ========== Weighted progress and ETA ==========
+    ETA_SUFFIX = ", {eta} left"
+    QUEUE_ETA_SUFFIX = ", {eta} left (done around {finish})"
@@ -46,9 +46,6 @@ class Translations:
     ENCODING_COMPLETE = "エンコード完了"
     STOPPING = "エンコードを停止中..."
     LOG_TITLE = "ログ"
-    LOADING_FILES = "読み込み中..."
-    LOADING_FILES_INIT = "ファイル情報を読み込んでいます..."
-    LOADING_FILES_PROGRESS = "読み込み中 {current}/{total} ファイル"
     
     # 制御ボタン
     START_ENCODING = "エンコード開始"
@@ -277,3 +274,232 @@ class Translations:
     ENCODING_COMPLETE_FORMAT = "エンコード完了: {success}/{total} 成功"
     CURRENT_FILE_FORMAT = "{filename} - {message}"
 
+    # ========== 監視フォルダー ==========
+    WATCH_FOLDERS = "フォルダー監視"
+    WATCH_FOLDERS_TOOLTIP = "有効にすると、監視フォルダーの新しいファイルは書き込み完了後に自動でキューに追加され、エンコードされます"
+    WATCH_SETTINGS = "監視フォルダー"
+    WATCH_ADD_FOLDER = "追加..."
+    WATCH_REMOVE_FOLDER = "削除"
+    WATCH_STABLE_SECONDS = "安定待ち時間（秒）"
+    WATCH_STABLE_SECONDS_TOOLTIP = "ファイルサイズと更新日時がこの秒数変化しなければ書き込み完了とみなします"
+    WATCH_PROCESS_EXISTING = "監視開始時にフォルダー内の既存ファイルもエンコードする"
+    WATCH_FOLDERS_HINT = "ファイルはフォルダー構造を保ったまま全体の出力フォルダーに出力されます。フォルダーごとの output_dir と settings は config.json で設定できます。"
+    MSG_NO_WATCH_FOLDERS = "監視フォルダーが設定されていません。先に設定で追加してください"
+    LOG_WATCH_STARTED = "{count} 個のフォルダーの監視を開始しました（{backend}）"
+    LOG_WATCH_STOPPED = "フォルダーの監視を停止しました"
+    LOG_WATCH_FILE_QUEUED = "監視フォルダーの新しいファイル: {filename}"
+    LOG_WATCH_NO_OUTPUT_DIR = "監視フォルダーの出力フォルダーが未設定のためスキップしました: {filename}"
+
+    # ========== バックグラウンドエンコード ==========
+    LOG_ENCODE_SERVICE_FALLBACK = "バックグラウンドのエンコードプロセスを起動できませんでした（{error}）。このウィンドウでエンコードします"
+    LOG_ENCODE_SERVICE_REATTACHED = "バックグラウンドのエンコードに再接続しました（{count} 件）"
+    LOG_ENCODE_SERVICE_FINISHED_OFFLINE = "ウィンドウを閉じている間にバックグラウンドのエンコードが完了しました：成功 {success} 件、失敗 {failed} 件"
+    MSG_ENCODE_CONTINUE_IN_BACKGROUND = "エンコードはまだ実行中です。\n\nはい：バックグラウンドでエンコードを続行（VvEnc を再度開くと進捗を確認できます）\nいいえ：エンコードを停止して終了\nキャンセル：ウィンドウに戻る"
+
+    # ========== FFmpeg の機能検出 ==========
+    FFMPEG_CAPABILITIES_INFO = "FFmpeg バージョン {version}、エンコーダー {encoders} 個、ハードウェアアクセラレーション: {hwaccels}"
+    CODEC_UNAVAILABLE_TOOLTIP = "現在の FFmpeg ではこのエンコーダーを使用できません"
+    MSG_JOB_VALIDATION_FAILED = "現在の FFmpeg（{version}）ではエンコードを実行できません：\n\n{problems}\n\nエンコード設定を変更するか、別の FFmpeg を使用してください。"
+
+    # ========== 重複ファイルの検出 ==========
+    STATUS_DUPLICATE = "重複"
+    DEDUPE_SETTINGS = "重複ファイル"
+    DEDUPE_ON_ADD = "追加時に内容が同じファイルを検出し、1 回だけエンコードする"
+    DEDUPE_ON_ADD_TOOLTIP = "ファイルサイズとサンプリングハッシュ（先頭・中間・末尾）で重複を検出します。ハードリンクや同じファイルへのシンボリックリンクは読み込みなしで識別します。元のファイルのエンコード完了後、その出力を重複ファイルの出力パスにハードリンク（できない場合はコピー）します。"
+    DEDUPE_FULL_HASH = "サンプルが一致した後にファイル全体を比較する（より確実、低速）"
+    DEDUPE_FULL_HASH_TOOLTIP = "サンプリングハッシュが一致したファイルは全体のハッシュを計算します（ファイル全体を読み込みます）"
+    LOG_DUPLICATES_FOUND = "{count} 件の重複ファイルが見つかりました。元のファイルのエンコード結果を使用します"
+    LOG_DUPLICATE_FILE = "重複ファイル: {filename}（元のファイル: {original}）"
+    LOG_DUPLICATE_OUTPUT_LINKED = "重複ファイル {filename} の出力をハードリンクしました: {output}"
+    LOG_DUPLICATE_OUTPUT_COPIED = "重複ファイル {filename} の出力をコピーしました: {output}"
+    LOG_DUPLICATE_OUTPUT_FAILED = "重複ファイル {filename} の出力を作成できませんでした: {error}"
+
+    # ========== 類似動画の検出 ==========
+    FIND_SIMILAR = "類似動画を検索"
+    FIND_SIMILAR_TOOLTIP = "待機中の各ファイルから少数の縮小フレームを抽出して知覚ハッシュを比較し、同じ内容の別バージョン（コンテナ、コーデック、解像度の違い）を見つけます"
+    MSG_NUMPY_REQUIRED = "類似動画の検出には NumPy が必要です。pip install numpy でインストールしてください"
+    MSG_SIMILAR_NEED_FILES = "待機中のファイルが 2 つ以上必要です"
+    MSG_NO_SIMILAR_VIDEOS = "類似する動画は見つかりませんでした"
+    SIMILAR_ANALYZING = "{current}/{total} ファイルを分析中..."
+    SIMILAR_DIALOG_TITLE = "類似動画"
+    SIMILAR_DIALOG_HINT = "各グループのファイルは映像と長さが近く、同じ内容の別バージョンと思われます。各グループで解像度とビットレートが最も高いファイルがチェックされています。チェックされていないファイルは一時停止になり、エンコードされません。"
+    SIMILAR_GROUP = "グループ {index}（{count} ファイル）"
+    SIMILAR_KEEP_CHECKED = "チェックしたファイルを残し、他を一時停止"
+    LOG_SIMILAR_PAUSED = "類似動画：{groups} グループ、{count} ファイルを一時停止しました"
+
+    # ========== ディレクトリスナップショット索引 ==========
+    REFRESH_FOLDERS = "フォルダーを更新"
+    REFRESH_FOLDERS_TOOLTIP = "追加済みのフォルダーを再スキャンします（変更のあったディレクトリのみ確認）：新しいファイルを追加し、削除されたファイルを除外し、変更されたファイルの情報を再読み込みします"
+    MSG_NO_SCANNED_FOLDERS = "フォルダーがまだ追加されていません"
+    LOG_SCAN_DELTA = "フォルダーの変更：追加 {added} 件、削除 {removed} 件、変更 {modified} 件"
+
+    # ========== 段階的プローブ ==========
+    PROBE_STATUS = "詳細情報を取得中 {done}/{total}（取得中も並べ替えやエンコード開始が可能）"
+
+    # ========== フィルターバー ==========
+    FILTER_LABEL = "フィルター:"
+    FILTER_PLACEHOLDER = "例: height < 720 and status = waiting"
+    FILTER_HELP = ("フィールド: codec, acodec, status, width, height/res, fps, bitrate, vbitrate, abitrate, bpp, duration, size, path, name\n"
+                   "演算子: < <= > >= = !=。path/name/codec/status では ~（ワイルドカード一致）と !~ も使用可能\n"
+                   "組み合わせ: and, or, not, 括弧\n"
+                   "例: codec = hevc and bitrate > 6M | status = failed | path ~ */archive/* | duration > 30m | size > 2GB")
+    FILTER_INVALID = "フィルター条件が正しくありません: {error}"
+    FILTER_MATCHES = "一致 {count} / {total}"
+    FILTER_ACTIONS = "一括操作"
+    FILTER_SELECT_MATCHES = "一致したファイルをすべて選択"
+    FILTER_SET_WAITING = "一致したファイルをエンコード待ちに設定"
+    FILTER_SET_PAUSED = "一致したファイルを一時停止に設定"
+    FILTER_REMOVE_MATCHES = "一致したファイルをリストから削除"
+    LOG_FILTER_APPLIED = "一括操作「{action}」：{count} 件のファイル"
+
+    # ========== キューマニフェスト ==========
+    QUEUE_MANIFEST = "キューマニフェスト"
+    QUEUE_MANIFEST_TOOLTIP = "キュー（パス、出力パス、ファイル単位の設定、動画情報、状態）を JSON Lines ファイルとしてインポート/エクスポートします。別のマシンに渡したりスクリプトで生成したりできます"
+    IMPORT_QUEUE = "キューをインポート..."
+    EXPORT_QUEUE = "キューをエクスポート..."
+    MANIFEST_FILES_FILTER = "キューマニフェスト (*.jsonl *.jsonl.gz);;すべてのファイル (*.*)"
+    MSG_MANIFEST_IMPORT_FAILED = "キューマニフェストの読み込みに失敗しました: {error}"
+    MSG_MANIFEST_EXPORT_FAILED = "キューマニフェストのエクスポートに失敗しました: {error}"
+    LOG_MANIFEST_IMPORT_STARTED = "キューマニフェストをインポート中: {path}"
+    LOG_MANIFEST_IMPORTED = "キューマニフェストのインポート完了：{count} 件のジョブ、{added} 件のファイルを追加（うち {probed} 件は動画情報付きでプローブ不要）"
+    LOG_MANIFEST_INVALID_LINES = "キューマニフェストの無効な行 {count} 行をスキップしました（{error}）"
+    LOG_MANIFEST_EXPORTED = "{count} 件のジョブをキューマニフェストにエクスポートしました: {path}"
+
+    # ========== エンコード計画 ==========
+    ENCODE_PLAN = "エンコード計画"
+    ENCODE_PLAN_TOOLTIP = "エンコードせずに各ジョブの出力パス、FFmpeg コマンド、推定作業量をプレビューし、出力の衝突を確認します"
+    PLAN_DIALOG_TITLE = "エンコード計画"
+    PLAN_SUMMARY = "{count} 件のジョブ、合計時間 {duration}、推定作業量 {cost}（1080p30 換算、時間不明 {unknown} 件）。出力の衝突 {collisions} 件、入力ファイルの上書き {overwrites} 件、既存の出力 {exists} 件。"
+    PLAN_ONLY_ISSUES = "問題のあるジョブのみ表示"
+    PLAN_COL_OUTPUT = "出力ファイル"
+    PLAN_COL_ISSUES = "問題"
+    PLAN_COL_COST = "作業量"
+    PLAN_COL_COMMAND = "FFmpeg コマンド"
+    PLAN_ISSUE_COLLISION = "他のジョブと同じ出力ファイル"
+    PLAN_ISSUE_IN_PLACE = "出力ファイルが入力ファイルと同じ"
+    PLAN_ISSUE_INPUT_OVERWRITE = "キュー内の他のジョブの入力ファイルを上書き"
+    PLAN_ISSUE_EXISTS = "出力ファイルが既に存在し、上書きされます"
+    PLAN_EXPORT_SCRIPT = "スクリプトをエクスポート..."
+    PLAN_EXPORT_MANIFEST = "キューマニフェストをエクスポート..."
+    PLAN_SCRIPT_FILES_FILTER = "スクリプト (*.bat *.cmd *.sh);;すべてのファイル (*.*)"
+    PLAN_CLOSE = "閉じる"
+    MSG_PLAN_BLOCKED = "{count} 件のジョブの出力ファイルが他のジョブと重複しているか入力ファイルを上書きするため、エンコードを開始しませんでした。\nエンコード計画で確認し、出力ディレクトリを変更するか、不要なファイルを一時停止にしてください。"
+    MSG_PLAN_EXPORT_FAILED = "エンコード計画のエクスポートに失敗しました: {error}"
+    LOG_PLAN_EXISTING_OUTPUTS = "{count} 件のジョブの出力ファイルが既に存在し、上書きされます"
+    LOG_PLAN_EXPORTED = "エンコード計画をエクスポートしました（{count} 件）: {path}"
+
+    # ========== 映像フィルターの計画 ==========
+    SCALE_FLAGS = "スケーラー"
+    SCALE_FLAGS_TOOLTIP = "解像度を変更するときの FFmpeg スケーリングアルゴリズム。既定の bicubic は FFmpeg の既定値と同じです。auto：縮小時は高速ですが画質がやや劣る bilinear、拡大時は bicubic を使用します。FFmpeg scale フィルターの flags（例: lanczos）を直接入力することもできます"
+    PLAN_COL_FILTERS = "映像フィルター"
+    PLAN_NO_FILTERS = "なし（ソースと同じ）"
+    PLAN_FILTER_FPS_DROP_FIRST = "フレームレート {source} → {target} fps：fps を先頭に置き、後続のフィルターが処理するフレームを {saved}% 削減"
+    PLAN_FILTER_FPS_UNKNOWN_FIRST = "ソースのフレームレートが不明：フレームレートを下げるものとして fps を先頭に配置"
+    PLAN_FILTER_FPS_RAISE_LAST = "フレームレート {source} → {target} fps：複製フレームをスケーリングしないよう fps を最後に配置"
+    PLAN_FILTER_FPS_SAME = "ソースは既に {target} fps のため fps を省略"
+    PLAN_FILTER_SCALE = "スケーリング {source} → {target}、アルゴリズム {flags}"
+    PLAN_FILTER_SCALE_UNKNOWN = "{target} にスケーリング（ソース解像度不明）、アルゴリズム {flags}"
+    PLAN_FILTER_SCALE_SAME = "ソースは既に {target} のため scale を省略"
+    PLAN_FILTER_FORMAT_MERGED = "ピクセルフォーマット {source} → {target}：scale の直後に置き、同じスケーリング処理で変換"
+    PLAN_FILTER_FORMAT = "ピクセルフォーマット {source} → {target}"
+    PLAN_FILTER_FORMAT_SAME = "ソースのピクセルフォーマットは既に {target} のため format を省略"
+
+    # ========== マルチレンディション出力 ==========
+    RENDITION_SETTINGS = "マルチレンディション出力（1 回のデコードで複数ファイルを出力）"
+    RENDITION_NAME = "サフィックス"
+    RENDITION_ADD = "追加"
+    RENDITION_REMOVE = "削除"
+    RENDITION_TABLE_TOOLTIP = "1 行が 1 つの出力ファイルです。空欄の項目は上の映像設定を使用します（例: サフィックス 720p、解像度 -2:720）"
+    RENDITION_HINT = "設定すると各ファイルを 1 回だけデコードし、各レンディションにエンコードします：clip.mkv から clip_1080p.mp4、clip_720p.mp4 などを出力します。表が空の場合は 1 ファイルのみ出力します。"
+    LOG_RENDITION_OUTPUT = "  ✓ {name}: {output}（{size}）"
+    LOG_RENDITION_MISSING = "  ✗ {name}: 出力ファイルがありません {output}"
+
+    # ========== 小さいファイルの一括エンコード ==========
+    BATCH_SETTINGS = "小さいファイルの一括エンコード"
+    BATCH_SMALL_FILES = "複数の小さいファイルを 1 つの FFmpeg プロセスでエンコード"
+    BATCH_SMALL_FILES_TOOLTIP = "数秒のクリップでは、FFmpeg とエンコーダーの起動にエンコード自体より時間がかかります。小さいファイルをグループにまとめ、グループごとに 1 つのプロセスでエンコードします。プロセスが失敗した場合はグループ内のファイルを 1 つずつエンコードし直します。"
+    BATCH_MAX_DURATION = "小さいファイルの最大長"
+    BATCH_MAX_FILES = "プロセスあたりの最大ファイル数"
+
+    # ========== 黒帯の検出 ==========
+    COL_CROP = "黒帯クロップ"
+    CROP_NONE = "黒帯なし"
+    AUTO_CROP = "黒帯を検出してクロップ"
+    AUTO_CROP_TOOLTIP = "各ファイルから均等に抜き出した短い区間で cropdetect を実行し（高速シーク・並列実行）、安定した黒帯をスケーリングの前にクロップします。黒帯にビットレートを使わなくなります。検出結果はプローブ情報と一緒にキャッシュされ、「黒帯クロップ」列に表示されます。"
+    PLAN_FILTER_CROP = "黒帯をクロップ {source} → {target}：処理するピクセルが {saved}% 減少"
+    PLAN_FILTER_CROP_UNKNOWN = "黒帯をクロップして {target} に（ソース解像度不明）"
+
+    # ========== 重複フレームの間引き ==========
+    DECIMATE_SETTINGS = "重複フレーム（画面録画）"
+    DECIMATE = "重複フレームを破棄（mpdecimate、可変フレームレート出力）"
+    DECIMATE_TOOLTIP = "画面録画ではほとんどのフレームが直前のフレームと同じです。mpdecimate がクロップとスケーリングの前にそれらを破棄するため、エンコーダーは変化のあったフレームだけを処理します。出力は可変フレームレートで、残したフレームは元のタイムスタンプを保ち、MP4 は元のペースで再生されます。破棄したフレーム数はログに表示されます。"
+    DECIMATE_HI = "ブロック差分しきい値（hi）"
+    DECIMATE_HI_TOOLTIP = "いずれかの 8x8 ブロックの差分がこの値を超えると変化ありとみなします（FFmpeg の既定値 768 = 64*12）"
+    DECIMATE_LO = "ブロック差分しきい値（lo）"
+    DECIMATE_LO_TOOLTIP = "差分がこの値を超えるブロックの割合が下の比率を超えた場合も変化ありとみなします（FFmpeg の既定値 320 = 64*5）"
+    DECIMATE_FRAC = "変化ブロックの比率"
+    DECIMATE_MAX = "連続破棄の上限"
+    DECIMATE_MAX_UNLIMITED = "無制限"
+    DECIMATE_MAX_TOOLTIP = "この数だけ連続して破棄したら少なくとも 1 フレームを残し、長い静止画面も定期的に更新されるようにします"
+    PLAN_FILTER_FPS_DECIMATE_FIRST = "フレームレート {target} fps：mpdecimate の前に置き、重複フレームは mpdecimate が破棄"
+    PLAN_FILTER_DECIMATE = "mpdecimate が直前と同じフレームを破棄し、後続のフィルターは変化のあったフレームだけを処理（可変フレームレート出力）"
+
+    # ========== サンプル試しエンコードによる見積もり ==========
+    COL_EST_SIZE = "推定サイズ"
+    COL_EST_TIME = "推定エンコード時間"
+    EST_SIZE_TOOLTIP = "推定出力 {size}、元ファイル {source}（{change:+d}%）"
+    ESTIMATE = "見積もり"
+    ESTIMATE_STOP = "見積もりを停止"
+    ESTIMATE_TOOLTIP = "選択した待機中のファイル（未選択時は待機中のすべてのファイル）から短い区間をいくつか現在の設定で試しにエンコードし、出力サイズとエンコード時間を範囲付きで推定します。出力フォルダーには書き込みません。"
+    ESTIMATE_SUMMARY_TITLE = "見積もり"
+    ESTIMATE_SUMMARY = "{count} 個のファイルを見積もりました（{failed} 個は見積もり不可）\n出力サイズ：{size}（{size_low} – {size_high}）、元ファイル {source}（{change:+d}%）\nエンコード時間：{time}（{time_low} – {time_high}）"
+    LOG_ESTIMATE_STARTED = "{count} 個のファイルのサンプル区間を試しにエンコードしています..."
+    LOG_ESTIMATE_FAILED = "{filename} を見積もれません（長さが不明、または試しエンコードに失敗）"
+    LOG_ESTIMATE_CANCELLED = "見積もりを停止しました"
+
+    # ========== ファイルごとの CRF 探索 ==========
+    CRF_SEARCH_SETTINGS = "ファイルごとの CRF"
+    CRF_SEARCH = "ファイルごとに目標品質を満たす最大の CRF を探索"
+    CRF_SEARCH_TOOLTIP = "エンコード前に、各ファイルの短い区間をいくつか現在の設定と候補の CRF で試しにエンコードし、元の映像と品質を比較します（SSIM、FFmpeg に libvmaf がある場合は VMAF）。平均スコアが目標を満たす最大の CRF（最小のファイル）を二分探索で選び、そのファイルのエンコードに使います。スコアはキャッシュされ、再実行時に試しエンコードは繰り返されません。"
+    CRF_SEARCH_METRIC = "品質指標"
+    CRF_SEARCH_METRIC_AUTO = "自動（使用可能なら VMAF、それ以外は SSIM）"
+    CRF_SEARCH_METRIC_SSIM = "SSIM"
+    CRF_SEARCH_METRIC_VMAF = "VMAF"
+    CRF_SEARCH_TARGET_SSIM = "目標 SSIM"
+    CRF_SEARCH_TARGET_VMAF = "目標 VMAF"
+    CRF_SEARCH_RANGE = "CRF の範囲"
+    LOG_CRF_SEARCH_STARTED = "{count} 個のファイルの CRF を探索しています..."
+    LOG_CRF_SEARCH_FAILED = "{filename} の CRF 探索に失敗しました。設定の CRF を使用します"
+    LOG_CRF_SELECTED = "{filename}: {result}"
+
+    # ========== コンテンツの複雑さの分析 ==========
+    COMPLEXITY_SETTINGS = "コンテンツの複雑さ"
+    COMPLEXITY_ANALYSIS = "コンテンツの複雑さを分析し、ファイルごとに CRF とプリセットを調整する"
+    COMPLEXITY_ANALYSIS_TOOLTIP = "情報の取得後、ファイルを一度だけ縮小・間引きしてデコードし、空間的な複雑さ（細部）、時間的な複雑さ（動き）とシーンチェンジを NumPy で計算します。シングルコアでも実時間よりはるかに高速です。各ファイルを低・中・高に分類し、下の設定に従ってその段階の CRF とプリセットを調整します。結果は動画情報と一緒にキャッシュされます。"
+    COMPLEXITY_LOW = "低"
+    COMPLEXITY_MEDIUM = "中"
+    COMPLEXITY_HIGH = "高"
+    COMPLEXITY_CRF_OFFSET = "CRF の増減"
+    COMPLEXITY_PRESET_STEPS = "プリセットの段数"
+    COMPLEXITY_PRESET_STEPS_TOOLTIP = "正の値はより遅いプリセット（例: medium → slow）、負の値はより速いプリセットにします"
+    MSG_COMPLEXITY_NUMPY_REQUIRED = "コンテンツの複雑さの分析には NumPy が必要です。pip install numpy でインストールしてください"
+    COL_COMPLEXITY = "複雑さ"
+    COMPLEXITY_TOOLTIP = "空間 {spatial:.1f} · 時間 {temporal:.1f} · シーンチェンジ {cuts} 回"
+    LOG_COMPLEXITY_PENDING = "{count} 個のファイルは複雑さの分析が済んでいないため、元の CRF とプリセットを使用します"
+
+    # ========== 締め切りの計画 ==========
+    DEADLINE_SETTINGS = "締め切りの計画"
+    DEADLINE_PLANNING = "締め切りに合わせてファイルごとにプリセットを選ぶ"
+    DEADLINE_PLANNING_TOOLTIP = "エンコード開始時に、このマシンで記録したエンコード速度から各ファイルの所要時間を予測し、締め切りまでに完了できる範囲でできるだけ遅い（圧縮率の高い）プリセットをファイルごとに選びます。実際の速度が予測から大きくずれた場合は、まだ開始していないファイルを計画し直します。このマシンに速度データがないうちは既定の速度で見積もり、エンコードが完了するたびに自動的に補正します。"
+    DEADLINE_TIME = "締め切り"
+    DEADLINE_CORES = "使用できるコア数"
+    DEADLINE_ALL_CORES = "すべて"
+    MSG_DEADLINE_INVALID = "締め切りが無効です。23:30、+2h、+90m、2026-10-20 08:00 などの形式で指定してください"
+    LOG_DEADLINE_PLAN = "締め切り {deadline}: 使用可能 {available}、予測所要時間 {predicted}、プリセット {presets}"
+    LOG_DEADLINE_INFEASIBLE = "すべて最速のプリセットにしても締め切りまでに完了できません"
+    LOG_DEADLINE_UNCALIBRATED = "一部のエンコード設定はこのマシンの速度データがないため既定の速度で見積もっています。エンコード中に実際の速度で計画し直します"
+    LOG_DEADLINE_REPLAN = "実際の所要時間は予測の {ratio} です。未開始の {count} 個のファイルのプリセットを変更しました: {presets}"
+
+    # ========== 重み付き進捗と残り時間 ==========
+    ETA_SUFFIX = "、残り {eta}"
+    QUEUE_ETA_SUFFIX = "、残り {eta}（{finish} 頃に完了）"
@@ -46,9 +46,6 @@ class Translations:
     ENCODING_COMPLETE = "编码完成"
     STOPPING = "正在停止编码..."
     LOG_TITLE = "日志"
-    LOADING_FILES = "加载中..."
-    LOADING_FILES_INIT = "正在载入文件信息..."
-    LOADING_FILES_PROGRESS = "正在载入 {current}/{total} 文件"
     
     # 控制按钮
     START_ENCODING = "开始编码"
@@ -276,3 +273,232 @@ class Translations:
     ENCODING_COMPLETE_FORMAT = "编码完成: {success}/{total} 成功"
     CURRENT_FILE_FORMAT = "{filename} - {message}"
 
+    # ========== 监视文件夹 ==========
+    WATCH_FOLDERS = "监视文件夹"
+    WATCH_FOLDERS_TOOLTIP = "开启后，监视文件夹中的新文件写入完成后会自动加入队列并编码"
+    WATCH_SETTINGS = "监视文件夹"
+    WATCH_ADD_FOLDER = "添加..."
+    WATCH_REMOVE_FOLDER = "移除"
+    WATCH_STABLE_SECONDS = "稳定时间（秒）"
+    WATCH_STABLE_SECONDS_TOOLTIP = "文件大小和修改时间在该时间内保持不变时，视为写入完成"
+    WATCH_PROCESS_EXISTING = "开始监视时同时编码文件夹中已有的文件"
+    WATCH_FOLDERS_HINT = "文件按目录结构输出到全局输出目录。可在 config.json 中为每个文件夹单独设置 output_dir 和 settings。"
+    MSG_NO_WATCH_FOLDERS = "尚未配置监视文件夹，请先在设置中添加"
+    LOG_WATCH_STARTED = "开始监视 {count} 个文件夹（{backend}）"
+    LOG_WATCH_STOPPED = "已停止监视文件夹"
+    LOG_WATCH_FILE_QUEUED = "监视文件夹新文件: {filename}"
+    LOG_WATCH_NO_OUTPUT_DIR = "监视文件夹未设置输出目录，已跳过: {filename}"
+
+    # ========== 后台编码 ==========
+    LOG_ENCODE_SERVICE_FALLBACK = "无法启动后台编码进程（{error}），改为在当前窗口中编码"
+    LOG_ENCODE_SERVICE_REATTACHED = "已重新连接后台编码（{count} 个文件）"
+    LOG_ENCODE_SERVICE_FINISHED_OFFLINE = "窗口关闭期间后台编码已完成：成功 {success} 个，失败 {failed} 个"
+    MSG_ENCODE_CONTINUE_IN_BACKGROUND = "编码仍在进行中。\n\n是：在后台继续编码（重新打开 VvEnc 可查看进度）\n否：停止编码并退出\n取消：返回窗口"
+
+    # ========== FFmpeg 能力检测 ==========
+    FFMPEG_CAPABILITIES_INFO = "FFmpeg 版本 {version}，{encoders} 个编码器，硬件加速: {hwaccels}"
+    CODEC_UNAVAILABLE_TOOLTIP = "当前 FFmpeg 不支持此编码器"
+    MSG_JOB_VALIDATION_FAILED = "当前 FFmpeg（{version}）无法执行编码任务：\n\n{problems}\n\n请修改编码设置或更换 FFmpeg。"
+
+    # ========== 重复文件检测 ==========
+    STATUS_DUPLICATE = "重复文件"
+    DEDUPE_SETTINGS = "重复文件"
+    DEDUPE_ON_ADD = "添加文件时检测内容相同的文件，只编码一次"
+    DEDUPE_ON_ADD_TOOLTIP = "按文件大小和抽样哈希（开头、中间、结尾）检测重复；硬链接和指向同一文件的符号链接无需读取即可识别。原件编码完成后，其输出会硬链接（不支持时复制）到重复文件的输出路径。"
+    DEDUPE_FULL_HASH = "抽样相同后比较完整文件内容（更可靠，较慢）"
+    DEDUPE_FULL_HASH_TOOLTIP = "抽样哈希相同的文件再计算完整哈希，需要读取整个文件"
+    LOG_DUPLICATES_FOUND = "发现 {count} 个重复文件，将使用原件的编码结果"
+    LOG_DUPLICATE_FILE = "重复文件: {filename}（原件: {original}）"
+    LOG_DUPLICATE_OUTPUT_LINKED = "重复文件 {filename} 的输出已硬链接: {output}"
+    LOG_DUPLICATE_OUTPUT_COPIED = "重复文件 {filename} 的输出已复制: {output}"
+    LOG_DUPLICATE_OUTPUT_FAILED = "为重复文件 {filename} 生成输出失败: {error}"
+
+    # ========== 相似视频检测 ==========
+    FIND_SIMILAR = "查找相似视频"
+    FIND_SIMILAR_TOOLTIP = "对等待编码的文件抽取少量缩略帧计算感知哈希，找出同一内容的不同版本（不同封装、编码或分辨率）"
+    MSG_NUMPY_REQUIRED = "相似视频检测需要 NumPy，请先安装：pip install numpy"
+    MSG_SIMILAR_NEED_FILES = "至少需要两个等待编码的文件"
+    MSG_NO_SIMILAR_VIDEOS = "未发现相似的视频"
+    SIMILAR_ANALYZING = "正在分析 {current}/{total} 个文件..."
+    SIMILAR_DIALOG_TITLE = "相似视频"
+    SIMILAR_DIALOG_HINT = "以下各组文件画面和时长相近，可能是同一内容的不同版本。每组默认勾选分辨率和码率最高的文件；未勾选的文件将设为挂起，不会编码。"
+    SIMILAR_GROUP = "第 {index} 组（{count} 个文件）"
+    SIMILAR_KEEP_CHECKED = "保留勾选的文件，挂起其它文件"
+    LOG_SIMILAR_PAUSED = "相似视频：{groups} 组，已挂起 {count} 个文件"
+
+    # ========== 目录快照索引 ==========
+    REFRESH_FOLDERS = "刷新文件夹"
+    REFRESH_FOLDERS_TOOLTIP = "重新扫描已添加的文件夹（只检查有变化的目录）：加入新文件，移除已删除的文件，重新读取被修改文件的信息"
+    MSG_NO_SCANNED_FOLDERS = "尚未添加文件夹"
+    LOG_SCAN_DELTA = "文件夹变化：新增 {added} 个，删除 {removed} 个，修改 {modified} 个"
+
+    # ========== 分级探测 ==========
+    PROBE_STATUS = "正在获取详细信息 {done}/{total}（期间可排序和开始编码）"
+
+    # ========== 过滤栏 ==========
+    FILTER_LABEL = "筛选:"
+    FILTER_PLACEHOLDER = "例如: height < 720 and status = waiting"
+    FILTER_HELP = ("字段: codec, acodec, status, width, height/res, fps, bitrate, vbitrate, abitrate, bpp, duration, size, path, name\n"
+                   "运算符: < <= > >= = !=，path/name/codec/status 还可用 ~（通配符匹配）和 !~\n"
+                   "组合: and, or, not, 括号\n"
+                   "示例: codec = hevc and bitrate > 6M | status = failed | path ~ */archive/* | duration > 30m | size > 2GB")
+    FILTER_INVALID = "过滤条件有误: {error}"
+    FILTER_MATCHES = "匹配 {count} / {total}"
+    FILTER_ACTIONS = "批量操作"
+    FILTER_SELECT_MATCHES = "选中所有匹配项"
+    FILTER_SET_WAITING = "匹配项设为等待编码"
+    FILTER_SET_PAUSED = "匹配项设为挂起"
+    FILTER_REMOVE_MATCHES = "从列表移除匹配项"
+    LOG_FILTER_APPLIED = "批量操作“{action}”：{count} 个文件"
+
+    # ========== 队列清单 ==========
+    QUEUE_MANIFEST = "队列清单"
+    QUEUE_MANIFEST_TOOLTIP = "以 JSON Lines 文件导入/导出队列（路径、输出路径、文件级设置、视频信息和状态），可交给其它电脑或由脚本生成"
+    IMPORT_QUEUE = "导入队列..."
+    EXPORT_QUEUE = "导出队列..."
+    MANIFEST_FILES_FILTER = "队列清单 (*.jsonl *.jsonl.gz);;所有文件 (*.*)"
+    MSG_MANIFEST_IMPORT_FAILED = "读取队列清单失败: {error}"
+    MSG_MANIFEST_EXPORT_FAILED = "导出队列清单失败: {error}"
+    LOG_MANIFEST_IMPORT_STARTED = "正在导入队列清单: {path}"
+    LOG_MANIFEST_IMPORTED = "队列清单导入完成：{count} 个任务，新增 {added} 个文件，其中 {probed} 个自带视频信息（无需探测）"
+    LOG_MANIFEST_INVALID_LINES = "队列清单中有 {count} 行无效，已跳过（{error}）"
+    LOG_MANIFEST_EXPORTED = "已导出 {count} 个任务到队列清单: {path}"
+
+    # ========== 编码计划 ==========
+    ENCODE_PLAN = "编码计划"
+    ENCODE_PLAN_TOOLTIP = "不编码，预览每个任务的输出路径、FFmpeg 命令和估算工作量，并检查输出冲突"
+    PLAN_DIALOG_TITLE = "编码计划"
+    PLAN_SUMMARY = "{count} 个任务，总时长 {duration}，估算工作量 {cost}（按 1080p30 折算，{unknown} 个任务时长未知）。输出冲突 {collisions} 个，覆盖输入文件 {overwrites} 个，输出已存在 {exists} 个。"
+    PLAN_ONLY_ISSUES = "只显示有问题的任务"
+    PLAN_COL_OUTPUT = "输出文件"
+    PLAN_COL_ISSUES = "问题"
+    PLAN_COL_COST = "工作量"
+    PLAN_COL_COMMAND = "FFmpeg 命令"
+    PLAN_ISSUE_COLLISION = "与其他任务输出到同一文件"
+    PLAN_ISSUE_IN_PLACE = "输出文件就是输入文件"
+    PLAN_ISSUE_INPUT_OVERWRITE = "会覆盖队列中其他任务的输入文件"
+    PLAN_ISSUE_EXISTS = "输出文件已存在，将被覆盖"
+    PLAN_EXPORT_SCRIPT = "导出脚本..."
+    PLAN_EXPORT_MANIFEST = "导出队列清单..."
+    PLAN_SCRIPT_FILES_FILTER = "脚本 (*.bat *.cmd *.sh);;所有文件 (*.*)"
+    PLAN_CLOSE = "关闭"
+    MSG_PLAN_BLOCKED = "有 {count} 个任务的输出文件与其他任务相同或会覆盖输入文件，未开始编码。\n请在编码计划中查看这些任务，更改输出目录或将多余的文件设为挂起。"
+    MSG_PLAN_EXPORT_FAILED = "导出编码计划失败: {error}"
+    LOG_PLAN_EXISTING_OUTPUTS = "{count} 个任务的输出文件已存在，编码时将被覆盖"
+    LOG_PLAN_EXPORTED = "已导出编码计划（{count} 个任务）: {path}"
+
+    # ========== 视频滤镜规划 ==========
+    SCALE_FLAGS = "缩放算法"
+    SCALE_FLAGS_TOOLTIP = "调整分辨率时使用的 FFmpeg 缩放算法。默认 bicubic 与 FFmpeg 默认值相同；auto：缩小时使用较快但画质略低的 bilinear，放大时使用 bicubic；也可以直接填写 FFmpeg scale 滤镜的 flags，例如 lanczos"
+    PLAN_COL_FILTERS = "视频滤镜"
+    PLAN_NO_FILTERS = "无（与源相同）"
+    PLAN_FILTER_FPS_DROP_FIRST = "帧率 {source} → {target} fps：fps 放在最前，后续滤镜少处理 {saved}% 的帧"
+    PLAN_FILTER_FPS_UNKNOWN_FIRST = "源帧率未知：fps 按降低帧率处理，放在最前"
+    PLAN_FILTER_FPS_RAISE_LAST = "帧率 {source} → {target} fps：fps 放在最后，避免缩放重复的帧"
+    PLAN_FILTER_FPS_SAME = "源帧率已是 {target} fps，省略 fps"
+    PLAN_FILTER_SCALE = "缩放 {source} → {target}，算法 {flags}"
+    PLAN_FILTER_SCALE_UNKNOWN = "缩放到 {target}（源分辨率未知），算法 {flags}"
+    PLAN_FILTER_SCALE_SAME = "源分辨率已是 {target}，省略 scale"
+    PLAN_FILTER_FORMAT_MERGED = "像素格式 {source} → {target}：紧跟 scale，由同一次缩放完成"
+    PLAN_FILTER_FORMAT = "像素格式 {source} → {target}"
+    PLAN_FILTER_FORMAT_SAME = "源像素格式已是 {target}，省略 format"
+
+    # ========== 多码率输出 ==========
+    RENDITION_SETTINGS = "多码率输出（一次解码，输出多个文件）"
+    RENDITION_NAME = "后缀"
+    RENDITION_ADD = "添加"
+    RENDITION_REMOVE = "移除"
+    RENDITION_TABLE_TOOLTIP = "每行对应一个输出文件，留空的参数使用上方的视频设置，例如后缀 720p、分辨率 -2:720"
+    RENDITION_HINT = "配置后每个文件只解码一次，分别编码为各个规格：clip.mkv 输出为 clip_1080p.mp4、clip_720p.mp4 等。表格为空时只输出一个文件。"
+    LOG_RENDITION_OUTPUT = "  ✓ {name}: {output}（{size}）"
+    LOG_RENDITION_MISSING = "  ✗ {name}: 输出文件不存在 {output}"
+
+    # ========== 小文件批量编码 ==========
+    BATCH_SETTINGS = "小文件批量编码"
+    BATCH_SMALL_FILES = "多个小文件由同一个 FFmpeg 进程编码"
+    BATCH_SMALL_FILES_TOOLTIP = "几秒的短片中，启动 FFmpeg 和编码器的耗时比编码本身更长。小文件分组后每组由一个进程编码；进程失败时组内文件再逐个单独编码。"
+    BATCH_MAX_DURATION = "小文件最长时长"
+    BATCH_MAX_FILES = "每个进程最多文件数"
+
+    # ========== 黑边检测 ==========
+    COL_CROP = "黑边裁剪"
+    CROP_NONE = "无黑边"
+    AUTO_CROP = "检测并裁掉黑边"
+    AUTO_CROP_TOOLTIP = "在每个文件中均匀抽取几个短窗口运行 cropdetect（快速定位、并行运行），在缩放之前裁掉稳定的黑边，编码器不再为黑边浪费码率。检测结果与探测信息一起缓存，并显示在“黑边裁剪”列中。"
+    PLAN_FILTER_CROP = "裁掉黑边 {source} → {target}，少处理 {saved}% 的像素"
+    PLAN_FILTER_CROP_UNKNOWN = "裁掉黑边，裁剪为 {target}（源分辨率未知）"
+
+    # ========== 丢弃重复帧 ==========
+    DECIMATE_SETTINGS = "重复帧（屏幕录制）"
+    DECIMATE = "丢弃重复帧（mpdecimate，可变帧率输出）"
+    DECIMATE_TOOLTIP = "屏幕录制中大部分帧与上一帧相同。mpdecimate 在裁剪和缩放之前丢弃这些帧，编码器只处理有变化的帧。输出为可变帧率：保留的帧沿用原时间戳，MP4 按原节奏播放。日志中给出丢弃的帧数。"
+    DECIMATE_HI = "块差异阈值（hi）"
+    DECIMATE_HI_TOOLTIP = "任何一个 8x8 块的差异超过此值时视为有变化（FFmpeg 默认 768 = 64*12）"
+    DECIMATE_LO = "块差异阈值（lo）"
+    DECIMATE_LO_TOOLTIP = "差异超过此值的块占比超过下面的比例时也视为有变化（FFmpeg 默认 320 = 64*5）"
+    DECIMATE_FRAC = "变化块比例"
+    DECIMATE_MAX = "最多连续丢弃"
+    DECIMATE_MAX_UNLIMITED = "不限制"
+    DECIMATE_MAX_TOOLTIP = "连续丢弃这么多帧后至少保留一帧，长时间静止的画面也会定期刷新"
+    PLAN_FILTER_FPS_DECIMATE_FIRST = "帧率 {target} fps：放在 mpdecimate 之前，由 mpdecimate 丢弃重复帧"
+    PLAN_FILTER_DECIMATE = "mpdecimate 丢弃与上一帧相同的帧，之后的滤镜只处理有变化的帧（可变帧率输出）"
+
+    # ========== 抽样试编码预估 ==========
+    COL_EST_SIZE = "预估大小"
+    COL_EST_TIME = "预估耗时"
+    EST_SIZE_TOOLTIP = "预估输出 {size}，源文件 {source}（{change:+d}%）"
+    ESTIMATE = "预估"
+    ESTIMATE_STOP = "停止预估"
+    ESTIMATE_TOOLTIP = "用当前设置试编码选中的等待编码文件（未选中时为全部等待编码文件）中的几个短窗口，推算输出大小和编码耗时及其范围。不会写入输出目录。"
+    ESTIMATE_SUMMARY_TITLE = "预估"
+    ESTIMATE_SUMMARY = "已预估 {count} 个文件（{failed} 个无法预估）\n输出大小：{size}（{size_low} – {size_high}），源文件 {source}（{change:+d}%）\n编码耗时：{time}（{time_low} – {time_high}）"
+    LOG_ESTIMATE_STARTED = "正在试编码 {count} 个文件的抽样窗口..."
+    LOG_ESTIMATE_FAILED = "无法预估 {filename}（时长未知或试编码失败）"
+    LOG_ESTIMATE_CANCELLED = "已停止预估"
+
+    # ========== 按片源搜索 CRF ==========
+    CRF_SEARCH_SETTINGS = "按片源搜索 CRF"
+    CRF_SEARCH = "为每个文件搜索满足目标质量的最大 CRF"
+    CRF_SEARCH_TOOLTIP = "编码前用当前设置以候选 CRF 试编码每个文件中的几个短窗口，并与源视频比较质量（SSIM，FFmpeg 带有 libvmaf 时为 VMAF）。二分查找平均得分达到目标的最大 CRF（文件最小），该文件使用这个 CRF 编码。得分会被缓存，再次编码时不再重复试编码。"
+    CRF_SEARCH_METRIC = "质量指标"
+    CRF_SEARCH_METRIC_AUTO = "自动（可用时使用 VMAF，否则使用 SSIM）"
+    CRF_SEARCH_METRIC_SSIM = "SSIM"
+    CRF_SEARCH_METRIC_VMAF = "VMAF"
+    CRF_SEARCH_TARGET_SSIM = "目标 SSIM"
+    CRF_SEARCH_TARGET_VMAF = "目标 VMAF"
+    CRF_SEARCH_RANGE = "CRF 范围"
+    LOG_CRF_SEARCH_STARTED = "正在为 {count} 个文件搜索 CRF..."
+    LOG_CRF_SEARCH_FAILED = "{filename} 的 CRF 搜索失败，使用设置中的 CRF"
+    LOG_CRF_SELECTED = "{filename}: {result}"
+
+    # ========== 内容复杂度分析 ==========
+    COMPLEXITY_SETTINGS = "内容复杂度"
+    COMPLEXITY_ANALYSIS = "分析内容复杂度，按文件调整 CRF 和预设"
+    COMPLEXITY_ANALYSIS_TOOLTIP = "文件探测完成后解码一次（缩小并抽帧），用 NumPy 计算空间复杂度（细节）、时间复杂度（运动）和镜头切换，单核即远快于实时。每个文件分为低、中、高三档，并按下方设置调整该档的 CRF 和预设。结果与视频信息一起缓存。"
+    COMPLEXITY_LOW = "低"
+    COMPLEXITY_MEDIUM = "中"
+    COMPLEXITY_HIGH = "高"
+    COMPLEXITY_CRF_OFFSET = "CRF 偏移"
+    COMPLEXITY_PRESET_STEPS = "预设档数"
+    COMPLEXITY_PRESET_STEPS_TOOLTIP = "正数改用更慢的预设（例如 medium → slow），负数改用更快的预设"
+    MSG_COMPLEXITY_NUMPY_REQUIRED = "内容复杂度分析需要 NumPy，请先安装：pip install numpy"
+    COL_COMPLEXITY = "复杂度"
+    COMPLEXITY_TOOLTIP = "空间 {spatial:.1f} · 时间 {temporal:.1f} · {cuts} 次镜头切换"
+    LOG_COMPLEXITY_PENDING = "{count} 个文件尚未完成复杂度分析，使用原有的 CRF 和预设"
+
+    # ========== 截止时间规划 ==========
+    DEADLINE_SETTINGS = "截止时间规划"
+    DEADLINE_PLANNING = "按截止时间为每个文件选择预设"
+    DEADLINE_PLANNING_TOOLTIP = "开始编码时按本机记录的编码速度预测每个文件的耗时，在截止时间前完成的前提下为每个文件选择尽可能慢（压缩率更高）的预设。编码过程中实际速度与预测偏差较大时，重新规划尚未开始的文件。本机还没有速度数据时按默认速度估算，每次编码完成后自动校准。"
+    DEADLINE_TIME = "截止时间"
+    DEADLINE_CORES = "可用核心数"
+    DEADLINE_ALL_CORES = "全部"
+    MSG_DEADLINE_INVALID = "无效的截止时间，可使用 23:30、+2h、+90m 或 2026-10-20 08:00 等格式"
+    LOG_DEADLINE_PLAN = "截止时间 {deadline}：可用 {available}，预计耗时 {predicted}，预设 {presets}"
+    LOG_DEADLINE_INFEASIBLE = "即使全部使用最快的预设也无法在截止时间前完成"
+    LOG_DEADLINE_UNCALIBRATED = "本机尚无部分编码参数的速度数据，按默认速度估算，编码过程中会按实际速度重新规划"
+    LOG_DEADLINE_REPLAN = "实际耗时为预测的 {ratio}，已调整 {count} 个未开始文件的预设：{presets}"
+
+    # ========== 加权进度和剩余时间 ==========
+    ETA_SUFFIX = "，剩余 {eta}"
+    QUEUE_ETA_SUFFIX = "，剩余 {eta}（预计 {finish} 完成）"
@@ -46,9 +46,6 @@ class Translations:
     ENCODING_COMPLETE = "編碼完成"
     STOPPING = "正在停止編碼..."
     LOG_TITLE = "日誌"
-    LOADING_FILES = "載入中..."
-    LOADING_FILES_INIT = "正在載入檔案資訊..."
-    LOADING_FILES_PROGRESS = "正在載入 {current}/{total} 檔案"
     
     # 控制按鈕
     START_ENCODING = "開始編碼"
@@ -276,3 +273,232 @@ class Translations:
     ENCODING_COMPLETE_FORMAT = "編碼完成: {success}/{total} 成功"
     CURRENT_FILE_FORMAT = "{filename} - {message}"
 
+    # ========== 監視資料夾 ==========
+    WATCH_FOLDERS = "監視資料夾"
+    WATCH_FOLDERS_TOOLTIP = "開啟後，監視資料夾中的新檔案寫入完成後會自動加入佇列並編碼"
+    WATCH_SETTINGS = "監視資料夾"
+    WATCH_ADD_FOLDER = "新增..."
+    WATCH_REMOVE_FOLDER = "移除"
+    WATCH_STABLE_SECONDS = "穩定時間（秒）"
+    WATCH_STABLE_SECONDS_TOOLTIP = "檔案大小和修改時間在該時間內保持不變時，視為寫入完成"
+    WATCH_PROCESS_EXISTING = "開始監視時同時編碼資料夾中已有的檔案"
+    WATCH_FOLDERS_HINT = "檔案按目錄結構輸出到全域輸出目錄。可在 config.json 中為每個資料夾單獨設定 output_dir 和 settings。"
+    MSG_NO_WATCH_FOLDERS = "尚未設定監視資料夾，請先在設定中新增"
+    LOG_WATCH_STARTED = "開始監視 {count} 個資料夾（{backend}）"
+    LOG_WATCH_STOPPED = "已停止監視資料夾"
+    LOG_WATCH_FILE_QUEUED = "監視資料夾新檔案: {filename}"
+    LOG_WATCH_NO_OUTPUT_DIR = "監視資料夾未設定輸出目錄，已略過: {filename}"
+
+    # ========== 背景編碼 ==========
+    LOG_ENCODE_SERVICE_FALLBACK = "無法啟動背景編碼程序（{error}），改為在目前視窗中編碼"
+    LOG_ENCODE_SERVICE_REATTACHED = "已重新連線背景編碼（{count} 個檔案）"
+    LOG_ENCODE_SERVICE_FINISHED_OFFLINE = "視窗關閉期間背景編碼已完成：成功 {success} 個，失敗 {failed} 個"
+    MSG_ENCODE_CONTINUE_IN_BACKGROUND = "編碼仍在進行中。\n\n是：在背景繼續編碼（重新開啟 VvEnc 可查看進度）\n否：停止編碼並結束\n取消：返回視窗"
+
+    # ========== FFmpeg 能力偵測 ==========
+    FFMPEG_CAPABILITIES_INFO = "FFmpeg 版本 {version}，{encoders} 個編碼器，硬體加速: {hwaccels}"
+    CODEC_UNAVAILABLE_TOOLTIP = "目前的 FFmpeg 不支援此編碼器"
+    MSG_JOB_VALIDATION_FAILED = "目前的 FFmpeg（{version}）無法執行編碼任務：\n\n{problems}\n\n請修改編碼設定或更換 FFmpeg。"
+
+    # ========== 重複檔案偵測 ==========
+    STATUS_DUPLICATE = "重複檔案"
+    DEDUPE_SETTINGS = "重複檔案"
+    DEDUPE_ON_ADD = "新增檔案時偵測內容相同的檔案，只編碼一次"
+    DEDUPE_ON_ADD_TOOLTIP = "依檔案大小與抽樣雜湊（開頭、中間、結尾）偵測重複；硬連結及指向同一檔案的符號連結無需讀取即可識別。原件編碼完成後，其輸出會硬連結（不支援時複製）到重複檔案的輸出路徑。"
+    DEDUPE_FULL_HASH = "抽樣相同後比較完整檔案內容（較可靠，較慢）"
+    DEDUPE_FULL_HASH_TOOLTIP = "抽樣雜湊相同的檔案再計算完整雜湊，需要讀取整個檔案"
+    LOG_DUPLICATES_FOUND = "發現 {count} 個重複檔案，將使用原件的編碼結果"
+    LOG_DUPLICATE_FILE = "重複檔案: {filename}（原件: {original}）"
+    LOG_DUPLICATE_OUTPUT_LINKED = "重複檔案 {filename} 的輸出已硬連結: {output}"
+    LOG_DUPLICATE_OUTPUT_COPIED = "重複檔案 {filename} 的輸出已複製: {output}"
+    LOG_DUPLICATE_OUTPUT_FAILED = "為重複檔案 {filename} 產生輸出失敗: {error}"
+
+    # ========== 相似影片偵測 ==========
+    FIND_SIMILAR = "尋找相似影片"
+    FIND_SIMILAR_TOOLTIP = "對等待編碼的檔案擷取少量縮圖畫格計算感知雜湊，找出同一內容的不同版本（不同封裝、編碼或解析度）"
+    MSG_NUMPY_REQUIRED = "相似影片偵測需要 NumPy，請先安裝：pip install numpy"
+    MSG_SIMILAR_NEED_FILES = "至少需要兩個等待編碼的檔案"
+    MSG_NO_SIMILAR_VIDEOS = "未發現相似的影片"
+    SIMILAR_ANALYZING = "正在分析 {current}/{total} 個檔案..."
+    SIMILAR_DIALOG_TITLE = "相似影片"
+    SIMILAR_DIALOG_HINT = "以下各組檔案畫面與時長相近，可能是同一內容的不同版本。每組預設勾選解析度與位元率最高的檔案；未勾選的檔案將設為掛起，不會編碼。"
+    SIMILAR_GROUP = "第 {index} 組（{count} 個檔案）"
+    SIMILAR_KEEP_CHECKED = "保留勾選的檔案，掛起其他檔案"
+    LOG_SIMILAR_PAUSED = "相似影片：{groups} 組，已掛起 {count} 個檔案"
+
+    # ========== 目錄快照索引 ==========
+    REFRESH_FOLDERS = "重新整理資料夾"
+    REFRESH_FOLDERS_TOOLTIP = "重新掃描已新增的資料夾（只檢查有變化的目錄）：加入新檔案，移除已刪除的檔案，重新讀取被修改檔案的資訊"
+    MSG_NO_SCANNED_FOLDERS = "尚未新增資料夾"
+    LOG_SCAN_DELTA = "資料夾變化：新增 {added} 個，刪除 {removed} 個，修改 {modified} 個"
+
+    # ========== 分級探測 ==========
+    PROBE_STATUS = "正在獲取詳細資訊 {done}/{total}（期間可排序和開始編碼）"
+
+    # ========== 篩選列 ==========
+    FILTER_LABEL = "篩選:"
+    FILTER_PLACEHOLDER = "例如: height < 720 and status = waiting"
+    FILTER_HELP = ("欄位: codec, acodec, status, width, height/res, fps, bitrate, vbitrate, abitrate, bpp, duration, size, path, name\n"
+                   "運算子: < <= > >= = !=，path/name/codec/status 還可用 ~（萬用字元比對）和 !~\n"
+                   "組合: and, or, not, 括號\n"
+                   "範例: codec = hevc and bitrate > 6M | status = failed | path ~ */archive/* | duration > 30m | size > 2GB")
+    FILTER_INVALID = "篩選條件有誤: {error}"
+    FILTER_MATCHES = "符合 {count} / {total}"
+    FILTER_ACTIONS = "批次操作"
+    FILTER_SELECT_MATCHES = "選取所有符合項"
+    FILTER_SET_WAITING = "符合項設為等待編碼"
+    FILTER_SET_PAUSED = "符合項設為掛起"
+    FILTER_REMOVE_MATCHES = "從清單移除符合項"
+    LOG_FILTER_APPLIED = "批次操作「{action}」：{count} 個檔案"
+
+    # ========== 佇列清單 ==========
+    QUEUE_MANIFEST = "佇列清單"
+    QUEUE_MANIFEST_TOOLTIP = "以 JSON Lines 檔案匯入/匯出佇列（路徑、輸出路徑、檔案層級設定、影片資訊和狀態），可交給其它電腦或由指令碼產生"
+    IMPORT_QUEUE = "匯入佇列..."
+    EXPORT_QUEUE = "匯出佇列..."
+    MANIFEST_FILES_FILTER = "佇列清單 (*.jsonl *.jsonl.gz);;所有檔案 (*.*)"
+    MSG_MANIFEST_IMPORT_FAILED = "讀取佇列清單失敗: {error}"
+    MSG_MANIFEST_EXPORT_FAILED = "匯出佇列清單失敗: {error}"
+    LOG_MANIFEST_IMPORT_STARTED = "正在匯入佇列清單: {path}"
+    LOG_MANIFEST_IMPORTED = "佇列清單匯入完成：{count} 個任務，新增 {added} 個檔案，其中 {probed} 個附帶影片資訊（無需探測）"
+    LOG_MANIFEST_INVALID_LINES = "佇列清單中有 {count} 行無效，已略過（{error}）"
+    LOG_MANIFEST_EXPORTED = "已匯出 {count} 個任務到佇列清單: {path}"
+
+    # ========== 編碼計畫 ==========
+    ENCODE_PLAN = "編碼計畫"
+    ENCODE_PLAN_TOOLTIP = "不編碼，預覽每個任務的輸出路徑、FFmpeg 命令和估算工作量，並檢查輸出衝突"
+    PLAN_DIALOG_TITLE = "編碼計畫"
+    PLAN_SUMMARY = "{count} 個任務，總時長 {duration}，估算工作量 {cost}（按 1080p30 折算，{unknown} 個任務時長未知）。輸出衝突 {collisions} 個，覆蓋輸入檔案 {overwrites} 個，輸出已存在 {exists} 個。"
+    PLAN_ONLY_ISSUES = "只顯示有問題的任務"
+    PLAN_COL_OUTPUT = "輸出檔案"
+    PLAN_COL_ISSUES = "問題"
+    PLAN_COL_COST = "工作量"
+    PLAN_COL_COMMAND = "FFmpeg 命令"
+    PLAN_ISSUE_COLLISION = "與其他任務輸出到同一檔案"
+    PLAN_ISSUE_IN_PLACE = "輸出檔案就是輸入檔案"
+    PLAN_ISSUE_INPUT_OVERWRITE = "會覆蓋佇列中其他任務的輸入檔案"
+    PLAN_ISSUE_EXISTS = "輸出檔案已存在，將被覆蓋"
+    PLAN_EXPORT_SCRIPT = "匯出指令碼..."
+    PLAN_EXPORT_MANIFEST = "匯出佇列清單..."
+    PLAN_SCRIPT_FILES_FILTER = "指令碼 (*.bat *.cmd *.sh);;所有檔案 (*.*)"
+    PLAN_CLOSE = "關閉"
+    MSG_PLAN_BLOCKED = "有 {count} 個任務的輸出檔案與其他任務相同或會覆蓋輸入檔案，未開始編碼。\n請在編碼計畫中查看這些任務，變更輸出目錄或將多餘的檔案設為掛起。"
+    MSG_PLAN_EXPORT_FAILED = "匯出編碼計畫失敗: {error}"
+    LOG_PLAN_EXISTING_OUTPUTS = "{count} 個任務的輸出檔案已存在，編碼時將被覆蓋"
+    LOG_PLAN_EXPORTED = "已匯出編碼計畫（{count} 個任務）: {path}"
+
+    # ========== 影片濾鏡規劃 ==========
+    SCALE_FLAGS = "縮放演算法"
+    SCALE_FLAGS_TOOLTIP = "調整解析度時使用的 FFmpeg 縮放演算法。預設 bicubic 與 FFmpeg 預設值相同；auto：縮小時使用較快但畫質略低的 bilinear，放大時使用 bicubic；也可以直接填寫 FFmpeg scale 濾鏡的 flags，例如 lanczos"
+    PLAN_COL_FILTERS = "影片濾鏡"
+    PLAN_NO_FILTERS = "無（與來源相同）"
+    PLAN_FILTER_FPS_DROP_FIRST = "影格率 {source} → {target} fps：fps 放在最前，後續濾鏡少處理 {saved}% 的影格"
+    PLAN_FILTER_FPS_UNKNOWN_FIRST = "來源影格率未知：fps 按降低影格率處理，放在最前"
+    PLAN_FILTER_FPS_RAISE_LAST = "影格率 {source} → {target} fps：fps 放在最後，避免縮放重複的影格"
+    PLAN_FILTER_FPS_SAME = "來源影格率已是 {target} fps，省略 fps"
+    PLAN_FILTER_SCALE = "縮放 {source} → {target}，演算法 {flags}"
+    PLAN_FILTER_SCALE_UNKNOWN = "縮放到 {target}（來源解析度未知），演算法 {flags}"
+    PLAN_FILTER_SCALE_SAME = "來源解析度已是 {target}，省略 scale"
+    PLAN_FILTER_FORMAT_MERGED = "像素格式 {source} → {target}：緊接 scale，由同一次縮放完成"
+    PLAN_FILTER_FORMAT = "像素格式 {source} → {target}"
+    PLAN_FILTER_FORMAT_SAME = "來源像素格式已是 {target}，省略 format"
+
+    # ========== 多碼率輸出 ==========
+    RENDITION_SETTINGS = "多碼率輸出（一次解碼，輸出多個檔案）"
+    RENDITION_NAME = "後綴"
+    RENDITION_ADD = "新增"
+    RENDITION_REMOVE = "移除"
+    RENDITION_TABLE_TOOLTIP = "每列對應一個輸出檔案，留空的參數使用上方的影片設定，例如後綴 720p、解析度 -2:720"
+    RENDITION_HINT = "設定後每個檔案只解碼一次，分別編碼為各個規格：clip.mkv 輸出為 clip_1080p.mp4、clip_720p.mp4 等。表格為空時只輸出一個檔案。"
+    LOG_RENDITION_OUTPUT = "  ✓ {name}: {output}（{size}）"
+    LOG_RENDITION_MISSING = "  ✗ {name}: 輸出檔案不存在 {output}"
+
+    # ========== 小檔案批次編碼 ==========
+    BATCH_SETTINGS = "小檔案批次編碼"
+    BATCH_SMALL_FILES = "多個小檔案由同一個 FFmpeg 程序編碼"
+    BATCH_SMALL_FILES_TOOLTIP = "幾秒的短片中，啟動 FFmpeg 和編碼器的耗時比編碼本身更長。小檔案分組後每組由一個程序編碼；程序失敗時組內檔案再逐個單獨編碼。"
+    BATCH_MAX_DURATION = "小檔案最長時長"
+    BATCH_MAX_FILES = "每個程序最多檔案數"
+
+    # ========== 黑邊偵測 ==========
+    COL_CROP = "黑邊裁切"
+    CROP_NONE = "無黑邊"
+    AUTO_CROP = "偵測並裁掉黑邊"
+    AUTO_CROP_TOOLTIP = "在每個檔案中均勻抽取幾個短窗口執行 cropdetect（快速定位、並行執行），在縮放之前裁掉穩定的黑邊，編碼器不再為黑邊浪費位元率。偵測結果與探測資訊一起快取，並顯示在「黑邊裁切」欄中。"
+    PLAN_FILTER_CROP = "裁掉黑邊 {source} → {target}，少處理 {saved}% 的像素"
+    PLAN_FILTER_CROP_UNKNOWN = "裁掉黑邊，裁切為 {target}（來源解析度未知）"
+
+    # ========== 丟棄重複影格 ==========
+    DECIMATE_SETTINGS = "重複影格（螢幕錄影）"
+    DECIMATE = "丟棄重複影格（mpdecimate，可變影格率輸出）"
+    DECIMATE_TOOLTIP = "螢幕錄影中大部分影格與上一影格相同。mpdecimate 在裁切和縮放之前丟棄這些影格，編碼器只處理有變化的影格。輸出為可變影格率：保留的影格沿用原時間戳，MP4 按原節奏播放。日誌中會列出丟棄的影格數。"
+    DECIMATE_HI = "區塊差異閾值（hi）"
+    DECIMATE_HI_TOOLTIP = "任何一個 8x8 區塊的差異超過此值時視為有變化（FFmpeg 預設 768 = 64*12）"
+    DECIMATE_LO = "區塊差異閾值（lo）"
+    DECIMATE_LO_TOOLTIP = "差異超過此值的區塊佔比超過下面的比例時也視為有變化（FFmpeg 預設 320 = 64*5）"
+    DECIMATE_FRAC = "變化區塊比例"
+    DECIMATE_MAX = "最多連續丟棄"
+    DECIMATE_MAX_UNLIMITED = "不限制"
+    DECIMATE_MAX_TOOLTIP = "連續丟棄這麼多影格後至少保留一格，長時間靜止的畫面也會定期更新"
+    PLAN_FILTER_FPS_DECIMATE_FIRST = "影格率 {target} fps：放在 mpdecimate 之前，由 mpdecimate 丟棄重複影格"
+    PLAN_FILTER_DECIMATE = "mpdecimate 丟棄與上一影格相同的影格，之後的濾鏡只處理有變化的影格（可變影格率輸出）"
+
+    # ========== 抽樣試編碼預估 ==========
+    COL_EST_SIZE = "預估大小"
+    COL_EST_TIME = "預估耗時"
+    EST_SIZE_TOOLTIP = "預估輸出 {size}，來源檔案 {source}（{change:+d}%）"
+    ESTIMATE = "預估"
+    ESTIMATE_STOP = "停止預估"
+    ESTIMATE_TOOLTIP = "用目前設定試編碼選取的等待編碼檔案（未選取時為全部等待編碼檔案）中的幾個短視窗，推算輸出大小和編碼耗時及其範圍。不會寫入輸出目錄。"
+    ESTIMATE_SUMMARY_TITLE = "預估"
+    ESTIMATE_SUMMARY = "已預估 {count} 個檔案（{failed} 個無法預估）\n輸出大小：{size}（{size_low} – {size_high}），來源檔案 {source}（{change:+d}%）\n編碼耗時：{time}（{time_low} – {time_high}）"
+    LOG_ESTIMATE_STARTED = "正在試編碼 {count} 個檔案的抽樣視窗..."
+    LOG_ESTIMATE_FAILED = "無法預估 {filename}（時長未知或試編碼失敗）"
+    LOG_ESTIMATE_CANCELLED = "已停止預估"
+
+    # ========== 依片源搜尋 CRF ==========
+    CRF_SEARCH_SETTINGS = "依片源搜尋 CRF"
+    CRF_SEARCH = "為每個檔案搜尋符合目標品質的最大 CRF"
+    CRF_SEARCH_TOOLTIP = "編碼前用目前設定以候選 CRF 試編碼每個檔案中的幾個短視窗，並與來源影片比較品質（SSIM，FFmpeg 帶有 libvmaf 時為 VMAF）。二分搜尋平均分數達到目標的最大 CRF（檔案最小），該檔案使用這個 CRF 編碼。分數會被快取，再次編碼時不再重複試編碼。"
+    CRF_SEARCH_METRIC = "品質指標"
+    CRF_SEARCH_METRIC_AUTO = "自動（可用時使用 VMAF，否則使用 SSIM）"
+    CRF_SEARCH_METRIC_SSIM = "SSIM"
+    CRF_SEARCH_METRIC_VMAF = "VMAF"
+    CRF_SEARCH_TARGET_SSIM = "目標 SSIM"
+    CRF_SEARCH_TARGET_VMAF = "目標 VMAF"
+    CRF_SEARCH_RANGE = "CRF 範圍"
+    LOG_CRF_SEARCH_STARTED = "正在為 {count} 個檔案搜尋 CRF..."
+    LOG_CRF_SEARCH_FAILED = "{filename} 的 CRF 搜尋失敗，使用設定中的 CRF"
+    LOG_CRF_SELECTED = "{filename}: {result}"
+
+    # ========== 內容複雜度分析 ==========
+    COMPLEXITY_SETTINGS = "內容複雜度"
+    COMPLEXITY_ANALYSIS = "分析內容複雜度，依檔案調整 CRF 和預設"
+    COMPLEXITY_ANALYSIS_TOOLTIP = "檔案偵測完成後解碼一次（縮小並抽幀），以 NumPy 計算空間複雜度（細節）、時間複雜度（運動）和鏡頭切換，單核即遠快於即時。每個檔案分為低、中、高三檔，並依下方設定調整該檔的 CRF 和預設。結果與影片資訊一起快取。"
+    COMPLEXITY_LOW = "低"
+    COMPLEXITY_MEDIUM = "中"
+    COMPLEXITY_HIGH = "高"
+    COMPLEXITY_CRF_OFFSET = "CRF 偏移"
+    COMPLEXITY_PRESET_STEPS = "預設檔數"
+    COMPLEXITY_PRESET_STEPS_TOOLTIP = "正數改用更慢的預設（例如 medium → slow），負數改用更快的預設"
+    MSG_COMPLEXITY_NUMPY_REQUIRED = "內容複雜度分析需要 NumPy，請先安裝：pip install numpy"
+    COL_COMPLEXITY = "複雜度"
+    COMPLEXITY_TOOLTIP = "空間 {spatial:.1f} · 時間 {temporal:.1f} · {cuts} 次鏡頭切換"
+    LOG_COMPLEXITY_PENDING = "{count} 個檔案尚未完成複雜度分析，使用原有的 CRF 和預設"
+
+    # ========== 截止時間規劃 ==========
+    DEADLINE_SETTINGS = "截止時間規劃"
+    DEADLINE_PLANNING = "依截止時間為每個檔案選擇預設"
+    DEADLINE_PLANNING_TOOLTIP = "開始編碼時依本機記錄的編碼速度預測每個檔案的耗時，在截止時間前完成的前提下為每個檔案選擇盡可能慢（壓縮率更高）的預設。編碼過程中實際速度與預測偏差較大時，重新規劃尚未開始的檔案。本機還沒有速度資料時依預設速度估算，每次編碼完成後自動校準。"
+    DEADLINE_TIME = "截止時間"
+    DEADLINE_CORES = "可用核心數"
+    DEADLINE_ALL_CORES = "全部"
+    MSG_DEADLINE_INVALID = "無效的截止時間，可使用 23:30、+2h、+90m 或 2026-10-20 08:00 等格式"
+    LOG_DEADLINE_PLAN = "截止時間 {deadline}：可用 {available}，預計耗時 {predicted}，預設 {presets}"
+    LOG_DEADLINE_INFEASIBLE = "即使全部使用最快的預設也無法在截止時間前完成"
+    LOG_DEADLINE_UNCALIBRATED = "本機尚無部分編碼參數的速度資料，依預設速度估算，編碼過程中會依實際速度重新規劃"
+    LOG_DEADLINE_REPLAN = "實際耗時為預測的 {ratio}，已調整 {count} 個未開始檔案的預設：{presets}"
+
+    # ========== 加權進度和剩餘時間 ==========
+    ETA_SUFFIX = "，剩餘 {eta}"
+    QUEUE_ETA_SUFFIX = "，剩餘 {eta}（預計 {finish} 完成）"